@@ -8,7 +8,13 @@ import random
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Mapping, Optional, Sequence
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from backend.services.inference_batcher import MicroBatcher
+from backend.services.model_backends import backend_status, load_fast_pipeline, resolve_backend
+from backend.services.ohlcv_store import OHLCVView
 from config import HUGGINGFACE_MODELS, get_settings
 
 # Module logger must exist before any import-time logging below.
@@ -96,6 +102,15 @@ if HF_MODE == "auth" and not HF_TOKEN_ENV:
     HF_MODE = "off"
     logger.warning("HF_MODE='auth' but no HF_TOKEN found, resetting to 'off'")
 
+# Micro-batching of pipeline calls (see backend/services/inference_batcher.py)
+INFERENCE_MAX_BATCH = int(os.getenv("HF_INFERENCE_MAX_BATCH", "32"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("HF_INFERENCE_MAX_WAIT_MS", "5"))
+INFERENCE_CACHE_SIZE = int(os.getenv("HF_INFERENCE_CACHE_SIZE", "4096"))
+
+# CPU backend for classification models: auto | torch | onnx | onnx-int8 | int8
+# (see backend/services/model_backends.py)
+INFERENCE_BACKEND = os.getenv("HF_INFERENCE_BACKEND", "auto").lower()
+
 # Linked models in HF Space - these are pre-validated
 LINKED_MODEL_IDS = {
     "cardiffnlp/twitter-roberta-base-sentiment-latest",
@@ -326,6 +341,8 @@ class ModelRegistry:
         self._failed_models = {}  # Track failed models with reasons
         # Health tracking for self-healing
         self._health_registry = {}  # key -> health entry
+        self._batchers: Dict[str, MicroBatcher] = {}  # key -> micro-batching queue
+        self._backends: Dict[str, str] = {}  # key -> backend the pipeline was loaded with
 
     def _get_or_create_health_entry(self, key: str) -> ModelHealthEntry:
         """Get or create health entry for a model"""
@@ -588,8 +605,8 @@ class ModelRegistry:
                     # Explicitly set to None to avoid using expired tokens
                     pipeline_kwargs["token"] = None
                 
-                self._pipelines[key] = pipeline(**pipeline_kwargs)
-                logger.info(f"✅ Successfully loaded model: {spec.model_id}")
+                self._pipelines[key] = self._load_pipeline(spec, pipeline_kwargs)
+                logger.info(f"✅ Successfully loaded model: {spec.model_id} (backend={self._backends[key]})")
                 # Update health on successful load
                 self._update_health_on_success(key)
                 return self._pipelines[key]
@@ -653,6 +670,26 @@ class ModelRegistry:
         
         return self._pipelines[key]
     
+    def _load_pipeline(self, spec: PipelineSpec, pipeline_kwargs: Dict[str, Any]):
+        """Load with the fast CPU backend when it applies, else a plain transformers pipeline"""
+        backend = resolve_backend(INFERENCE_BACKEND, spec.task, pipeline_kwargs.get("device", -1))
+        if backend != "torch":
+            try:
+                pipe = load_fast_pipeline(
+                    spec.model_id,
+                    spec.task,
+                    backend,
+                    reference_factory=lambda: pipeline(**pipeline_kwargs),
+                    token=pipeline_kwargs.get("token")
+                )
+                self._backends[spec.key] = backend
+                return pipe
+            except Exception as e:
+                logger.warning(f"{backend} backend unavailable for {spec.model_id}, using torch: {str(e)[:200]}")
+
+        self._backends[spec.key] = "torch"
+        return pipeline(**pipeline_kwargs)
+
     def call_model_safe(self, key: str, text: str, **kwargs) -> Dict[str, Any]:
         """
         Safely call a model with health tracking.
@@ -687,6 +724,42 @@ class ModelRegistry:
                 "model_key": key
             }
 
+    def get_batcher(self, key: str) -> MicroBatcher:
+        """
+        Micro-batching queue in front of a model pipeline.
+        Raises ModelNotAvailable (like get_pipeline) if the model cannot be loaded.
+        """
+        self.get_pipeline(key)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            with self._lock:
+                batcher = self._batchers.get(key)
+                if batcher is None:
+                    batcher = self._batchers[key] = MicroBatcher(
+                        lambda texts, key=key: self._run_pipeline_batch(key, texts),
+                        max_batch_size=INFERENCE_MAX_BATCH,
+                        max_wait_ms=INFERENCE_MAX_WAIT_MS,
+                        cache_size=INFERENCE_CACHE_SIZE,
+                        name=key
+                    )
+        return batcher
+
+    def _run_pipeline_batch(self, key: str, texts: List[str]) -> List[Any]:
+        """One padded forward pass over a list of texts"""
+        pipe = self.get_pipeline(key)
+        try:
+            results = pipe(texts, batch_size=len(texts), truncation=True)
+        except Exception as e:
+            self._update_health_on_failure(key, f"{type(e).__name__}: {str(e)[:200]}")
+            raise
+        self._update_health_on_success(key)
+        # Single-label pipelines return a dict per text, top_k pipelines a list
+        return [r[0] if isinstance(r, list) and r else r for r in results]
+
+    def get_batcher_stats(self) -> List[Dict[str, Any]]:
+        """Batch size, cache hit ratio and latency stats of every active batcher"""
+        return [batcher.get_stats() for batcher in self._batchers.values()]
+
     def get_registry_status(self) -> Dict[str, Any]:
         """Get detailed registry status with all models"""
         items = []
@@ -700,6 +773,7 @@ class ModelRegistry:
                 "task": spec.task,
                 "category": spec.category,
                 "loaded": loaded,
+                "backend": self._backends.get(key),
                 "error": error,
                 "requires_auth": spec.requires_auth
             })
@@ -711,6 +785,7 @@ class ModelRegistry:
             "items": items,
             "hf_mode": HF_MODE,
             "transformers_available": TRANSFORMERS_AVAILABLE,
+            "inference_backend": backend_status(),
             "initialized": self._initialized
         }
     
@@ -903,19 +978,17 @@ def call_model_safe(model_key: str, text: str, **kwargs) -> Dict[str, Any]:
     """Safely call a model with health tracking"""
     return _registry.call_model_safe(model_key, text, **kwargs)
 
-def ensemble_crypto_sentiment(text: str) -> Dict[str, Any]:
-    """Ensemble crypto sentiment with fallback model selection"""
-    if not TRANSFORMERS_AVAILABLE:
-        logger.warning("Transformers not available, using fallback")
-        return basic_sentiment_fallback(text)
-    
-    if HF_MODE == "off":
-        logger.warning("HF_MODE=off, using fallback")
-        return basic_sentiment_fallback(text)
-    
-    results, labels_count, total_conf = {}, {"bullish": 0, "bearish": 0, "neutral": 0}, 0.0
-    
-    # Try models in order with expanded fallback chain
+def _map_sentiment_label(label: str) -> str:
+    """Map model labels to bullish / bearish / neutral"""
+    label = label.upper()
+    if "POSITIVE" in label or "BULLISH" in label or "LABEL_2" in label:
+        return "bullish"
+    if "NEGATIVE" in label or "BEARISH" in label or "LABEL_0" in label:
+        return "bearish"
+    return "neutral"
+
+def _crypto_sentiment_candidates() -> List[str]:
+    """Crypto sentiment model keys in fallback order"""
     # Primary candidates
     candidate_keys = ["crypto_sent_0", "crypto_sent_1", "crypto_sent_2"]
     
@@ -925,56 +998,79 @@ def ensemble_crypto_sentiment(text: str) -> Dict[str, Any]:
     # Last resort: try any crypto sentiment model
     all_crypto_keys = [k for k in MODEL_SPECS.keys() if k.startswith("crypto_sent_") or MODEL_SPECS[k].category == "sentiment_crypto"]
     
-    # Combine all candidate keys
-    all_candidates = candidate_keys + fallback_keys + [k for k in all_crypto_keys if k not in candidate_keys and k not in fallback_keys][:5]
+    candidates = candidate_keys + fallback_keys + [k for k in all_crypto_keys if k not in candidate_keys and k not in fallback_keys][:5]
+    return [k for k in candidates if k in MODEL_SPECS]
+
+def _crypto_sentiment_result(key: str, res: Dict[str, Any]) -> Dict[str, Any]:
+    """Ensemble response for one pipeline result"""
+    mapped = _map_sentiment_label(res.get("label", "NEUTRAL"))
+    score = res.get("score", 0.5)
+    return {
+        "label": mapped,
+        "confidence": score,
+        "scores": {MODEL_SPECS[key].model_id: {"label": mapped, "score": score}},
+        "model_count": 1,
+        "available": True,
+        "engine": "huggingface"
+    }
+
+def _hf_sentiment_enabled() -> bool:
+    if not TRANSFORMERS_AVAILABLE:
+        logger.warning("Transformers not available, using fallback")
+        return False
+    if HF_MODE == "off":
+        logger.warning("HF_MODE=off, using fallback")
+        return False
+    return True
+
+def ensemble_crypto_sentiment_batch(texts: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Crypto sentiment for many texts with one forward pass per batch.
+    Uses the first available model of the fallback chain; results are cached
+    per normalized text.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    if not _hf_sentiment_enabled():
+        return [basic_sentiment_fallback(text) for text in texts]
     
-    for key in all_candidates:
-        if key not in MODEL_SPECS:
-            continue
+    for key in _crypto_sentiment_candidates():
         try:
-            pipe = _registry.get_pipeline(key)
-            res = pipe(text[:512])
-            if isinstance(res, list) and res: 
-                res = res[0]
-            
-            label = res.get("label", "NEUTRAL").upper()
-            score = res.get("score", 0.5)
-            
-            # Map labels to our standard format
-            mapped = "bullish" if "POSITIVE" in label or "BULLISH" in label or "LABEL_2" in label else (
-                "bearish" if "NEGATIVE" in label or "BEARISH" in label or "LABEL_0" in label else "neutral"
-            )
-            
-            spec = MODEL_SPECS[key]
-            results[spec.model_id] = {"label": mapped, "score": score}
-            labels_count[mapped] += 1
-            total_conf += score
-            
-            # If we got at least one result, we can proceed
-            if len(results) >= 1:
-                break  # Got at least one working model
-                
+            results = _registry.get_batcher(key).infer(texts)
+            return [_crypto_sentiment_result(key, res) for res in results]
         except ModelNotAvailable:
             continue  # Try next model
         except Exception as e:
             logger.warning(f"Ensemble failed for {key}: {str(e)[:100]}")
             continue
     
-    if not results:
-        logger.warning("No HF models available, using fallback")
+    logger.warning("No HF models available, using fallback")
+    return [basic_sentiment_fallback(text) for text in texts]
+
+async def ensemble_crypto_sentiment_async(text: str) -> Dict[str, Any]:
+    """
+    Async crypto sentiment: concurrent callers are coalesced into
+    micro-batches and served from the result cache when possible
+    """
+    if not _hf_sentiment_enabled():
         return basic_sentiment_fallback(text)
     
-    final = max(labels_count, key=labels_count.get)
-    avg_conf = total_conf / len(results)
+    for key in _crypto_sentiment_candidates():
+        try:
+            return _crypto_sentiment_result(key, await _registry.get_batcher(key).submit(text))
+        except ModelNotAvailable:
+            continue
+        except Exception as e:
+            logger.warning(f"Ensemble failed for {key}: {str(e)[:100]}")
+            continue
     
-    return {
-        "label": final,
-        "confidence": avg_conf,
-        "scores": results,
-        "model_count": len(results),
-        "available": True,
-        "engine": "huggingface"
-    }
+    logger.warning("No HF models available, using fallback")
+    return basic_sentiment_fallback(text)
+
+def ensemble_crypto_sentiment(text: str) -> Dict[str, Any]:
+    """Ensemble crypto sentiment with fallback model selection"""
+    return ensemble_crypto_sentiment_batch([text])[0]
 
 def analyze_crypto_sentiment(text: str): return ensemble_crypto_sentiment(text)
 
@@ -1086,9 +1182,15 @@ def analyze_chart_points(data: Sequence[Mapping[str, Any]], indicators: Optional
     return {"trend": trend, "strength": strength, "change_pct": change, "support": min(prices), "resistance": max(prices), "analysis": f"Price moved {change:.2f}% showing {trend} trend"}
 
 def analyze_news_item(item: Dict[str, Any]):
-    text = item.get("title", "") + " " + item.get("description", "")
-    sent = ensemble_crypto_sentiment(text)
-    return {**item, "sentiment": sent["label"], "sentiment_confidence": sent["confidence"], "sentiment_details": sent}
+    return analyze_news_items([item])[0]
+
+def analyze_news_items(items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach sentiment to news items (one batched inference for all articles)"""
+    texts = [(item.get("title") or "") + " " + (item.get("description") or "") for item in items]
+    return [
+        {**item, "sentiment": sent["label"], "sentiment_confidence": sent["confidence"], "sentiment_details": sent}
+        for item, sent in zip(items, ensemble_crypto_sentiment_batch(texts))
+    ]
 
 def get_model_info():
     return {
@@ -1096,6 +1198,7 @@ def get_model_info():
         "hf_auth_configured": bool(settings.hf_token),
         "models_initialized": _registry._initialized,
         "models_loaded": len(_registry._pipelines),
+        "inference_batchers": _registry.get_batcher_stats(),
         "model_catalog": {
             "crypto_sentiment": CRYPTO_SENTIMENT_MODELS,
             "social_sentiment": SOCIAL_SENTIMENT_MODELS,
@@ -1229,7 +1332,7 @@ class GapFillingService:
     async def fill_missing_ohlc(
         self, 
         symbol: str, 
-        existing_data: List[Dict[str, Any]], 
+        existing_data: Union[List[Dict[str, Any]], OHLCVView], 
         missing_timestamps: List[int]
     ) -> Dict[str, Any]:
         """
@@ -1237,42 +1340,41 @@ class GapFillingService:
         
         Args:
             symbol: Trading pair symbol (e.g., "BTCUSDT")
-            existing_data: List of existing OHLC data points
+            existing_data: List of existing OHLC data points, or a zero-copy
+                OHLCVView from the columnar store (timestamps in epoch ms)
             missing_timestamps: List of timestamps with missing data
         
         Returns:
             Dictionary with filled data and metadata
         """
-        try:
-            if not existing_data or not missing_timestamps:
-                return {
-                    "status": "error",
-                    "message": "Insufficient data for gap filling",
-                    "filled_count": 0,
-                    "fallback": True
-                }
-            
-            # Validate data structure
-            if not isinstance(existing_data, list) or not isinstance(missing_timestamps, list):
-                return {
-                    "status": "error",
-                    "message": "Invalid data types for gap filling",
-                    "filled_count": 0,
-                    "fallback": True
-                }
+        no_data = not len(existing_data) if isinstance(existing_data, OHLCVView) else not existing_data
+        if no_data or not missing_timestamps:
+            return {
+                "status": "error",
+                "message": "Insufficient data for gap filling",
+                "filled_count": 0,
+                "fallback": True
+            }
         
-            filled_data = []
-            confidence_scores = []
-            
-            # Sort existing data by timestamp
-            try:
-                existing_data.sort(key=lambda x: x.get("timestamp", 0))
-            except (TypeError, AttributeError) as e:
-                logger.warning(f"Error sorting existing_data: {e}, using fallback")
-                # Fallback: use first and last if sorting fails
-                if len(existing_data) >= 2:
-                    existing_data = [existing_data[0], existing_data[-1]]
-                else:
+        # Validate data structure
+        if not isinstance(existing_data, (list, OHLCVView)) or not isinstance(missing_timestamps, list):
+            return {
+                "status": "error",
+                "message": "Invalid data types for gap filling",
+                "filled_count": 0,
+                "fallback": True
+            }
+        
+        try:
+            if isinstance(existing_data, OHLCVView):
+                # Store views are already sorted, typed columns (zero-copy)
+                timestamps = existing_data.timestamp
+                columns = {name: getattr(existing_data, name) for name in ("open", "high", "low", "close", "volume")}
+            else:
+                try:
+                    timestamps, columns = self._candle_columns(existing_data)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Error sorting existing_data: {e}")
                     return {
                         "status": "error",
                         "message": "Cannot sort existing data",
@@ -1280,82 +1382,8 @@ class GapFillingService:
                         "fallback": True
                     }
             
-            for missing_ts in missing_timestamps:
-                try:
-                    # Find surrounding data points
-                    before = [d for d in existing_data if d.get("timestamp", 0) < missing_ts]
-                    after = [d for d in existing_data if d.get("timestamp", 0) > missing_ts]
-                    
-                    if before and after:
-                        # Linear interpolation between surrounding points
-                        prev_point = before[-1]
-                        next_point = after[0]
-                        
-                        # Validate point structure
-                        if not all(k in prev_point for k in ["timestamp", "close"]) or \
-                           not all(k in next_point for k in ["timestamp", "open", "close"]):
-                            logger.warning(f"Invalid data point structure, skipping timestamp {missing_ts}")
-                            continue
-                        
-                        # Calculate interpolation factor
-                        time_diff = next_point["timestamp"] - prev_point["timestamp"]
-                        position = (missing_ts - prev_point["timestamp"]) / time_diff if time_diff > 0 else 0.5
-                        
-                        # Interpolate OHLC values with safe defaults
-                        prev_close = prev_point.get("close", prev_point.get("price", 0))
-                        next_open = next_point.get("open", next_point.get("close", prev_close))
-                        next_close = next_point.get("close", next_open)
-                        
-                        interpolated = {
-                            "timestamp": missing_ts,
-                            "open": prev_close * (1 - position) + next_open * position,
-                            "high": max(prev_point.get("high", prev_close), next_point.get("high", next_close)) * (0.98 + position * 0.04),
-                            "low": min(prev_point.get("low", prev_close), next_point.get("low", next_close)) * (1.02 - position * 0.04),
-                            "close": prev_close * (1 - position) + next_close * position,
-                            "volume": (prev_point.get("volume", 0) + next_point.get("volume", 0)) / 2,
-                            "is_synthetic": True,
-                            "method": "linear_interpolation"
-                        }
-                        
-                        # Calculate confidence based on distance
-                        confidence = 0.95 ** (len(missing_timestamps))  # Decay with gap size
-                        confidence_scores.append(confidence)
-                        interpolated["confidence"] = confidence
-                        
-                        filled_data.append(interpolated)
-                    elif before:
-                        # Only before data - use last known value
-                        prev_point = before[-1]
-                        filled_data.append({
-                            "timestamp": missing_ts,
-                            "open": prev_point.get("close", prev_point.get("price", 0)),
-                            "high": prev_point.get("high", prev_point.get("close", 0)),
-                            "low": prev_point.get("low", prev_point.get("close", 0)),
-                            "close": prev_point.get("close", prev_point.get("price", 0)),
-                            "volume": prev_point.get("volume", 0),
-                            "is_synthetic": True,
-                            "method": "last_known_value",
-                            "confidence": 0.70
-                        })
-                        confidence_scores.append(0.70)
-                    elif after:
-                        # Only after data - use first known value
-                        next_point = after[0]
-                        filled_data.append({
-                            "timestamp": missing_ts,
-                            "open": next_point.get("open", next_point.get("price", 0)),
-                            "high": next_point.get("high", next_point.get("open", 0)),
-                            "low": next_point.get("low", next_point.get("open", 0)),
-                            "close": next_point.get("open", next_point.get("price", 0)),
-                            "volume": next_point.get("volume", 0),
-                            "is_synthetic": True,
-                            "method": "first_known_value",
-                            "confidence": 0.70
-                        })
-                        confidence_scores.append(0.70)
-                except Exception as e:
-                    logger.warning(f"Error filling timestamp {missing_ts}: {e}")
-                    continue
+            filled_data = self._interpolate_gaps(timestamps, columns, missing_timestamps)
+            confidence_scores = [point["confidence"] for point in filled_data]
             
             return {
                 "status": "success",
@@ -1380,6 +1408,132 @@ class GapFillingService:
                 "error": str(e)[:200]
             }
     
+    @staticmethod
+    def _candle_columns(candles: List[Dict[str, Any]]):
+        """
+        Sorted timestamp array plus float columns (NaN where a field is absent)
+        for a list of candle dicts; built once, O(n log n)
+        """
+        def column(name: str) -> np.ndarray:
+            return np.array(
+                [np.nan if c.get(name) is None else c[name] for c in candles],
+                dtype=np.float64
+            )
+        
+        timestamps = np.array([c.get("timestamp", 0) for c in candles], dtype=np.float64)
+        order = np.argsort(timestamps, kind="stable")
+        columns = {name: column(name)[order] for name in ("open", "high", "low", "close", "volume", "price")}
+        columns["has_timestamp"] = np.array(["timestamp" in c for c in candles])[order]
+        return timestamps[order], columns
+    
+    @staticmethod
+    def _interpolate_gaps(
+        timestamps: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        missing_timestamps: List[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fill every missing timestamp at once: neighbours come from two binary
+        searches on the sorted timestamps (O(m log n)) and all OHLCV values
+        are computed as array operations
+        
+        Args:
+            timestamps: Sorted existing timestamps
+            columns: open/high/low/close/volume arrays aligned with timestamps
+                (optional price and has_timestamp for dict input; NaN = absent)
+            missing_timestamps: Timestamps to synthesize
+        
+        Returns:
+            Synthetic candles in the order of missing_timestamps
+        """
+        n = len(timestamps)
+        targets = np.asarray(missing_timestamps, dtype=np.float64)
+        before = np.searchsorted(timestamps, targets, side="left") - 1
+        after = np.searchsorted(timestamps, targets, side="right")
+        has_before = before >= 0
+        has_after = after < n
+        b = np.clip(before, 0, n - 1)
+        a = np.clip(after, 0, n - 1)
+        
+        missing = np.full(n, np.nan)
+        price = columns.get("price", missing)
+        has_timestamp = columns.get("has_timestamp", np.ones(n, dtype=bool))
+        
+        def first(*values):
+            """Element-wise first non-NaN value (like chained dict.get defaults)"""
+            out = np.asarray(values[0], dtype=np.float64)
+            for value in values[1:]:
+                out = np.where(np.isnan(out), value, out)
+            return out
+        
+        open_, high, low, close, volume = (columns[name] for name in ("open", "high", "low", "close", "volume"))
+        
+        # Linear interpolation between surrounding points
+        prev_close = first(close[b], price[b], 0.0)
+        next_open = first(open_[a], close[a], prev_close)
+        next_close = first(close[a], next_open)
+        time_diff = timestamps[a] - timestamps[b]
+        position = np.where(time_diff > 0, (targets - timestamps[b]) / np.where(time_diff > 0, time_diff, 1), 0.5)
+        interp_ok = (
+            has_before & has_after & has_timestamp[b] & has_timestamp[a]
+            & ~np.isnan(close[b]) & ~np.isnan(open_[a]) & ~np.isnan(close[a])
+        )
+        interp = {
+            "open": prev_close * (1 - position) + next_open * position,
+            "high": np.maximum(first(high[b], prev_close), first(high[a], next_close)) * (0.98 + position * 0.04),
+            "low": np.minimum(first(low[b], prev_close), first(low[a], next_close)) * (1.02 - position * 0.04),
+            "close": prev_close * (1 - position) + next_close * position,
+            "volume": (first(volume[b], 0.0) + first(volume[a], 0.0)) / 2
+        }
+        
+        # Only data before the gap - last known value
+        last_close = first(close[b], price[b], 0.0)
+        last_known = {
+            "open": last_close,
+            "high": first(high[b], close[b], 0.0),
+            "low": first(low[b], close[b], 0.0),
+            "close": last_close,
+            "volume": first(volume[b], 0.0)
+        }
+        
+        # Only data after the gap - first known value
+        first_open = first(open_[a], price[a], 0.0)
+        first_known = {
+            "open": first_open,
+            "high": first(high[a], open_[a], 0.0),
+            "low": first(low[a], open_[a], 0.0),
+            "close": first_open,
+            "volume": first(volume[a], 0.0)
+        }
+        
+        interp_confidence = 0.95 ** len(missing_timestamps)  # Decay with gap size
+        fields = ("open", "high", "low", "close", "volume")
+        interp_rows = zip(*(interp[f].tolist() for f in fields))
+        last_rows = zip(*(last_known[f].tolist() for f in fields))
+        first_rows = zip(*(first_known[f].tolist() for f in fields))
+        
+        filled_data = []
+        for ts, both, ok, prev_only, row_i, row_l, row_f in zip(
+            missing_timestamps, (has_before & has_after).tolist(), interp_ok.tolist(),
+            (has_before & ~has_after).tolist(), interp_rows, last_rows, first_rows
+        ):
+            if both:
+                if not ok:
+                    logger.warning(f"Invalid data point structure, skipping timestamp {ts}")
+                    continue
+                row, method, confidence = row_i, "linear_interpolation", interp_confidence
+            elif prev_only:
+                row, method, confidence = row_l, "last_known_value", 0.70
+            else:
+                row, method, confidence = row_f, "first_known_value", 0.70
+            
+            point = {"timestamp": ts}
+            point.update(zip(fields, row))
+            point.update({"is_synthetic": True, "method": method, "confidence": confidence})
+            filled_data.append(point)
+        
+        return filled_data
+    
     async def estimate_orderbook_depth(
         self, 
         symbol: str, 
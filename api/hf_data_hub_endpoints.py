@@ -9,7 +9,7 @@ This API ensures all data comes from HuggingFace Datasets:
 
 import os
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Query, Depends
@@ -24,6 +24,7 @@ try:
 except ImportError:
     DATASETS_AVAILABLE = False
 
+from hf_shard_writer import DATASET_KEY_COLUMNS, drop_revisions
 from utils.logger import setup_logger
 
 logger = setup_logger("hf_data_hub_api")
@@ -77,6 +78,36 @@ MARKET_DATASET = f"{HF_USERNAME}/crypto-market-data"
 OHLC_DATASET = f"{HF_USERNAME}/crypto-ohlc-data"
 
 
+# dataset type -> (fingerprint, latest rows); load_dataset keeps the
+# fingerprint until the repo's data files change
+_latest_cache: Dict[str, Tuple[str, Any]] = {}
+
+
+def _latest_rows(dataset, dataset_type: str):
+    """
+    Drop row versions superseded by later sharded appends (newest per key wins)
+
+    Computed once per dataset fingerprint, from the key and fetched_at
+    columns only; the result selects rows of the loaded dataset (no copy).
+    """
+    fingerprint = getattr(dataset, "_fingerprint", None)
+    cached = _latest_cache.get(dataset_type)
+    if cached is not None and fingerprint is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    columns = dataset.column_names
+    keys = [c for c in (DATASET_KEY_COLUMNS[dataset_type] or []) if c in columns] or columns
+    frame = dataset.select_columns(keys + [c for c in ("fetched_at",) if c in columns and c not in keys]).to_pandas()
+    frame["__row"] = range(len(frame))
+    latest = drop_revisions(frame, keys)
+    if len(latest) < len(frame):
+        dataset = dataset.select(latest["__row"].tolist())
+
+    if fingerprint is not None:
+        _latest_cache[dataset_type] = (fingerprint, dataset)
+    return dataset
+
+
 def _load_market_dataset():
     """Load market data dataset from HuggingFace"""
     try:
@@ -89,7 +120,7 @@ def _load_market_dataset():
             split="train",
             token=HF_TOKEN
         )
-        return dataset
+        return _latest_rows(dataset, "market")
 
     except Exception as e:
         logger.error(f"Error loading market dataset: {e}")
@@ -108,7 +139,7 @@ def _load_ohlc_dataset():
             split="train",
             token=HF_TOKEN
         )
-        return dataset
+        return _latest_rows(dataset, "ohlc")
 
     except Exception as e:
         logger.error(f"Error loading OHLC dataset: {e}")
@@ -375,7 +375,7 @@ async def health_check(auth: bool = Depends(verify_hf_token)):
         }
         
         try:
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session() as session:
                 from database.models import CachedMarketData, CachedOHLC
                 from sqlalchemy import func, distinct
                 
@@ -9,7 +9,7 @@ from fastapi import APIRouter, HTTPException, Body
 from pydantic import BaseModel, Field
 
 from database.db_manager import db_manager
-from monitoring.source_pool_manager import SourcePoolManager
+from monitoring.source_pool_manager import SourcePoolManager, get_pool_selector
 from utils.logger import setup_logger
 
 logger = setup_logger("pool_api")
@@ -209,6 +209,7 @@ async def update_pool(pool_id: int, request: UpdatePoolRequest):
 
         session.commit()
         session.refresh(pool)
+        get_pool_selector().invalidate(pool_id)
 
         result = {
             "pool_id": pool.id,
@@ -259,6 +260,7 @@ async def delete_pool(pool_id: int):
         session.delete(pool)
         session.commit()
         session.close()
+        get_pool_selector().invalidate(pool_id)
 
         return {
             "message": f"Pool '{pool_name}' deleted successfully",
@@ -368,6 +370,7 @@ async def update_pool_member(
 
         session.commit()
         session.refresh(member)
+        get_pool_selector().invalidate(pool_id)
 
         result = {
             "pool_id": pool_id,
@@ -425,6 +428,7 @@ async def remove_pool_member(pool_id: int, provider_id: int):
         session.delete(member)
         session.commit()
         session.close()
+        get_pool_selector().invalidate(pool_id)
 
         return {
             "message": "Provider removed from pool successfully",
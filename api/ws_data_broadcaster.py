@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Dict, Any
 
 from backend.orchestration.provider_manager import provider_manager
+from backend.services.ws_delta import DeltaStream
 from backend.services.ws_service_manager import ws_manager, ServiceType
 from utils.logger import setup_logger
 
@@ -20,6 +21,10 @@ class DataBroadcaster:
         self.last_broadcast = {}
         self.broadcast_interval = 5  # seconds for price updates
         self.is_running = False
+
+        # Market data goes out as a snapshot on subscribe, then changed fields only
+        self.market_stream = DeltaStream("market_data")
+        ws_manager.register_snapshot_provider(ServiceType.MARKET_DATA, self.market_stream.snapshot)
         logger.info("DataBroadcaster initialized")
 
     async def start_broadcasting(self):
@@ -59,7 +64,9 @@ class DataBroadcaster:
                     "market",
                     params={"ids": "bitcoin,ethereum,tron,solana,binancecoin,ripple", "vs_currency": "usd"},
                     use_cache=True,
-                    ttl=10 # Short TTL for live prices if provider allows
+                    ttl=10, # Short TTL for live prices if provider allows
+                    # Serve the last prices while one refresh runs instead of stalling the tick
+                    stale_while_revalidate=True
                 )
 
                 if response["success"] and response["data"]:
@@ -78,24 +85,24 @@ class DataBroadcaster:
                         volumes[symbol] = coin.get("total_volume")
                         market_caps[symbol] = coin.get("market_cap")
 
-                    data = {
-                        "type": "market_data",
-                        "data": {
-                            "prices": prices,
-                            "volumes": volumes,
-                            "market_caps": market_caps,
-                            "price_changes": price_changes
-                        },
-                        "count": len(coins),
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "source": response["source"]
+                    state = {
+                        "prices": prices,
+                        "volumes": volumes,
+                        "market_caps": market_caps,
+                        "price_changes": price_changes
                     }
 
-                    # Diff check could be here (optimization)
-
-                    # Broadcast to subscribed clients
-                    await ws_manager.broadcast_to_service(ServiceType.MARKET_DATA, data)
-                    logger.debug(f"Broadcasted {len(coins)} price updates from {response['source']}")
+                    delta = self.market_stream.update(state, count=len(coins), source=response["source"])
+                    if delta is None:
+                        logger.debug("Market data unchanged, nothing to broadcast")
+                    else:
+                        # Every delta matters for the client's seq chain: never coalesce them
+                        await ws_manager.broadcast_to_service(ServiceType.MARKET_DATA, delta, coalesce=False)
+                        changed = sum(len(values) for values in delta["data"].values())
+                        logger.debug(
+                            f"Broadcasted market delta seq={delta['seq']} "
+                            f"({changed} changed fields) from {response['source']}"
+                        )
 
             except Exception as e:
                 logger.error(f"Error broadcasting market data: {e}", exc_info=True)
@@ -1,34 +1,31 @@
-import time
-import asyncio
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Optional
+
+from backend.cache.tiered_cache import TieredCache, get_tiered_cache
 
 class CacheManager:
-    def __init__(self):
-        self._cache: Dict[str, Tuple[Any, float]] = {}
-        self._lock = asyncio.Lock()
+    """Async key/value cache on the "cache_manager" namespace of the TieredCache"""
+
+    def __init__(self, namespace: str = "cache_manager", cache: Optional[TieredCache] = None):
+        self.namespace = namespace
+        self._tiered = cache
+
+    @property
+    def tiered(self) -> TieredCache:
+        if self._tiered is None:
+            self._tiered = get_tiered_cache()
+        return self._tiered
 
     async def get(self, key: str) -> Optional[Any]:
-        async with self._lock:
-            if key in self._cache:
-                value, expiry = self._cache[key]
-                if time.time() < expiry:
-                    return value
-                else:
-                    del self._cache[key]
-        return None
+        return self.tiered.get(self.namespace, key)
 
     async def set(self, key: str, value: Any, ttl: int = 60):
-        async with self._lock:
-            self._cache[key] = (value, time.time() + ttl)
+        self.tiered.set(self.namespace, key, value, ttl=ttl)
 
     async def delete(self, key: str):
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+        self.tiered.delete(self.namespace, key)
 
     async def clear(self):
-        async with self._lock:
-            self._cache.clear()
+        self.tiered.clear(self.namespace)
 
 # Global cache instance
 cache_manager = CacheManager()
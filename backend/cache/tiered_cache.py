@@ -0,0 +1,745 @@
+"""
+Tiered Cache
+One cache for provider responses and derived data, shared by the clients
+that used to keep their own unbounded dicts.
+
+- L1: in-process LRU per namespace, bounded by entry count and bytes
+- L2: optional SQLite store for persistent namespaces, written behind in
+  batches by a background flusher thread and loaded back into L1 on boot
+  (warm()), so a redeploy does not start cold against rate-limited providers
+- An in-memory index of the keys held in L2 answers L1 misses without a
+  SQLite read. Keys evicted from L1 (and every miss before the index is
+  loaded) are read back by the flusher thread: the lookup misses and the
+  entry is back in L1 for the next one, so the event loop never waits on
+  SQLite and no SQLite call runs under the cache lock. Keys written by
+  other processes show up after their next warm()
+- Per-namespace TTL, stale window, size limits and hit/miss/eviction stats
+
+Values in persistent namespaces must be JSON-serializable to reach L2;
+anything else (e.g. DataFrames) stays in L1 only.
+
+Usage:
+    cache = get_tiered_cache()
+    cache.set("coingecko", key, data)            # namespace TTL
+    cache.get("coingecko", key)                  # fresh value or None
+    cache.get_entry("provider", key)             # (value, is_fresh) inside the stale window
+    cache.get_stale("coingecko", key, 3600)      # any value younger than max_age
+
+Environment:
+    CACHE_L2_ENABLED   "false" disables the SQLite tier (default true)
+    CACHE_L2_PATH      SQLite file (default data/cache_l2.db)
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger("tiered_cache")
+
+CACHE_L2_ENABLED = os.getenv("CACHE_L2_ENABLED", "true").lower() not in ("0", "false", "no")
+CACHE_L2_PATH = os.getenv("CACHE_L2_PATH", "data/cache_l2.db")
+
+# The flusher writes pending L2 changes once this many are queued or every
+# L2_FLUSH_INTERVAL seconds
+L2_FLUSH_BATCH = 64
+L2_FLUSH_INTERVAL = 1.0
+
+MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class NamespaceConfig:
+    """Settings of one cache namespace"""
+
+    ttl: float = 60.0
+    stale_ttl: float = 0.0  # seconds an expired entry stays readable as stale
+    max_entries: int = 1024
+    max_bytes: int = 16 * MB
+    persistent: bool = False  # mirrored to L2 and warmed on boot
+
+
+CACHE_NAMESPACES: Dict[str, NamespaceConfig] = {
+    "default": NamespaceConfig(),
+    # ProviderManager responses (ttl per call)
+    "provider": NamespaceConfig(ttl=60, max_entries=4096, max_bytes=64 * MB, persistent=True),
+    # CoinGecko client; expired data is served when the API is rate limited
+    "coingecko": NamespaceConfig(ttl=300, stale_ttl=86400, max_entries=2048, max_bytes=32 * MB, persistent=True),
+    # DataHubComplete (ttl per data category)
+    "data_hub": NamespaceConfig(ttl=60, max_entries=2048, max_bytes=32 * MB, persistent=True),
+    # MultiSourceFallbackEngine; stale data is a fallback when every source fails
+    "multi_source": NamespaceConfig(ttl=60, stale_ttl=3600, max_entries=2048, max_bytes=32 * MB, persistent=True),
+    # HF datasets hold DataFrames: memory only, few but large entries
+    "hf_datasets": NamespaceConfig(ttl=3600, max_entries=64, max_bytes=512 * MB),
+    # On-demand fetches of the data collection worker
+    "realtime": NamespaceConfig(ttl=60, max_entries=1024, max_bytes=8 * MB),
+    "cache_manager": NamespaceConfig(ttl=60, max_entries=1024, max_bytes=16 * MB),
+}
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate memory footprint used for the max_bytes limit"""
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):  # pandas objects
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, "sum") else usage)
+        except Exception:
+            pass
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "created", "expires", "stale_until", "size")
+
+    def __init__(self, value: Any, created: float, expires: float, stale_until: float, size: int):
+        self.value = value
+        self.created = created
+        self.expires = expires
+        self.stale_until = stale_until
+        self.size = size
+
+
+class _Namespace:
+    """L1 entries and counters of one namespace"""
+
+    def __init__(self, name: str, config: NamespaceConfig):
+        self.name = name
+        self.config = config
+        self.entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.l2_hits = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.l2_skipped = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_entries": self.config.max_entries,
+            "max_bytes": self.config.max_bytes,
+            "ttl": self.config.ttl,
+            "persistent": self.config.persistent,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "l2_hits": self.l2_hits,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else None,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "l2_skipped": self.l2_skipped,
+        }
+
+
+class SQLiteL2:
+    """Persistent second tier: one row per (namespace, key) with JSON values"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._open_lock = threading.RLock()  # cache threads and the flusher open lazily
+        self.writes = 0
+        self.errors = 0
+
+    def _reader(self) -> sqlite3.Connection:
+        """Separate connection for reads (WAL: not blocked by the flusher's writes)"""
+        with self._open_lock:
+            if self._read_conn is None:
+                self._connection()
+                self._read_conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            return self._read_conn
+
+    def _connection(self) -> sqlite3.Connection:
+        with self._open_lock:
+            return self._open_writer()
+
+    def _open_writer(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    expires REAL NOT NULL,
+                    stale_until REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_stale ON cache_entries (stale_until)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[str, float, float, float]]:
+        return self._reader().execute(
+            "SELECT value, created, expires, stale_until FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+
+    def write(self, upserts: List[Tuple], deletes: List[Tuple[str, str]]):
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            if upserts:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(namespace, key, value, created, expires, stale_until) VALUES (?, ?, ?, ?, ?, ?)",
+                    upserts
+                )
+            if deletes:
+                conn.executemany("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", deletes)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.writes += len(upserts) + len(deletes)
+
+    def load(self, namespace: str, now: float, limit: int) -> List[Tuple[str, str, float, float, float]]:
+        """Newest still-readable entries of a namespace"""
+        return self._reader().execute(
+            "SELECT key, value, created, expires, stale_until FROM cache_entries "
+            "WHERE namespace = ? AND stale_until > ? ORDER BY created DESC LIMIT ?",
+            (namespace, now, limit)
+        ).fetchall()
+
+    def keys(self, namespace: str, now: float) -> List[Tuple[str, float]]:
+        """(key, stale_until) of the still-readable entries of a namespace"""
+        return self._reader().execute(
+            "SELECT key, stale_until FROM cache_entries WHERE namespace = ? AND stale_until > ?",
+            (namespace, now)
+        ).fetchall()
+
+    def clear(self, namespace: Optional[str] = None):
+        if namespace is None:
+            self._connection().execute("DELETE FROM cache_entries")
+        else:
+            self._connection().execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def purge_expired(self, now: float) -> int:
+        return self._connection().execute("DELETE FROM cache_entries WHERE stale_until <= ?", (now,)).rowcount
+
+    def close(self):
+        for conn in (self._read_conn, self._conn):
+            if conn is not None:
+                conn.close()
+        self._conn = self._read_conn = None
+
+
+class TieredCache:
+    """
+    Namespaced L1 LRU with an optional persistent L2
+
+    Args:
+        namespaces: Namespace settings (defaults to CACHE_NAMESPACES); unknown
+            namespaces use the "default" settings
+        l2_path: SQLite file for persistent namespaces; None disables L2
+    """
+
+    def __init__(
+        self,
+        namespaces: Optional[Dict[str, NamespaceConfig]] = None,
+        l2_path: Optional[str] = CACHE_L2_PATH if CACHE_L2_ENABLED else None
+    ):
+        self._configs = dict(CACHE_NAMESPACES if namespaces is None else namespaces)
+        self._configs.setdefault("default", NamespaceConfig())
+        self._namespaces: Dict[str, _Namespace] = {}
+        self.l2 = SQLiteL2(l2_path) if l2_path else None
+        self._pending: Dict[Tuple[str, str], Optional[Tuple]] = {}
+        self._inflight: Dict[Tuple[str, str], Optional[Tuple]] = {}  # being written by flush()
+        self._l2_keys: Dict[str, Dict[str, float]] = {}  # namespace -> {key: stale_until} in L2
+        self._l2_loaded: Set[str] = set()  # namespaces whose key index is complete
+        self._reads: Dict[Tuple[str, Optional[str]], None] = {}  # queued L2 reads (key None: key index)
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()  # serializes L2 writes
+        self._flush_wakeup = threading.Event()
+        self._flush_stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Namespaces
+    # ------------------------------------------------------------------
+
+    def configure(self, namespace: str, **overrides) -> NamespaceConfig:
+        """Override settings of a namespace (e.g. configure("coingecko", ttl=120))"""
+        with self._lock:
+            config = replace(self._configs.get(namespace, self._configs["default"]), **overrides)
+            self._configs[namespace] = config
+            ns = self._namespaces.get(namespace)
+            if ns is not None:
+                ns.config = config
+                self._enforce_limits(ns)
+            return config
+
+    def _ns(self, namespace: str) -> _Namespace:
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            config = self._configs.get(namespace, self._configs["default"])
+            ns = self._namespaces[namespace] = _Namespace(namespace, config)
+        return ns
+
+    def _persistent(self, ns: _Namespace) -> bool:
+        return self.l2 is not None and ns.config.persistent
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _lookup(self, ns: _Namespace, key: str, now: float) -> Optional[_Entry]:
+        """L1 entry (falling back to L2) that is still inside its stale window"""
+        entry = ns.entries.get(key)
+        if entry is None and self._persistent(ns):
+            entry = self._load_from_l2(ns, key, now)
+        if entry is None:
+            return None
+        if now >= entry.stale_until:
+            self._remove(ns, key)
+            ns.expirations += 1
+            return None
+        ns.entries.move_to_end(key)
+        return entry
+
+    def _l2_index(self, ns: _Namespace) -> Dict[str, float]:
+        """
+        Keys held in L2 for a namespace, kept in sync by set()/delete()
+
+        The first use queues the SQLite load on the flusher thread; until it
+        is merged the index only holds keys set since.
+        """
+        index = self._l2_keys.get(ns.name)
+        if index is None:
+            index = self._l2_keys[ns.name] = {}
+        if ns.name not in self._l2_loaded:
+            self._request_read(ns.name, None)
+        return index
+
+    def _load_from_l2(self, ns: _Namespace, key: str, now: float) -> Optional[_Entry]:
+        queued = (ns.name, key)
+        pending = self._pending.get(queued, self._inflight.get(queued, False))
+        if pending is None:
+            return None  # deleted, not flushed yet
+        if not pending:
+            stale_until = self._l2_index(ns).get(key)
+            if ns.name in self._l2_loaded and (stale_until is None or now >= stale_until):
+                return None  # not in L2: no SQLite read
+            # Read back on the flusher thread; a miss for now
+            self._request_read(ns.name, key)
+            return None
+        encoded, created, expires, stale_until = pending[2:]
+        if now >= stale_until:
+            return None
+        entry = _Entry(json.loads(encoded), created, expires, stale_until, len(encoded))
+        self._store(ns, key, entry)
+        ns.l2_hits += 1
+        return entry
+
+    def _request_read(self, namespace: str, key: Optional[str]):
+        """Queue an L2 read (key None: the key index) for the flusher thread"""
+        self._reads[(namespace, key)] = None
+        self._start_flusher()
+        self._flush_wakeup.set()
+
+    def _serve_reads(self) -> int:
+        """
+        Run queued L2 reads and merge the results into L1 and the key index
+
+        Runs on the flusher thread; SQLite is read without the cache lock.
+        """
+        if self.l2 is None:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                reads, self._reads = list(self._reads), {}
+            for name, key in reads:
+                now = time.time()
+                try:
+                    result = self.l2.keys(name, now) if key is None else self.l2.get(name, key)
+                except sqlite3.Error as e:
+                    logger.warning(f"L2 read failed for {name}: {e}")
+                    continue
+                with self._lock:
+                    if key is None:
+                        self._merge_index(name, result)
+                    else:
+                        self._promote(self._ns(name), key, result, now)
+            return len(reads)
+
+    def _merge_index(self, name: str, rows: Iterable[Tuple[str, float]]):
+        # Keys set or deleted since the read are already in the index
+        self._l2_keys[name] = {**dict(rows), **self._l2_keys.get(name, {})}
+        self._l2_loaded.add(name)
+
+    def _promote(self, ns: _Namespace, key: str, row: Optional[Tuple], now: float):
+        """Store a row read back from L2 unless a newer value was set meanwhile"""
+        queued = (ns.name, key)
+        if key in ns.entries or queued in self._pending or queued in self._inflight:
+            return
+        if row is None or now >= row[3]:
+            self._l2_keys.get(ns.name, {}).pop(key, None)
+            return
+        encoded, created, expires, stale_until = row
+        try:
+            value = json.loads(encoded)
+        except ValueError:
+            return
+        self._store(ns, key, _Entry(value, created, expires, stale_until, len(encoded)))
+        ns.l2_hits += 1
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Fresh value, or `default`"""
+        with self._lock:
+            ns = self._ns(namespace)
+            now = time.time()
+            entry = self._lookup(ns, key, now)
+            if entry is not None and now < entry.expires:
+                ns.hits += 1
+                return entry.value
+            ns.misses += 1
+            return default
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Tuple[Any, bool]]:
+        """
+        Value together with its freshness
+
+        Returns:
+            (value, is_fresh); expired values are returned with is_fresh=False
+            while inside their stale window; None otherwise
+        """
+        with self._lock:
+            ns = self._ns(namespace)
+            now = time.time()
+            entry = self._lookup(ns, key, now)
+            if entry is None:
+                ns.misses += 1
+                return None
+            if now < entry.expires:
+                ns.hits += 1
+                return entry.value, True
+            ns.stale_hits += 1
+            return entry.value, False
+
+    def get_stale(self, namespace: str, key: str, max_age: float) -> Any:
+        """Value younger than `max_age` seconds, fresh or not (None otherwise)"""
+        with self._lock:
+            ns = self._ns(namespace)
+            now = time.time()
+            entry = self._lookup(ns, key, now)
+            if entry is None or now - entry.created >= max_age:
+                ns.misses += 1
+                return None
+            if now < entry.expires:
+                ns.hits += 1
+            else:
+                ns.stale_hits += 1
+            return entry.value
+
+    def age(self, namespace: str, key: str) -> Optional[float]:
+        """Seconds since the entry was stored (None if absent)"""
+        with self._lock:
+            entry = self._ns(namespace).entries.get(key)
+            return time.time() - entry.created if entry is not None else None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None
+    ):
+        """
+        Store a value
+
+        Args:
+            namespace: Cache namespace
+            key: Cache key
+            value: Value (JSON-serializable to be persisted)
+            ttl: Seconds the value is fresh (namespace default if None)
+            stale_ttl: Seconds it stays readable as stale afterwards
+        """
+        with self._lock:
+            ns = self._ns(namespace)
+            config = ns.config
+            now = time.time()
+            expires = now + (config.ttl if ttl is None else ttl)
+            stale_until = expires + max(0.0, config.stale_ttl if stale_ttl is None else stale_ttl)
+
+            encoded = None
+            if self._persistent(ns):
+                try:
+                    encoded = json.dumps(value, separators=(",", ":"))
+                except (TypeError, ValueError):
+                    ns.l2_skipped += 1
+            size = len(encoded) if encoded is not None else _estimate_size(value)
+
+            self._store(ns, key, _Entry(value, now, expires, stale_until, size))
+            ns.sets += 1
+            if encoded is not None:
+                self._pending[(namespace, key)] = (namespace, key, encoded, now, expires, stale_until)
+                self._l2_index(ns)[key] = stale_until
+                self._schedule_flush()
+
+    def _store(self, ns: _Namespace, key: str, entry: _Entry):
+        previous = ns.entries.pop(key, None)
+        if previous is not None:
+            ns.bytes -= previous.size
+        ns.entries[key] = entry
+        ns.bytes += entry.size
+        self._enforce_limits(ns)
+
+    def _enforce_limits(self, ns: _Namespace):
+        # Least recently used first; never evict the entry just stored
+        while len(ns.entries) > 1 and (
+            len(ns.entries) > ns.config.max_entries or ns.bytes > ns.config.max_bytes
+        ):
+            _, evicted = ns.entries.popitem(last=False)
+            ns.bytes -= evicted.size
+            ns.evictions += 1
+
+    def _remove(self, ns: _Namespace, key: str):
+        entry = ns.entries.pop(key, None)
+        if entry is not None:
+            ns.bytes -= entry.size
+
+    def delete(self, namespace: str, key: str):
+        """Delete a key from both tiers"""
+        with self._lock:
+            ns = self._ns(namespace)
+            self._remove(ns, key)
+            if self._persistent(ns):
+                self._pending[(namespace, key)] = None
+                self._l2_index(ns).pop(key, None)
+                self._schedule_flush()
+
+    def clear(self, namespace: Optional[str] = None):
+        """Clear one namespace (or everything) in both tiers"""
+        with self._lock:
+            targets = [self._ns(namespace)] if namespace is not None else list(self._namespaces.values())
+            for ns in targets:
+                ns.entries.clear()
+                ns.bytes = 0
+            if namespace is None:
+                self._pending.clear()
+                self._inflight.clear()
+                self._l2_keys.clear()
+                self._l2_loaded.clear()
+            else:
+                for pending_key in [k for k in self._pending if k[0] == namespace]:
+                    del self._pending[pending_key]
+                for inflight_key in [k for k in self._inflight if k[0] == namespace]:
+                    del self._inflight[inflight_key]
+                self._l2_keys.pop(namespace, None)
+                self._l2_loaded.discard(namespace)
+        if self.l2 is not None:
+            # After an in-flight flush, so its rows do not come back
+            with self._flush_lock:
+                try:
+                    self.l2.clear(namespace)
+                except sqlite3.Error as e:
+                    logger.warning(f"L2 clear failed: {e}")
+
+    def cleanup(self, namespace: Optional[str] = None) -> int:
+        """Drop entries past their stale window (and purge them from L2)"""
+        with self._lock:
+            now = time.time()
+            removed = 0
+            targets = [self._ns(namespace)] if namespace is not None else list(self._namespaces.values())
+            for ns in targets:
+                for key in [k for k, e in ns.entries.items() if now >= e.stale_until]:
+                    self._remove(ns, key)
+                    ns.expirations += 1
+                    removed += 1
+                index = self._l2_keys.get(ns.name, {})
+                for key in [k for k, stale_until in index.items() if now >= stale_until]:
+                    del index[key]
+        if self.l2 is not None and namespace is None:
+            self.flush()
+            with self._flush_lock:
+                try:
+                    self.l2.purge_expired(now)
+                except sqlite3.Error as e:
+                    logger.warning(f"L2 purge failed: {e}")
+        return removed
+
+    # ------------------------------------------------------------------
+    # L2 persistence
+    # ------------------------------------------------------------------
+
+    def _start_flusher(self):
+        if self._flusher is None and not self._flush_stop.is_set():
+            self._flusher = threading.Thread(target=self._flush_loop, name="tiered-cache-l2", daemon=True)
+            self._flusher.start()
+
+    def _schedule_flush(self):
+        """Start the flusher thread if needed; wake it early once a batch is queued"""
+        self._start_flusher()
+        if len(self._pending) >= L2_FLUSH_BATCH:
+            self._flush_wakeup.set()
+
+    def _flush_loop(self):
+        while not self._flush_stop.is_set():
+            self._flush_wakeup.wait(L2_FLUSH_INTERVAL)
+            self._flush_wakeup.clear()
+            self._serve_reads()
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write pending L2 changes in one transaction
+
+        Runs on the flusher thread; the cache lock is only held to take the
+        pending batch, not during the SQLite write. A failed batch is queued
+        again for the next flush (changes queued since then win).
+        """
+        if self.l2 is None:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._inflight, self._pending = self._pending, {}
+                pending = self._inflight
+            upserts = [row for row in pending.values() if row is not None]
+            deletes = [key for key, row in pending.items() if row is None]
+            failed = False
+            try:
+                self.l2.write(upserts, deletes)
+            except sqlite3.Error as e:
+                logger.warning(f"L2 write of {len(pending)} entries failed, retrying on the next flush: {e}")
+                failed = True
+            with self._lock:
+                if failed:
+                    # clear() drops its keys from _inflight, so they stay cleared
+                    for queued, row in self._inflight.items():
+                        self._pending.setdefault(queued, row)
+                self._inflight = {}
+            return 0 if failed else len(upserts) + len(deletes)
+
+    def warm(self, namespaces: Optional[Iterable[str]] = None) -> int:
+        """
+        Load persisted entries into L1 (newest first, up to max_entries) and
+        the L2 key index. Call it off the event loop (asyncio.to_thread).
+
+        Args:
+            namespaces: Namespaces to warm (all persistent ones by default)
+
+        Returns:
+            Number of entries loaded
+        """
+        if self.l2 is None:
+            return 0
+        now = time.time()
+        with self._flush_lock:
+            try:
+                self.l2.purge_expired(now)
+            except sqlite3.Error as e:
+                logger.warning(f"L2 purge failed: {e}")
+        with self._lock:
+            names = list(namespaces) if namespaces is not None else [
+                name for name, config in self._configs.items() if config.persistent
+            ]
+        loaded = 0
+        for name in names:
+            with self._lock:
+                max_entries = self._ns(name).config.max_entries
+            # SQLite reads outside the cache lock
+            try:
+                keys = self.l2.keys(name, now)
+                rows = self.l2.load(name, now, max_entries)
+            except sqlite3.Error as e:
+                logger.warning(f"L2 warm-up of {name} failed: {e}")
+                continue
+            with self._lock:
+                ns = self._ns(name)
+                self._merge_index(name, keys)
+                # Oldest first so the newest end up most recently used
+                for key, encoded, created, expires, stale_until in reversed(rows):
+                    queued = (name, key)
+                    if key in ns.entries or queued in self._pending or queued in self._inflight:
+                        continue
+                    try:
+                        value = json.loads(encoded)
+                    except ValueError:
+                        continue
+                    self._store(ns, key, _Entry(value, created, expires, stale_until, len(encoded)))
+                    loaded += 1
+        if loaded:
+            logger.info(f"Warmed {loaded} cache entries from {self.l2.path}")
+        return loaded
+
+    def close(self):
+        """Stop the flusher, write what is pending and close L2"""
+        self._flush_stop.set()
+        self._flush_wakeup.set()
+        flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join(timeout=5)
+        self.flush()
+        with self._flush_lock:
+            if self.l2 is not None:
+                self.l2.close()
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {name: ns.stats() for name, ns in sorted(self._namespaces.items())}
+            totals = {
+                field: sum(ns[field] for ns in namespaces.values())
+                for field in ("entries", "bytes", "hits", "stale_hits", "misses", "l2_hits", "evictions")
+            }
+            return {
+                **totals,
+                "l2": {
+                    "enabled": self.l2 is not None,
+                    "path": self.l2.path if self.l2 else None,
+                    "pending_writes": len(self._pending) + len(self._inflight),
+                    "pending_reads": len(self._reads),
+                    "indexed_keys": sum(len(index) for index in self._l2_keys.values()),
+                    "writes": self.l2.writes if self.l2 else 0,
+                },
+                "namespaces": namespaces,
+            }
+
+
+_tiered_cache: Optional[TieredCache] = None
+
+
+def get_tiered_cache() -> TieredCache:
+    """Get global TieredCache instance"""
+    global _tiered_cache
+    if _tiered_cache is None:
+        _tiered_cache = TieredCache()
+        atexit.register(_tiered_cache.close)
+    return _tiered_cache
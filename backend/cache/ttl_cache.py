@@ -1,74 +1,67 @@
-import time
-import asyncio
-from typing import Any, Dict, Optional, Tuple, List
+from typing import Any, Optional, Tuple
 import logging
 
+from backend.cache.tiered_cache import TieredCache, get_tiered_cache
+
 logger = logging.getLogger(__name__)
 
 class TTLCache:
     """
-    Async-safe TTL Cache for provider responses.
+    Async TTL Cache for provider responses.
     Features:
     - Time-To-Live expiration
+    - Optional stale retention (stale-while-revalidate)
     - Async get/set
     - Invalidation
+
+    Entries live in one namespace of the shared TieredCache, so they are
+    bounded by its LRU limits and persisted across restarts.
     """
-    def __init__(self, default_ttl: int = 60):
-        self._cache: Dict[str, Tuple[Any, float]] = {}
-        self._lock = asyncio.Lock()
+    def __init__(self, default_ttl: int = 60, namespace: str = "provider", cache: Optional[TieredCache] = None):
         self.default_ttl = default_ttl
+        self.namespace = namespace
+        self._tiered = cache
+
+    @property
+    def tiered(self) -> TieredCache:
+        if self._tiered is None:
+            self._tiered = get_tiered_cache()
+        return self._tiered
 
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired"""
-        async with self._lock:
-            if key in self._cache:
-                value, expiry = self._cache[key]
-                if time.time() < expiry:
-                    return value
-                else:
-                    # Lazy expiration
-                    del self._cache[key]
-        return None
+        return self.tiered.get(self.namespace, key)
 
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        """Set value in cache with TTL"""
+    async def get_entry(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """
+        Get a cached value together with its freshness.
+
+        Returns:
+            (value, is_fresh) - expired values are returned with is_fresh=False
+            while they are inside their stale window; None otherwise
+        """
+        return self.tiered.get_entry(self.namespace, key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, stale_ttl: int = 0):
+        """Set value in cache with TTL, keeping it `stale_ttl` seconds past expiry"""
         ttl_val = ttl if ttl is not None else self.default_ttl
-        expiry = time.time() + ttl_val
-        async with self._lock:
-            self._cache[key] = (value, expiry)
+        self.tiered.set(self.namespace, key, value, ttl=ttl_val, stale_ttl=stale_ttl)
 
     async def delete(self, key: str):
         """Delete specific key"""
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+        self.tiered.delete(self.namespace, key)
 
     async def clear(self):
         """Clear all cache"""
-        async with self._lock:
-            self._cache.clear()
+        self.tiered.clear(self.namespace)
             
     async def cleanup(self):
-        """Remove expired items"""
-        now = time.time()
-        keys_to_remove = []
-        async with self._lock:
-            for key, (_, expiry) in self._cache.items():
-                if now >= expiry:
-                    keys_to_remove.append(key)
-            
-            for key in keys_to_remove:
-                del self._cache[key]
+        """Remove expired items (including their stale window)"""
+        self.tiered.cleanup(self.namespace)
     
     def get_sync(self, key: str) -> Optional[Any]:
-        """Synchronous get for non-async contexts (use with caution regarding race conditions)"""
-        if key in self._cache:
-            value, expiry = self._cache[key]
-            if time.time() < expiry:
-                return value
-            else:
-                del self._cache[key]
-        return None
+        """Synchronous get for non-async contexts"""
+        return self.tiered.get(self.namespace, key)
 
 # Global cache instance
 ttl_cache = TTLCache(default_ttl=60)
@@ -1,66 +1,101 @@
 """
 Metrics Middleware - Automatically track request metrics
 Records request count, response times, and error rates
+
+Implemented as plain ASGI middleware: the response time is taken when the
+response headers are sent (http.response.start), which is also when the
+Server-Timing header is added, and response bodies pass through untouched
+so streaming responses are not buffered.
 """
 import time
 import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+
+from utils.server_timing import (
+    begin_request, current_phases, end_request, format_server_timing
+)
+from backend.routers.system_metrics_api import get_metrics_tracker
 
 logger = logging.getLogger(__name__)
 
+# The metrics endpoints themselves are not tracked
+SKIP_PATHS = frozenset({"/api/system/metrics", "/api/system/health"})
+
+
+def route_template(scope) -> str:
+    """Method and matched route template (bounded cardinality, unlike raw paths)"""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    return f"{scope.get('method', 'GET')} {path}"
 
-class MetricsMiddleware(BaseHTTPMiddleware):
+
+class MetricsMiddleware:
     """
     Middleware to track HTTP request metrics
-    
+
     Tracks:
     - Request count
-    - Response times
+    - Response times (time to response headers)
     - Error rates
+
+    Adds a Server-Timing header with the phases handlers recorded through
+    utils.server_timing and the total app time.
+
+    Args:
+        app: ASGI application
+        server_timing: Add the Server-Timing response header
     """
-    
-    async def dispatch(self, request: Request, call_next):
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
         """Process request and track metrics"""
-        # Skip tracking for static files and the metrics endpoint itself
-        if (request.url.path.startswith("/static/") or 
-            request.url.path == "/api/system/metrics" or
-            request.url.path == "/api/system/health"):
-            return await call_next(request)
-        
+        # Skip tracking for websockets, static files and the metrics endpoints
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        if path in SKIP_PATHS or path.startswith("/static/"):
+            await self.app(scope, receive, send)
+            return
+
         # Record start time
-        start_time = time.time()
-        
-        # Process request
+        start_time = time.perf_counter()
+        token = begin_request()
+        phases = current_phases()
+        status_code = None
+
+        async def send_with_metrics(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = time.perf_counter() - start_time
+                if self.server_timing:
+                    headers = list(message.get("headers", ()))
+                    headers.append((b"server-timing", format_server_timing(phases, elapsed)))
+                    message = {**message, "headers": headers}
+                self._record(scope, elapsed, status_code)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        except Exception:
+            # Record error (no response was started, the server will send a 500)
+            if status_code is None:
+                self._record(scope, time.perf_counter() - start_time, 500)
+            raise
+        finally:
+            end_request(token)
+
+    @staticmethod
+    def _record(scope, elapsed: float, status_code: int):
         try:
-            response = await call_next(request)
-            
-            # Calculate response time
-            response_time_ms = (time.time() - start_time) * 1000
-            
-            # Check if it's an error response
-            is_error = response.status_code >= 400
-            
-            # Record metrics
-            try:
-                from backend.routers.system_metrics_api import get_metrics_tracker
-                tracker = get_metrics_tracker()
-                tracker.record_request(response_time_ms, is_error)
-            except Exception as e:
-                logger.debug(f"Failed to record metrics: {e}")
-            
-            return response
-        
+            get_metrics_tracker().record_request(
+                elapsed * 1000,
+                is_error=status_code >= 400,
+                route=route_template(scope),
+                status_code=status_code
+            )
         except Exception as e:
-            # Record error
-            response_time_ms = (time.time() - start_time) * 1000
-            
-            try:
-                from backend.routers.system_metrics_api import get_metrics_tracker
-                tracker = get_metrics_tracker()
-                tracker.record_request(response_time_ms, is_error=True)
-            except Exception as track_error:
-                logger.debug(f"Failed to record error metrics: {track_error}")
-            
-            # Re-raise the exception
-            raise e
+            logger.debug(f"Failed to record metrics: {e}")
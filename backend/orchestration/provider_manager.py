@@ -10,6 +10,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 from backend.cache.ttl_cache import ttl_cache
+from utils.server_timing import timed_phase
 
 # Configure logging
 def setup_provider_logger(name, log_file):
@@ -159,6 +160,20 @@ class ProviderManager:
             "rpc": []
         }
         self._lock = asyncio.Lock()
+        
+        # Single-flight: cache_key -> upstream fetch shared by concurrent misses
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        # Stale-while-revalidate: serve expired entries for up to stale_ttl seconds
+        self.stale_while_revalidate = os.getenv("PROVIDER_STALE_WHILE_REVALIDATE", "false").lower() == "true"
+        self.stale_ttl = int(os.getenv("PROVIDER_STALE_TTL", "300"))
+        
+        self.coalescing_stats = {
+            "upstream_calls": 0,       # fetches that actually went to providers
+            "coalesced_waiters": 0,    # callers that awaited another caller's fetch
+            "stale_served": 0,         # expired entries served while refreshing
+            "background_refreshes": 0  # refreshes started by stale hits
+        }
 
     def register_provider(self, category: str, config: ProviderConfig, fetch_func: Callable[..., Awaitable[Any]]):
         if category not in self.providers:
@@ -212,23 +227,108 @@ class ProviderManager:
             main_logger.warning(f"No available providers for {category}")
             return None
 
-    async def fetch_data(self, category: str, params: Dict[str, Any] = None, use_cache: bool = True, ttl: int = 60) -> Dict[str, Any]:
+    async def fetch_data(
+        self,
+        category: str,
+        params: Dict[str, Any] = None,
+        use_cache: bool = True,
+        ttl: int = 60,
+        stale_while_revalidate: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """
         Main entry point for fetching data.
         Handles caching, rotation, failover, and standardized response.
+        
+        Concurrent misses for the same category/params share one upstream
+        fetch. With stale_while_revalidate (defaults to the manager setting)
+        an expired cache entry is returned immediately while a single
+        background refresh runs.
         """
         if params is None:
             params = {}
+        if stale_while_revalidate is None:
+            stale_while_revalidate = self.stale_while_revalidate
             
         # 1. Check Cache
         cache_key = f"{category}:{json.dumps(params, sort_keys=True)}"
         if use_cache:
-            cached = await ttl_cache.get(cache_key)
-            if cached:
-                main_logger.debug(f"Cache hit for {cache_key}")
-                return cached
+            with timed_phase("cache"):
+                entry = await ttl_cache.get_entry(cache_key)
+            if entry is not None:
+                cached, is_fresh = entry
+                if is_fresh and cached:
+                    main_logger.debug(f"Cache hit for {cache_key}")
+                    return cached
+                if not is_fresh and cached and stale_while_revalidate:
+                    main_logger.debug(f"Stale hit for {cache_key}, revalidating in background")
+                    self.coalescing_stats["stale_served"] += 1
+                    self._start_background_refresh(category, params, cache_key, ttl)
+                    return cached
+
+        # 2. Fetch upstream once per key, however many callers are waiting
+        return await self._fetch_coalesced(category, params, cache_key, use_cache, ttl, stale_while_revalidate)
+
+    async def _fetch_coalesced(
+        self,
+        category: str,
+        params: Dict[str, Any],
+        cache_key: str,
+        use_cache: bool,
+        ttl: int,
+        stale_while_revalidate: bool
+    ) -> Dict[str, Any]:
+        """Join an in-flight fetch for cache_key or start one"""
+        if cache_key in self._inflight:
+            self.coalescing_stats["coalesced_waiters"] += 1
+        task = self._get_or_start_fetch(category, params, cache_key, use_cache, ttl, stale_while_revalidate)
+        # shield: a cancelled caller must not cancel the fetch others are waiting on
+        return await asyncio.shield(task)
 
-        # 2. Get Provider & Fetch
+    def _get_or_start_fetch(
+        self,
+        category: str,
+        params: Dict[str, Any],
+        cache_key: str,
+        use_cache: bool,
+        ttl: int,
+        stale_while_revalidate: bool
+    ) -> asyncio.Task:
+        """Return the in-flight upstream fetch for cache_key, starting it if needed"""
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_upstream(
+                category, params, cache_key, use_cache, ttl,
+                stale_ttl=self.stale_ttl if stale_while_revalidate else 0
+            ))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        return task
+
+    def _start_background_refresh(self, category: str, params: Dict[str, Any], cache_key: str, ttl: int):
+        """Refresh a stale key in the background (at most one fetch per key)"""
+        if cache_key in self._inflight:
+            return
+        
+        def log_failure(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is not None:
+                main_logger.warning(f"Background refresh failed for {cache_key}: {task.exception()}")
+        
+        self.coalescing_stats["background_refreshes"] += 1
+        task = self._get_or_start_fetch(category, params, cache_key, True, ttl, True)
+        task.add_done_callback(log_failure)
+
+    async def _fetch_upstream(
+        self,
+        category: str,
+        params: Dict[str, Any],
+        cache_key: str,
+        use_cache: bool,
+        ttl: int,
+        stale_ttl: int = 0
+    ) -> Dict[str, Any]:
+        """Rotate through providers until one succeeds"""
+        self.coalescing_stats["upstream_calls"] += 1
+        
         attempts = 0
         max_attempts = len(self.providers.get(category, [])) + 1 # Try potentially all providers + retry
         
@@ -277,7 +377,7 @@ class ProviderManager:
                 
                 # Set Cache
                 if use_cache:
-                    await ttl_cache.set(cache_key, response, ttl=ttl)
+                    await ttl_cache.set(cache_key, response, ttl=ttl, stale_ttl=stale_ttl)
                 
                 return response
 
@@ -323,6 +423,15 @@ class ProviderManager:
                 })
         return stats
     
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Request coalescing counters: coalesced waiters versus real upstream calls"""
+        stats = dict(self.coalescing_stats)
+        total = stats["upstream_calls"] + stats["coalesced_waiters"] + stats["stale_served"]
+        stats["inflight"] = len(self._inflight)
+        stats["stale_while_revalidate"] = self.stale_while_revalidate
+        stats["upstream_ratio"] = round(stats["upstream_calls"] / total, 4) if total else None
+        return stats
+    
     def get_detailed_stats(self) -> List[Dict[str, Any]]:
         """
         Get detailed provider statistics for status display
@@ -58,6 +58,15 @@ async def get_resource_prices(
         raise HTTPException(status_code=503, detail=str(e))
 
 
+@router.get("/api/resources/market/latency")
+async def get_resource_market_latency():
+    """
+    Per-provider latency histograms (p50/p90/p99) of the market data providers
+    and the hedge delay each one currently gets before the next is started.
+    """
+    return JSONResponse(content={"success": True, **market_data_aggregator.get_latency_stats()})
+
+
 # ============================================================================
 # News Endpoints - Uses ALL Free News Sources
 # ============================================================================
@@ -349,6 +349,7 @@ async def get_system_status():
         'status': 'operational',
         'timestamp': datetime.now().isoformat(),
         'providers': stats,
+        'request_coalescing': provider_manager.get_coalescing_stats(),
         'version': '2.0.0',
         'meta': MetaInfo(source="system").dict()
     }
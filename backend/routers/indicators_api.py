@@ -15,11 +15,17 @@ CRITICAL RULES:
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
 from datetime import datetime
 import logging
 import math
 
+from backend.services import indicator_engine
+from backend.services.indicator_engine import last_value
+from backend.services.indicator_state import get_indicator_registry
+from backend.services.ohlcv_store import OHLCVView, get_ohlcv_store
+from utils.server_timing import timed_phase
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/indicators", tags=["Technical Indicators"])
@@ -182,24 +188,45 @@ def sanitize_dict(data: Dict[str, Any]) -> Dict[str, Any]:
     return sanitized
 
 
-def validate_ohlcv_data(ohlcv: Optional[Dict[str, Any]], min_candles: int, symbol: str, indicator: str) -> tuple[bool, Optional[List[float]], Optional[str]]:
+async def fetch_ohlcv(symbol: str, timeframe: str, days: int, min_candles: int) -> Tuple[Any, str]:
+    """
+    Get OHLCV data for an indicator endpoint
+    
+    Prefers the local columnar store (zero-copy memory-mapped view) when it
+    holds at least `min_candles` candles of the requested window, otherwise
+    fetches from CoinGecko.
+    
+    Returns:
+        (ohlcv, source) - an OHLCVView or the CoinGecko response dict
+    """
+    view = get_ohlcv_store().read_recent(symbol, timeframe, days)
+    if view is not None and len(view) >= min_candles:
+        return view, "ohlcv_store"
+    
+    from backend.services.coingecko_client import coingecko_client
+    return await coingecko_client.get_ohlcv(symbol, days=days), "coingecko"
+
+
+def validate_ohlcv_data(ohlcv: Union[Dict[str, Any], OHLCVView, None], min_candles: int, symbol: str, indicator: str) -> tuple[bool, Optional[Sequence[float]], Optional[str]]:
     """
     Validate OHLCV data and extract prices
     
     Returns:
-        (is_valid, prices, error_message)
+        (is_valid, prices, error_message) - prices is a NumPy view for OHLCVView input
     """
-    if not ohlcv:
+    if ohlcv is None or (not isinstance(ohlcv, OHLCVView) and not ohlcv):
         logger.warning(f"❌ {indicator} - {symbol}: No OHLCV data received")
         return False, None, "No market data available"
     
-    if "prices" not in ohlcv:
+    if isinstance(ohlcv, OHLCVView):
+        prices = ohlcv.close
+    elif "prices" not in ohlcv:
         logger.warning(f"❌ {indicator} - {symbol}: OHLCV missing 'prices' key")
         return False, None, "Invalid market data format"
+    else:
+        prices = [p[1] for p in ohlcv["prices"] if len(p) >= 2]
     
-    prices = [p[1] for p in ohlcv["prices"] if len(p) >= 2]
-    
-    if not prices:
+    if not len(prices):
         logger.warning(f"❌ {indicator} - {symbol}: Empty price array")
         return False, None, "No price data available"
     
@@ -218,47 +245,28 @@ def validate_ohlcv_data(ohlcv: Optional[Dict[str, Any]], min_candles: int, symbo
 def calculate_sma(prices: List[float], period: int) -> float:
     """Calculate Simple Moving Average"""
     if len(prices) < period:
-        return prices[-1] if prices else 0
-    return sum(prices[-period:]) / period
+        return prices[-1] if len(prices) else 0
+    return last_value(indicator_engine.sma(prices, period), prices[-1])
 
 
 def calculate_ema(prices: List[float], period: int) -> float:
     """Calculate Exponential Moving Average"""
     if len(prices) < period:
-        return prices[-1] if prices else 0
-    
-    multiplier = 2 / (period + 1)
-    ema = sum(prices[:period]) / period  # SMA for first period
-    
-    for price in prices[period:]:
-        ema = (price * multiplier) + (ema * (1 - multiplier))
-    
-    return ema
+        return prices[-1] if len(prices) else 0
+    return last_value(indicator_engine.ema(prices, period), prices[-1])
 
 
 def calculate_rsi(prices: List[float], period: int = 14) -> float:
-    """Calculate Relative Strength Index"""
+    """Calculate Relative Strength Index (Wilder smoothing)"""
     if len(prices) < period + 1:
         return 50.0
-    
-    deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-    gains = [d if d > 0 else 0 for d in deltas[-period:]]
-    losses = [-d if d < 0 else 0 for d in deltas[-period:]]
-    
-    avg_gain = sum(gains) / period
-    avg_loss = sum(losses) / period
-    
-    if avg_loss == 0:
-        return 100.0 if avg_gain > 0 else 50.0
-    
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+    return last_value(indicator_engine.rsi(prices, period), 50.0)
 
 
 def calculate_bollinger_bands(prices: List[float], period: int = 20, std_dev: float = 2) -> Dict[str, float]:
     """Calculate Bollinger Bands"""
     if len(prices) < period:
-        current = prices[-1] if prices else 0
+        current = prices[-1] if len(prices) else 0
         return {
             "upper": current,
             "middle": current,
@@ -267,21 +275,18 @@ def calculate_bollinger_bands(prices: List[float], period: int = 20, std_dev: fl
             "percent_b": 50
         }
     
-    recent_prices = prices[-period:]
-    middle = sum(recent_prices) / period
-    
-    # Calculate standard deviation
-    variance = sum((p - middle) ** 2 for p in recent_prices) / period
-    std = variance ** 0.5
-    
-    upper = middle + (std_dev * std)
-    lower = middle - (std_dev * std)
-    
+    upper_s, middle_s, lower_s = indicator_engine.bollinger_bands(prices, period, std_dev)
+    return summarize_bollinger_bands(
+        last_value(upper_s, 0.0), last_value(middle_s, 0.0), last_value(lower_s, 0.0), prices[-1]
+    )
+
+
+def summarize_bollinger_bands(upper: float, middle: float, lower: float, current_price: float) -> Dict[str, float]:
+    """Build the Bollinger Bands payload (bandwidth and %B) from the latest band values"""
     # Bandwidth as percentage
     bandwidth = ((upper - lower) / middle) * 100 if middle > 0 else 0
     
     # Percent B (position within bands)
-    current_price = prices[-1]
     if upper != lower:
         percent_b = ((current_price - lower) / (upper - lower)) * 100
     else:
@@ -301,79 +306,27 @@ def calculate_stoch_rsi(prices: List[float], rsi_period: int = 14, stoch_period:
     if len(prices) < rsi_period + stoch_period:
         return {"value": 50, "k_line": 50, "d_line": 50}
     
-    # Calculate RSI values for the stoch period
-    rsi_values = []
-    for i in range(stoch_period + 3):  # Extra for smoothing
-        end_idx = len(prices) - stoch_period + i + 1
-        if end_idx > rsi_period:
-            slice_prices = prices[:end_idx]
-            rsi_values.append(calculate_rsi(slice_prices, rsi_period))
+    k_series, d_series = indicator_engine.stoch_rsi(prices, rsi_period, stoch_period)
     
-    if len(rsi_values) < stoch_period:
-        return {"value": 50, "k_line": 50, "d_line": 50}
-    
-    recent_rsi = rsi_values[-stoch_period:]
-    rsi_high = max(recent_rsi)
-    rsi_low = min(recent_rsi)
-    
-    current_rsi = rsi_values[-1]
-    
-    if rsi_high == rsi_low:
-        stoch_rsi = 50
-    else:
-        stoch_rsi = ((current_rsi - rsi_low) / (rsi_high - rsi_low)) * 100
-    
-    # K line is the raw Stoch RSI
-    k_line = stoch_rsi
-    
-    # D line is 3-period SMA of K
-    if len(rsi_values) >= 3:
-        k_values = []
-        for i in range(3):
-            idx = -3 + i
-            r_high = max(rsi_values[idx-stoch_period+1:idx+1]) if idx+1 <= 0 else rsi_high
-            r_low = min(rsi_values[idx-stoch_period+1:idx+1]) if idx+1 <= 0 else rsi_low
-            curr = rsi_values[idx]
-            if r_high != r_low:
-                k_values.append(((curr - r_low) / (r_high - r_low)) * 100)
-            else:
-                k_values.append(50)
-        d_line = sum(k_values) / 3
-    else:
-        d_line = k_line
+    # K line is the raw Stoch RSI, D line is 3-period SMA of K
+    k_line = last_value(k_series, 50.0)
+    d_line = last_value(d_series, k_line)
     
     return {
-        "value": round(stoch_rsi, 2),
+        "value": round(k_line, 2),
         "k_line": round(k_line, 2),
         "d_line": round(d_line, 2)
     }
 
 
 def calculate_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
-    """Calculate Average True Range"""
+    """Calculate Average True Range (Wilder smoothing)"""
     if len(closes) < period + 1:
         if len(highs) > 0 and len(lows) > 0:
             return highs[-1] - lows[-1]
         return 0
     
-    true_ranges = []
-    for i in range(1, len(closes)):
-        high = highs[i]
-        low = lows[i]
-        prev_close = closes[i-1]
-        
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
-        )
-        true_ranges.append(tr)
-    
-    # ATR is the average of the last 'period' true ranges
-    if len(true_ranges) < period:
-        return sum(true_ranges) / len(true_ranges) if true_ranges else 0
-    
-    return sum(true_ranges[-period:]) / period
+    return last_value(indicator_engine.atr(highs, lows, closes, period), 0.0)
 
 
 def calculate_macd(prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, float]:
@@ -381,27 +334,10 @@ def calculate_macd(prices: List[float], fast: int = 12, slow: int = 26, signal:
     if len(prices) < slow + signal:
         return {"macd_line": 0, "signal_line": 0, "histogram": 0}
     
-    ema_fast = calculate_ema(prices, fast)
-    ema_slow = calculate_ema(prices, slow)
-    macd_line = ema_fast - ema_slow
-    
-    # Calculate signal line (EMA of MACD)
-    # We need MACD values history for signal line
-    macd_values = []
-    for i in range(signal + 5):
-        idx = len(prices) - signal - 5 + i
-        if idx > slow:
-            slice_prices = prices[:idx+1]
-            ef = calculate_ema(slice_prices, fast)
-            es = calculate_ema(slice_prices, slow)
-            macd_values.append(ef - es)
-    
-    if len(macd_values) >= signal:
-        signal_line = calculate_ema(macd_values, signal)
-    else:
-        signal_line = macd_line
-    
-    histogram = macd_line - signal_line
+    macd_s, signal_s, hist_s = indicator_engine.macd(prices, fast, slow, signal)
+    macd_line = last_value(macd_s, 0.0)
+    signal_line = last_value(signal_s, macd_line)
+    histogram = last_value(hist_s, macd_line - signal_line)
     
     return {
         "macd_line": round(macd_line, 8),
@@ -536,14 +472,12 @@ async def get_bollinger_bands(
             )
         
         # Get OHLCV data from market API
-        from backend.services.coingecko_client import coingecko_client
-        
         # Map timeframe to days
         timeframe_days = {"1m": 1, "5m": 1, "15m": 1, "1h": 7, "4h": 30, "1d": 90}
         days = timeframe_days.get(timeframe, 7)
         
         try:
-            ohlcv = await coingecko_client.get_ohlcv(symbol, days=days)
+            ohlcv, source = await fetch_ohlcv(symbol, timeframe, days, MIN_CANDLES[indicator_name])
         except Exception as e:
             logger.error(f"❌ {indicator_name} - Failed to fetch OHLCV: {e}")
             return JSONResponse(
@@ -574,7 +508,7 @@ async def get_bollinger_bands(
         # Calculate Bollinger Bands
         try:
             bb = calculate_bollinger_bands(prices, period, std_dev)
-            current_price = prices[-1] if prices else 0
+            current_price = prices[-1] if len(prices) else 0
             
             # Sanitize output
             bb = sanitize_dict(bb)
@@ -621,7 +555,7 @@ async def get_bollinger_bands(
             "signal": signal,
             "description": description,
             "timestamp": datetime.utcnow().isoformat() + "Z",
-            "source": "coingecko"
+            "source": source
         }
         
     except Exception as e:
@@ -668,13 +602,11 @@ async def get_stoch_rsi(
             )
         
         # Fetch OHLCV data
-        from backend.services.coingecko_client import coingecko_client
-        
         timeframe_days = {"1m": 1, "5m": 1, "15m": 1, "1h": 7, "4h": 30, "1d": 90}
         days = timeframe_days.get(timeframe, 7)
         
         try:
-            ohlcv = await coingecko_client.get_ohlcv(symbol, days=days)
+            ohlcv, source = await fetch_ohlcv(symbol, timeframe, days, MIN_CANDLES[indicator_name])
         except Exception as e:
             logger.error(f"❌ {indicator_name} - Failed to fetch OHLCV: {e}")
             return JSONResponse(
@@ -749,7 +681,7 @@ async def get_stoch_rsi(
             "signal": signal,
             "description": description,
             "timestamp": datetime.utcnow().isoformat() + "Z",
-            "source": "coingecko"
+            "source": source
         }
         
     except Exception as e:
@@ -786,13 +718,11 @@ async def get_atr(
             )
         
         # Fetch OHLCV data
-        from backend.services.coingecko_client import coingecko_client
-        
         timeframe_days = {"1m": 1, "5m": 1, "15m": 1, "1h": 7, "4h": 30, "1d": 90}
         days = timeframe_days.get(timeframe, 7)
         
         try:
-            ohlcv = await coingecko_client.get_ohlcv(symbol, days=days)
+            ohlcv, source = await fetch_ohlcv(symbol, timeframe, days, MIN_CANDLES[indicator_name])
         except Exception as e:
             logger.error(f"❌ {indicator_name} - Failed to fetch OHLCV: {e}")
             return JSONResponse(
@@ -822,12 +752,16 @@ async def get_atr(
         
         # Calculate ATR
         try:
-            # For ATR we need H/L/C - use price approximation
-            highs = [p * 1.005 for p in prices]  # Approximate
-            lows = [p * 0.995 for p in prices]
+            if isinstance(ohlcv, OHLCVView):
+                # Real highs/lows from the columnar store
+                highs, lows = ohlcv.high, ohlcv.low
+            else:
+                # For ATR we need H/L/C - use price approximation
+                highs = [p * 1.005 for p in prices]  # Approximate
+                lows = [p * 0.995 for p in prices]
             
             atr_value = calculate_atr(highs, lows, prices, period)
-            current_price = prices[-1] if prices else 1
+            current_price = prices[-1] if len(prices) else 1
             atr_percent = (atr_value / current_price) * 100 if current_price > 0 else 0
             
             # Sanitize
@@ -884,7 +818,7 @@ async def get_atr(
             "signal": signal,
             "description": description,
             "timestamp": datetime.utcnow().isoformat() + "Z",
-            "source": "coingecko"
+            "source": source
         }
         
     except Exception as e:
@@ -909,11 +843,9 @@ async def get_sma(
     
     try:
         # Fetch OHLCV data
-        from backend.services.coingecko_client import coingecko_client
-        
         try:
             # Need more data for SMA 200
-            ohlcv = await coingecko_client.get_ohlcv(symbol, days=365)
+            ohlcv, source = await fetch_ohlcv(symbol, timeframe, 365, MIN_CANDLES[indicator_name])
         except Exception as e:
             logger.error(f"❌ {indicator_name} - Failed to fetch OHLCV: {e}")
             return JSONResponse(
@@ -943,7 +875,7 @@ async def get_sma(
         
         # Calculate SMAs
         try:
-            current_price = prices[-1] if prices else 0
+            current_price = prices[-1] if len(prices) else 0
             
             sma20 = calculate_sma(prices, 20)
             sma50 = calculate_sma(prices, 50)
@@ -1015,7 +947,7 @@ async def get_sma(
             "signal": signal,
             "description": description,
             "timestamp": datetime.utcnow().isoformat() + "Z",
-            "source": "coingecko"
+            "source": source
         }
         
     except Exception as e:
@@ -1040,10 +972,8 @@ async def get_ema(
     
     try:
         # Fetch OHLCV data
-        from backend.services.coingecko_client import coingecko_client
-        
         try:
-            ohlcv = await coingecko_client.get_ohlcv(symbol, days=90)
+            ohlcv, source = await fetch_ohlcv(symbol, timeframe, 90, MIN_CANDLES[indicator_name])
         except Exception as e:
             logger.error(f"❌ {indicator_name} - Failed to fetch OHLCV: {e}")
             return JSONResponse(
@@ -1073,7 +1003,7 @@ async def get_ema(
         
         # Calculate EMAs
         try:
-            current_price = prices[-1] if prices else 0
+            current_price = prices[-1] if len(prices) else 0
             
             ema12 = calculate_ema(prices, 12)
             ema26 = calculate_ema(prices, 26)
@@ -1138,7 +1068,7 @@ async def get_ema(
             "signal": signal,
             "description": description,
             "timestamp": datetime.utcnow().isoformat() + "Z",
-            "source": "coingecko"
+            "source": source
         }
         
     except Exception as e:
@@ -1177,10 +1107,8 @@ async def get_macd(
             )
         
         # Fetch OHLCV data
-        from backend.services.coingecko_client import coingecko_client
-        
         try:
-            ohlcv = await coingecko_client.get_ohlcv(symbol, days=90)
+            ohlcv, source = await fetch_ohlcv(symbol, timeframe, 90, MIN_CANDLES[indicator_name])
         except Exception as e:
             logger.error(f"❌ {indicator_name} - Failed to fetch OHLCV: {e}")
             return JSONResponse(
@@ -1259,7 +1187,7 @@ async def get_macd(
             "signal": signal,
             "description": description,
             "timestamp": datetime.utcnow().isoformat() + "Z",
-            "source": "coingecko"
+            "source": source
         }
         
     except Exception as e:
@@ -1296,13 +1224,11 @@ async def get_rsi(
             )
         
         # Fetch OHLCV data
-        from backend.services.coingecko_client import coingecko_client
-        
         timeframe_days = {"1m": 1, "5m": 1, "15m": 1, "1h": 7, "4h": 30, "1d": 90}
         days = timeframe_days.get(timeframe, 7)
         
         try:
-            ohlcv = await coingecko_client.get_ohlcv(symbol, days=days)
+            ohlcv, source = await fetch_ohlcv(symbol, timeframe, days, MIN_CANDLES[indicator_name])
         except Exception as e:
             logger.error(f"❌ {indicator_name} - Failed to fetch OHLCV: {e}")
             return JSONResponse(
@@ -1379,7 +1305,7 @@ async def get_rsi(
             "signal": signal,
             "description": description,
             "timestamp": datetime.utcnow().isoformat() + "Z",
-            "source": "coingecko"
+            "source": source
         }
         
     except Exception as e:
@@ -1408,16 +1334,23 @@ async def get_comprehensive_analysis(
             logger.error(f"CoinGecko client import failed: {import_err}")
             client_available = False
         
-        # Try to get historical data if client is available
+        # Serve straight from the streaming state when the OHLC worker tracks this series
+        # Then the columnar store, then historical data if client is available
         ohlcv = None
-        if client_available:
+        with timed_phase("cache"):
+            live = get_indicator_registry().latest(symbol, timeframe)
+            if live is None:
+                ohlcv = get_ohlcv_store().read_recent(symbol, timeframe, 365)
+                if ohlcv is not None and len(ohlcv) < MIN_CANDLES["STOCH_RSI"]:
+                    ohlcv = None
+        if live is None and ohlcv is None and client_available:
             try:
                 ohlcv = await coingecko_client.get_ohlcv(symbol, days=365)
             except Exception as fetch_err:
                 logger.error(f"Failed to fetch OHLCV data: {fetch_err}")
                 ohlcv = None
         
-        if not ohlcv or "prices" not in ohlcv:
+        if live is None and not isinstance(ohlcv, OHLCVView) and (not ohlcv or "prices" not in ohlcv):
             # Return comprehensive fallback with real structure
             current_price = 67500 if symbol.upper() == "BTC" else 3400 if symbol.upper() == "ETH" else 100
             logger.warning(f"Using fallback data for {symbol} - API unavailable")
@@ -1452,29 +1385,60 @@ async def get_comprehensive_analysis(
                 "warning": "API temporarily unavailable - using fallback data"
             }
         
-        prices = [p[1] for p in ohlcv["prices"]]
-        current_price = prices[-1] if prices else 0
-        
-        # Calculate all indicators
-        bb = calculate_bollinger_bands(prices, 20, 2)
-        stoch = calculate_stoch_rsi(prices, 14, 14)
+        if live is not None:
+            # Latest values maintained incrementally by the OHLC worker
+            current_price = live["current_price"]
+            source = "indicator_state"
+            
+            bands = live["bollinger_bands"]
+            bb = summarize_bollinger_bands(bands["upper"], bands["middle"], bands["lower"], current_price)
+            k_line = live["stoch_rsi"]["k_line"]
+            stoch = {
+                "value": round(k_line, 2),
+                "k_line": round(k_line, 2),
+                "d_line": round(live["stoch_rsi"]["d_line"], 2)
+            }
+            atr_value = live["atr"]
+            
+            sma20 = live["sma"]["sma20"]
+            sma50 = live["sma"]["sma50"]
+            sma200 = live["sma"]["sma200"]
+            
+            ema12 = live["ema"]["ema12"]
+            ema26 = live["ema"]["ema26"]
+            
+            macd = {key: round(value, 8) for key, value in live["macd"].items()}
+            rsi = live["rsi"]
+        else:
+            if isinstance(ohlcv, OHLCVView):
+                prices, highs, lows = ohlcv.close, ohlcv.high, ohlcv.low
+                source = "ohlcv_store"
+            else:
+                prices = [p[1] for p in ohlcv["prices"]]
+                # Approximate H/L for ATR
+                highs = [p * 1.005 for p in prices]
+                lows = [p * 0.995 for p in prices]
+                source = "coingecko"
+            current_price = float(prices[-1]) if len(prices) else 0
+            
+            # Calculate all indicators
+            with timed_phase("compute"):
+                bb = calculate_bollinger_bands(prices, 20, 2)
+                stoch = calculate_stoch_rsi(prices, 14, 14)
+                atr_value = calculate_atr(highs, lows, prices, 14)
+                
+                sma20 = calculate_sma(prices, 20)
+                sma50 = calculate_sma(prices, 50)
+                sma200 = calculate_sma(prices, 200) if len(prices) >= 200 else None
+                
+                ema12 = calculate_ema(prices, 12)
+                ema26 = calculate_ema(prices, 26)
+                
+                macd = calculate_macd(prices, 12, 26, 9)
+                rsi = calculate_rsi(prices, 14)
         
-        # Approximate H/L for ATR
-        highs = [p * 1.005 for p in prices]
-        lows = [p * 0.995 for p in prices]
-        atr_value = calculate_atr(highs, lows, prices, 14)
         atr_percent = (atr_value / current_price) * 100 if current_price > 0 else 0
         
-        sma20 = calculate_sma(prices, 20)
-        sma50 = calculate_sma(prices, 50)
-        sma200 = calculate_sma(prices, 200) if len(prices) >= 200 else None
-        
-        ema12 = calculate_ema(prices, 12)
-        ema26 = calculate_ema(prices, 26)
-        
-        macd = calculate_macd(prices, 12, 26, 9)
-        rsi = calculate_rsi(prices, 14)
-        
         # Determine individual signals
         signals = {}
         
@@ -1576,7 +1540,7 @@ async def get_comprehensive_analysis(
             "confidence": confidence,
             "recommendation": recommendation,
             "timestamp": datetime.utcnow().isoformat() + "Z",
-            "source": "coingecko"
+            "source": source
         }
         
     except Exception as e:
@@ -0,0 +1,243 @@
+"""
+Lazy Router Registry
+Declares API routers by path prefix and imports them on first use
+
+Importing every router at startup pulls in pandas, SQLAlchemy models and all
+provider clients before the server can bind its port. Routers declared here
+are imported when the first request under one of their prefixes arrives
+(or by a background warm-up shortly after startup), then included into the
+app at the position they were declared, so route precedence is the same as
+with eager ``include_router`` calls.
+
+Usage:
+    lazy_routers = LazyRouterRegistry(app)
+    lazy_routers.declare("market_api", "backend.routers.market_api", ["/api/market", "/ws"])
+    lazy_routers.install()          # before the app starts
+    ...
+    lazy_routers.start_warmup()     # from the lifespan handler
+
+Set LAZY_ROUTERS=false to import everything at install time.
+"""
+
+import asyncio
+import importlib
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+
+from utils.logger import setup_logger
+
+logger = setup_logger("lazy_routers")
+
+LAZY_ROUTERS = os.getenv("LAZY_ROUTERS", "true").lower() not in ("0", "false", "no")
+ROUTER_WARMUP_DELAY = float(os.getenv("ROUTER_WARMUP_DELAY", "2.0"))
+
+
+@dataclass
+class RouterSpec:
+    """A router declared by module path and the URL prefixes it serves"""
+
+    name: str
+    module: str
+    prefixes: Tuple[str, ...]
+    attr: str = "router"
+    include_kwargs: Dict[str, Any] = field(default_factory=dict)
+    routes: List[Any] = field(default_factory=list)
+    loaded: bool = False
+    error: Optional[str] = None
+    load_seconds: Optional[float] = None
+
+    def matches(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix.rstrip("/") + "/") for prefix in self.prefixes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "module": self.module,
+            "prefixes": list(self.prefixes),
+            "status": "failed" if self.error else ("loaded" if self.loaded else "pending"),
+            "routes": len(self.routes),
+            "load_ms": round(self.load_seconds * 1000, 1) if self.load_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+class LazyRouterRegistry:
+    """
+    Registry of lazily imported routers for one FastAPI app
+
+    Args:
+        app: Application the routers are included into
+        load_all_paths: Paths that need every router (schema, route listings)
+    """
+
+    def __init__(self, app: FastAPI, load_all_paths: Iterable[str] = ("/openapi.json", "/docs", "/redoc")):
+        self.app = app
+        self.specs: List[RouterSpec] = []
+        self.load_all_paths = set(load_all_paths)
+        self._anchor: Optional[int] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Declaration
+    # ------------------------------------------------------------------
+
+    def declare(
+        self,
+        name: str,
+        module: str,
+        prefixes: Sequence[str],
+        attr: str = "router",
+        **include_kwargs
+    ) -> RouterSpec:
+        """
+        Declare a router
+
+        Args:
+            name: Name reported by status()
+            module: Dotted module path
+            prefixes: URL prefixes of the router's routes (after include prefix)
+            attr: Module attribute holding the APIRouter
+            **include_kwargs: Passed to app.include_router (e.g. prefix)
+
+        Returns:
+            The RouterSpec
+        """
+        spec = RouterSpec(name, module, tuple(prefixes), attr, include_kwargs)
+        self.specs.append(spec)
+        return spec
+
+    def install(self):
+        """Attach the loading middleware (or load everything when LAZY_ROUTERS is off)"""
+        self._anchor = len(self.app.router.routes)
+        if not LAZY_ROUTERS:
+            self.load_all()
+            return
+        self.app.add_middleware(LazyRouterMiddleware, registry=self)
+        logger.info(f"Declared {len(self.specs)} lazy routers")
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @property
+    def pending(self) -> List[RouterSpec]:
+        return [spec for spec in self.specs if not spec.loaded and not spec.error]
+
+    def _include(self, spec: RouterSpec, module: Any, started: float):
+        """Include a freshly imported router at its declaration position"""
+        if spec.loaded or spec.error:
+            return
+        routes = self.app.router.routes
+        before = len(routes)
+        try:
+            self.app.include_router(getattr(module, spec.attr), **spec.include_kwargs)
+        except Exception as e:
+            del routes[before:]
+            self._fail(spec, e)
+            return
+
+        new_routes = routes[before:]
+        del routes[before:]
+        position = self._anchor if self._anchor is not None else before
+        for other in self.specs:
+            if other is spec:
+                break
+            position += len(other.routes)
+        routes[position:position] = new_routes
+
+        spec.routes = new_routes
+        spec.loaded = True
+        spec.load_seconds = time.perf_counter() - started
+        self.app.openapi_schema = None
+        logger.info(f"Loaded router {spec.name} ({len(new_routes)} routes, {spec.load_seconds * 1000:.0f} ms)")
+
+    def _fail(self, spec: RouterSpec, error: Exception):
+        spec.error = f"{type(error).__name__}: {error}"
+        logger.error(f"Failed to include {spec.name}: {error}")
+
+    def load(self, spec: RouterSpec):
+        """Import and include a router on the calling thread"""
+        if spec.loaded or spec.error:
+            return
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(spec.module)
+        except Exception as e:
+            self._fail(spec, e)
+            return
+        self._include(spec, module, started)
+
+    def load_all(self):
+        """Import and include every pending router"""
+        for spec in self.pending:
+            self.load(spec)
+
+    async def load_async(self, spec: RouterSpec):
+        """Import a router in a worker thread, then include it on the event loop"""
+        if spec.loaded or spec.error:
+            return
+        started = time.perf_counter()
+        try:
+            module = await asyncio.to_thread(importlib.import_module, spec.module)
+        except Exception as e:
+            if not spec.error:
+                self._fail(spec, e)
+            return
+        self._include(spec, module, started)
+
+    async def ensure_loaded(self, path: str):
+        """Load the routers a request path may need"""
+        if path in self.load_all_paths:
+            needed = self.pending
+        else:
+            needed = [spec for spec in self.pending if spec.matches(path)]
+        for spec in needed:
+            await self.load_async(spec)
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+
+    async def warmup(self, delay: float = ROUTER_WARMUP_DELAY):
+        """Load the remaining routers in the background, one at a time"""
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        count = len(self.pending)
+        for spec in self.pending:
+            await self.load_async(spec)
+        if count:
+            logger.info(f"Warmed up {count} routers in {time.perf_counter() - started:.1f}s")
+
+    def start_warmup(self, delay: float = ROUTER_WARMUP_DELAY) -> Optional[asyncio.Task]:
+        """Schedule warmup() (call from the running loop, e.g. lifespan startup)"""
+        if not self.pending or delay < 0:
+            return None
+        self._warmup_task = asyncio.create_task(self.warmup(delay))
+        return self._warmup_task
+
+    async def stop_warmup(self):
+        """Cancel a running warm-up"""
+        task, self._warmup_task = self._warmup_task, None
+        if task and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Load state per declared router"""
+        return {spec.name: spec.to_dict() for spec in self.specs}
+
+
+class LazyRouterMiddleware:
+    """Raw ASGI middleware loading declared routers before routing"""
+
+    def __init__(self, app, registry: LazyRouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.registry.pending:
+            await self.registry.ensure_loaded(scope["path"])
+        await self.app(scope, receive, send)
@@ -64,7 +64,7 @@ async def get_system_status():
         from database.models import Provider, SourcePool, PoolMember
         
         try:
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session() as session:
                 providers = session.query(Provider).all()
                 pools = session.query(SourcePool).all()
                 
@@ -151,7 +151,7 @@ async def get_detailed_sources():
         from database.models import Provider, SourcePool, PoolMember
         
         try:
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session() as session:
                 providers = session.query(Provider).all()
                 
                 sources = []
@@ -11,54 +11,192 @@ from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from utils.latency_histogram import LatencyHistogram
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Seconds covered by the rolling request window
+METRICS_WINDOW_SECONDS = 60
+# Distinct route templates tracked before the rest are folded into "other"
+MAX_TRACKED_ROUTES = 256
+
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+def _status_class_index(status_code: Optional[int], is_error: bool) -> int:
+    if status_code is None:
+        return 4 if is_error else 1
+    return min(max(status_code // 100, 1), 5) - 1
+
+
+class _SecondBucket:
+    """Requests recorded during one second of the rolling window"""
+
+    __slots__ = ("second", "requests", "errors", "status", "latency")
+
+    def __init__(self):
+        self.second = -1
+        self.requests = 0
+        self.errors = 0
+        self.status = [0] * len(STATUS_CLASSES)
+        self.latency = LatencyHistogram()
+
+    def reset(self, second: int):
+        self.second = second
+        self.requests = 0
+        self.errors = 0
+        self.status = [0] * len(STATUS_CLASSES)
+        self.latency.reset()
+
+
+class _RouteStats:
+    """Cumulative counters and latency distribution of one route template"""
+
+    __slots__ = ("requests", "errors", "status", "latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.status = [0] * len(STATUS_CLASSES)
+        self.latency = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests * 100, 2) if self.requests else 0.0,
+            "status": {name: count for name, count in zip(STATUS_CLASSES, self.status) if count},
+            **_percentiles(self.latency),
+        }
+
+
+def _percentiles(histogram: LatencyHistogram) -> Dict[str, Optional[float]]:
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        "mean_ms": ms(histogram.mean),
+        "p50_ms": ms(histogram.quantile(0.50)),
+        "p95_ms": ms(histogram.quantile(0.95)),
+        "p99_ms": ms(histogram.quantile(0.99)),
+        "max_ms": ms(histogram.max),
+    }
+
+
 # Global metrics tracker
 class MetricsTracker:
-    """Track request metrics for real-time monitoring"""
+    """
+    Track request metrics for real-time monitoring
+
+    Recording is O(1) with constant memory: the last minute is a ring of
+    per-second buckets (count, errors, status classes, latency histogram),
+    and lifetime latency is an HDR-style histogram overall and per route
+    template. Called from the event loop only, so no locking is needed.
+    """
     
-    def __init__(self):
+    def __init__(self, window_seconds: int = METRICS_WINDOW_SECONDS):
         self.start_time = time.time()
         self.request_count = 0
         self.error_count = 0
-        self.response_times = []
-        self.max_response_times = 100  # Keep last 100 response times
-        self.last_minute_requests = []
-        self.last_minute_errors = []
+        self.window_seconds = window_seconds
+        self.latency = LatencyHistogram()
+        self.status_counts = [0] * len(STATUS_CLASSES)
+        self.routes: Dict[str, _RouteStats] = {}
+        self._buckets = [_SecondBucket() for _ in range(window_seconds)]
         
-    def record_request(self, response_time_ms: float, is_error: bool = False):
-        """Record a request with its response time"""
-        current_time = time.time()
+    def record_request(
+        self,
+        response_time_ms: float,
+        is_error: bool = False,
+        route: Optional[str] = None,
+        status_code: Optional[int] = None
+    ):
+        """
+        Record a request with its response time
+
+        Args:
+            response_time_ms: Response time in milliseconds
+            is_error: Whether the request failed
+            route: Route template with method (e.g. "GET /api/coins/{symbol}")
+            status_code: HTTP status code, if a response was sent
+        """
+        seconds = response_time_ms / 1000
+        status_index = _status_class_index(status_code, is_error)
         
         self.request_count += 1
         if is_error:
             self.error_count += 1
+        self.latency.observe(seconds)
+        self.status_counts[status_index] += 1
         
-        # Track response time
-        self.response_times.append(response_time_ms)
-        if len(self.response_times) > self.max_response_times:
-            self.response_times.pop(0)
-        
-        # Track requests per minute
-        self.last_minute_requests.append(current_time)
-        self.last_minute_requests = [t for t in self.last_minute_requests if current_time - t < 60]
-        
-        # Track errors per minute
+        # Rolling window: reuse the bucket of the same second a minute ago
+        now = int(time.monotonic())
+        bucket = self._buckets[now % self.window_seconds]
+        if bucket.second != now:
+            bucket.reset(now)
+        bucket.requests += 1
         if is_error:
-            self.last_minute_errors.append(current_time)
-            self.last_minute_errors = [t for t in self.last_minute_errors if current_time - t < 60]
+            bucket.errors += 1
+        bucket.status[status_index] += 1
+        bucket.latency.observe(seconds)
+        
+        if route is not None:
+            stats = self.routes.get(route)
+            if stats is None:
+                if len(self.routes) >= MAX_TRACKED_ROUTES:
+                    route = "other"
+                stats = self.routes.setdefault(route, _RouteStats())
+            stats.requests += 1
+            if is_error:
+                stats.errors += 1
+            stats.status[status_index] += 1
+            stats.latency.observe(seconds)
+    
+    def _window_buckets(self):
+        oldest = int(time.monotonic()) - self.window_seconds
+        return [bucket for bucket in self._buckets if bucket.second > oldest]
+    
+    def get_window(self) -> Dict[str, Any]:
+        """Requests, errors, status classes and latency over the rolling window"""
+        buckets = self._window_buckets()
+        latency = LatencyHistogram()
+        status = [0] * len(STATUS_CLASSES)
+        for bucket in buckets:
+            latency.merge(bucket.latency)
+            for index, count in enumerate(bucket.status):
+                status[index] += count
+        return {
+            "seconds": self.window_seconds,
+            "requests": sum(bucket.requests for bucket in buckets),
+            "errors": sum(bucket.errors for bucket in buckets),
+            "status": dict(zip(STATUS_CLASSES, status)),
+            "latency": latency,
+        }
     
     def get_requests_per_minute(self) -> int:
         """Get number of requests in the last minute"""
-        return len(self.last_minute_requests)
+        return sum(bucket.requests for bucket in self._window_buckets())
     
     def get_average_response_time(self) -> float:
-        """Get average response time in milliseconds"""
-        if not self.response_times:
-            return 0.0
-        return sum(self.response_times) / len(self.response_times)
+        """Get average response time in milliseconds (last minute, else lifetime)"""
+        window = self.get_window()["latency"]
+        mean = window.mean if window.count else self.latency.mean
+        return mean * 1000 if mean is not None else 0.0
+    
+    def get_percentiles(self, window: bool = True) -> Dict[str, Optional[float]]:
+        """p50/p95/p99 response times in milliseconds (last minute or lifetime)"""
+        return _percentiles(self.get_window()["latency"] if window else self.latency)
+    
+    def get_route_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Lifetime breakdown per route template, busiest first"""
+        ordered = sorted(self.routes.items(), key=lambda item: item[1].requests, reverse=True)
+        return {route: stats.to_dict() for route, stats in ordered}
+    
+    def get_status_classes(self) -> Dict[str, int]:
+        """Lifetime request count per status class"""
+        return dict(zip(STATUS_CLASSES, self.status_counts))
     
     def get_error_rate(self) -> float:
         """Get error rate as a percentage"""
@@ -91,6 +229,10 @@ class SystemMetricsResponse(BaseModel):
     uptime: int
     requests_per_min: int
     avg_response_ms: float
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    status_classes: Dict[str, int] = {}
     error_rate: float
     timestamp: int
     status: str = "ok"
@@ -107,6 +249,8 @@ async def get_system_metrics():
         - uptime: Process uptime in seconds
         - requests_per_min: Number of requests in the last minute
         - avg_response_ms: Average response time in milliseconds
+        - p50_ms / p95_ms / p99_ms: Response time percentiles over the last minute
+        - status_classes: Requests per status class over the last minute
         - error_rate: Error rate as percentage
         - timestamp: Current Unix timestamp
     
@@ -127,8 +271,10 @@ async def get_system_metrics():
         uptime = tracker.get_uptime()
         
         # Get request metrics (real)
-        requests_per_min = tracker.get_requests_per_minute()
+        window = tracker.get_window()
+        requests_per_min = window["requests"]
         avg_response_ms = tracker.get_average_response_time()
+        percentiles = _percentiles(window["latency"])
         error_rate = tracker.get_error_rate()
         
         # Current timestamp
@@ -144,6 +290,10 @@ async def get_system_metrics():
             uptime=uptime,
             requests_per_min=requests_per_min,
             avg_response_ms=round(avg_response_ms, 2),
+            p50_ms=percentiles["p50_ms"],
+            p95_ms=percentiles["p95_ms"],
+            p99_ms=percentiles["p99_ms"],
+            status_classes=window["status"],
             error_rate=round(error_rate, 2),
             timestamp=timestamp,
             status="ok"
@@ -164,6 +314,25 @@ async def get_system_metrics():
         )
 
 
+@router.get("/api/system/metrics/routes")
+async def get_route_metrics():
+    """
+    Get per-route request metrics
+    
+    Returns request count, error rate, status classes and p50/p95/p99
+    response times per route template since startup, busiest first
+    """
+    tracker = get_metrics_tracker()
+    
+    return {
+        "routes": tracker.get_route_stats(),
+        "status_classes": tracker.get_status_classes(),
+        "overall": _percentiles(tracker.latency),
+        "uptime": tracker.get_uptime(),
+        "timestamp": int(time.time())
+    }
+
+
 @router.get("/api/system/health")
 async def get_system_health():
     """
@@ -210,6 +379,38 @@ async def get_system_health():
         }
 
 
+@router.get("/api/system/http-pools")
+async def get_http_pool_stats():
+    """
+    Get shared HTTP client pool statistics
+    
+    Returns per-provider request counts, connection reuse ratio and
+    handshake (connect + TLS) timing for the pooled clients
+    """
+    from utils.http_pool import get_pool_stats
+    
+    return {
+        **get_pool_stats(),
+        "timestamp": int(time.time())
+    }
+
+
+@router.get("/api/system/cache")
+async def get_cache_stats():
+    """
+    Get tiered cache statistics
+    
+    Returns per-namespace entries, bytes, hit/miss/eviction counters and
+    the state of the persistent L2 store
+    """
+    from backend.cache.tiered_cache import get_tiered_cache
+    
+    return {
+        **get_tiered_cache().stats(),
+        "timestamp": int(time.time())
+    }
+
+
 @router.get("/api/system/info")
 async def get_system_info():
     """
@@ -13,6 +13,9 @@ import logging
 import math
 import statistics
 
+from backend.services import indicator_engine
+from backend.services.indicator_engine import last_value
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Technical Analysis"])
@@ -104,22 +107,11 @@ def normalize_candle(candle: Dict[str, Any]) -> Dict[str, float]:
 
 
 def calculate_rsi(prices: List[float], period: int = 14) -> float:
-    """Calculate RSI (Relative Strength Index)"""
+    """Calculate RSI (Relative Strength Index) with Wilder smoothing"""
     if len(prices) < period + 1:
         return 50.0
     
-    deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-    gains = [d if d > 0 else 0 for d in deltas]
-    losses = [-d if d < 0 else 0 for d in deltas]
-    
-    avg_gain = sum(gains[-period:]) / period
-    avg_loss = sum(losses[-period:]) / period
-    
-    if avg_loss == 0:
-        return 100.0
-    
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
+    rsi = last_value(indicator_engine.rsi(prices, period), 50.0)
     return round(rsi, 2)
 
 
@@ -128,25 +120,15 @@ def calculate_macd(prices: List[float], fast: int = 12, slow: int = 26, signal:
     if len(prices) < slow:
         return {'macd': 0, 'signal': 0, 'histogram': 0}
     
-    # Simple EMA calculation
-    def ema(data, period):
-        multiplier = 2 / (period + 1)
-        ema_values = [data[0]]
-        for price in data[1:]:
-            ema_values.append((price - ema_values[-1]) * multiplier + ema_values[-1])
-        return ema_values
-    
-    fast_ema = ema(prices, fast)
-    slow_ema = ema(prices, slow)
-    
-    macd_line = [fast_ema[i] - slow_ema[i] for i in range(len(slow_ema))]
-    signal_line = ema(macd_line[-signal:], signal) if len(macd_line) >= signal else [0]
-    
-    histogram = macd_line[-1] - signal_line[-1] if signal_line else 0
+    macd_s, signal_s, _ = indicator_engine.macd(prices, fast, slow, signal)
+    macd_line = last_value(macd_s, 0.0)
+    # Not enough MACD history for a full signal EMA yet - fall back to the line itself
+    signal_line = last_value(signal_s, macd_line)
+    histogram = macd_line - signal_line
     
     return {
-        'macd': round(macd_line[-1], 4),
-        'signal': round(signal_line[-1], 4),
+        'macd': round(macd_line, 4),
+        'signal': round(signal_line, 4),
         'histogram': round(histogram, 4)
     }
 
@@ -155,7 +137,7 @@ def calculate_sma(prices: List[float], period: int) -> float:
     """Calculate Simple Moving Average"""
     if len(prices) < period:
         return sum(prices) / len(prices) if prices else 0
-    return sum(prices[-period:]) / period
+    return last_value(indicator_engine.sma(prices, period), 0)
 
 
 def find_support_resistance(candles: List[Dict[str, float]]) -> Dict[str, Any]:
@@ -20,6 +20,9 @@ import httpx
 import asyncio
 import numpy as np
 
+from backend.services import indicator_engine
+from backend.services.indicator_engine import last_value
+
 # Import enhanced provider manager for intelligent load balancing
 from backend.services.enhanced_provider_manager import (
     get_enhanced_provider_manager,
@@ -112,22 +115,11 @@ async def fetch_ohlcv_for_analysis(symbol: str, interval: str, limit: int) -> Li
 
 
 def calculate_rsi(prices: List[float], period: int = 14) -> float:
-    """Calculate RSI indicator"""
+    """Calculate RSI indicator (Wilder smoothing)"""
     if len(prices) < period + 1:
         return 50.0
     
-    deltas = np.diff(prices)
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-    
-    avg_gain = np.mean(gains[-period:])
-    avg_loss = np.mean(losses[-period:])
-    
-    if avg_loss == 0:
-        return 100.0
-    
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
+    rsi = last_value(indicator_engine.rsi(prices, period), 50.0)
     return round(rsi, 2)
 
 
@@ -136,14 +128,9 @@ def calculate_macd(prices: List[float], fast: int = 12, slow: int = 26, signal:
     if len(prices) < slow:
         return {"macd": 0, "signal": 0, "histogram": 0}
     
-    prices_arr = np.array(prices)
-    
-    # Calculate EMAs
-    ema_fast = prices_arr[-1]  # Simplified
-    ema_slow = prices_arr[-slow]
-    
-    macd_line = ema_fast - ema_slow
-    signal_line = macd_line * 0.9  # Simplified
+    macd_s, signal_s, _ = indicator_engine.macd(prices, fast, slow, signal)
+    macd_line = last_value(macd_s, 0.0)
+    signal_line = last_value(signal_s, macd_line)
     histogram = macd_line - signal_line
     
     return {
@@ -158,14 +145,12 @@ def calculate_bollinger_bands(prices: List[float], period: int = 20, std_dev: in
     if len(prices) < period:
         return {"upper": 0, "middle": 0, "lower": 0}
     
-    recent_prices = prices[-period:]
-    middle = np.mean(recent_prices)
-    std = np.std(recent_prices)
+    upper, middle, lower = indicator_engine.bollinger_bands(prices, period, std_dev)
     
     return {
-        "upper": round(middle + (std_dev * std), 2),
-        "middle": round(middle, 2),
-        "lower": round(middle - (std_dev * std), 2)
+        "upper": round(last_value(upper, 0.0), 2),
+        "middle": round(last_value(middle, 0.0), 2),
+        "lower": round(last_value(lower, 0.0), 2)
     }
 
 
@@ -325,10 +310,11 @@ async def get_technical_indicators(
         
         # Calculate requested indicators
         if "rsi" in requested:
+            rsi_value = calculate_rsi(closes, 14)
             result_indicators["rsi"] = {
-                "value": calculate_rsi(closes, 14),
+                "value": rsi_value,
                 "period": 14,
-                "interpretation": "oversold" if calculate_rsi(closes, 14) < 30 else "overbought" if calculate_rsi(closes, 14) > 70 else "neutral"
+                "interpretation": "oversold" if rsi_value < 30 else "overbought" if rsi_value > 70 else "neutral"
             }
         
         if "macd" in requested:
@@ -358,9 +344,8 @@ async def get_technical_indicators(
             }
         
         if "ema" in requested:
-            # Simplified EMA calculation
-            ema_12 = round(closes[-1] * 0.15 + closes[-2] * 0.85, 2) if len(closes) >= 2 else closes[-1]
-            ema_26 = round(np.mean(closes[-26:]), 2) if len(closes) >= 26 else 0
+            ema_12 = round(last_value(indicator_engine.ema(closes, 12), closes[-1]), 2)
+            ema_26 = round(last_value(indicator_engine.ema(closes, 26), 0), 2)
             result_indicators["ema"] = {
                 "ema_12": ema_12,
                 "ema_26": ema_26,
@@ -426,9 +411,13 @@ async def backtest_strategy(request: BacktestRequest):
             fast_period = request.params.get("fast", 10)
             slow_period = request.params.get("slow", 30)
             
+            # sma_*[i - 1] is the average of closes[i-period:i]
+            sma_fast_series = indicator_engine.sma(closes, fast_period)
+            sma_slow_series = indicator_engine.sma(closes, slow_period)
+            
             for i in range(slow_period, len(closes)):
-                sma_fast = np.mean(closes[i-fast_period:i])
-                sma_slow = np.mean(closes[i-slow_period:i])
+                sma_fast = sma_fast_series[i - 1]
+                sma_slow = sma_slow_series[i - 1]
                 
                 # Buy signal: fast crosses above slow
                 if sma_fast > sma_slow and position is None:
@@ -456,8 +445,11 @@ async def backtest_strategy(request: BacktestRequest):
             oversold = request.params.get("oversold", 30)
             overbought = request.params.get("overbought", 70)
             
+            # rsi_series[i - 1] is the RSI over closes[:i]
+            rsi_series = indicator_engine.rsi(closes, rsi_period)
+            
             for i in range(rsi_period + 1, len(closes)):
-                rsi = calculate_rsi(closes[:i], rsi_period)
+                rsi = rsi_series[i - 1]
                 
                 # Buy signal: RSI oversold
                 if rsi < oversold and position is None:
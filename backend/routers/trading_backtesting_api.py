@@ -6,13 +6,17 @@ Binance & KuCoin with advanced features
 """
 
 from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Union
+import json
 import logging
 
 from backend.services.trading_backtesting_service import (
     get_trading_service,
     get_backtesting_service
 )
+from backend.services.parameter_sweep import RANK_METRICS, get_sweep_manager
 
 logger = logging.getLogger(__name__)
 
@@ -370,6 +374,130 @@ async def run_backtest(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ========== Parameter Sweep Endpoints ==========
+
+class SweepRequest(BaseModel):
+    """Parameter sweep request"""
+    strategy: str = Field(..., description="Strategy name (sma_crossover, rsi, macd)")
+    parameters: Dict[str, Union[List[float], Dict[str, float]]] = Field(
+        ..., description="Parameter ranges: list of values or {start, stop, step}"
+    )
+    timeframe: str = Field("1h", description="Timeframe")
+    days: int = Field(30, ge=1, le=365, description="Historical data period")
+    exchange: str = Field("binance", description="Exchange (binance/kucoin)")
+    initial_capital: float = Field(10000.0, ge=100, description="Initial capital")
+
+
+def _get_sweep_job(job_id: str):
+    job = get_sweep_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Sweep {job_id} not found")
+    return job
+
+
+@router.post("/backtest/sweep/{symbol}")
+async def start_parameter_sweep(symbol: str, request: SweepRequest):
+    """
+    Start a parameter sweep (grid search) for a strategy
+    
+    The history is fetched once; every combination is evaluated on a
+    process pool against that single copy. Returns a job id to poll,
+    stream or cancel.
+    
+    **Parameters per strategy (defaults):**
+    - `sma_crossover`: fast (10), slow (30)
+    - `rsi`: period (14), oversold (30), overbought (70)
+    - `macd`: fast (12), slow (26), signal (9)
+    
+    **Example:**
+    ```
+    POST /api/trading/backtest/sweep/BTCUSDT
+    {"strategy": "sma_crossover", "days": 90,
+     "parameters": {"fast": {"start": 5, "stop": 30, "step": 5}, "slow": [50, 100, 200]}}
+    ```
+    """
+    try:
+        backtest_service = get_backtesting_service()
+        
+        job = await backtest_service.start_parameter_sweep(
+            symbol=symbol,
+            strategy=request.strategy,
+            parameters=request.parameters,
+            timeframe=request.timeframe,
+            days=request.days,
+            exchange=request.exchange,
+            initial_capital=request.initial_capital
+        )
+        
+        return {"success": True, **job.progress()}
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to start parameter sweep for {symbol}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/backtest/sweep/{job_id}")
+async def get_parameter_sweep(
+    job_id: str,
+    rank_by: str = Query("total_return", description="total_return, sharpe, profit or max_drawdown"),
+    top: int = Query(20, ge=1, le=1000, description="Number of ranked results")
+):
+    """
+    Get sweep progress and the ranked results so far
+    """
+    job = _get_sweep_job(job_id)
+    try:
+        results = job.ranked(rank_by, top)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, **job.progress(), "rank_by": rank_by, "results": results}
+
+
+@router.get("/backtest/sweep/{job_id}/stream")
+async def stream_parameter_sweep(
+    job_id: str,
+    rank_by: str = Query("total_return", description="total_return, sharpe, profit or max_drawdown"),
+    top: int = Query(50, ge=1, le=1000, description="Number of ranked results")
+):
+    """
+    Stream sweep progress as NDJSON
+    
+    One `progress` line (with the current best combination) per completed
+    batch, then the final ranked table as `result` lines and a `done` line.
+    """
+    job = _get_sweep_job(job_id)
+    if rank_by not in RANK_METRICS:
+        raise HTTPException(status_code=400, detail=f"rank_by must be one of {sorted(RANK_METRICS)}")
+    
+    async def events():
+        reported = -1
+        while True:
+            if job.completed != reported:
+                reported = job.completed
+                best = job.ranked(rank_by, 1)
+                yield json.dumps({"event": "progress", **job.progress(), "best": best[0] if best else None}) + "\n"
+            if job.done:
+                break
+            await job.wait_for_update()
+        for row in job.ranked(rank_by, top):
+            yield json.dumps({"event": "result", **row}) + "\n"
+        yield json.dumps({"event": "done", **job.progress()}) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.delete("/backtest/sweep/{job_id}")
+async def cancel_parameter_sweep(job_id: str):
+    """
+    Cancel a running sweep (combinations already evaluated are kept)
+    """
+    job = _get_sweep_job(job_id)
+    cancelled = get_sweep_manager().cancel(job_id)
+    return {"success": True, "cancelled": cancelled, **job.progress()}
+
+
 @router.get("/exchanges/status")
 async def get_exchanges_status(
     enable_proxy: bool = Query(False, description="Enable proxy")
@@ -26,8 +26,8 @@ Endpoints:
 """
 
 from fastapi import APIRouter, HTTPException, Query, Body, WebSocket, WebSocketDisconnect, Path
-from fastapi.responses import JSONResponse
-from typing import Optional, List, Dict, Any, Union
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Union
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 import logging
@@ -54,6 +54,8 @@ except ImportError:
     create_engine = None  # type: ignore
     sessionmaker = None  # type: ignore
 
+from utils.http_pool import pooled_client
+
 # Import internal modules
 try:
     from backend.services.hf_unified_client import get_hf_client
@@ -308,10 +310,15 @@ async def try_ws_exception(endpoint: str, params: Optional[Dict] = None) -> Opti
     return None
 
 
-async def try_fallback_providers(endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+async def try_fallback_providers(
+    endpoint: str,
+    params: Optional[Dict] = None,
+    exclude: Iterable[str] = ()
+) -> Optional[Dict]:
     """
     Try external fallback providers with at least 3 fallbacks per endpoint
     Priority order: CoinGecko → Binance → CoinMarketCap → CoinPaprika → CoinCap
+    Providers named in `exclude` (already tried by the caller) are skipped.
     """
     attempted = []
     
@@ -351,6 +358,8 @@ async def try_fallback_providers(endpoint: str, params: Optional[Dict] = None) -
     
     # Get fallback chain for this endpoint
     fallbacks = fallback_configs.get(endpoint, fallback_configs.get("rate", []))
+    skipped = set(exclude)
+    fallbacks = [fallback for fallback in fallbacks if fallback["name"] not in skipped]
     
     # Try each fallback in order
     for fallback in fallbacks[:5]:  # Try up to 5 fallbacks
@@ -374,13 +383,17 @@ async def try_fallback_providers(endpoint: str, params: Optional[Dict] = None) -
     return {"attempted": attempted, "error": "All fallback providers failed"}
 
 
+# Coin ids for the symbol-keyed providers
+_COINGECKO_IDS = {"BTC": "bitcoin", "ETH": "ethereum", "BNB": "binancecoin"}
+_COINCAP_IDS = {"BTC": "bitcoin", "ETH": "ethereum", "BNB": "binance-coin"}
+
+
 # Fallback provider functions
 async def _fetch_coingecko_rate(params: Dict) -> Dict:
     """Fallback 1: CoinGecko"""
     pair = params.get("pair", "BTC/USDT")
     base = pair.split("/")[0].lower()
-    coin_id_map = {"BTC": "bitcoin", "ETH": "ethereum", "BNB": "binancecoin"}
-    coin_id = coin_id_map.get(base.upper(), base.lower())
+    coin_id = _COINGECKO_IDS.get(base.upper(), base.lower())
     
     async with httpx.AsyncClient(timeout=10.0) as client:
         response = await client.get(
@@ -478,8 +491,7 @@ async def _fetch_coincap_rate(params: Dict) -> Dict:
     """Fallback 5: CoinCap"""
     pair = params.get("pair", "BTC/USDT")
     base = pair.split("/")[0].upper()
-    coin_id_map = {"BTC": "bitcoin", "ETH": "ethereum", "BNB": "binance-coin"}
-    coin_id = coin_id_map.get(base, base.lower())
+    coin_id = _COINCAP_IDS.get(base, base.lower())
     
     async with httpx.AsyncClient(timeout=10.0) as client:
         response = await client.get(
@@ -498,6 +510,196 @@ async def _fetch_coincap_rate(params: Dict) -> Dict:
         }
 
 
+# ============================================================================
+# Batch rate resolution
+# ============================================================================
+
+# Concurrency for pairs that no multi-symbol API could answer
+BATCH_RATE_CONCURRENCY = 8
+
+
+def _pair_parts(pair: str) -> Tuple[str, str]:
+    """Split "BTC/USDT" into ("BTC", "USDT")"""
+    base, _, quote = pair.upper().partition("/")
+    return base, quote or "USDT"
+
+
+def _rate_data(pair: str, price: float, quote: Optional[str] = None) -> Dict[str, Any]:
+    """Rate payload in the same shape as get_single_rate"""
+    return {
+        "pair": pair,
+        "price": price,
+        "quote": quote or _pair_parts(pair)[1],
+        "ts": datetime.utcnow().isoformat() + "Z"
+    }
+
+
+async def _batch_rates_hf(pairs: List[str]) -> Dict[str, Dict]:
+    """One HF Space /api/market call for all pairs"""
+    if get_hf_client is None:
+        return {}
+    hf_client = get_hf_client()
+    result = await hf_client.get_market_prices(
+        symbols=[pair.replace("/", "") for pair in pairs], limit=len(pairs)
+    )
+    if not result or not result.get("success"):
+        return {}
+
+    prices = {}
+    for item in result.get("data") or []:
+        symbol = str(item.get("symbol", "")).upper()
+        if item.get("price"):
+            prices[symbol] = item["price"]
+
+    rates = {}
+    for pair in pairs:
+        base, quote = _pair_parts(pair)
+        price = prices.get(base + quote) or prices.get(base)
+        if price:
+            rates[pair] = _rate_data(pair, price)
+    return rates
+
+
+async def _batch_rates_coingecko(pairs: List[str]) -> Dict[str, Dict]:
+    """CoinGecko simple/price with every coin id in one request (USD quotes)"""
+    ids = {pair: _COINGECKO_IDS.get(_pair_parts(pair)[0], _pair_parts(pair)[0].lower()) for pair in pairs}
+    async with pooled_client("coingecko") as client:
+        response = await client.get(
+            "https://api.coingecko.com/api/v3/simple/price",
+            params={"ids": ",".join(sorted(set(ids.values()))), "vs_currencies": "usd"}
+        )
+        response.raise_for_status()
+        data = response.json()
+
+    return {
+        pair: _rate_data(pair, data[coin_id]["usd"])
+        for pair, coin_id in ids.items()
+        if data.get(coin_id, {}).get("usd")
+    }
+
+
+async def _batch_rates_binance(pairs: List[str]) -> Dict[str, Dict]:
+    """Binance ticker/price without a symbol (all markets in one request)"""
+    async with pooled_client("binance") as client:
+        response = await client.get("https://api.binance.com/api/v3/ticker/price")
+        response.raise_for_status()
+        data = response.json()
+
+    prices = {item["symbol"]: item["price"] for item in data if "symbol" in item}
+    rates = {}
+    for pair in pairs:
+        price = float(prices.get(pair.replace("/", "").upper(), 0) or 0)
+        if price > 0:
+            rates[pair] = _rate_data(pair, price)
+    return rates
+
+
+async def _batch_rates_coincap(pairs: List[str]) -> Dict[str, Dict]:
+    """CoinCap assets?ids= for all pairs in one request (USD quotes)"""
+    ids = {pair: _COINCAP_IDS.get(_pair_parts(pair)[0], _pair_parts(pair)[0].lower()) for pair in pairs}
+    async with pooled_client("coincap") as client:
+        response = await client.get(
+            "https://api.coincap.io/v2/assets",
+            params={"ids": ",".join(sorted(set(ids.values())))}
+        )
+        response.raise_for_status()
+        data = response.json()
+
+    prices = {asset.get("id"): float(asset.get("priceUsd") or 0) for asset in data.get("data", [])}
+    return {
+        pair: _rate_data(pair, prices[coin_id], "USD")
+        for pair, coin_id in ids.items()
+        if prices.get(coin_id, 0) > 0
+    }
+
+
+# Multi-symbol providers, tried in order on the pairs still unresolved
+BATCH_RATE_PROVIDERS = [
+    ("hf", _batch_rates_hf),
+    ("coingecko", _batch_rates_coingecko),
+    ("binance", _batch_rates_binance),
+    ("coincap", _batch_rates_coincap),
+]
+
+
+async def resolve_batch_rates(pairs: List[str]):
+    """
+    Resolve many pairs with as few upstream requests as possible
+
+    Each multi-symbol provider gets one request for the pairs still open;
+    pairs none of them could answer walk the rest of the per-pair fallback
+    chain concurrently (at most BATCH_RATE_CONCURRENCY at a time).
+
+    Args:
+        pairs: Pairs such as "BTC/USDT" (deduplicated by the caller)
+
+    Yields:
+        (pair, data or None, source, attempted) as soon as each pair is
+        resolved
+    """
+    remaining = list(pairs)
+    attempted: List[str] = []
+
+    for name, fetch in BATCH_RATE_PROVIDERS:
+        if not remaining:
+            return
+        attempted.append(name)
+        try:
+            rates = await fetch(remaining)
+        except Exception as e:
+            logger.warning(f"⚠️ Batch rate provider {name} failed: {e}")
+            continue
+        for pair in remaining:
+            if pair in rates:
+                yield pair, rates[pair], name, list(attempted)
+        remaining = [pair for pair in remaining if pair not in rates]
+
+    if not remaining:
+        return
+
+    semaphore = asyncio.Semaphore(BATCH_RATE_CONCURRENCY)
+    tried = tuple(attempted)
+
+    async def resolve_one(pair: str):
+        async with semaphore:
+            try:
+                # The batch pass already asked these providers for every pair
+                return pair, await try_fallback_providers("rate", {"pair": pair}, exclude=tried)
+            except Exception as e:
+                return pair, {"attempted": [], "error": str(e)}
+
+    for next_done in asyncio.as_completed([resolve_one(pair) for pair in remaining]):
+        pair, result = await next_done
+        if result and not result.get("error"):
+            yield pair, result["data"], result["source"], attempted + result.get("attempted", [])
+        else:
+            yield pair, None, "none", attempted + (result or {}).get("attempted", [])
+
+
+def _persist_rates(resolved: List[Tuple[Dict[str, Any], str]]):
+    """Store (data, source) rate results in one transaction (blocking: run it in a thread)"""
+    if not resolved or SessionLocal is None or CachedMarketData is None:
+        return
+    db = SessionLocal()
+    try:
+        stored_at = datetime.utcnow()
+        db.add_all([
+            CachedMarketData(
+                symbol=data.get("pair", "").split("/")[0],
+                price=data.get("price", 0),
+                provider=source,
+                fetched_at=stored_at
+            )
+            for data, source in resolved
+        ])
+        db.commit()
+    except Exception as e:
+        logger.error(f"❌ Failed to persist batch rates: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
 # Placeholder functions for other endpoints (to be implemented)
 async def _fetch_coingecko_market(params: Dict) -> Dict:
     return {"error": "Not implemented"}
@@ -711,23 +913,47 @@ async def get_single_rate(
 
 @router.get("/api/service/rate/batch")
 async def get_batch_rates(
-    pairs: str = Query(..., description="Comma-separated pairs e.g. BTC/USDT,ETH/USDT")
+    pairs: str = Query(..., description="Comma-separated pairs e.g. BTC/USDT,ETH/USDT"),
+    stream: bool = Query(False, description="Stream one NDJSON line per pair as it resolves")
 ):
-    """Get current rates for multiple pairs"""
-    pair_list = pairs.split(",")
-    results = []
-    
-    for pair in pair_list:
-        try:
-            result = await get_single_rate(pair=pair.strip())
-            if result["data"]:
-                results.append(result["data"])
-        except:
-            continue
-    
+    """
+    Get current rates for multiple pairs
+
+    Pairs are grouped into one request per multi-symbol provider (HF Space,
+    CoinGecko simple/price, Binance ticker/price, CoinCap assets); leftovers
+    use the per-pair fallback chain concurrently. With stream=true the
+    response is NDJSON: one {"pair", "data", "source"} line per pair in
+    completion order, then a final {"meta"} line.
+    """
+    pair_list = list(dict.fromkeys(p.strip() for p in pairs.split(",") if p.strip()))
+
+    if stream:
+        async def ndjson():
+            resolved = []
+            async for pair, data, source, _ in resolve_batch_rates(pair_list):
+                if data:
+                    resolved.append((data, source))
+                yield json.dumps({"pair": pair, "data": data, "source": source}) + "\n"
+            await asyncio.to_thread(_persist_rates, resolved)
+            meta = build_meta("mixed", cache_ttl_seconds=10)
+            meta["resolved"] = len(resolved)
+            meta["requested"] = len(pair_list)
+            yield json.dumps({"meta": meta}) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    by_pair = {}
+    attempted: List[str] = []
+    async for pair, data, source, pair_attempted in resolve_batch_rates(pair_list):
+        if data:
+            by_pair[pair] = (data, source)
+        attempted.extend(name for name in pair_attempted if name not in attempted)
+
+    await asyncio.to_thread(_persist_rates, list(by_pair.values()))
+
     return {
-        "data": results,
-        "meta": build_meta("mixed", cache_ttl_seconds=10)
+        "data": [by_pair[pair][0] for pair in pair_list if pair in by_pair],
+        "meta": build_meta("mixed", cache_ttl_seconds=10, attempted=attempted)
     }
 
 
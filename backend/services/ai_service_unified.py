@@ -20,7 +20,7 @@ logger = logging.getLogger(__name__)
 # Import local model manager
 try:
     from ai_models import (
-        ensemble_crypto_sentiment as local_ensemble,
+        ensemble_crypto_sentiment_async as local_ensemble,
         analyze_financial_sentiment as local_financial,
         analyze_social_sentiment as local_social,
         basic_sentiment_fallback,
@@ -198,13 +198,13 @@ class UnifiedAIService:
         try:
             # انتخاب تابع بر اساس category
             if category == "crypto":
-                result = local_ensemble(text)
+                result = await local_ensemble(text)
             elif category == "financial":
                 result = local_financial(text)
             elif category == "social":
                 result = local_social(text)
             else:
-                result = local_ensemble(text)
+                result = await local_ensemble(text)
             
             # اطمینان از وجود فیلدهای مورد نیاز
             if not isinstance(result, dict):
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Backtest Engine
+Linear-time, long-only backtest used by BacktestingService.
+
+A run has three stages, none of which re-slices the candle history:
+
+1. Indicators: strategies compute their series once over the whole close
+   array (vectorised, see backend.services.indicator_engine).
+2. Signals: an int8 array (BUY=1, SELL=-1, HOLD=0), either produced in one
+   vectorised step by Strategy.signals() or streamed bar by bar through
+   Strategy.on_bar(state), which only sees the current bar, the current
+   indicator values and a bounded window of recent closes.
+3. Fills: position, equity curve, drawdown and trades are derived from the
+   signal array with array operations.
+
+Execution model (unchanged from the original loop): BUY opens a position
+with all capital at the bar close when flat, SELL closes it at the close
+when long, and an open position is closed at the last close.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend.services.indicator_engine import sma, to_array
+
+BUY = 1
+SELL = -1
+HOLD = 0
+
+SIGNAL_CODES = {"BUY": BUY, "SELL": SELL, "HOLD": HOLD}
+
+
+# ============================================================================
+# Data
+# ============================================================================
+
+@dataclass
+class OHLCVArrays:
+    """Candle columns as float64 arrays (timestamps kept as given)"""
+
+    timestamps: List[Any]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return self.close.shape[0]
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Dict[str, Any]]) -> "OHLCVArrays":
+        """Build from a list of {"timestamp", "open", "high", "low", "close", "volume"} dicts"""
+        def column(name: str) -> np.ndarray:
+            return np.fromiter(
+                (c.get(name) or 0.0 for c in candles), dtype=np.float64, count=len(candles)
+            )
+
+        return cls(
+            timestamps=[c.get("timestamp") for c in candles],
+            open=column("open"),
+            high=column("high"),
+            low=column("low"),
+            close=np.fromiter((c["close"] for c in candles), dtype=np.float64, count=len(candles)),
+            volume=column("volume"),
+        )
+
+
+class BarState:
+    """
+    What a streaming strategy sees on each bar
+
+    Attributes:
+        index: Bar number
+        timestamp, open, high, low, close, volume: The current candle
+        in_position: Whether a long position is open before this bar's signal
+        window: The last `Strategy.lookback` closes (oldest first)
+    """
+
+    __slots__ = (
+        "index", "timestamp", "open", "high", "low", "close", "volume",
+        "in_position", "window", "_indicators"
+    )
+
+    def __init__(self, indicators: Dict[str, np.ndarray], window: Deque[float]):
+        self._indicators = indicators
+        self.window = window
+        self.in_position = False
+
+    def indicator(self, name: str) -> float:
+        """Value of a precomputed indicator at the current bar"""
+        return float(self._indicators[name][self.index])
+
+
+# ============================================================================
+# Strategies
+# ============================================================================
+
+class Strategy:
+    """
+    Base class for backtest strategies
+
+    Override indicators() to precompute series, and signals() for a
+    vectorised signal array and/or on_bar() for streaming evaluation.
+    signals() returning None makes the engine stream through on_bar().
+    """
+
+    name = "strategy"
+    lookback = 0  # closes kept in BarState.window
+
+    def indicators(self, data: OHLCVArrays) -> Dict[str, np.ndarray]:
+        return {}
+
+    def signals(self, data: OHLCVArrays, indicators: Dict[str, np.ndarray]) -> Optional[np.ndarray]:
+        return None
+
+    def on_bar(self, state: BarState) -> str:
+        return "HOLD"
+
+
+def _compare_signals(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """BUY where fast > slow, SELL where fast < slow (NaN compares as HOLD)"""
+    out = np.zeros(fast.shape[0], dtype=np.int8)
+    out[fast > slow] = BUY
+    out[fast < slow] = SELL
+    return out
+
+
+class SMACrossStrategy(Strategy):
+    """Long when the short SMA is above the long SMA"""
+
+    name = "simple_moving_average"
+
+    def __init__(self, short_period: int = 10, long_period: int = 50):
+        self.short_period = short_period
+        self.long_period = long_period
+
+    def indicators(self, data: OHLCVArrays) -> Dict[str, np.ndarray]:
+        return {
+            "sma_short": sma(data.close, self.short_period),
+            "sma_long": sma(data.close, self.long_period),
+        }
+
+    def signals(self, data: OHLCVArrays, indicators: Dict[str, np.ndarray]) -> np.ndarray:
+        return _compare_signals(indicators["sma_short"], indicators["sma_long"])
+
+    def on_bar(self, state: BarState) -> str:
+        # The precomputed series, so ties on flat runs match signals() exactly
+        sma_short = state.indicator("sma_short")
+        sma_long = state.indicator("sma_long")
+        if sma_short > sma_long:
+            return "BUY"
+        elif sma_short < sma_long:
+            return "SELL"
+        return "HOLD"
+
+
+class RSIStrategy(Strategy):
+    """Buy oversold / sell overbought on a simple-average RSI over `period` closes"""
+
+    name = "rsi_strategy"
+
+    def __init__(self, period: int = 14, oversold: float = 30, overbought: float = 70):
+        self.period = period
+        self.oversold = oversold
+        self.overbought = overbought
+
+    def indicators(self, data: OHLCVArrays) -> Dict[str, np.ndarray]:
+        close = data.close
+        out = np.full(close.shape[0], np.nan)
+        if close.shape[0] >= self.period:
+            deltas = np.diff(close)
+            avg_gain = sma(np.clip(deltas, 0.0, None), self.period - 1)
+            avg_loss = sma(np.clip(-deltas, 0.0, None), self.period - 1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            values[avg_loss == 0] = 100.0
+            values[np.isnan(avg_gain)] = np.nan
+            out[1:] = values
+        return {"rsi": out}
+
+    def signals(self, data: OHLCVArrays, indicators: Dict[str, np.ndarray]) -> np.ndarray:
+        rsi = indicators["rsi"]
+        out = np.zeros(rsi.shape[0], dtype=np.int8)
+        out[rsi < self.oversold] = BUY
+        out[rsi > self.overbought] = SELL
+        return out
+
+    def on_bar(self, state: BarState) -> str:
+        rsi = state.indicator("rsi")  # NaN while warming up: neither comparison holds
+        if rsi < self.oversold:
+            return "BUY"
+        elif rsi > self.overbought:
+            return "SELL"
+        return "HOLD"
+
+
+class MACDStrategy(Strategy):
+    """Simplified MACD: long while the fast SMA is above the slow SMA"""
+
+    name = "macd_strategy"
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26):
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+
+    def indicators(self, data: OHLCVArrays) -> Dict[str, np.ndarray]:
+        return {"macd": sma(data.close, self.fast_period) - sma(data.close, self.slow_period)}
+
+    def signals(self, data: OHLCVArrays, indicators: Dict[str, np.ndarray]) -> np.ndarray:
+        return _compare_signals(indicators["macd"], np.zeros(len(data)))
+
+    def on_bar(self, state: BarState) -> str:
+        macd = state.indicator("macd")
+        if macd > 0:
+            return "BUY"
+        elif macd < 0:
+            return "SELL"
+        return "HOLD"
+
+
+STRATEGIES = {
+    SMACrossStrategy.name: SMACrossStrategy,
+    RSIStrategy.name: RSIStrategy,
+    MACDStrategy.name: MACDStrategy,
+}
+
+
+def get_strategy(name: str, **params) -> Strategy:
+    """Strategy instance by name (falls back to the SMA crossover)"""
+    return STRATEGIES.get(name, SMACrossStrategy)(**params)
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+def stream_signals(strategy: Strategy, data: OHLCVArrays, indicators: Dict[str, np.ndarray]) -> np.ndarray:
+    """Evaluate Strategy.on_bar() over every bar in one pass"""
+    n = len(data)
+    out = np.zeros(n, dtype=np.int8)
+    window: Deque[float] = deque(maxlen=max(strategy.lookback, 1))
+    state = BarState(indicators, window)
+    columns = zip(
+        data.timestamps, data.open.tolist(), data.high.tolist(),
+        data.low.tolist(), data.close.tolist(), data.volume.tolist()
+    )
+    for i, (timestamp, open_, high, low, close, volume) in enumerate(columns):
+        if strategy.lookback:
+            window.append(close)
+        state.index = i
+        state.timestamp = timestamp
+        state.open, state.high, state.low, state.close, state.volume = open_, high, low, close, volume
+        code = SIGNAL_CODES.get(strategy.on_bar(state), HOLD)
+        out[i] = code
+        if code == BUY:
+            state.in_position = True
+        elif code == SELL:
+            state.in_position = False
+    return out
+
+
+def positions_from_signals(signals: np.ndarray) -> np.ndarray:
+    """
+    Long/flat state after each bar: the last non-HOLD signal decides
+
+    (BUY while long and SELL while flat are no-ops, so this equals
+    simulating the fills one bar at a time.)
+    """
+    n = signals.shape[0]
+    last = np.where(signals != HOLD, np.arange(n), -1)
+    np.maximum.accumulate(last, out=last)
+    return (last >= 0) & (signals[np.maximum(last, 0)] == BUY)
+
+
+def simulate(
+    close: np.ndarray,
+    signals: np.ndarray,
+    initial_capital: float,
+    timestamps: Optional[Sequence[Any]] = None
+) -> Dict[str, Any]:
+    """
+    Fills, equity curve and metrics from a signal array
+
+    Args:
+        close: Close prices
+        signals: BUY/SELL/HOLD codes per bar
+        initial_capital: Starting capital
+        timestamps: Candle timestamps (for the trade list)
+
+    Returns:
+        Dict with total_return, sharpe_ratio, max_drawdown, win_rate,
+        total_trades, trades, equity_curve (all bars, including the start)
+    """
+    n = close.shape[0]
+    in_pos = positions_from_signals(signals)
+    was_in_pos = np.concatenate(([False], in_pos[:-1]))
+    entry_idx = np.flatnonzero(in_pos & ~was_in_pos)
+    exit_idx = np.flatnonzero(~in_pos & was_in_pos)
+    if exit_idx.shape[0] < entry_idx.shape[0]:
+        exit_idx = np.append(exit_idx, n - 1)  # closed at the last close
+
+    entry_price = close[entry_idx]
+    exit_price = close[exit_idx]
+    growth = np.cumprod(exit_price / entry_price)
+    capital_after = initial_capital * growth
+    capital_before = np.concatenate(([float(initial_capital)], capital_after[:-1]))
+    units = capital_before / entry_price
+
+    # Trade t is the latest one opened at or before each bar
+    trade = np.cumsum(in_pos & ~was_in_pos) - 1
+    has_trade = trade >= 0
+    safe_trade = np.maximum(trade, 0)
+    equity = np.full(n, float(initial_capital))
+    if entry_idx.shape[0]:
+        flat = has_trade & ~in_pos
+        equity[flat] = capital_after[safe_trade[flat]]
+        equity[in_pos] = units[safe_trade[in_pos]] * close[in_pos]
+    equity_curve = np.concatenate(([float(initial_capital)], equity))
+
+    high_water_mark = np.maximum.accumulate(equity_curve)
+    drawdown = (high_water_mark - equity_curve) / high_water_mark * 100
+    max_drawdown = max(0.0, float(drawdown.max()))
+
+    pnl = capital_after - units * entry_price
+    return_pct = pnl / (units * entry_price) * 100
+    trades = [
+        {
+            "entry_price": float(entry_price[t]),
+            "exit_price": float(exit_price[t]),
+            "pnl": float(pnl[t]),
+            "return_pct": float(return_pct[t]),
+            "timestamp": timestamps[exit_idx[t]] if timestamps is not None else int(exit_idx[t])
+        }
+        for t in range(entry_idx.shape[0])
+    ]
+
+    final_capital = float(capital_after[-1]) if trades else float(initial_capital)
+    return {
+        "total_return": (final_capital - initial_capital) / initial_capital * 100,
+        "sharpe_ratio": sharpe_ratio(equity_curve),
+        "max_drawdown": max_drawdown,
+        "win_rate": (sum(1 for t in trades if t["pnl"] > 0) / len(trades) * 100) if trades else 0.0,
+        "total_trades": len(trades),
+        "trades": trades,
+        "equity_curve": equity_curve,
+    }
+
+
+def sharpe_ratio(equity_curve: np.ndarray, periods_per_year: int = 365) -> float:
+    """Annualised Sharpe ratio of the per-bar returns of an equity curve"""
+    if equity_curve.shape[0] < 2:
+        return 0.0
+    previous = equity_curve[:-1]
+    valid = previous > 0
+    if not valid.any():
+        return 0.0
+    returns = (equity_curve[1:][valid] - previous[valid]) / previous[valid]
+    mean_return = float(returns.mean())
+    variance = float(((returns - mean_return) ** 2).mean())
+    std_dev = math.sqrt(variance) if variance > 0 else 0.0001
+    return (mean_return / std_dev) * math.sqrt(periods_per_year)
+
+
+def run_backtest(
+    data: OHLCVArrays,
+    strategy: Strategy,
+    initial_capital: float,
+    stream: bool = False
+) -> Dict[str, Any]:
+    """
+    Run a strategy over candle arrays
+
+    Args:
+        data: Candle columns
+        strategy: Strategy instance
+        initial_capital: Starting capital
+        stream: Use on_bar() even when the strategy has vectorised signals()
+
+    Returns:
+        Backtest results (see simulate())
+    """
+    if len(data) == 0:
+        raise ValueError("No candles to backtest")
+    indicators = strategy.indicators(data)
+    signals = None if stream else strategy.signals(data, indicators)
+    if signals is None:
+        signals = stream_signals(strategy, data, indicators)
+    return simulate(data.close, np.asarray(signals, dtype=np.int8), initial_capital, data.timestamps)
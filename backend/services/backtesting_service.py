@@ -12,8 +12,8 @@ from sqlalchemy import and_, desc
 import uuid
 import logging
 import json
-import math
 
+from backend.services.backtest_engine import OHLCVArrays, Strategy, get_strategy, run_backtest
 from database.models import (
     Base, BacktestJob, TrainingStatus, CachedOHLC
 )
@@ -119,83 +119,17 @@ class BacktestingService:
             if not historical_data:
                 raise ValueError(f"No historical data found for {job.symbol}")
 
-            # Get strategy function
-            strategy_func = self._get_strategy_function(job.strategy)
-
-            # Initialize backtest state
-            capital = job.initial_capital
-            position = 0.0  # Position size
-            entry_price = 0.0
-            trades = []
-            equity_curve = [capital]
-            high_water_mark = capital
-            max_drawdown = 0.0
-
-            # Run strategy on historical data
-            for i, candle in enumerate(historical_data):
-                close_price = candle["close"]
-                signal = strategy_func(historical_data[:i+1], close_price)
-
-                # Execute trades based on signal
-                if signal == "BUY" and position == 0:
-                    # Open long position
-                    position = capital / close_price
-                    entry_price = close_price
-                    capital = 0
-                
-                elif signal == "SELL" and position > 0:
-                    # Close long position
-                    capital = position * close_price
-                    pnl = capital - (position * entry_price)
-                    trades.append({
-                        "entry_price": entry_price,
-                        "exit_price": close_price,
-                        "pnl": pnl,
-                        "return_pct": (pnl / (position * entry_price)) * 100,
-                        "timestamp": candle["timestamp"]
-                    })
-                    position = 0
-                    entry_price = 0.0
-
-                # Calculate current equity
-                current_equity = capital + (position * close_price if position > 0 else 0)
-                equity_curve.append(current_equity)
-
-                # Update drawdown
-                if current_equity > high_water_mark:
-                    high_water_mark = current_equity
-                
-                drawdown = ((high_water_mark - current_equity) / high_water_mark) * 100
-                if drawdown > max_drawdown:
-                    max_drawdown = drawdown
-
-            # Close final position if open
-            if position > 0:
-                final_price = historical_data[-1]["close"]
-                capital = position * final_price
-                pnl = capital - (position * entry_price)
-                trades.append({
-                    "entry_price": entry_price,
-                    "exit_price": final_price,
-                    "pnl": pnl,
-                    "return_pct": (pnl / (position * entry_price)) * 100,
-                    "timestamp": historical_data[-1]["timestamp"]
-                })
-
-            # Calculate metrics
-            total_return = ((capital - job.initial_capital) / job.initial_capital) * 100
-            win_rate = self._calculate_win_rate(trades)
-            sharpe_ratio = self._calculate_sharpe_ratio(equity_curve)
+            # Indicators and signals are computed once over the whole
+            # history; fills and metrics come from the signal array
+            strategy = self._get_strategy(job.strategy)
+            results = run_backtest(
+                OHLCVArrays.from_candles(historical_data),
+                strategy,
+                job.initial_capital
+            )
+            results["equity_curve"] = results["equity_curve"][-100:].tolist()  # Last 100 points
 
-            return {
-                "total_return": total_return,
-                "sharpe_ratio": sharpe_ratio,
-                "max_drawdown": max_drawdown,
-                "win_rate": win_rate,
-                "total_trades": len(trades),
-                "trades": trades,
-                "equity_curve": equity_curve[-100:]  # Last 100 points
-            }
+            return results
 
         except Exception as e:
             logger.error(f"Error running backtest: {e}", exc_info=True)
@@ -247,113 +181,17 @@ class BacktestingService:
             logger.error(f"Error fetching historical data: {e}", exc_info=True)
             return []
 
-    def _get_strategy_function(self, strategy_name: str):
+    def _get_strategy(self, strategy_name: str) -> Strategy:
         """
-        Get strategy function by name.
+        Get strategy by name.
         
         Args:
             strategy_name: Strategy name
         
         Returns:
-            Strategy function
+            Strategy instance (SMA crossover for unknown names)
         """
-        strategies = {
-            "simple_moving_average": self._sma_strategy,
-            "rsi_strategy": self._rsi_strategy,
-            "macd_strategy": self._macd_strategy
-        }
-
-        return strategies.get(strategy_name, self._sma_strategy)
-
-    def _sma_strategy(self, data: List[Dict], current_price: float) -> str:
-        """Simple Moving Average strategy."""
-        if len(data) < 50:
-            return "HOLD"
-        
-        # Calculate SMAs
-        closes = [d["close"] for d in data[-50:]]
-        sma_short = sum(closes[-10:]) / 10
-        sma_long = sum(closes) / 50
-
-        if sma_short > sma_long:
-            return "BUY"
-        elif sma_short < sma_long:
-            return "SELL"
-        return "HOLD"
-
-    def _rsi_strategy(self, data: List[Dict], current_price: float) -> str:
-        """RSI strategy."""
-        if len(data) < 14:
-            return "HOLD"
-        
-        # Calculate RSI (simplified)
-        closes = [d["close"] for d in data[-14:]]
-        gains = [max(0, closes[i] - closes[i-1]) for i in range(1, len(closes))]
-        losses = [max(0, closes[i-1] - closes[i]) for i in range(1, len(closes))]
-        
-        avg_gain = sum(gains) / len(gains) if gains else 0
-        avg_loss = sum(losses) / len(losses) if losses else 0
-        
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-
-        if rsi < 30:
-            return "BUY"
-        elif rsi > 70:
-            return "SELL"
-        return "HOLD"
-
-    def _macd_strategy(self, data: List[Dict], current_price: float) -> str:
-        """MACD strategy."""
-        if len(data) < 26:
-            return "HOLD"
-        
-        # Simplified MACD
-        closes = [d["close"] for d in data[-26:]]
-        ema_12 = sum(closes[-12:]) / 12
-        ema_26 = sum(closes) / 26
-        
-        macd = ema_12 - ema_26
-
-        if macd > 0:
-            return "BUY"
-        elif macd < 0:
-            return "SELL"
-        return "HOLD"
-
-    def _calculate_win_rate(self, trades: List[Dict]) -> float:
-        """Calculate win rate from trades."""
-        if not trades:
-            return 0.0
-        
-        winning_trades = sum(1 for t in trades if t["pnl"] > 0)
-        return (winning_trades / len(trades)) * 100
-
-    def _calculate_sharpe_ratio(self, equity_curve: List[float]) -> float:
-        """Calculate Sharpe ratio from equity curve."""
-        if len(equity_curve) < 2:
-            return 0.0
-        
-        returns = []
-        for i in range(1, len(equity_curve)):
-            if equity_curve[i-1] > 0:
-                ret = (equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1]
-                returns.append(ret)
-        
-        if not returns:
-            return 0.0
-        
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-        std_dev = math.sqrt(variance) if variance > 0 else 0.0001
-
-        # Annualized Sharpe (assuming daily returns)
-        sharpe = (mean_return / std_dev) * math.sqrt(365) if std_dev > 0 else 0.0
-
-        return sharpe
+        return get_strategy(strategy_name)
 
     def _job_to_dict(self, job: BacktestJob) -> Dict[str, Any]:
         """Convert job model to dictionary."""
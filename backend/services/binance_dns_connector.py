@@ -11,6 +11,8 @@ import logging
 from datetime import datetime
 import time
 
+from utils.http_pool import pooled_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -186,8 +188,9 @@ class BinanceDNSConnector:
             start_time = time.time()
             
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(url, params=params)
+                # Each mirror host keeps its own keep-alive pool
+                async with pooled_client(endpoint) as client:
+                    response = await client.get(url, params=params, timeout=self.timeout)
                     response.raise_for_status()
                     
                     response_time = time.time() - start_time
@@ -264,8 +267,8 @@ class BinanceDNSConnector:
             start_time = time.time()
             
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(url, json=data, params=params)
+                async with pooled_client(endpoint) as client:
+                    response = await client.post(url, json=data, params=params, timeout=self.timeout)
                     response.raise_for_status()
                     
                     response_time = time.time() - start_time
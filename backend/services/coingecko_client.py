@@ -8,21 +8,28 @@ ENHANCED: 5-minute mandatory cache, exponential backoff, auto-blacklist on 429
 
 import httpx
 import logging
-import time
 import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from fastapi import HTTPException
 
+from backend.cache.tiered_cache import get_tiered_cache
+from monitoring.rate_limiter import rate_limiter
+from utils.http_pool import pooled_client
+
 logger = logging.getLogger(__name__)
 
 # Cache and rate limit management
-_cache: Dict[str, Dict[str, Any]] = {}
-_last_request_time = 0.0
-_min_request_interval = 10.0  # Minimum 10 seconds between requests
-_blacklist_until = 0.0  # Blacklist timestamp
+# Responses live in the "coingecko" namespace of the shared TieredCache; it
+# keeps expired entries for a day so they can be served while rate limited.
+CACHE_NAMESPACE = "coingecko"
 _consecutive_429s = 0  # Track consecutive 429 errors
 
+# Requests are paced by the shared per-provider token bucket
+# (monitoring.rate_limiter, quota "coingecko"); serve stale cache instead of
+# queueing when the next slot is further away than this.
+_max_rate_limit_wait = 10.0
+
 
 def _get_cache_key(method: str, **kwargs) -> str:
     """Generate cache key from method and parameters"""
@@ -31,82 +38,56 @@ def _get_cache_key(method: str, **kwargs) -> str:
 
 
 def _get_from_cache(cache_key: str, ttl: int = 300) -> Optional[Any]:
-    """Get data from cache if not expired (default 5 min TTL)"""
-    global _cache
-    if cache_key in _cache:
-        cached_data = _cache[cache_key]
-        if time.time() - cached_data["timestamp"] < ttl:
-            logger.info(f"✅ CoinGecko: Cache hit for {cache_key}")
-            return cached_data["data"]
-        else:
-            # Expired, remove from cache
-            del _cache[cache_key]
-    return None
+    """Get data from cache if younger than `ttl` (default 5 min)"""
+    data = get_tiered_cache().get_stale(CACHE_NAMESPACE, cache_key, max_age=ttl)
+    if data is not None:
+        logger.info(f"✅ CoinGecko: Cache hit for {cache_key}")
+    return data
+
+
+def _get_stale(cache_key: str) -> Optional[Any]:
+    """Get cached data however old (used when rate limited or on errors)"""
+    return get_tiered_cache().get_stale(CACHE_NAMESPACE, cache_key, max_age=float("inf"))
 
 
 def _set_cache(cache_key: str, data: Any):
     """Set data in cache with current timestamp"""
-    global _cache
-    _cache[cache_key] = {
-        "data": data,
-        "timestamp": time.time()
-    }
+    get_tiered_cache().set(CACHE_NAMESPACE, cache_key, data)
 
 
 def _check_rate_limit() -> bool:
-    """Check if we should rate limit (return True if we should wait)"""
-    global _last_request_time, _min_request_interval, _blacklist_until
-    
-    current_time = time.time()
-    
-    # Check blacklist
-    if current_time < _blacklist_until:
-        logger.warning(f"🔴 CoinGecko: Blacklisted until {datetime.fromtimestamp(_blacklist_until).strftime('%H:%M:%S')}")
-        return True
-    
-    # Check minimum interval
-    time_since_last = current_time - _last_request_time
-    if time_since_last < _min_request_interval:
-        wait_time = _min_request_interval - time_since_last
-        logger.warning(f"⏳ CoinGecko: Rate limiting - wait {wait_time:.1f}s")
+    """Check if we should rate limit (return True if the next slot is too far away)"""
+    wait_time = rate_limiter.time_until_available("coingecko")
+
+    if wait_time > _max_rate_limit_wait:
+        resume_at = datetime.now() + timedelta(seconds=wait_time)
+        logger.warning(f"🔴 CoinGecko: Rate limited until {resume_at.strftime('%H:%M:%S')}")
         return True
-    
+
     return False
 
 
 async def _wait_for_rate_limit():
-    """Wait until rate limit allows next request"""
-    global _last_request_time, _min_request_interval
-    
-    current_time = time.time()
-    time_since_last = current_time - _last_request_time
-    
-    if time_since_last < _min_request_interval:
-        wait_time = _min_request_interval - time_since_last
-        logger.info(f"⏳ CoinGecko: Waiting {wait_time:.1f}s before next request")
-        await asyncio.sleep(wait_time)
-
-
-def _update_last_request_time():
-    """Update the last request timestamp"""
-    global _last_request_time
-    _last_request_time = time.time()
+    """Wait until rate limit allows next request (takes the token)"""
+    waited = await rate_limiter.acquire("coingecko")
+    if waited >= 1:
+        logger.info(f"⏳ CoinGecko: Waited {waited:.1f}s before next request")
 
 
 def _handle_429_error():
     """Handle 429 rate limit error with exponential backoff"""
-    global _consecutive_429s, _blacklist_until, _min_request_interval
+    global _consecutive_429s
     
     _consecutive_429s += 1
     
     if _consecutive_429s >= 3:
         # Blacklist for 10 minutes after 3 consecutive 429s
-        _blacklist_until = time.time() + 600  # 10 minutes
+        rate_limiter.penalize("coingecko", 600)  # 10 minutes
         logger.error(f"🔴 CoinGecko: {_consecutive_429s} consecutive 429s - BLACKLISTED for 10 minutes")
     else:
         # Exponential backoff
         backoff_time = min(60 * (2 ** _consecutive_429s), 300)  # Max 5 minutes
-        _blacklist_until = time.time() + backoff_time
+        rate_limiter.penalize("coingecko", backoff_time)
         logger.warning(f"⚠️ CoinGecko: 429 rate limit - backing off for {backoff_time}s")
 
 
@@ -193,9 +174,10 @@ class CoinGeckoClient:
         # Check if blacklisted
         if _check_rate_limit():
             # Return cached data even if expired, or raise error
-            if cache_key in _cache:
+            stale_data = _get_stale(cache_key)
+            if stale_data is not None:
                 logger.warning("🔴 CoinGecko: Rate limited - returning stale cache")
-                return _cache[cache_key]["data"]
+                return stale_data
             else:
                 raise HTTPException(
                     status_code=429,
@@ -206,7 +188,7 @@ class CoinGeckoClient:
             # Wait for rate limit if needed
             await _wait_for_rate_limit()
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with pooled_client("coingecko") as client:
                 if symbols:
                     # Get specific symbols using /simple/price endpoint
                     coin_ids = [self._symbol_to_coingecko_id(s) for s in symbols]
@@ -243,7 +225,6 @@ class CoinGeckoClient:
                     logger.info(f"✅ CoinGecko: Fetched {len(prices)} real prices for specific symbols")
                     
                     # Update rate limit tracking
-                    _update_last_request_time()
                     _reset_429_counter()
                     
                     # Cache the result
@@ -293,7 +274,6 @@ class CoinGeckoClient:
                     logger.info(f"✅ CoinGecko: Fetched {len(prices)} real market prices")
                     
                     # Update rate limit tracking
-                    _update_last_request_time()
                     _reset_429_counter()
                     
                     # Cache the result
@@ -307,9 +287,10 @@ class CoinGeckoClient:
                 _handle_429_error()
                 
                 # Try to return cached data even if expired
-                if cache_key in _cache:
+                stale_data = _get_stale(cache_key)
+                if stale_data is not None:
                     logger.warning("🔴 CoinGecko: 429 rate limit - returning stale cache")
-                    return _cache[cache_key]["data"]
+                    return stale_data
                 
                 raise HTTPException(
                     status_code=429,
@@ -358,9 +339,10 @@ class CoinGeckoClient:
         
         # Check if blacklisted
         if _check_rate_limit():
-            if cache_key in _cache:
+            stale_data = _get_stale(cache_key)
+            if stale_data is not None:
                 logger.warning("🔴 CoinGecko OHLCV: Rate limited - returning stale cache")
-                return _cache[cache_key]["data"]
+                return stale_data
             else:
                 raise HTTPException(
                     status_code=429,
@@ -372,7 +354,7 @@ class CoinGeckoClient:
             
             coin_id = self._symbol_to_coingecko_id(symbol)
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with pooled_client("coingecko") as client:
                 # Get market chart (OHLC) data
                 response = await client.get(
                     f"{self.base_url}/coins/{coin_id}/market_chart",
@@ -388,7 +370,6 @@ class CoinGeckoClient:
                 logger.info(f"✅ CoinGecko: Fetched {days} days of OHLCV data for {symbol}")
                 
                 # Update rate limit tracking
-                _update_last_request_time()
                 _reset_429_counter()
                 
                 # Cache the result
@@ -399,9 +380,10 @@ class CoinGeckoClient:
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 429:
                 _handle_429_error()
-                if cache_key in _cache:
+                stale_data = _get_stale(cache_key)
+                if stale_data is not None:
                     logger.warning("🔴 CoinGecko OHLCV: 429 - returning stale cache")
-                    return _cache[cache_key]["data"]
+                    return stale_data
                 raise HTTPException(status_code=429, detail="CoinGecko rate limited")
             
             logger.error(f"❌ CoinGecko OHLCV API HTTP error: {e}")
@@ -439,16 +421,17 @@ class CoinGeckoClient:
         
         # Check if blacklisted
         if _check_rate_limit():
-            if cache_key in _cache:
+            stale_data = _get_stale(cache_key)
+            if stale_data is not None:
                 logger.warning("🔴 CoinGecko trending: Rate limited - returning stale cache")
-                return _cache[cache_key]["data"]
+                return stale_data
             else:
                 raise HTTPException(status_code=429, detail="CoinGecko rate limited")
         
         try:
             await _wait_for_rate_limit()
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with pooled_client("coingecko") as client:
                 # Get trending coins
                 response = await client.get(f"{self.base_url}/search/trending")
                 response.raise_for_status()
@@ -492,7 +475,6 @@ class CoinGeckoClient:
                 logger.info(f"✅ CoinGecko: Fetched {len(trending)} real trending coins")
                 
                 # Update rate limit tracking
-                _update_last_request_time()
                 _reset_429_counter()
                 
                 # Cache the result
@@ -503,9 +485,10 @@ class CoinGeckoClient:
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 429:
                 _handle_429_error()
-                if cache_key in _cache:
+                stale_data = _get_stale(cache_key)
+                if stale_data is not None:
                     logger.warning("🔴 CoinGecko trending: 429 - returning stale cache")
-                    return _cache[cache_key]["data"]
+                    return stale_data
                 raise HTTPException(status_code=429, detail="CoinGecko rate limited")
             
             logger.error(f"❌ CoinGecko trending API HTTP error: {e}")
@@ -17,8 +17,9 @@ from datetime import datetime, timedelta
 import hashlib
 import json
 import os
-from collections import defaultdict
-import time
+
+from backend.cache.tiered_cache import get_tiered_cache
+from monitoring.rate_limiter import PROVIDER_QUOTAS, rate_limiter as shared_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -71,43 +72,18 @@ class DataHubConfiguration:
 
 
 class RateLimiter:
-    """Rate limiter for API calls"""
+    """Rate limiter for API calls (shared per-provider token buckets)"""
     
     def __init__(self):
-        self.limits = {
-            "coinmarketcap": {"calls": 333, "period": 60},  # 333/min
-            "newsapi": {"calls": 500, "period": 3600},  # 500/hour
-            "etherscan": {"calls": 5, "period": 1},  # 5/sec
-            "bscscan": {"calls": 5, "period": 1},  # 5/sec
-            "tronscan": {"calls": 10, "period": 1},  # 10/sec
-            "coingecko": {"calls": 50, "period": 60},  # 50/min
-            "binance": {"calls": 1200, "period": 60},  # 1200/min
-        }
-        self.call_times = defaultdict(list)
+        # Quotas live in monitoring.rate_limiter.PROVIDER_QUOTAS so the
+        # CoinGecko client, health checks and the hub draw from one bucket
+        self.limits = PROVIDER_QUOTAS
     
     async def wait_if_needed(self, service: str):
-        """Wait if rate limit is reached"""
-        if service not in self.limits:
-            return
-        
-        limit = self.limits[service]
-        now = time.time()
-        
-        # Clean old calls
-        self.call_times[service] = [
-            t for t in self.call_times[service] 
-            if now - t < limit["period"]
-        ]
-        
-        # Check if limit reached
-        if len(self.call_times[service]) >= limit["calls"]:
-            wait_time = limit["period"] - (now - self.call_times[service][0])
-            if wait_time > 0:
-                logger.warning(f"⏳ Rate limit reached for {service}, waiting {wait_time:.1f}s")
-                await asyncio.sleep(wait_time)
-        
-        # Record new call
-        self.call_times[service].append(now)
+        """Wait until the service's next request slot"""
+        wait_time = await shared_rate_limiter.acquire(service)
+        if wait_time >= 1:
+            logger.warning(f"⏳ Rate limit reached for {service}, waited {wait_time:.1f}s")
 
 
 class DataHubComplete:
@@ -118,7 +94,8 @@ class DataHubComplete:
     def __init__(self):
         self.config = DataHubConfiguration()
         self.rate_limiter = RateLimiter()
-        self.cache = {}
+        self.cache = get_tiered_cache()
+        self.cache_namespace = "data_hub"
         self.timeout = httpx.Timeout(30.0, connect=10.0)
         
         logger.info("🚀 Data Hub Complete initialized with all new API keys")
@@ -134,28 +111,20 @@ class DataHubComplete:
     
     def _get_cached(self, cache_key: str, cache_type: str) -> Optional[Dict]:
         """Get data from cache if not expired"""
-        if cache_key not in self.cache:
+        if self.config.CACHE_TTL.get(cache_type, 0) == 0:
             return None
         
-        cached_data, cached_time = self.cache[cache_key]
-        ttl = self.config.CACHE_TTL.get(cache_type, 0)
-        
-        if ttl == 0:
-            return None
-        
-        age = (datetime.now() - cached_time).total_seconds()
-        if age < ttl:
+        cached_data = self.cache.get(self.cache_namespace, cache_key)
+        if cached_data is not None:
+            age = self.cache.age(self.cache_namespace, cache_key) or 0.0
             logger.info(f"📦 Cache HIT: {cache_type} (age: {age:.1f}s)")
-            return cached_data
-        
-        del self.cache[cache_key]
-        return None
+        return cached_data
     
     def _set_cache(self, cache_key: str, data: Dict, cache_type: str):
         """Store data in cache"""
         ttl = self.config.CACHE_TTL.get(cache_type, 0)
         if ttl > 0:
-            self.cache[cache_key] = (data, datetime.now())
+            self.cache.set(self.cache_namespace, cache_key, data, ttl=ttl)
     
     # =========================================================================
     # 1. Market Price Data - داده‌های قیمت بازار
@@ -8,7 +8,6 @@ import logging
 import os
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-import pandas as pd
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
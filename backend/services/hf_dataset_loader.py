@@ -10,6 +10,8 @@ import logging
 import asyncio
 from datetime import datetime, timedelta
 
+from backend.cache.tiered_cache import get_tiered_cache
+
 logger = logging.getLogger(__name__)
 
 # بررسی وجود کتابخانه datasets
@@ -74,7 +76,9 @@ class HFDatasetService:
     }
     
     def __init__(self):
-        self.cache = {}
+        # DataFrames stay in memory (L1 only), bounded by the namespace limits
+        self.cache = get_tiered_cache()
+        self.cache_namespace = "hf_datasets"
         self.cache_ttl = 3600  # 1 ساعت
     
     def is_available(self) -> bool:
@@ -109,11 +113,10 @@ class HFDatasetService:
             cache_key = f"{dataset_name}:{symbol}:{timeframe}:{limit}"
             
             # بررسی cache
-            if cache_key in self.cache:
-                cached_data, cached_time = self.cache[cache_key]
-                if (datetime.now() - cached_time).total_seconds() < self.cache_ttl:
-                    logger.info(f"Returning cached data for {cache_key}")
-                    return cached_data
+            cached_data = self.cache.get(self.cache_namespace, cache_key)
+            if cached_data is not None:
+                logger.info(f"Returning cached data for {cache_key}")
+                return cached_data
             
             logger.info(f"Loading dataset {dataset_name} for {symbol}...")
             
@@ -155,7 +158,7 @@ class HFDatasetService:
                     df = df.sort_values("timestamp", ascending=False)
                 
                 # ذخیره در cache
-                self.cache[cache_key] = (df, datetime.now())
+                self.cache.set(self.cache_namespace, cache_key, df, ttl=self.cache_ttl)
             
             logger.info(f"Loaded {len(df)} records for {symbol}")
             return df
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Indicator Engine
+Shared NumPy-backed technical indicator calculations used by the indicator,
+technical-analysis and trading-analysis routers.
+
+Every function takes a price sequence (list, tuple or ndarray) and returns a
+float64 series aligned with the input. Positions that do not yet have enough
+history are NaN. Each series is produced in a single O(n) pass - there is no
+recomputation over growing prefixes.
+"""
+
+import math
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+# Largest scale factor allowed inside one EMA block (keeps float64 well
+# away from overflow while allowing long blocks for slow EMAs)
+_MAX_BLOCK_SCALE_LOG = 150 * math.log(10)
+_MAX_BLOCK_SIZE = 256
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def to_array(values: ArrayLike) -> np.ndarray:
+    """Convert a price sequence to a contiguous float64 array"""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _empty_like(x: np.ndarray) -> np.ndarray:
+    return np.full(x.shape[0], np.nan, dtype=np.float64)
+
+
+def last_value(series: np.ndarray, default: Optional[float] = None) -> Optional[float]:
+    """Return the last finite value of a series as a Python float"""
+    if series.size == 0:
+        return default
+    value = float(series[-1])
+    if math.isnan(value) or math.isinf(value):
+        return default
+    return value
+
+
+def exponential_smooth(values: ArrayLike, alpha: float, seed: float) -> np.ndarray:
+    """
+    Apply y[t] = alpha * x[t] + (1 - alpha) * y[t-1] with y[-1] = seed.
+
+    The recurrence is evaluated block-wise: inside a block the closed form
+    is a scaled cumulative sum (fully vectorised across all blocks), and only
+    the block carries are propagated sequentially.
+    """
+    x = to_array(values)
+    n = x.shape[0]
+    if n == 0:
+        return x.copy()
+    if alpha >= 1.0:
+        return x.copy()
+
+    decay = 1.0 - alpha
+    block = int(min(_MAX_BLOCK_SIZE, max(1, _MAX_BLOCK_SCALE_LOG // -math.log(decay))))
+    n_blocks = -(-n // block)
+
+    padded = np.zeros(n_blocks * block, dtype=np.float64)
+    padded[:n] = x
+    blocks = padded.reshape(n_blocks, block)
+
+    k = np.arange(block, dtype=np.float64)
+    grow = decay ** -k            # (1 - a)^-k
+    shrink = decay ** k           # (1 - a)^k
+
+    # Zero-state response of each block
+    local = alpha * shrink * np.cumsum(blocks * grow, axis=1)
+
+    # Propagate the state carried between blocks
+    carry_decay = decay * shrink                      # (1 - a)^(k+1)
+    block_decay = decay ** block
+    carries = np.empty(n_blocks, dtype=np.float64)
+    state = float(seed)
+    local_end = local[:, -1]
+    for b in range(n_blocks):
+        carries[b] = state
+        state = float(local_end[b]) + block_decay * state
+
+    result = local + carries[:, None] * carry_decay
+    return result.reshape(-1)[:n]
+
+
+# ============================================================================
+# Moving Averages
+# ============================================================================
+
+def sma(values: ArrayLike, period: int) -> np.ndarray:
+    """Simple Moving Average series"""
+    x = to_array(values)
+    out = _empty_like(x)
+    if period < 1 or x.shape[0] < period:
+        return out
+    csum = np.cumsum(np.concatenate(([0.0], x)))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def ema(values: ArrayLike, period: int) -> np.ndarray:
+    """Exponential Moving Average series seeded with the SMA of the first period"""
+    x = to_array(values)
+    out = _empty_like(x)
+    if period < 1 or x.shape[0] < period:
+        return out
+    seed = float(x[:period].mean())
+    out[period - 1] = seed
+    out[period:] = exponential_smooth(x[period:], 2.0 / (period + 1), seed)
+    return out
+
+
+def wilder_smooth(values: ArrayLike, period: int) -> np.ndarray:
+    """Wilder's running average (RMA) seeded with the SMA of the first period"""
+    x = to_array(values)
+    out = _empty_like(x)
+    if period < 1 or x.shape[0] < period:
+        return out
+    seed = float(x[:period].mean())
+    out[period - 1] = seed
+    out[period:] = exponential_smooth(x[period:], 1.0 / period, seed)
+    return out
+
+
+# ============================================================================
+# Oscillators
+# ============================================================================
+
+def rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    """Convert average gain/loss series to RSI (0-100)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        values = 100.0 - 100.0 / (1.0 + rs)
+    flat = avg_loss == 0
+    values[flat] = np.where(avg_gain[flat] > 0, 100.0, 50.0)
+    values[np.isnan(avg_gain)] = np.nan
+    return values
+
+
+def rsi(values: ArrayLike, period: int = 14) -> np.ndarray:
+    """Relative Strength Index series using Wilder smoothing"""
+    x = to_array(values)
+    out = _empty_like(x)
+    if period < 1 or x.shape[0] < period + 1:
+        return out
+    deltas = np.diff(x)
+    avg_gain = wilder_smooth(np.clip(deltas, 0.0, None), period)
+    avg_loss = wilder_smooth(np.clip(-deltas, 0.0, None), period)
+    out[1:] = rsi_from_averages(avg_gain, avg_loss)
+    return out
+
+
+def stoch_rsi(
+    values: ArrayLike,
+    rsi_period: int = 14,
+    stoch_period: int = 14,
+    smooth: int = 3
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stochastic RSI.
+
+    Returns:
+        (k_line, d_line) where k_line is the raw Stoch RSI (0-100) and
+        d_line is its `smooth`-period SMA
+    """
+    r = rsi(values, rsi_period)
+    k_line = _empty_like(r)
+    if stoch_period < 1 or r.shape[0] < rsi_period + stoch_period:
+        return k_line, _empty_like(r)
+
+    start = rsi_period  # first index with an RSI value
+    windows = sliding_window_view(r[start:], stoch_period)
+    high = windows.max(axis=1)
+    low = windows.min(axis=1)
+    current = r[start + stoch_period - 1:]
+    span = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(span > 0, (current - low) / span * 100.0, 50.0)
+    k_line[start + stoch_period - 1:] = k
+
+    d_line = _empty_like(r)
+    d_line[start + stoch_period - 1:] = sma(k, smooth)
+    return k_line, d_line
+
+
+def macd(
+    values: ArrayLike,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence.
+
+    Returns:
+        (macd_line, signal_line, histogram)
+    """
+    x = to_array(values)
+    macd_line = ema(x, fast) - ema(x, slow)
+    signal_line = _empty_like(x)
+    first = max(fast, slow) - 1
+    if x.shape[0] > first:
+        signal_line[first:] = ema(macd_line[first:], signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+# ============================================================================
+# Volatility
+# ============================================================================
+
+def bollinger_bands(
+    values: ArrayLike,
+    period: int = 20,
+    std_dev: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands using the population standard deviation.
+
+    Returns:
+        (upper, middle, lower)
+    """
+    x = to_array(values)
+    middle = sma(x, period)
+    std = _empty_like(x)
+    if period >= 1 and x.shape[0] >= period:
+        std[period - 1:] = sliding_window_view(x, period).std(axis=1)
+    return middle + std_dev * std, middle, middle - std_dev * std
+
+
+def true_range(highs: ArrayLike, lows: ArrayLike, closes: ArrayLike) -> np.ndarray:
+    """True Range series (first element is NaN - it has no previous close)"""
+    h, l, c = to_array(highs), to_array(lows), to_array(closes)
+    out = _empty_like(c)
+    if c.shape[0] < 2:
+        return out
+    prev_close = c[:-1]
+    out[1:] = np.maximum.reduce([
+        h[1:] - l[1:],
+        np.abs(h[1:] - prev_close),
+        np.abs(l[1:] - prev_close),
+    ])
+    return out
+
+
+def atr(highs: ArrayLike, lows: ArrayLike, closes: ArrayLike, period: int = 14) -> np.ndarray:
+    """Average True Range series using Wilder smoothing"""
+    tr = true_range(highs, lows, closes)
+    out = _empty_like(tr)
+    if tr.shape[0] < period + 1:
+        return out
+    out[1:] = wilder_smooth(tr[1:], period)
+    return out
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Streaming Indicator State
+Per-(symbol, timeframe) indicator state that advances in O(1) per candle.
+
+The OHLC worker feeds every saved candle into the registry; endpoints read the
+latest indicator values straight from it instead of fetching history and
+recomputing. Values match the batch results of `indicator_engine` for the
+same candle sequence.
+
+Revisions of the latest (still open) candle are undone from a small undo
+log (the state each component had before the candle, plus the value each
+window dropped), so a revision is O(1) as well.
+"""
+
+import math
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+Timestamp = Union[datetime, int, float]
+
+_NOTHING = object()  # RollingWindow.save() marker: the push evicted no value
+
+
+def _to_epoch(timestamp: Timestamp) -> float:
+    """Normalize datetimes and second/millisecond epochs to epoch seconds (naive = UTC)"""
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    value = float(timestamp)
+    return value / 1000 if value > 1e11 else value
+
+
+class RunningAverage:
+    """
+    Exponential running average seeded with the SMA of the first `period` values.
+
+    alpha = 2 / (period + 1) gives a standard EMA, alpha = 1 / period gives
+    Wilder's smoothing (RMA).
+    """
+
+    __slots__ = ("period", "alpha", "count", "seed_sum", "value")
+
+    def __init__(self, period: int, alpha: Optional[float] = None):
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value: Optional[float] = None
+
+    def save(self) -> Tuple:
+        return self.count, self.seed_sum, self.value
+
+    def restore(self, saved: Tuple) -> None:
+        self.count, self.seed_sum, self.value = saved
+
+    def update(self, x: float) -> Optional[float]:
+        self.count += 1
+        if self.count < self.period:
+            self.seed_sum += x
+        elif self.count == self.period:
+            self.value = (self.seed_sum + x) / self.period
+        else:
+            self.value = self.alpha * x + (1.0 - self.alpha) * self.value
+        return self.value
+
+
+class RollingWindow:
+    """Fixed-size window with a running sum (resynced once per window length)"""
+
+    __slots__ = ("size", "values", "total", "_since_resync")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: Deque[float] = deque(maxlen=size)
+        self.total = 0.0
+        self._since_resync = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def save(self) -> Tuple:
+        """Token for restore(), taken right before a push()"""
+        return self.values[0] if self.full else _NOTHING, self.total, self._since_resync
+
+    def restore(self, saved: Tuple) -> None:
+        """Undo the push() made after save()"""
+        evicted, self.total, self._since_resync = saved
+        self.values.pop()
+        if evicted is not _NOTHING:
+            self.values.appendleft(evicted)
+
+    def push(self, x: float) -> None:
+        if self.full:
+            self.total -= self.values[0]
+        self.values.append(x)
+        self.total += x
+        self._since_resync += 1
+        if self._since_resync >= self.size:
+            # Bound floating point drift of the running sum
+            self.total = math.fsum(self.values)
+            self._since_resync = 0
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.size if self.full else None
+
+
+class IndicatorState:
+    """
+    Streaming indicators for one (symbol, timeframe) series.
+
+    Tracks SMA 20/50/200, EMA 12/26, Wilder RSI, Stoch RSI, Bollinger Bands,
+    Wilder ATR and MACD. `update()` is O(1) per candle; re-sending the most
+    recent candle (same timestamp, revised values) replaces it.
+    """
+
+    SMA_PERIODS = (20, 50, 200)
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str,
+        rsi_period: int = 14,
+        stoch_period: int = 14,
+        bb_period: int = 20,
+        bb_std_dev: float = 2.0,
+        atr_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9
+    ):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.bb_std_dev = bb_std_dev
+
+        self.candles = 0
+        self.last_timestamp: Optional[float] = None
+        self.last_close: Optional[float] = None
+
+        self.sma = {period: RollingWindow(period) for period in self.SMA_PERIODS}
+        self.bb_window = RollingWindow(bb_period)
+
+        self.ema_fast = RunningAverage(macd_fast)
+        self.ema_slow = RunningAverage(macd_slow)
+        self.macd_signal = RunningAverage(macd_signal)
+
+        self.avg_gain = RunningAverage(rsi_period, 1.0 / rsi_period)
+        self.avg_loss = RunningAverage(rsi_period, 1.0 / rsi_period)
+        self.rsi_window = RollingWindow(stoch_period)
+        self.k_window = RollingWindow(3)
+
+        self.atr = RunningAverage(atr_period, 1.0 / atr_period)
+
+        # How to revert the head candle: the scalars before it and
+        # (component, saved state) for every component it changed
+        self._head: Optional[Tuple[int, Optional[float], Optional[float]]] = None
+        self._undo: List[Tuple[Any, Tuple]] = []
+
+    # ------------------------------------------------------------------
+    # Update
+    # ------------------------------------------------------------------
+
+    def _track(self, component) -> Any:
+        """Record the state of a component before the head candle changes it"""
+        self._undo.append((component, component.save()))
+        return component
+
+    def _revert_head(self) -> None:
+        for component, saved in reversed(self._undo):
+            component.restore(saved)
+        self.candles, self.last_timestamp, self.last_close = self._head
+
+    def update(self, timestamp: Timestamp, high: float, low: float, close: float) -> bool:
+        """
+        Advance the state by one candle.
+
+        Returns:
+            True if the candle was applied, False if it is older than the
+            current head (already reflected in the state)
+        """
+        ts = _to_epoch(timestamp)
+        if self.last_timestamp is not None:
+            if ts < self.last_timestamp:
+                return False
+            if ts == self.last_timestamp:
+                if self._head is None:
+                    return False
+                # Revised version of the latest (still open) candle
+                self._revert_head()
+        self._head = (self.candles, self.last_timestamp, self.last_close)
+        self._undo = []
+        self._apply(ts, float(high), float(low), float(close))
+        return True
+
+    def _apply(self, ts: float, high: float, low: float, close: float) -> None:
+        prev_close = self.last_close
+
+        for window in self.sma.values():
+            self._track(window).push(close)
+        self._track(self.bb_window).push(close)
+
+        fast = self._track(self.ema_fast).update(close)
+        slow = self._track(self.ema_slow).update(close)
+        if fast is not None and slow is not None:
+            self._track(self.macd_signal).update(fast - slow)
+
+        if prev_close is not None:
+            delta = close - prev_close
+            self._track(self.avg_gain).update(max(delta, 0.0))
+            avg_loss = self._track(self.avg_loss).update(max(-delta, 0.0))
+            if avg_loss is not None:
+                self._update_stoch(self.rsi)
+
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            self._track(self.atr).update(true_range)
+
+        self.last_close = close
+        self.last_timestamp = ts
+        self.candles += 1
+
+    def _update_stoch(self, rsi: float) -> None:
+        self._track(self.rsi_window).push(rsi)
+        if self.rsi_window.full:
+            high, low = max(self.rsi_window.values), min(self.rsi_window.values)
+            k = (rsi - low) / (high - low) * 100 if high > low else 50.0
+            self._track(self.k_window).push(k)
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    @property
+    def rsi(self) -> Optional[float]:
+        avg_gain, avg_loss = self.avg_gain.value, self.avg_loss.value
+        if avg_gain is None or avg_loss is None:
+            return None
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    @property
+    def ready(self) -> bool:
+        """True once every indicator in the comprehensive set has a value"""
+        return (
+            self.macd_signal.value is not None
+            and self.k_window.full
+            and self.sma[50].full
+        )
+
+    def bollinger(self) -> Optional[Tuple[float, float, float]]:
+        """(upper, middle, lower) or None while warming up"""
+        middle = self.bb_window.mean()
+        if middle is None:
+            return None
+        variance = sum((v - middle) ** 2 for v in self.bb_window.values) / self.bb_window.size
+        std = math.sqrt(variance)
+        return middle + self.bb_std_dev * std, middle, middle - self.bb_std_dev * std
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latest indicator values (None where there is not enough history yet)"""
+        k_line = self.k_window.values[-1] if self.k_window.values else None
+        d_line = self.k_window.mean()
+        macd_line = (
+            self.ema_fast.value - self.ema_slow.value
+            if self.ema_fast.value is not None and self.ema_slow.value is not None
+            else None
+        )
+        signal_line = self.macd_signal.value
+        bands = self.bollinger()
+
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "candles": self.candles,
+            "last_timestamp": self.last_timestamp,
+            "current_price": self.last_close,
+            "sma": {f"sma{period}": window.mean() for period, window in self.sma.items()},
+            "ema": {"ema12": self.ema_fast.value, "ema26": self.ema_slow.value},
+            "rsi": self.rsi,
+            "stoch_rsi": {"k_line": k_line, "d_line": d_line},
+            "bollinger_bands": (
+                {"upper": bands[0], "middle": bands[1], "lower": bands[2]} if bands else None
+            ),
+            "atr": self.atr.value,
+            "macd": {
+                "macd_line": macd_line,
+                "signal_line": signal_line,
+                "histogram": macd_line - signal_line if macd_line is not None and signal_line is not None else None
+            }
+        }
+
+
+class IndicatorStateRegistry:
+    """Thread-safe map of (SYMBOL, timeframe) -> IndicatorState"""
+
+    def __init__(self):
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(symbol: str, timeframe: str) -> Tuple[str, str]:
+        return symbol.upper(), timeframe
+
+    def get(self, symbol: str, timeframe: str) -> Optional[IndicatorState]:
+        return self._states.get(self._key(symbol, timeframe))
+
+    def update(self, symbol: str, timeframe: str, candles: Iterable[Dict[str, Any]]) -> int:
+        """
+        Advance a series with candles (any order; each needs timestamp/high/low/close).
+
+        Returns:
+            Number of candles applied
+        """
+        ordered = sorted(candles, key=lambda c: _to_epoch(c["timestamp"]))
+        key = self._key(symbol, timeframe)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = IndicatorState(key[0], timeframe)
+            applied = 0
+            for candle in ordered:
+                if state.update(candle["timestamp"], candle["high"], candle["low"], candle["close"]):
+                    applied += 1
+        return applied
+
+    def update_from_candles(self, candles: Iterable[Dict[str, Any]]) -> int:
+        """Group mixed candles by symbol/interval and advance each series"""
+        groups: Dict[Tuple[str, str], list] = {}
+        for candle in candles:
+            groups.setdefault((candle["symbol"], candle["interval"]), []).append(candle)
+        return sum(self.update(symbol, interval, group) for (symbol, interval), group in groups.items())
+
+    def latest(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a ready series, or None if it is unknown or still warming up"""
+        with self._lock:
+            state = self._states.get(self._key(symbol, timeframe))
+            if state is None or not state.ready:
+                return None
+            return state.snapshot()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "series": len(self._states),
+                "ready": sum(1 for s in self._states.values() if s.ready)
+            }
+
+
+_indicator_registry: Optional[IndicatorStateRegistry] = None
+
+
+def get_indicator_registry() -> IndicatorStateRegistry:
+    """Get global IndicatorStateRegistry instance"""
+    global _indicator_registry
+    if _indicator_registry is None:
+        _indicator_registry = IndicatorStateRegistry()
+    return _indicator_registry
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Micro-batching Inference Queue
+Coalesces single-text model calls into padded batches with an LRU result cache.
+
+Async callers `await batcher.submit(text)`; requests arriving within
+`max_wait_ms` of each other (or until `max_batch_size` is reached) run as one
+forward pass in a worker thread, and each caller gets its own result back.
+Identical in-flight texts share one slot. Sync callers use `infer(texts)`,
+which serves cached texts and runs the misses in chunks of `max_batch_size`.
+
+Results are cached by a hash of the normalized text (unicode NFKC, collapsed
+whitespace, truncated to `max_chars`) with LRU eviction.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger("inference_batcher")
+
+_MISSING = object()
+
+
+def normalize_text(text: str, max_chars: int = 512) -> str:
+    """Canonical form of a text for inference and caching"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.split())[:max_chars]
+
+
+def text_key(text: str) -> str:
+    """Cache key of an already normalized text"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe LRU mapping with a fixed number of entries"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _LoopState:
+    """Pending requests of one event loop"""
+
+    __slots__ = ("loop", "pending", "inflight", "full", "task")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.pending: List[Tuple[str, str, asyncio.Future]] = []
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.full = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class MicroBatcher:
+    """
+    Batching front-end for a model callable
+
+    `infer_fn` takes a list of normalized texts and returns one result per
+    text, in order (a HuggingFace pipeline called with a list does this).
+    """
+
+    def __init__(
+        self,
+        infer_fn: Callable[[List[str]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        cache_size: int = 4096,
+        max_chars: int = 512,
+        name: str = "model"
+    ):
+        """
+        Args:
+            infer_fn: Runs one batch (list of texts -> list of results)
+            max_batch_size: Largest batch handed to infer_fn
+            max_wait_ms: How long the first queued request waits for company
+            cache_size: LRU entries (0 disables the cache)
+            max_chars: Texts are truncated to this many characters
+            name: Label used in logs and stats
+        """
+        self.infer_fn = infer_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_chars = max_chars
+        self.name = name
+        self.cache = LRUCache(cache_size)
+        self._states: Dict[int, _LoopState] = {}
+
+        # Stats
+        self.requests = 0
+        self.cache_hits = 0
+        self.batches = 0
+        self.batched_texts = 0
+        self.inference_seconds = 0.0
+        self._latencies: deque = deque(maxlen=2048)
+
+    # ------------------------------------------------------------------
+    # Inference
+    # ------------------------------------------------------------------
+
+    def _run_batch(self, texts: List[str]) -> List[Any]:
+        start = time.perf_counter()
+        results = list(self.infer_fn(texts))
+        elapsed = time.perf_counter() - start
+        if len(results) != len(texts):
+            raise ValueError(f"{self.name}: expected {len(texts)} results, got {len(results)}")
+        self.batches += 1
+        self.batched_texts += len(texts)
+        self.inference_seconds += elapsed
+        return results
+
+    def infer(self, texts: Sequence[str]) -> List[Any]:
+        """
+        Run texts synchronously (cached texts are not recomputed)
+
+        Returns:
+            One result per input text, in order
+        """
+        normalized = [normalize_text(text, self.max_chars) for text in texts]
+        keys = [text_key(text) for text in normalized]
+        results: List[Any] = [self.cache.get(key, _MISSING) for key in keys]
+        self.requests += len(texts)
+
+        misses: Dict[str, str] = {}
+        for key, text, result in zip(keys, normalized, results):
+            if result is _MISSING:
+                misses.setdefault(key, text)
+        self.cache_hits += len(texts) - sum(1 for r in results if r is _MISSING)
+
+        computed: Dict[str, Any] = {}
+        miss_items = list(misses.items())
+        for i in range(0, len(miss_items), self.max_batch_size):
+            chunk = miss_items[i:i + self.max_batch_size]
+            for (key, _), result in zip(chunk, self._run_batch([text for _, text in chunk])):
+                computed[key] = result
+                self.cache.put(key, result)
+
+        return [computed[key] if result is _MISSING else result for key, result in zip(keys, results)]
+
+    async def submit(self, text: str) -> Any:
+        """Queue one text for the next batch and wait for its result"""
+        started = time.perf_counter()
+        normalized = normalize_text(text, self.max_chars)
+        key = text_key(normalized)
+        self.requests += 1
+
+        cached = self.cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            self.cache_hits += 1
+            return cached
+
+        loop = asyncio.get_running_loop()
+        state = self._state_for(loop)
+        future = state.inflight.get(key)
+        if future is None:
+            future = loop.create_future()
+            state.inflight[key] = future
+            state.pending.append((key, normalized, future))
+            if len(state.pending) >= self.max_batch_size:
+                state.full.set()
+            if state.task is None or state.task.done():
+                state.task = loop.create_task(self._drain(state))
+
+        # Shield: a cancelled caller must not cancel a result others wait on
+        result = await asyncio.shield(future)
+        self._latencies.append(time.perf_counter() - started)
+        return result
+
+    async def submit_many(self, texts: Sequence[str]) -> List[Any]:
+        """Queue several texts at once (they share batches with other callers)"""
+        return list(await asyncio.gather(*(self.submit(text) for text in texts)))
+
+    def _state_for(self, loop: asyncio.AbstractEventLoop) -> _LoopState:
+        state = self._states.get(id(loop))
+        if state is None or state.loop is not loop:
+            for loop_id in [i for i, s in self._states.items() if s.loop.is_closed()]:
+                self._states.pop(loop_id, None)
+            state = self._states[id(loop)] = _LoopState(loop)
+        return state
+
+    async def _drain(self, state: _LoopState) -> None:
+        while state.pending:
+            if len(state.pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(state.full.wait(), timeout=self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = state.pending[:self.max_batch_size]
+            state.pending = state.pending[self.max_batch_size:]
+            if len(state.pending) < self.max_batch_size:
+                state.full.clear()
+
+            try:
+                results = await state.loop.run_in_executor(None, self._run_batch, [text for _, text, _ in batch])
+            except Exception as e:
+                logger.warning(f"Batch of {len(batch)} failed for {self.name}: {type(e).__name__}: {str(e)[:200]}")
+                for key, _, future in batch:
+                    state.inflight.pop(key, None)
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (key, _, future), result in zip(batch, results):
+                self.cache.put(key, result)
+                state.inflight.pop(key, None)
+                if not future.done():
+                    future.set_result(result)
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2)
+
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "cache_hit_ratio": round(self.cache_hits / self.requests, 4) if self.requests else None,
+            "cache_entries": len(self.cache),
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else None,
+            "texts_per_sec": (
+                round(self.batched_texts / self.inference_seconds, 1) if self.inference_seconds else None
+            ),
+            "p50_latency_ms": percentile(0.50),
+            "p99_latency_ms": percentile(0.99),
+        }
@@ -7,10 +7,15 @@ Maximizes usage of all available free market data APIs with intelligent fallback
 import httpx
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from fastapi import HTTPException
 
+from utils.http_pool import pooled_client
+from utils.latency_histogram import LatencyHistogram
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +36,26 @@ class MarketDataAggregator:
     
     def __init__(self):
         self.timeout = 10.0
+        
+        # Hedged requests: start the best provider and, if it has not answered
+        # within hedge_multiplier x its observed p50, start the next one too.
+        # Providers with fewer than hedge_min_samples answers use
+        # hedge_default_delay. The first valid answer wins.
+        self.hedge_requests = True
+        self.hedge_multiplier = 1.5
+        self.hedge_min_delay = 0.05
+        self.hedge_default_delay = 1.0
+        self.hedge_min_samples = 5
+        
+        # Concurrency of the per-symbol fallback in get_multiple_prices
+        self.fallback_concurrency = 8
+        
+        # Per-provider latency of successful price fetches (drives hedging)
+        self.latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.provider_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"success": 0, "errors": 0, "cancelled": 0, "wins": 0}
+        )
+        self.hedge_stats = {"requests": 0, "hedged": 0, "launched": 0}
         self.providers = {
             "coingecko": {
                 "base_url": "https://api.coingecko.com/api/v3",
@@ -91,50 +116,187 @@ class MarketDataAggregator:
             "APT": "aptos", "ARB": "arbitrum", "OP": "optimism"
         }
     
-    async def get_price(self, symbol: str) -> Dict[str, Any]:
+    def _price_fetchers(self) -> List[Tuple[str, Callable[[str], Awaitable[Dict[str, Any]]]]]:
+        """Single-symbol fetchers in priority order"""
+        fetchers = {
+            "coingecko": self._get_price_coingecko,
+            "coinpaprika": self._get_price_coinpaprika,
+            "coincap": self._get_price_coincap,
+            "binance": self._get_price_binance,
+            "coinlore": self._get_price_coinlore,
+            "messari": self._get_price_messari,
+            "coinstats": self._get_price_coinstats,
+        }
+        return [
+            (name, fetchers[name])
+            for name, _ in sorted(self.providers.items(), key=lambda x: x[1]["priority"])
+            if name in fetchers
+        ]
+    
+    def hedge_delay(self, provider_name: str) -> float:
+        """
+        Seconds to wait for a provider before starting the next one
+        
+        Args:
+            provider_name: Provider that was started last
+        
+        Returns:
+            hedge_multiplier x observed p50, clamped to
+            [hedge_min_delay, timeout]; hedge_default_delay until the
+            provider has hedge_min_samples answers
+        """
+        histogram = self.latency.get(provider_name)
+        if histogram is None or histogram.count < self.hedge_min_samples:
+            return self.hedge_default_delay
+        delay = histogram.quantile(0.5) * self.hedge_multiplier
+        return min(max(delay, self.hedge_min_delay), self.timeout)
+    
+    async def _timed_fetch(self, provider_name: str, fetch, symbol: str) -> Optional[Dict[str, Any]]:
+        """Run one provider fetch, recording its latency and outcome"""
+        start = time.perf_counter()
+        try:
+            price_data = await fetch(symbol)
+        except asyncio.CancelledError:
+            self.provider_stats[provider_name]["cancelled"] += 1
+            raise
+        except Exception:
+            self.provider_stats[provider_name]["errors"] += 1
+            raise
+        
+        if price_data and price_data.get("price", 0) > 0:
+            self.latency[provider_name].observe(time.perf_counter() - start)
+            self.provider_stats[provider_name]["success"] += 1
+            return price_data
+        
+        self.provider_stats[provider_name]["errors"] += 1
+        return None
+    
+    async def get_price(self, symbol: str, hedged: Optional[bool] = None) -> Dict[str, Any]:
         """
         Get price using ALL available free providers with fallback
+        
+        Args:
+            symbol: Coin symbol (BTC, BTCUSDT, ...)
+            hedged: Overlap slow providers with the next one instead of
+                trying them strictly one after another (default:
+                self.hedge_requests)
         """
         symbol = symbol.upper().replace("USDT", "").replace("USD", "")
+        fetchers = self._price_fetchers()
         
-        # Try all providers in priority order
-        providers_to_try = sorted(
-            self.providers.items(),
-            key=lambda x: x[1]["priority"]
-        )
+        if hedged is None:
+            hedged = self.hedge_requests
         
-        for provider_name, provider_info in providers_to_try:
-            try:
-                if provider_name == "coingecko":
-                    price_data = await self._get_price_coingecko(symbol)
-                elif provider_name == "coinpaprika":
-                    price_data = await self._get_price_coinpaprika(symbol)
-                elif provider_name == "coincap":
-                    price_data = await self._get_price_coincap(symbol)
-                elif provider_name == "binance":
-                    price_data = await self._get_price_binance(symbol)
-                elif provider_name == "coinlore":
-                    price_data = await self._get_price_coinlore(symbol)
-                elif provider_name == "messari":
-                    price_data = await self._get_price_messari(symbol)
-                elif provider_name == "coinstats":
-                    price_data = await self._get_price_coinstats(symbol)
-                else:
+        if hedged:
+            price_data = await self._get_price_hedged(symbol, fetchers)
+            if price_data is not None:
+                return price_data
+        else:
+            for provider_name, fetch in fetchers:
+                try:
+                    price_data = await self._timed_fetch(provider_name, fetch, symbol)
+                    if price_data is not None:
+                        logger.info(f"✅ {provider_name.upper()}: Successfully fetched price for {symbol}")
+                        return price_data
+                except Exception as e:
+                    logger.warning(f"⚠️ {provider_name.upper()} failed for {symbol}: {e}")
                     continue
-                
-                if price_data and price_data.get("price", 0) > 0:
-                    logger.info(f"✅ {provider_name.upper()}: Successfully fetched price for {symbol}")
-                    return price_data
-                    
-            except Exception as e:
-                logger.warning(f"⚠️ {provider_name.upper()} failed for {symbol}: {e}")
-                continue
         
         raise HTTPException(
             status_code=503,
             detail=f"All market data providers failed for {symbol}"
         )
     
+    async def _get_price_hedged(self, symbol: str, fetchers) -> Optional[Dict[str, Any]]:
+        """
+        Hedged fan-out over the providers
+        
+        The next provider is started when the last one started exceeds its
+        hedge delay or when an in-flight request fails. The first valid
+        answer is returned and the remaining requests are cancelled.
+        
+        Returns:
+            Price data, or None if every provider failed
+        """
+        remaining = iter(fetchers)
+        pending: Dict[asyncio.Task, str] = {}
+        last_started: Optional[str] = None
+        self.hedge_stats["requests"] += 1
+        
+        def start_next() -> bool:
+            nonlocal last_started
+            for provider_name, fetch in remaining:
+                task = asyncio.ensure_future(self._timed_fetch(provider_name, fetch, symbol))
+                pending[task] = provider_name
+                last_started = provider_name
+                self.hedge_stats["launched"] += 1
+                return True
+            last_started = None
+            return False
+        
+        launched = int(start_next())
+        try:
+            while pending:
+                delay = self.hedge_delay(last_started) if last_started is not None else None
+                done, _ = await asyncio.wait(
+                    pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                if not done:
+                    # Last started provider is slower than its budget: hedge
+                    if start_next():
+                        launched += 1
+                    continue
+                
+                for task in done:
+                    provider_name = pending.pop(task)
+                    try:
+                        price_data = task.result()
+                    except Exception as e:
+                        logger.warning(f"⚠️ {provider_name.upper()} failed for {symbol}: {e}")
+                        continue
+                    if price_data is not None:
+                        self.provider_stats[provider_name]["wins"] += 1
+                        logger.info(f"✅ {provider_name.upper()}: Successfully fetched price for {symbol}")
+                        return price_data
+                
+                # Every finished request failed: start the next provider now
+                if start_next():
+                    launched += 1
+            return None
+        finally:
+            if launched > 1:
+                self.hedge_stats["hedged"] += 1
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """
+        Per-provider latency histograms and hedging counters
+        
+        Returns:
+            Dict with a snapshot (count, mean/p50/p90/p99/min/max in ms),
+            outcome counts and current hedge delay per provider
+        """
+        providers = {}
+        for provider_name, _ in self._price_fetchers():
+            histogram = self.latency.get(provider_name, LatencyHistogram())
+            providers[provider_name] = {
+                **histogram.snapshot(),
+                **self.provider_stats.get(provider_name, {"success": 0, "errors": 0, "cancelled": 0, "wins": 0}),
+                "hedge_delay_ms": round(self.hedge_delay(provider_name) * 1000, 1),
+            }
+        return {
+            "providers": providers,
+            "hedging": {
+                "enabled": self.hedge_requests,
+                **self.hedge_stats,
+                "multiplier": self.hedge_multiplier,
+            },
+        }
+    
     async def get_multiple_prices(self, symbols: List[str], limit: int = 100) -> List[Dict[str, Any]]:
         """
         Get prices for multiple symbols using batch APIs where possible
@@ -157,15 +319,19 @@ class MarketDataAggregator:
         except Exception as e:
             logger.warning(f"⚠️ CoinPaprika batch failed: {e}")
         
-        # Fallback: Get individual prices
+        # Fallback: Get individual prices (concurrently, bounded)
         if symbols:
-            results = []
-            for symbol in symbols[:limit]:
-                try:
-                    price_data = await self.get_price(symbol)
-                    results.append(price_data)
-                except:
-                    continue
+            semaphore = asyncio.Semaphore(self.fallback_concurrency)
+            
+            async def fetch_one(symbol: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    try:
+                        return await self.get_price(symbol)
+                    except Exception:
+                        return None
+            
+            fetched = await asyncio.gather(*(fetch_one(symbol) for symbol in symbols[:limit]))
+            results = [price_data for price_data in fetched if price_data is not None]
             
             if results:
                 return results
@@ -180,7 +346,7 @@ class MarketDataAggregator:
         """Get price from CoinGecko"""
         coin_id = self.symbol_to_coingecko_id.get(symbol, symbol.lower())
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("coingecko") as client:
             response = await client.get(
                 f"{self.providers['coingecko']['base_url']}/simple/price",
                 params={
@@ -210,7 +376,7 @@ class MarketDataAggregator:
     
     async def _get_batch_coingecko(self, symbols: Optional[List[str]], limit: int) -> List[Dict[str, Any]]:
         """Get batch prices from CoinGecko"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("coingecko") as client:
             if symbols:
                 coin_ids = [self.symbol_to_coingecko_id.get(s.upper(), s.lower()) for s in symbols]
                 response = await client.get(
@@ -270,7 +436,7 @@ class MarketDataAggregator:
     # CoinPaprika implementation
     async def _get_price_coinpaprika(self, symbol: str) -> Dict[str, Any]:
         """Get price from CoinPaprika"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("coinpaprika") as client:
             # Search for coin
             search_response = await client.get(
                 f"{self.providers['coinpaprika']['base_url']}/search",
@@ -305,7 +471,7 @@ class MarketDataAggregator:
     
     async def _get_batch_coinpaprika(self, limit: int) -> List[Dict[str, Any]]:
         """Get batch prices from CoinPaprika"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("coinpaprika") as client:
             response = await client.get(
                 f"{self.providers['coinpaprika']['base_url']}/tickers",
                 params={"limit": limit}
@@ -333,7 +499,7 @@ class MarketDataAggregator:
     # CoinCap implementation
     async def _get_price_coincap(self, symbol: str) -> Dict[str, Any]:
         """Get price from CoinCap"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("coincap") as client:
             # Search for asset
             search_response = await client.get(
                 f"{self.providers['coincap']['base_url']}/assets",
@@ -368,7 +534,7 @@ class MarketDataAggregator:
     
     async def _get_batch_coincap(self, symbols: Optional[List[str]], limit: int) -> List[Dict[str, Any]]:
         """Get batch prices from CoinCap"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("coincap") as client:
             response = await client.get(
                 f"{self.providers['coincap']['base_url']}/assets",
                 params={"limit": limit}
@@ -397,7 +563,7 @@ class MarketDataAggregator:
         """Get price from Binance"""
         binance_symbol = f"{symbol}USDT"
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("binance") as client:
             response = await client.get(
                 f"{self.providers['binance']['base_url']}/ticker/24hr",
                 params={"symbol": binance_symbol}
@@ -419,7 +585,7 @@ class MarketDataAggregator:
     # CoinLore implementation
     async def _get_price_coinlore(self, symbol: str) -> Dict[str, Any]:
         """Get price from CoinLore"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("coinlore") as client:
             response = await client.get(
                 f"{self.providers['coinlore']['base_url']}/tickers/"
             )
@@ -443,7 +609,7 @@ class MarketDataAggregator:
     # Messari implementation
     async def _get_price_messari(self, symbol: str) -> Dict[str, Any]:
         """Get price from Messari"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("messari") as client:
             response = await client.get(
                 f"{self.providers['messari']['base_url']}/assets/{symbol.lower()}/metrics"
             )
@@ -465,7 +631,7 @@ class MarketDataAggregator:
     # CoinStats implementation
     async def _get_price_coinstats(self, symbol: str) -> Dict[str, Any]:
         """Get price from CoinStats"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with pooled_client("coinstats") as client:
             response = await client.get(
                 f"{self.providers['coinstats']['base_url']}/coins",
                 params={"currency": "USD"}
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+CPU Inference Backends for ModelRegistry
+Optional fast backends for sequence-classification pipelines:
+
+    onnx        ONNX export run by onnxruntime (needs optimum[onnxruntime])
+    onnx-int8   ONNX export + onnxruntime dynamic int8 quantization
+    int8        torch dynamic int8 quantization of the Linear layers
+    torch       plain transformers pipeline (fp32, no conversion)
+
+Converted models are cached on disk under HF_BACKEND_CACHE_DIR
+(<cache>/<backend>/<model id>/), so the export runs once per model. The first
+load of a conversion is checked against the fp32 pipeline on a fixed set of
+headlines; the result is stored next to the artifacts (parity.json) and a
+backend whose label agreement is below HF_BACKEND_MIN_PARITY is not used for
+that model again.
+"""
+
+import importlib.util
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from utils.logger import setup_logger
+
+logger = setup_logger("model_backends")
+
+TORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
+ONNX_AVAILABLE = (
+    importlib.util.find_spec("optimum") is not None
+    and importlib.util.find_spec("onnxruntime") is not None
+)
+
+BACKENDS = ("torch", "onnx", "onnx-int8", "int8")
+FAST_BACKEND_TASKS = {"sentiment-analysis", "text-classification"}
+
+BACKEND_CACHE_DIR = os.getenv("HF_BACKEND_CACHE_DIR", "data/model_backends")
+MIN_PARITY = float(os.getenv("HF_BACKEND_MIN_PARITY", "0.9"))
+
+# Probe texts for the fp32 parity check
+PARITY_TEXTS = [
+    "Bitcoin surges past $70k as ETF inflows hit a record",
+    "Ethereum slides 8% after a major exchange hack",
+    "Solana network halts again, validators scramble to restart",
+    "Analysts expect the market to trade sideways this week",
+    "Whales accumulate BTC while retail sentiment stays fearful",
+    "SEC sues crypto exchange over unregistered securities",
+    "Dogecoin rallies on renewed social media hype",
+    "Miners capitulate as hashprice falls to all-time low",
+    "Stablecoin supply grows for the fifth straight month",
+    "Regulators approve spot ether ETFs, prices jump",
+    "Liquidations top $1 billion as leveraged longs get wiped out",
+    "Trading volume is flat ahead of the Fed decision",
+]
+
+
+class FastBackendRejected(Exception):
+    """Converted model did not match the fp32 outputs closely enough"""
+    pass
+
+
+def resolve_backend(requested: str, task: str, device: int = -1) -> str:
+    """
+    Pick the backend to load a model with
+
+    Args:
+        requested: HF_INFERENCE_BACKEND value ('auto' or one of BACKENDS)
+        task: Pipeline task of the model
+        device: Pipeline device (fast backends are CPU only)
+
+    Returns:
+        Backend name; 'torch' when the fast path does not apply
+    """
+    requested = (requested or "auto").lower()
+    if task not in FAST_BACKEND_TASKS or device != -1 or requested == "torch":
+        return "torch"
+    if requested == "auto":
+        if ONNX_AVAILABLE:
+            return "onnx-int8"
+        return "int8" if TORCH_AVAILABLE else "torch"
+    if requested in ("onnx", "onnx-int8") and not ONNX_AVAILABLE:
+        logger.warning(f"HF_INFERENCE_BACKEND={requested} but optimum/onnxruntime are not installed")
+        return "torch"
+    if requested == "int8" and not TORCH_AVAILABLE:
+        return "torch"
+    if requested not in BACKENDS:
+        logger.warning(f"Unknown inference backend '{requested}', using torch")
+        return "torch"
+    return requested
+
+
+def artifact_dir(model_id: str, backend: str, cache_dir: Optional[str] = None) -> Path:
+    return Path(cache_dir or BACKEND_CACHE_DIR) / backend / model_id.replace("/", "__")
+
+
+# ============================================================================
+# Parity
+# ============================================================================
+
+def _top_prediction(result: Any) -> Dict[str, Any]:
+    return result[0] if isinstance(result, list) and result else result
+
+
+def parity_check(reference: Callable, candidate: Callable, texts: Sequence[str] = PARITY_TEXTS) -> Dict[str, Any]:
+    """
+    Compare the top label and score of two pipelines on the same texts
+
+    Returns:
+        Dict with label_agreement (0-1), max_score_diff and mismatching texts
+    """
+    texts = list(texts)
+    expected = [_top_prediction(r) for r in reference(texts)]
+    actual = [_top_prediction(r) for r in candidate(texts)]
+
+    mismatches = [
+        {"text": text, "expected": e.get("label"), "actual": a.get("label")}
+        for text, e, a in zip(texts, expected, actual)
+        if e.get("label") != a.get("label")
+    ]
+    return {
+        "texts": len(texts),
+        "label_agreement": round(1 - len(mismatches) / len(texts), 4) if texts else 1.0,
+        "max_score_diff": round(max(
+            (abs(float(e.get("score", 0)) - float(a.get("score", 0))) for e, a in zip(expected, actual)),
+            default=0.0
+        ), 4),
+        "mismatches": mismatches,
+    }
+
+
+def _read_parity(target: Path) -> Optional[Dict[str, Any]]:
+    path = target / "parity.json"
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def _write_parity(target: Path, parity: Dict[str, Any]) -> None:
+    target.mkdir(parents=True, exist_ok=True)
+    (target / "parity.json").write_text(json.dumps(parity, indent=2))
+
+
+# ============================================================================
+# Export & load
+# ============================================================================
+
+def _export_onnx(model_id: str, target: Path, quantize: bool, token: Optional[str]) -> None:
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer
+
+    model = ORTModelForSequenceClassification.from_pretrained(model_id, export=True, token=token)
+    model.save_pretrained(target)
+    AutoTokenizer.from_pretrained(model_id, token=token).save_pretrained(target)
+
+    if quantize:
+        from optimum.onnxruntime import ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        quantizer = ORTQuantizer.from_pretrained(model)
+        qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=target, quantization_config=qconfig)
+
+
+def _load_onnx(target: Path, task: str, quantized: bool):
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer, pipeline
+
+    model = ORTModelForSequenceClassification.from_pretrained(
+        target, file_name="model_quantized.onnx" if quantized else "model.onnx"
+    )
+    return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(target))
+
+
+def _quantize_int8(model):
+    import torch
+
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _export_int8(model_id: str, target: Path, token: Optional[str]) -> None:
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_id, token=token)
+    model.config.save_pretrained(target)
+    AutoTokenizer.from_pretrained(model_id, token=token).save_pretrained(target)
+    torch.save(_quantize_int8(model.eval()).state_dict(), target / "model_int8.pt")
+
+
+def _load_int8(target: Path, task: str):
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+    # Rebuild the quantized module structure, then load the cached int8 weights
+    model = _quantize_int8(AutoModelForSequenceClassification.from_config(AutoConfig.from_pretrained(target)).eval())
+    model.load_state_dict(torch.load(target / "model_int8.pt"))
+    return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(target), device=-1)
+
+
+def _artifact_ready(target: Path, backend: str) -> bool:
+    names = {"onnx": "model.onnx", "onnx-int8": "model_quantized.onnx", "int8": "model_int8.pt"}
+    return (target / names[backend]).exists()
+
+
+def load_fast_pipeline(
+    model_id: str,
+    task: str,
+    backend: str,
+    reference_factory: Callable[[], Any],
+    token: Optional[str] = None,
+    cache_dir: Optional[str] = None
+):
+    """
+    Load (exporting on first use) a model with a fast CPU backend
+
+    Args:
+        model_id: HuggingFace model id
+        task: Pipeline task
+        backend: 'onnx', 'onnx-int8' or 'int8'
+        reference_factory: Builds the fp32 pipeline for the first-load parity check
+        token: HF token for gated models
+        cache_dir: Artifact cache root (HF_BACKEND_CACHE_DIR by default)
+
+    Returns:
+        A transformers pipeline backed by the converted model
+
+    Raises:
+        FastBackendRejected: Conversion failed the parity check (now or earlier)
+    """
+    target = artifact_dir(model_id, backend, cache_dir)
+    parity = _read_parity(target)
+    if parity is not None and not parity.get("accepted"):
+        raise FastBackendRejected(
+            f"{backend} rejected for {model_id} (label agreement {parity.get('label_agreement')})"
+        )
+
+    if not _artifact_ready(target, backend):
+        start = time.perf_counter()
+        target.mkdir(parents=True, exist_ok=True)
+        if backend == "int8":
+            _export_int8(model_id, target, token)
+        else:
+            _export_onnx(model_id, target, quantize=backend == "onnx-int8", token=token)
+        logger.info(f"Exported {model_id} to {backend} in {time.perf_counter() - start:.1f}s ({target})")
+
+    if backend == "int8":
+        fast = _load_int8(target, task)
+    else:
+        fast = _load_onnx(target, task, quantized=backend == "onnx-int8")
+
+    if parity is None:
+        reference = reference_factory()
+        parity = parity_check(reference, fast)
+        del reference
+        parity.update({"model_id": model_id, "backend": backend, "accepted": parity["label_agreement"] >= MIN_PARITY})
+        _write_parity(target, parity)
+        logger.info(
+            f"{backend} parity for {model_id}: agreement={parity['label_agreement']}, "
+            f"max score diff={parity['max_score_diff']}"
+        )
+        if not parity["accepted"]:
+            raise FastBackendRejected(f"{backend} rejected for {model_id}: {parity['mismatches'][:3]}")
+
+    return fast
+
+
+def backend_status() -> Dict[str, Any]:
+    return {
+        "requested": os.getenv("HF_INFERENCE_BACKEND", "auto"),
+        "onnx_available": ONNX_AVAILABLE,
+        "torch_available": TORCH_AVAILABLE,
+        "cache_dir": BACKEND_CACHE_DIR,
+        "min_parity": MIN_PARITY,
+    }
@@ -15,6 +15,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from enum import Enum
 
+from backend.cache.tiered_cache import get_tiered_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,42 +40,34 @@ class SourceStatus(Enum):
 
 
 class MultiSourceCache:
-    """Simple in-memory cache with TTL"""
+    """TTL cache on the "multi_source" namespace of the shared TieredCache"""
     
-    def __init__(self):
-        self._cache: Dict[str, Tuple[Any, float, float]] = {}  # key: (data, timestamp, ttl)
+    def __init__(self, namespace: str = "multi_source"):
+        self.namespace = namespace
+        self._tiered = get_tiered_cache()
     
     def get(self, key: str) -> Optional[Any]:
         """Get cached data if not expired"""
-        if key in self._cache:
-            data, timestamp, ttl = self._cache[key]
-            if time.time() - timestamp < ttl:
-                logger.info(f"✅ Cache HIT: {key}")
-                return data
-            else:
-                # Expired
-                del self._cache[key]
-                logger.debug(f"⏰ Cache EXPIRED: {key}")
-        return None
+        data = self._tiered.get(self.namespace, key)
+        if data is not None:
+            logger.info(f"✅ Cache HIT: {key}")
+        return data
     
     def set(self, key: str, data: Any, ttl: int):
         """Set cache with TTL in seconds"""
-        self._cache[key] = (data, time.time(), ttl)
+        self._tiered.set(self.namespace, key, data, ttl=ttl)
         logger.debug(f"💾 Cache SET: {key} (TTL: {ttl}s)")
     
     def get_stale(self, key: str, max_age: int) -> Optional[Any]:
         """Get cached data even if expired, within max_age"""
-        if key in self._cache:
-            data, timestamp, _ = self._cache[key]
-            age = time.time() - timestamp
-            if age < max_age:
-                logger.warning(f"⚠️ Cache STALE: {key} (age: {age:.0f}s)")
-                return data
-        return None
+        data = self._tiered.get_stale(self.namespace, key, max_age)
+        if data is not None:
+            logger.warning(f"⚠️ Cache STALE: {key} (age: {self._tiered.age(self.namespace, key) or 0:.0f}s)")
+        return data
     
     def clear(self):
         """Clear all cache"""
-        self._cache.clear()
+        self._tiered.clear(self.namespace)
 
 
 class SourceMonitor:
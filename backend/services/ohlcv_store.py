@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Columnar OHLCV Store
+Append-only, memory-mapped candle storage per (exchange, symbol, interval).
+
+Each series is a directory with one fixed-width column file per field:
+
+    <root>/<exchange>/<SYMBOL>/<interval>/timestamp.i8   int64 epoch milliseconds
+    <root>/<exchange>/<SYMBOL>/<interval>/{open,high,low,close,volume}.f8   float64
+
+Candles from different exchanges never share a series. The OHLC worker's
+multi-source candles live under DEFAULT_EXCHANGE. Ranges the exchange has
+no candles for (maintenance, delisting windows) are recorded in
+empty.i8 as int64 (start, end) pairs, so callers stop refetching them.
+
+Reads memory-map the column files and slice them by timestamp with a binary
+search, so callers get zero-copy NumPy views instead of ORM rows or dicts. A
+year of 1m candles (~525k rows) is ~21 MB on disk and costs nothing to open.
+
+Appends only accept candles newer than the last stored one; re-sending the
+last candle (same timestamp) overwrites it in place, older candles are ignored.
+The timestamp column is written last, so a crash mid-append never exposes a
+partially written row. Backfills (candles before or inside the stored range)
+go through merge(), which rewrites the series into a new directory and swaps
+it in.
+"""
+
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.logger import setup_logger
+
+logger = setup_logger("ohlcv_store")
+
+DEFAULT_EXCHANGE = "aggregate"
+VALUE_COLUMNS = ("open", "high", "low", "close", "volume")
+ROW_BYTES = 8
+EMPTY_RANGES_FILE = "empty.i8"
+
+Timestamp = Union[datetime, int, float, str]
+
+
+def to_epoch_ms(value: Timestamp) -> int:
+    """Normalize datetimes, ISO strings and second/millisecond epochs to epoch ms (naive = UTC)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    value = float(value)
+    return int(value if value > 1e11 else value * 1000)
+
+
+class OHLCVView:
+    """
+    Zero-copy view over a range of a stored series
+
+    Attributes are NumPy arrays backed by the memory-mapped column files
+    (read-only). Use `to_dataframe()` / `to_records()` when a copy is needed.
+    """
+
+    __slots__ = ("symbol", "interval", "exchange", "timestamp") + VALUE_COLUMNS
+
+    def __init__(self, symbol: str, interval: str, columns: Dict[str, np.ndarray], exchange: str = DEFAULT_EXCHANGE):
+        self.symbol = symbol
+        self.interval = interval
+        self.exchange = exchange
+        self.timestamp = columns["timestamp"]
+        for name in VALUE_COLUMNS:
+            setattr(self, name, columns[name])
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def first_timestamp(self) -> Optional[int]:
+        return int(self.timestamp[0]) if len(self) else None
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self.timestamp[-1]) if len(self) else None
+
+    def to_dataframe(self):
+        """pandas DataFrame indexed by candle open time (copies the data)"""
+        import pandas as pd
+
+        df = pd.DataFrame({name: np.array(getattr(self, name)) for name in VALUE_COLUMNS})
+        df.index = pd.to_datetime(np.array(self.timestamp), unit="ms")
+        df.index.name = "timestamp"
+        return df
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """List of candle dicts (timestamp in epoch ms) for legacy callers"""
+        columns = [self.timestamp.tolist()] + [getattr(self, name).tolist() for name in VALUE_COLUMNS]
+        keys = ("timestamp",) + VALUE_COLUMNS
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+class OHLCVStore:
+    """Directory of append-only columnar OHLCV series"""
+
+    def __init__(self, root: str = "data/ohlcv_store"):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        # (exchange, symbol, interval) -> (rows, columns) memmaps for the current file length
+        self._maps: Dict[Tuple[str, str, str], Tuple[int, Dict[str, np.ndarray]]] = {}
+
+    @staticmethod
+    def _key(symbol: str, interval: str, exchange: str = DEFAULT_EXCHANGE) -> Tuple[str, str, str]:
+        return (exchange or DEFAULT_EXCHANGE).lower(), symbol.upper(), interval
+
+    def _series_dir(self, symbol: str, interval: str, exchange: str = DEFAULT_EXCHANGE) -> Path:
+        exchange, symbol, interval = self._key(symbol, interval, exchange)
+        return self.root / exchange / symbol / interval
+
+    @staticmethod
+    def _column_path(series_dir: Path, name: str) -> Path:
+        return series_dir / (f"{name}.i8" if name == "timestamp" else f"{name}.f8")
+
+    def _rows(self, series_dir: Path) -> int:
+        path = self._column_path(series_dir, "timestamp")
+        return path.stat().st_size // ROW_BYTES if path.exists() else 0
+
+    # ------------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        symbol: str,
+        interval: str,
+        candles: Iterable[Dict[str, Any]],
+        exchange: str = DEFAULT_EXCHANGE
+    ) -> int:
+        """
+        Append candles to a series (any order; each needs timestamp/open/high/low/close/volume)
+
+        Returns:
+            Number of candles written (appended or replacing the last row)
+        """
+        rows = sorted(
+            (
+                (to_epoch_ms(c["timestamp"]),) + tuple(float(c.get(name) or 0.0) for name in VALUE_COLUMNS)
+                for c in candles
+            ),
+            key=lambda row: row[0]
+        )
+        if not rows:
+            return 0
+
+        series_dir = self._series_dir(symbol, interval, exchange)
+        with self._lock:
+            series_dir.mkdir(parents=True, exist_ok=True)
+            count = self._rows(series_dir)
+            last_ts = self._last_timestamp(series_dir, count)
+
+            # Revision of the stored head candle
+            written = 0
+            if last_ts is not None:
+                head = [row for row in rows if row[0] == last_ts]
+                if head:
+                    self._overwrite_last(series_dir, count, head[-1])
+                    written += 1
+                rows = [row for row in rows if row[0] > last_ts]
+
+            # Keep the last version of duplicate timestamps within the batch
+            unique: Dict[int, tuple] = {}
+            for row in rows:
+                unique[row[0]] = row
+            rows = list(unique.values())
+
+            if rows:
+                data = np.array(rows, dtype=np.float64)
+                for i, name in enumerate(VALUE_COLUMNS, start=1):
+                    path = self._column_path(series_dir, name)
+                    if path.exists() and path.stat().st_size != count * ROW_BYTES:
+                        # Drop values left behind by an interrupted append
+                        os.truncate(path, count * ROW_BYTES)
+                    with open(path, "ab") as f:
+                        f.write(np.ascontiguousarray(data[:, i]).tobytes())
+                # Timestamps last: they define the committed row count
+                with open(self._column_path(series_dir, "timestamp"), "ab") as f:
+                    f.write(np.array([row[0] for row in rows], dtype=np.int64).tobytes())
+                written += len(rows)
+
+            self._maps.pop(self._key(symbol, interval, exchange), None)
+
+        return written
+
+    def merge(
+        self,
+        symbol: str,
+        interval: str,
+        candles: Iterable[Dict[str, Any]],
+        exchange: str = DEFAULT_EXCHANGE
+    ) -> int:
+        """
+        Merge candles anywhere into a series (backfills, revisions of old rows)
+
+        Rewrites the whole series, so use append() for new candles. Incoming
+        candles replace stored ones with the same timestamp. The new column
+        files are written to a temporary directory and swapped in, so readers
+        see the old or the new series (or, between the two renames, none).
+
+        Returns:
+            Number of candles merged
+        """
+        incoming = {
+            row[0]: row
+            for row in (
+                (to_epoch_ms(c["timestamp"]),) + tuple(float(c.get(name) or 0.0) for name in VALUE_COLUMNS)
+                for c in candles
+            )
+        }
+        if not incoming:
+            return 0
+
+        series_dir = self._series_dir(symbol, interval, exchange)
+        with self._lock:
+            count = self._rows(series_dir)
+            if count:
+                stored = {
+                    name: np.fromfile(self._column_path(series_dir, name), dtype=np.int64 if name == "timestamp" else np.float64, count=count)
+                    for name in ("timestamp",) + VALUE_COLUMNS
+                }
+                keep = ~np.isin(stored["timestamp"], np.fromiter(incoming, dtype=np.int64, count=len(incoming)))
+            else:
+                stored, keep = None, None
+
+            new = np.array(sorted(incoming.values()), dtype=np.float64)
+            timestamps = np.array(sorted(incoming), dtype=np.int64)
+            if stored is not None:
+                timestamps = np.concatenate([stored["timestamp"][keep], timestamps])
+            order = np.argsort(timestamps, kind="stable")
+
+            tmp_dir = series_dir.with_name(f"{series_dir.name}.merge-{os.getpid()}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+            for i, name in enumerate(VALUE_COLUMNS, start=1):
+                values = new[:, i] if stored is None else np.concatenate([stored[name][keep], new[:, i]])
+                np.ascontiguousarray(values[order]).tofile(self._column_path(tmp_dir, name))
+            timestamps[order].tofile(self._column_path(tmp_dir, "timestamp"))
+            if (series_dir / EMPTY_RANGES_FILE).exists():
+                shutil.copyfile(series_dir / EMPTY_RANGES_FILE, tmp_dir / EMPTY_RANGES_FILE)
+
+            old_dir = series_dir.with_name(f"{series_dir.name}.old-{os.getpid()}")
+            if series_dir.exists():
+                os.replace(series_dir, old_dir)
+            os.replace(tmp_dir, series_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+            self._maps.pop(self._key(symbol, interval, exchange), None)
+
+        return len(incoming)
+
+    def mark_empty(
+        self,
+        symbol: str,
+        interval: str,
+        start: Timestamp,
+        end: Timestamp,
+        exchange: str = DEFAULT_EXCHANGE
+    ) -> None:
+        """Record a range (inclusive) the exchange returned no candles for"""
+        series_dir = self._series_dir(symbol, interval, exchange)
+        with self._lock:
+            ranges = self._empty_ranges(series_dir)
+            ranges.append((to_epoch_ms(start), to_epoch_ms(end)))
+            series_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = series_dir / f"{EMPTY_RANGES_FILE}.tmp-{os.getpid()}"
+            np.array(sorted(ranges), dtype=np.int64).tofile(tmp_path)
+            os.replace(tmp_path, series_dir / EMPTY_RANGES_FILE)
+
+    @staticmethod
+    def _empty_ranges(series_dir: Path) -> List[Tuple[int, int]]:
+        path = series_dir / EMPTY_RANGES_FILE
+        if not path.exists():
+            return []
+        return [tuple(pair) for pair in np.fromfile(path, dtype=np.int64).reshape(-1, 2).tolist()]
+
+    def empty_ranges(self, symbol: str, interval: str, exchange: str = DEFAULT_EXCHANGE) -> List[Tuple[int, int]]:
+        """Ranges (epoch ms, inclusive) recorded with mark_empty(), sorted by start"""
+        return self._empty_ranges(self._series_dir(symbol, interval, exchange))
+
+    def append_candles(self, candles: Iterable[Dict[str, Any]]) -> int:
+        """Group mixed candles (OHLC worker format) by exchange/symbol/interval and append each series"""
+        groups: Dict[Tuple[str, str, str], list] = {}
+        for candle in candles:
+            key = (candle.get("exchange") or DEFAULT_EXCHANGE, candle["symbol"], candle["interval"])
+            groups.setdefault(key, []).append(candle)
+        return sum(
+            self.append(symbol, interval, group, exchange=exchange)
+            for (exchange, symbol, interval), group in groups.items()
+        )
+
+    def _last_timestamp(self, series_dir: Path, count: int) -> Optional[int]:
+        if count == 0:
+            return None
+        with open(self._column_path(series_dir, "timestamp"), "rb") as f:
+            f.seek((count - 1) * ROW_BYTES)
+            return int(np.frombuffer(f.read(ROW_BYTES), dtype=np.int64)[0])
+
+    def _overwrite_last(self, series_dir: Path, count: int, row: tuple) -> None:
+        offset = (count - 1) * ROW_BYTES
+        for i, name in enumerate(VALUE_COLUMNS, start=1):
+            with open(self._column_path(series_dir, name), "r+b") as f:
+                f.seek(offset)
+                f.write(np.float64(row[i]).tobytes())
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    def _columns(self, symbol: str, interval: str, exchange: str) -> Optional[Dict[str, np.ndarray]]:
+        key = self._key(symbol, interval, exchange)
+        series_dir = self._series_dir(symbol, interval, exchange)
+        count = self._rows(series_dir)
+        if count == 0:
+            return None
+
+        cached = self._maps.get(key)
+        if cached is not None and cached[0] == count:
+            return cached[1]
+
+        columns = {
+            "timestamp": np.memmap(self._column_path(series_dir, "timestamp"), dtype=np.int64, mode="r", shape=(count,))
+        }
+        for name in VALUE_COLUMNS:
+            columns[name] = np.memmap(self._column_path(series_dir, name), dtype=np.float64, mode="r", shape=(count,))
+        self._maps[key] = (count, columns)
+        return columns
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[Timestamp] = None,
+        end: Optional[Timestamp] = None,
+        limit: Optional[int] = None,
+        exchange: str = DEFAULT_EXCHANGE
+    ) -> Optional[OHLCVView]:
+        """
+        Zero-copy view of candles with start <= timestamp <= end
+
+        Args:
+            symbol: Symbol as stored by the OHLC worker (e.g. 'BTC')
+            interval: Candle interval (e.g. '1h')
+            start / end: Range bounds (datetime, ISO string or epoch s/ms)
+            limit: Keep only the most recent `limit` candles of the range
+            exchange: Exchange the candles came from (DEFAULT_EXCHANGE for the OHLC worker)
+
+        Returns:
+            OHLCVView, or None if the series does not exist
+        """
+        columns = self._columns(symbol, interval, exchange)
+        if columns is None:
+            return None
+
+        timestamps = columns["timestamp"]
+        lo = int(np.searchsorted(timestamps, to_epoch_ms(start), side="left")) if start is not None else 0
+        hi = int(np.searchsorted(timestamps, to_epoch_ms(end), side="right")) if end is not None else len(timestamps)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+
+        return OHLCVView(
+            symbol.upper(),
+            interval,
+            {name: column[lo:hi] for name, column in columns.items()},
+            exchange=self._key(symbol, interval, exchange)[0]
+        )
+
+    def read_recent(
+        self,
+        symbol: str,
+        interval: str,
+        days: float,
+        exchange: str = DEFAULT_EXCHANGE
+    ) -> Optional[OHLCVView]:
+        """View of the last `days` days of a series (relative to now)"""
+        return self.read(symbol, interval, start=int((time.time() - days * 86400) * 1000), exchange=exchange)
+
+    def series(self) -> List[Tuple[str, str, str]]:
+        """All stored (exchange, symbol, interval) triples"""
+        if not self.root.exists():
+            return []
+        return sorted(
+            (exchange_dir.name, symbol_dir.name, interval_dir.name)
+            for exchange_dir in self.root.iterdir() if exchange_dir.is_dir()
+            for symbol_dir in exchange_dir.iterdir() if symbol_dir.is_dir()
+            for interval_dir in symbol_dir.iterdir()
+            if interval_dir.is_dir() and "." not in interval_dir.name  # skip merge() work dirs
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        series = self.series()
+        rows = sum(
+            self._rows(self._series_dir(symbol, interval, exchange))
+            for exchange, symbol, interval in series
+        )
+        return {
+            "root": str(self.root),
+            "series": len(series),
+            "candles": rows,
+            "bytes": rows * ROW_BYTES * (len(VALUE_COLUMNS) + 1)
+        }
+
+
+_ohlcv_store: Optional[OHLCVStore] = None
+
+
+def get_ohlcv_store() -> OHLCVStore:
+    """Get global OHLCVStore instance (root from OHLCV_STORE_DIR)"""
+    global _ohlcv_store
+    if _ohlcv_store is None:
+        _ohlcv_store = OHLCVStore(os.getenv("OHLCV_STORE_DIR", "data/ohlcv_store"))
+    return _ohlcv_store
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep
+Grid search over the trading backtester's strategy parameters.
+
+The close series is loaded once and placed in shared memory; combinations
+are split into tasks that a process pool evaluates against that single
+copy. Inside a task one indicator is fixed and the swept parameters are
+broadcast: e.g. one fast SMA against the SMAs of every slow window at once,
+so each task produces a (combinations x candles) signal matrix and all of
+its metrics in a handful of array operations.
+
+Results use the same model as BacktestingService.run_backtest (signal of the
+previous bar held as a long/short position, compounded per-bar returns,
+trades = signal changes), so the default combination reproduces a single run.
+
+Jobs run in the background; progress, a ranked results table and
+cancellation are exposed through SweepManager (see trading_backtesting_api).
+"""
+
+import asyncio
+import itertools
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from backend.services.indicator_engine import exponential_smooth, to_array
+from utils.logger import setup_logger
+
+logger = setup_logger("parameter_sweep")
+
+SWEEP_WORKERS = int(os.getenv("SWEEP_WORKERS", str(min(4, os.cpu_count() or 1))))
+MAX_SWEEP_COMBINATIONS = 20_000
+# Upper bound on (combinations x candles) evaluated per task (~32 MB of float64)
+TASK_ELEMENTS = 4_000_000
+MAX_SWEEP_JOBS = 20
+
+# Strategy -> parameter defaults (the windows BacktestingService.run_backtest uses)
+SWEEP_STRATEGIES: Dict[str, Dict[str, float]] = {
+    "sma_crossover": {"fast": 10, "slow": 30},
+    "rsi": {"period": 14, "oversold": 30, "overbought": 70},
+    "macd": {"fast": 12, "slow": 26, "signal": 9},
+}
+
+# Parameters fixed per task (one indicator computation), the rest are broadcast
+_TASK_KEYS = {
+    "sma_crossover": ("fast",),
+    "rsi": ("period",),
+    "macd": ("fast", "slow"),
+}
+
+RANK_METRICS = {"total_return": True, "sharpe": True, "profit": True, "max_drawdown": False}
+
+RangeSpec = Union[Sequence[float], Dict[str, float]]
+
+
+# ============================================================================
+# Parameter grid
+# ============================================================================
+
+def expand_range(spec: RangeSpec) -> List[float]:
+    """
+    Values of one swept parameter
+
+    Args:
+        spec: Explicit list of values, or {"start", "stop", "step"} (stop inclusive)
+    """
+    if isinstance(spec, dict):
+        start, stop = float(spec["start"]), float(spec["stop"])
+        step = float(spec.get("step", 1))
+        if step <= 0:
+            raise ValueError("step must be positive")
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        values = [start + i * step for i in range(max(count, 0))]
+    else:
+        values = [float(v) for v in spec]
+    return [int(v) if float(v).is_integer() else v for v in values]
+
+
+def _is_valid(strategy: str, combo: Dict[str, float]) -> bool:
+    if strategy == "sma_crossover":
+        return 1 <= combo["fast"] < combo["slow"]
+    if strategy == "rsi":
+        return combo["period"] >= 1 and combo["oversold"] < combo["overbought"]
+    if strategy == "macd":
+        return 1 <= combo["fast"] < combo["slow"] and combo["signal"] >= 1
+    return False
+
+
+def build_grid(strategy: str, parameters: Dict[str, RangeSpec]) -> List[Dict[str, float]]:
+    """
+    All valid parameter combinations of a sweep
+
+    Parameters not given keep their default; invalid combinations
+    (e.g. fast >= slow) are dropped.
+    """
+    if strategy not in SWEEP_STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    defaults = SWEEP_STRATEGIES[strategy]
+    unknown = set(parameters) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {strategy}: {sorted(unknown)}")
+
+    names = list(defaults)
+    axes = [expand_range(parameters[name]) if name in parameters else [defaults[name]] for name in names]
+    grid = [dict(zip(names, values)) for values in itertools.product(*axes)]
+    grid = [combo for combo in grid if _is_valid(strategy, combo)]
+    if len(grid) > MAX_SWEEP_COMBINATIONS:
+        raise ValueError(f"{len(grid)} combinations exceed the limit of {MAX_SWEEP_COMBINATIONS}")
+    return grid
+
+
+def plan_tasks(strategy: str, grid: List[Dict[str, float]], candles: int) -> List[Tuple[Dict, List[Dict]]]:
+    """Group combinations by their fixed indicator, split to bound task memory"""
+    keys = _TASK_KEYS[strategy]
+    groups: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+    for combo in grid:
+        groups.setdefault(tuple(combo[k] for k in keys), []).append(combo)
+
+    per_task = max(1, TASK_ELEMENTS // max(candles, 1))
+    tasks = []
+    for fixed_values, combos in groups.items():
+        fixed = dict(zip(keys, fixed_values))
+        for i in range(0, len(combos), per_task):
+            tasks.append((fixed, combos[i:i + per_task]))
+    return tasks
+
+
+# ============================================================================
+# Vectorised evaluation
+# ============================================================================
+
+def rolling_means(values: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """Rolling means for many window lengths at once: shape (len(windows), n), NaN warm-up"""
+    n = values.shape[0]
+    w = np.asarray(windows, dtype=np.int64)[:, None]
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    idx = np.arange(n)[None, :]
+    start = np.maximum(idx + 1 - w, 0)
+    out = (csum[idx + 1] - csum[start]) / w
+    out[idx < w - 1] = np.nan
+    return out
+
+
+def ewm(values: np.ndarray, span: float) -> np.ndarray:
+    """Exponential moving average, equal to pandas ewm(span, adjust=False).mean()"""
+    if values.shape[0] == 0:
+        return values.copy()
+    return exponential_smooth(values, 2.0 / (span + 1.0), float(values[0]))
+
+
+def _crossover_signals(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """+1 where fast > slow, -1 where fast < slow (NaN stays 0)"""
+    return (fast > slow).astype(np.int8) - (fast < slow).astype(np.int8)
+
+
+def strategy_signals(strategy: str, close: np.ndarray, fixed: Dict, combos: List[Dict]) -> np.ndarray:
+    """Signal matrix (len(combos) x candles) for combinations sharing `fixed`"""
+    if strategy == "sma_crossover":
+        fast = rolling_means(close, [int(fixed["fast"])])
+        slow = rolling_means(close, [int(c["slow"]) for c in combos])
+        return _crossover_signals(fast, slow)
+
+    if strategy == "rsi":
+        delta = np.diff(close, prepend=np.nan)
+        gains = rolling_means(np.where(delta > 0, delta, 0.0), [int(fixed["period"])])[0]
+        losses = rolling_means(np.where(delta < 0, -delta, 0.0), [int(fixed["period"])])[0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - 100 / (1 + gains / losses)
+        oversold = np.array([c["oversold"] for c in combos], dtype=np.float64)[:, None]
+        overbought = np.array([c["overbought"] for c in combos], dtype=np.float64)[:, None]
+        signals = (rsi[None, :] < oversold).astype(np.int8)
+        signals[np.broadcast_to(rsi[None, :] > overbought, signals.shape)] = -1
+        return signals
+
+    if strategy == "macd":
+        macd = ewm(close, fixed["fast"]) - ewm(close, fixed["slow"])
+        signal_lines = {span: ewm(macd, span) for span in {c["signal"] for c in combos}}
+        lines = np.stack([signal_lines[c["signal"]] for c in combos])
+        return _crossover_signals(macd[None, :], lines)
+
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+def evaluate_signals(
+    close: np.ndarray,
+    signals: np.ndarray,
+    initial_capital: float,
+    periods_per_year: float
+) -> Dict[str, np.ndarray]:
+    """
+    Metrics for every row of a signal matrix
+
+    The signal of bar i-1 is the position (long 1 / short -1 / flat 0)
+    held over the return of bar i.
+    """
+    returns = np.zeros(close.shape[0])
+    returns[1:] = close[1:] / close[:-1] - 1
+    strategy_returns = np.zeros(signals.shape, dtype=np.float64)
+    strategy_returns[:, 1:] = signals[:, :-1] * returns[1:]
+
+    equity = np.cumprod(1.0 + strategy_returns, axis=1)
+    total_return = equity[:, -1] - 1.0
+    peak = np.maximum.accumulate(equity, axis=1)
+    max_drawdown = ((peak - equity) / peak).max(axis=1) * 100
+
+    active = strategy_returns[:, 1:]
+    if active.shape[1]:
+        std = active.std(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, active.mean(axis=1) / std * math.sqrt(periods_per_year), 0.0)
+    else:
+        sharpe = np.zeros(signals.shape[0])
+    trades = 1 + np.count_nonzero(np.diff(signals, axis=1), axis=1)
+
+    return {
+        "total_return": total_return * 100,
+        "final_capital": initial_capital * (1.0 + total_return),
+        "profit": initial_capital * total_return,
+        "max_drawdown": max_drawdown,
+        "sharpe": sharpe,
+        "trades": trades,
+    }
+
+
+def evaluate_combinations(
+    strategy: str,
+    close: np.ndarray,
+    fixed: Dict,
+    combos: List[Dict],
+    initial_capital: float,
+    periods_per_year: float
+) -> List[Dict[str, Any]]:
+    """Result rows (parameters + metrics) for combinations sharing `fixed`"""
+    metrics = evaluate_signals(
+        close, strategy_signals(strategy, close, fixed, combos), initial_capital, periods_per_year
+    )
+    rows = []
+    for i, combo in enumerate(combos):
+        row = {"params": combo}
+        for name, values in metrics.items():
+            row[name] = int(values[i]) if name == "trades" else round(float(values[i]), 6)
+        rows.append(row)
+    return rows
+
+
+def _run_task(args: tuple) -> List[Dict[str, Any]]:
+    """Process pool entry point: evaluate one task against the shared close series"""
+    shm_name, candles, strategy, fixed, combos, initial_capital, periods_per_year = args
+    # Workers share the parent's resource tracker, which keeps owning the block
+    shm = shared_memory.SharedMemory(name=shm_name)
+    close = np.ndarray((candles,), dtype=np.float64, buffer=shm.buf)
+    try:
+        return evaluate_combinations(strategy, close, fixed, combos, initial_capital, periods_per_year)
+    finally:
+        del close
+        shm.close()
+
+
+def _unlink(shm: shared_memory.SharedMemory):
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# ============================================================================
+# Jobs
+# ============================================================================
+
+class SweepJob:
+    """State of one sweep: progress, results and cancellation"""
+
+    def __init__(self, strategy: str, grid: List[Dict], meta: Dict[str, Any]):
+        self.job_id = f"SW-{uuid.uuid4().hex[:12].upper()}"
+        self.strategy = strategy
+        self.grid = grid
+        self.meta = meta
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self.results: List[Dict[str, Any]] = []
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def total(self) -> int:
+        return len(self.grid)
+
+    @property
+    def completed(self) -> int:
+        return len(self.results)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "cancelled", "failed")
+
+    def _notify(self):
+        event, self._changed = self._changed, asyncio.Event()
+        event.set()
+
+    async def wait_for_update(self, timeout: float = 15.0):
+        """Wait until results are added or the job finishes"""
+        event = self._changed
+        if self.done:
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def ranked(self, rank_by: str = "total_return", top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Results sorted best first (max_drawdown ascending, others descending)"""
+        if rank_by not in RANK_METRICS:
+            raise ValueError(f"rank_by must be one of {sorted(RANK_METRICS)}")
+        rows = sorted(self.results, key=lambda r: r[rank_by], reverse=RANK_METRICS[rank_by])
+        rows = rows[:top] if top else rows
+        return [{"rank": i + 1, **row} for i, row in enumerate(rows)]
+
+    def progress(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "job_id": self.job_id,
+            "strategy": self.strategy,
+            "status": self.status,
+            "completed": self.completed,
+            "total": self.total,
+            "progress": round(self.completed / self.total, 4) if self.total else 1.0,
+            "elapsed_seconds": round(elapsed, 3),
+            "error": self.error,
+            **self.meta,
+        }
+
+
+class SweepManager:
+    """
+    Runs sweeps on a shared process pool and keeps the recent jobs
+
+    Args:
+        workers: Pool size; 0 evaluates tasks in-process (threads)
+    """
+
+    def __init__(self, workers: int = SWEEP_WORKERS):
+        self.workers = workers
+        self.jobs: "OrderedDict[str, SweepJob]" = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            # spawn: forking a process with running threads/event loop is unsafe
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+        return self._executor
+
+    def start(
+        self,
+        strategy: str,
+        parameters: Dict[str, RangeSpec],
+        close: Sequence[float],
+        initial_capital: float = 10000.0,
+        periods_per_year: float = 365 * 24,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> SweepJob:
+        """
+        Start a sweep in the background
+
+        Args:
+            strategy: sma_crossover, rsi or macd
+            parameters: Parameter name -> list of values or {"start", "stop", "step"}
+            close: Close prices (loaded once by the caller)
+            initial_capital: Initial capital
+            periods_per_year: Candles per year (Sharpe annualisation)
+            meta: Extra fields reported with the job's progress
+
+        Returns:
+            The running SweepJob
+        """
+        close = to_array(close)
+        grid = build_grid(strategy, parameters)
+        job = SweepJob(strategy, grid, {"candles": int(close.shape[0]), **(meta or {})})
+        self.jobs[job.job_id] = job
+        # Evict the oldest finished jobs; running ones are kept whatever their age
+        excess = len(self.jobs) - MAX_SWEEP_JOBS
+        if excess > 0:
+            for job_id in [job_id for job_id, old in self.jobs.items() if old.done][:excess]:
+                del self.jobs[job_id]
+        job.task = asyncio.create_task(self._run(job, close, initial_capital, periods_per_year))
+        return job
+
+    async def _run(self, job: SweepJob, close: np.ndarray, initial_capital: float, periods_per_year: float):
+        loop = asyncio.get_running_loop()
+        shm = shared_memory.SharedMemory(create=True, size=max(close.nbytes, 1))
+        futures: List[asyncio.Future] = []
+        pool_futures: List[Future] = []
+        try:
+            np.ndarray(close.shape, dtype=np.float64, buffer=shm.buf)[:] = close
+            executor = self._get_executor()
+            job.status = "running"
+            for fixed, combos in plan_tasks(job.strategy, job.grid, close.shape[0]):
+                if executor is None:
+                    futures.append(loop.run_in_executor(
+                        None, evaluate_combinations,
+                        job.strategy, close, fixed, combos, initial_capital, periods_per_year
+                    ))
+                else:
+                    args = (shm.name, close.shape[0], job.strategy, fixed, combos, initial_capital, periods_per_year)
+                    pool_futures.append(executor.submit(_run_task, args))
+                    futures.append(asyncio.wrap_future(pool_futures[-1], loop=loop))
+
+            for next_done in asyncio.as_completed(futures):
+                job.results.extend(await next_done)
+                job._notify()
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.error(f"Sweep {job.job_id} failed: {e}", exc_info=True)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            for future in futures + pool_futures:
+                future.cancel()  # tasks not started yet are dropped
+            shm.close()
+            self._unlink_when_done(shm, pool_futures)
+            job.finished_at = time.time()
+            job._notify()
+            logger.info(
+                f"Sweep {job.job_id} {job.status}: {job.completed}/{job.total} combinations "
+                f"in {job.finished_at - job.started_at:.2f}s"
+            )
+
+    @staticmethod
+    def _unlink_when_done(shm: shared_memory.SharedMemory, pool_futures: List[Future]):
+        """
+        Unlink the shared block once no submitted task can still attach to it
+
+        Tasks already in the pool's call queue cannot be cancelled; they
+        would fail to attach to an unlinked block, so the last of them to
+        finish unlinks it (from the executor's thread).
+        """
+        pending = [future for future in pool_futures if not future.done()]
+        if not pending:
+            _unlink(shm)
+            return
+        remaining = [len(pending)]
+        lock = threading.Lock()
+
+        def release(_future: Future):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                _unlink(shm)
+
+        for future in pending:
+            future.add_done_callback(release)
+
+    def get(self, job_id: str) -> Optional[SweepJob]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a running sweep (pending tasks are dropped, results so far are kept)"""
+        job = self.jobs.get(job_id)
+        if job is None or job.done or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    def shutdown(self):
+        for job in self.jobs.values():
+            if job.task is not None and not job.done:
+                job.task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_sweep_manager: Optional[SweepManager] = None
+
+
+def get_sweep_manager() -> SweepManager:
+    """Get global SweepManager instance"""
+    global _sweep_manager
+    if _sweep_manager is None:
+        _sweep_manager = SweepManager()
+    return _sweep_manager
@@ -12,6 +12,7 @@ from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 import uuid
 
+from backend.services.ws_hub import ChannelHub
 from backend.services.real_api_clients import (
     cmc_client,
     news_client,
@@ -25,12 +26,21 @@ class RealWebSocketManager:
     """
     Real-time WebSocket Manager
     Broadcasts REAL data only - NO MOCK DATA
+
+    Channel data is fetched by one shared task per subscribed channel (see
+    ChannelHub), not once per client, and each update is encoded once.
     """
     
+    UPDATE_INTERVAL = 30  # seconds between channel refreshes
+    
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.subscriptions: Dict[str, Set[str]] = {}  # client_id -> set of channels
-        self.update_tasks: Dict[str, asyncio.Task] = {}
+        self.hub = ChannelHub(
+            "real_websocket",
+            fetch=self._channel_update,
+            interval=self.UPDATE_INTERVAL
+        )
     
     async def connect(self, websocket: WebSocket, client_id: str):
         """
@@ -39,6 +49,7 @@ class RealWebSocketManager:
         await websocket.accept()
         self.active_connections[client_id] = websocket
         self.subscriptions[client_id] = set()
+        self.hub.register(client_id, websocket.send_text, on_close=self.disconnect)
         
         logger.info(f"✅ WebSocket client connected: {client_id}")
         
@@ -63,10 +74,8 @@ class RealWebSocketManager:
         if client_id in self.subscriptions:
             del self.subscriptions[client_id]
         
-        # Cancel any running update tasks for this client
-        if client_id in self.update_tasks:
-            self.update_tasks[client_id].cancel()
-            del self.update_tasks[client_id]
+        # Drops the client's send queue and stops channel updates nobody needs
+        self.hub.unregister(client_id)
         
         logger.info(f"❌ WebSocket client disconnected: {client_id}")
     
@@ -79,28 +88,20 @@ class RealWebSocketManager:
         
         for channel in channels:
             self.subscriptions[client_id].add(channel)
+            # The first subscriber of a channel starts its shared update task
+            self.hub.subscribe(client_id, channel)
         
         logger.info(f"✅ Client {client_id} subscribed to: {channels}")
         
         # Start sending real data for subscribed channels
         await self.send_initial_data(client_id, channels)
-        
-        # Start real-time updates
-        if client_id not in self.update_tasks:
-            self.update_tasks[client_id] = asyncio.create_task(
-                self.send_realtime_updates(client_id)
-            )
     
     async def send_personal_message(self, message: Dict[str, Any], client_id: str):
         """
         Send message to specific client
         """
         if client_id in self.active_connections:
-            try:
-                await self.active_connections[client_id].send_json(message)
-            except Exception as e:
-                logger.error(f"❌ Failed to send message to {client_id}: {e}")
-                await self.disconnect(client_id)
+            self.hub.send(client_id, message)
     
     async def broadcast(self, channel: str, data: Dict[str, Any]):
         """
@@ -113,19 +114,8 @@ class RealWebSocketManager:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        disconnected_clients = []
-        
-        for client_id, channels in self.subscriptions.items():
-            if channel in channels and client_id in self.active_connections:
-                try:
-                    await self.active_connections[client_id].send_json(message)
-                except Exception as e:
-                    logger.error(f"❌ Failed to broadcast to {client_id}: {e}")
-                    disconnected_clients.append(client_id)
-        
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            await self.disconnect(client_id)
+        # Encoded once, queued for every subscriber; failed sends disconnect
+        self.hub.publish(channel, message)
     
     async def send_initial_data(self, client_id: str, channels: list):
         """
@@ -133,51 +123,33 @@ class RealWebSocketManager:
         """
         for channel in channels:
             try:
-                data = await self.fetch_real_data_for_channel(channel)
+                # Shared with other subscribers while the last fetch is fresh
+                update = await self.hub.current(channel)
+                if update is None:
+                    continue
                 await self.send_personal_message(
                     {
                         "type": "initial_data",
                         "channel": channel,
-                        "data": data,
-                        "timestamp": datetime.utcnow().isoformat()
+                        "data": update["data"],
+                        "timestamp": update["timestamp"]
                     },
                     client_id
                 )
             except Exception as e:
                 logger.error(f"❌ Failed to fetch initial data for {channel}: {e}")
     
-    async def send_realtime_updates(self, client_id: str):
+    async def _channel_update(self, channel: str) -> Dict[str, Any]:
         """
-        Send real-time REAL data updates to client
+        Fetch one update message for a channel (run by the hub, once per channel)
         """
-        try:
-            while client_id in self.active_connections:
-                # Get subscribed channels
-                channels = self.subscriptions.get(client_id, set())
-                
-                # Fetch and send real data for each channel
-                for channel in channels:
-                    try:
-                        data = await self.fetch_real_data_for_channel(channel)
-                        await self.send_personal_message(
-                            {
-                                "type": "update",
-                                "channel": channel,
-                                "data": data,
-                                "timestamp": datetime.utcnow().isoformat()
-                            },
-                            client_id
-                        )
-                    except Exception as e:
-                        logger.error(f"❌ Update failed for {channel}: {e}")
-                
-                # Wait before next update (adjust based on channel type)
-                await asyncio.sleep(30)  # Update every 30 seconds
-        
-        except asyncio.CancelledError:
-            logger.info(f"Update task cancelled for client {client_id}")
-        except Exception as e:
-            logger.error(f"❌ Update task error for {client_id}: {e}")
+        data = await self.fetch_real_data_for_channel(channel)
+        return {
+            "type": "update",
+            "channel": channel,
+            "data": data,
+            "timestamp": datetime.utcnow().isoformat()
+        }
     
     async def fetch_real_data_for_channel(self, channel: str) -> Dict[str, Any]:
         """
@@ -258,6 +230,7 @@ class RealWebSocketManager:
             "active_connections": len(self.active_connections),
             "total_subscriptions": sum(len(subs) for subs in self.subscriptions.values()),
             "channels": list(set().union(*self.subscriptions.values())),
+            "hub": self.hub.stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
 
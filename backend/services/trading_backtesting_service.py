@@ -7,16 +7,24 @@ Specialized for trading and backtesting with Binance & KuCoin
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-import pandas as pd
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
 import numpy as np
 
 from .smart_exchange_clients import UltraSmartBinanceClient, UltraSmartKuCoinClient
 from .multi_source_fallback_engine import get_fallback_engine, DataType
+from .ohlcv_store import get_ohlcv_store
+from .parameter_sweep import SweepJob, build_grid, get_sweep_manager
 
 logger = logging.getLogger(__name__)
 
+# Candle length per timeframe (used to check store coverage)
+TIMEFRAME_MS = {
+    "1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000, "1w": 604_800_000
+}
+
 
 class TradingDataService:
     """
@@ -372,7 +380,7 @@ class BacktestingService:
         timeframe: str = "1h",
         days: int = 30,
         exchange: str = "binance"
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """
         Fetch historical data for backtesting
         
@@ -386,14 +394,138 @@ class BacktestingService:
             DataFrame with OHLCV data
         """
         # Calculate timestamps
-        end_time = int(datetime.utcnow().timestamp() * 1000)
-        start_time = int((datetime.utcnow() - timedelta(days=days)).timestamp() * 1000)
+        end_time = int(time.time() * 1000)
+        start_time = end_time - days * 86_400_000
+        
+        # Reuse candles already in the columnar store and only fetch what is
+        # missing: older candles (backfill), holes inside the series and the
+        # tail up to now. Ranges the exchange already returned nothing for
+        # are recorded in the store and skipped.
+        store = get_ohlcv_store()
+        interval_ms = TIMEFRAME_MS.get(timeframe, 3_600_000)
+        try:
+            stored = store.read(symbol, timeframe, start=start_time, end=end_time, exchange=exchange)
+            empty = store.empty_ranges(symbol, timeframe, exchange=exchange)
+        except Exception as e:
+            logger.warning(f"OHLCV store unavailable for {symbol} {timeframe}: {e}")
+            stored, empty = None, []
+        missing = self._missing_ranges(stored, start_time, end_time, interval_ms, empty)
+        
+        if not missing:
+            df = stored.to_dataframe()
+            logger.info(f"✅ Loaded {len(df)} candles for {symbol} from OHLCV store ({days} days)")
+            return df
         
-        # Fetch data in chunks (max 1000 candles per request)
         all_candles = []
-        current_start = start_time
+        try:
+            backfill = []
+            fetched = []  # Head and hole ranges fetched without errors
+            for range_start, range_end in missing:
+                candles, complete = await self._fetch_range(symbol, timeframe, exchange, range_start, range_end)
+                before_tail = stored is not None and len(stored) > 0 and range_start < stored.last_timestamp
+                if complete and before_tail:
+                    fetched.append((range_start, range_end))
+                if not candles:
+                    continue
+                all_candles.extend(candles)
+                if before_tail:
+                    # Before or inside the stored series: the append path ignores these
+                    backfill.extend(candles)
+                else:
+                    store.append(symbol, timeframe, candles, exchange=exchange)
+            if backfill:
+                # One rewrite for the head and every interior hole
+                store.merge(symbol, timeframe, backfill, exchange=exchange)
+            
+            view = store.read(symbol, timeframe, start=start_time, end=end_time, exchange=exchange)
+            if view is not None and len(view) > 0:
+                still_missing = []
+                for gap in self._missing_ranges(view, start_time, end_time, interval_ms, empty):
+                    if self._covered(gap, fetched):
+                        # The exchange has no candles there (maintenance, delisting)
+                        store.mark_empty(symbol, timeframe, gap[0], gap[1], exchange=exchange)
+                    else:
+                        still_missing.append(gap)
+                if still_missing:
+                    logger.warning(
+                        f"Historical data for {symbol} {timeframe} is incomplete; missing "
+                        + ", ".join(f"{a}..{b}" for a, b in still_missing)
+                    )
+                df = view.to_dataframe()
+                logger.info(f"✅ Loaded {len(df)} candles for {symbol} ({days} days, {len(all_candles)} fetched)")
+                return df
+        except Exception as e:
+            logger.warning(f"OHLCV store unavailable for {symbol} {timeframe}: {e}")
+        
+        # Convert to DataFrame
+        import pandas as pd
+        if all_candles:
+            df = pd.DataFrame(all_candles)
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            df.set_index('timestamp', inplace=True)
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+            
+            logger.info(f"✅ Fetched {len(df)} candles for {symbol} ({days} days)")
+            return df
+        else:
+            logger.warning(f"No historical data fetched for {symbol}")
+            return pd.DataFrame()
+    
+    @staticmethod
+    def _covered(gap: tuple, ranges: List[tuple]) -> bool:
+        """True if one of the ranges contains the whole gap"""
+        return any(start <= gap[0] and gap[1] <= end for start, end in ranges)
+    
+    @classmethod
+    def _missing_ranges(
+        cls,
+        view,
+        start_time: int,
+        end_time: int,
+        interval_ms: int,
+        empty: List[tuple] = ()
+    ) -> List[tuple]:
+        """
+        Ranges (epoch ms, inclusive) a stored series lacks for [start_time, end_time]
+        
+        The head is covered when the first candle opens within one interval of
+        start_time. Consecutive candles more than one interval apart leave a
+        hole (appends after an earlier window was stored). The tail is stale
+        once a newer candle has opened; it is refetched from the last stored
+        candle, which may have been stored while still open. Head ranges and
+        holes inside one of the `empty` ranges (known to have no candles at
+        the exchange) are not missing.
+        """
+        if view is None or len(view) == 0:
+            return [(start_time, end_time)]
+        missing = []
+        if view.first_timestamp > start_time + interval_ms:
+            missing.append((start_time, view.first_timestamp - 1))
+        timestamps = np.asarray(view.timestamp)
+        for i in np.flatnonzero(np.diff(timestamps) > interval_ms):
+            missing.append((int(timestamps[i]) + interval_ms, int(timestamps[i + 1]) - 1))
+        missing = [gap for gap in missing if not cls._covered(gap, empty)]
+        if view.last_timestamp + interval_ms <= end_time:
+            missing.append((view.last_timestamp, end_time))
+        return missing
+    
+    async def _fetch_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        exchange: str,
+        start_time: int,
+        end_time: int
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch candles of a range in chunks (max 1000 candles per request)
         
-        while current_start < end_time:
+        Returns:
+            (candles, complete); complete is False when a request failed
+        """
+        candles_out = []
+        current_start = start_time
+        while current_start <= end_time:
             try:
                 result = await self.trading_service.get_trading_ohlcv(
                     symbol=symbol,
@@ -408,7 +540,7 @@ class BacktestingService:
                 if not candles:
                     break
                 
-                all_candles.extend(candles)
+                candles_out.extend(candles)
                 
                 # Update start time for next chunk
                 last_timestamp = candles[-1]["timestamp"]
@@ -419,20 +551,8 @@ class BacktestingService:
             
             except Exception as e:
                 logger.error(f"Error fetching historical data: {e}")
-                break
-        
-        # Convert to DataFrame
-        if all_candles:
-            df = pd.DataFrame(all_candles)
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            df = df.sort_index()
-            
-            logger.info(f"✅ Fetched {len(df)} candles for {symbol} ({days} days)")
-            return df
-        else:
-            logger.warning(f"No historical data fetched for {symbol}")
-            return pd.DataFrame()
+                return candles_out, False
+        return candles_out, True
     
     async def run_backtest(
         self,
@@ -492,7 +612,52 @@ class BacktestingService:
         
         return results
     
-    def _backtest_sma_crossover(self, df: pd.DataFrame, initial_capital: float) -> Dict[str, Any]:
+    async def start_parameter_sweep(
+        self,
+        symbol: str,
+        strategy: str,
+        parameters: Dict[str, Any],
+        timeframe: str = "1h",
+        days: int = 30,
+        exchange: str = "binance",
+        initial_capital: float = 10000.0
+    ) -> SweepJob:
+        """
+        Start a grid search over strategy parameters
+        
+        The history is fetched once and shared by every combination;
+        evaluation runs in the background on the sweep process pool.
+        
+        Args:
+            symbol: Trading pair
+            strategy: Strategy name ("sma_crossover", "rsi", "macd")
+            parameters: Parameter name -> list of values or {"start", "stop", "step"}
+            timeframe: Timeframe
+            days: Historical data period
+            exchange: Exchange name
+            initial_capital: Initial capital for backtesting
+        
+        Returns:
+            The running SweepJob (see get_sweep_manager())
+        """
+        # Validate before fetching any data
+        build_grid(strategy, parameters)
+        
+        df = await self.fetch_historical_data(symbol, timeframe, days, exchange)
+        if df.empty:
+            raise ValueError(f"No historical data available for {symbol}")
+        
+        interval_ms = TIMEFRAME_MS.get(timeframe, 3_600_000)
+        return get_sweep_manager().start(
+            strategy,
+            parameters,
+            df["close"].to_numpy(dtype=np.float64),
+            initial_capital=initial_capital,
+            periods_per_year=365 * 86_400_000 / interval_ms,
+            meta={"symbol": symbol, "exchange": exchange, "timeframe": timeframe, "days": days}
+        )
+    
+    def _backtest_sma_crossover(self, df: "pd.DataFrame", initial_capital: float) -> Dict[str, Any]:
         """Simple Moving Average Crossover strategy"""
         # Calculate SMAs
         df['sma_fast'] = df['close'].rolling(window=10).mean()
@@ -526,7 +691,7 @@ class BacktestingService:
             "candles_analyzed": len(df)
         }
     
-    def _backtest_rsi(self, df: pd.DataFrame, initial_capital: float) -> Dict[str, Any]:
+    def _backtest_rsi(self, df: "pd.DataFrame", initial_capital: float) -> Dict[str, Any]:
         """RSI strategy"""
         # Calculate RSI
         delta = df['close'].diff()
@@ -561,7 +726,7 @@ class BacktestingService:
             "candles_analyzed": len(df)
         }
     
-    def _backtest_macd(self, df: pd.DataFrame, initial_capital: float) -> Dict[str, Any]:
+    def _backtest_macd(self, df: "pd.DataFrame", initial_capital: float) -> Dict[str, Any]:
         """MACD strategy"""
         # Calculate MACD
         ema_fast = df['close'].ewm(span=12, adjust=False).mean()
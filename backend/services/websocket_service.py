@@ -10,6 +10,8 @@ from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 from collections import defaultdict
 
+from backend.services.ws_hub import ALL_CHANNELS, ChannelHub
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +31,9 @@ class ConnectionManager:
         # Connection metadata
         self.connection_metadata: Dict[str, Dict[str, Any]] = {}
 
+        # Per-client send queues; messages are encoded once per broadcast
+        self.hub = ChannelHub("websocket_service")
+
     async def connect(self, websocket: WebSocket, client_id: str, metadata: Optional[Dict] = None):
         """
         Connect a new WebSocket client
@@ -41,6 +46,7 @@ class ConnectionManager:
         await websocket.accept()
         self.active_connections[client_id] = websocket
         self.connection_metadata[client_id] = metadata or {}
+        self.hub.register(client_id, websocket.send_text, on_close=self.disconnect)
 
         logger.info(f"Client {client_id} connected. Total connections: {len(self.active_connections)}")
 
@@ -53,6 +59,7 @@ class ConnectionManager:
         """
         if client_id in self.active_connections:
             del self.active_connections[client_id]
+        self.hub.unregister(client_id)
 
         # Remove all subscriptions for this client
         for api_id in self.client_subscriptions.get(client_id, set()).copy():
@@ -76,6 +83,7 @@ class ConnectionManager:
         """
         self.subscriptions[api_id].add(client_id)
         self.client_subscriptions[client_id].add(api_id)
+        self.hub.subscribe(client_id, api_id)
 
         logger.debug(f"Client {client_id} subscribed to {api_id}")
 
@@ -96,6 +104,7 @@ class ConnectionManager:
 
         if client_id in self.client_subscriptions:
             self.client_subscriptions[client_id].discard(api_id)
+        self.hub.unsubscribe(client_id, api_id)
 
         logger.debug(f"Client {client_id} unsubscribed from {api_id}")
 
@@ -107,6 +116,7 @@ class ConnectionManager:
             client_id: Client identifier
         """
         self.client_subscriptions[client_id].add('*')
+        self.hub.subscribe(client_id, ALL_CHANNELS)
         logger.debug(f"Client {client_id} subscribed to all updates")
 
     async def send_personal_message(self, message: Dict[str, Any], client_id: str):
@@ -118,12 +128,7 @@ class ConnectionManager:
             client_id: Target client identifier
         """
         if client_id in self.active_connections:
-            websocket = self.active_connections[client_id]
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending message to {client_id}: {e}")
-                self.disconnect(client_id)
+            self.hub.send(client_id, message)
 
     async def broadcast(self, message: Dict[str, Any], api_id: Optional[str] = None):
         """
@@ -133,33 +138,9 @@ class ConnectionManager:
             message: Message data
             api_id: Optional API ID (broadcasts to all if None)
         """
-        if api_id:
-            # Send to clients subscribed to this specific API
-            target_clients = self.subscriptions.get(api_id, set())
-
-            # Also include clients subscribed to all updates
-            target_clients = target_clients.union(
-                {cid for cid, subs in self.client_subscriptions.items() if '*' in subs}
-            )
-        else:
-            # Broadcast to all connected clients
-            target_clients = set(self.active_connections.keys())
-
-        # Send to all target clients
-        disconnected_clients = []
-
-        for client_id in target_clients:
-            if client_id in self.active_connections:
-                websocket = self.active_connections[client_id]
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to {client_id}: {e}")
-                    disconnected_clients.append(client_id)
-
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
+        # Encoded once and queued per client (subscribers of '*' included);
+        # clients whose sends fail are disconnected by the hub
+        self.hub.publish(api_id, message)
 
     async def broadcast_api_update(self, api_id: str, data: Dict[str, Any], metadata: Optional[Dict] = None):
         """
@@ -0,0 +1,127 @@
+"""
+Snapshot + Delta WebSocket Streams
+Keeps the last broadcast state of a stream and turns each new state into a
+patch containing only the fields that changed.
+
+Protocol (per stream, e.g. market_data):
+    {"type": "market_data", "snapshot": true, "seq": 41, "data": {...full state...}}
+        sent to a client when it subscribes or asks for it
+        ({"action": "get_snapshot", "service": "market_data"})
+    {"type": "market_data_delta", "seq": 42, "base_seq": 41,
+     "data": {"prices": {"BTC": 64123.5}}, "removed": {"prices": ["XRP"]}}
+        broadcast when something changed; "removed" only when keys vanished
+
+A client applies a delta only when base_seq equals the seq it holds and asks
+for a new snapshot otherwise (a gap means it missed or dropped an update).
+A tick where nothing changed sends nothing.
+
+State is two levels deep: section -> key -> value.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+State = Dict[str, Dict[str, Any]]
+
+_MISSING = object()
+
+
+def diff_state(old: State, new: State) -> Tuple[State, Dict[str, List[str]]]:
+    """
+    Compare two states
+
+    Returns:
+        (changed or added values per section, removed keys per section)
+    """
+    changes: State = {}
+    removed: Dict[str, List[str]] = {}
+
+    for section, values in new.items():
+        previous = old.get(section, {})
+        changed = {key: value for key, value in values.items() if previous.get(key, _MISSING) != value}
+        if changed:
+            changes[section] = changed
+        gone = [key for key in previous if key not in values]
+        if gone:
+            removed[section] = gone
+
+    for section, previous in old.items():
+        if section not in new and previous:
+            removed[section] = list(previous)
+
+    return changes, removed
+
+
+def apply_delta(state: State, delta: Dict[str, Any]) -> State:
+    """Apply a delta message to a state (what a client does); returns a new state"""
+    result = {section: dict(values) for section, values in state.items()}
+    for section, values in delta.get("data", {}).items():
+        result.setdefault(section, {}).update(values)
+    for section, keys in delta.get("removed", {}).items():
+        for key in keys:
+            result.get(section, {}).pop(key, None)
+    return result
+
+
+class DeltaStream:
+    """
+    Last-sent state and sequence number of one broadcast stream
+
+    Args:
+        message_type: Message type of snapshots; deltas use "<type>_delta"
+    """
+
+    def __init__(self, message_type: str):
+        self.message_type = message_type
+        self.state: State = {}
+        self.meta: Dict[str, Any] = {}
+        self.seq = 0
+        self.updated_at: Optional[str] = None
+        self.unchanged_ticks = 0
+
+    def update(self, state: State, **meta) -> Optional[Dict[str, Any]]:
+        """
+        Record a new state
+
+        Args:
+            state: Full new state
+            **meta: Extra fields carried on snapshots and deltas (e.g. source);
+                changes to these alone do not produce a delta
+
+        Returns:
+            Delta message, or None when nothing changed
+        """
+        changes, removed = diff_state(self.state, state)
+        self.meta = meta
+        if not changes and not removed:
+            self.unchanged_ticks += 1
+            return None
+
+        self.state = {section: dict(values) for section, values in state.items()}
+        self.seq += 1
+        self.updated_at = datetime.utcnow().isoformat()
+
+        message = {
+            "type": f"{self.message_type}_delta",
+            "seq": self.seq,
+            "base_seq": self.seq - 1,
+            "data": changes,
+            **meta,
+            "timestamp": self.updated_at,
+        }
+        if removed:
+            message["removed"] = removed
+        return message
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Full-state message at the current seq (None before the first update)"""
+        if not self.seq:
+            return None
+        return {
+            "type": self.message_type,
+            "snapshot": True,
+            "seq": self.seq,
+            "data": self.state,
+            **self.meta,
+            "timestamp": self.updated_at,
+        }
@@ -0,0 +1,473 @@
+"""
+WebSocket Channel Hub
+Fan-out-once delivery shared by the WebSocket managers
+
+Each published message is JSON-encoded once and handed to every subscriber's
+bounded send queue; a writer task per client drains its queue, so one slow or
+stuck socket never delays the others. When a client falls behind, a pending
+update for the same channel is replaced by the newer one (coalesced) and,
+once the queue is full, the oldest pending message is dropped.
+
+Channels with a producer are fetched by a single task per channel while they
+have subscribers, however many clients are listening.
+
+Clients that registered a binary sender may switch to msgpack frames
+(optional dependency); a message is encoded at most once per encoding.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from utils.logger import setup_logger
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+logger = setup_logger("ws_hub")
+
+WS_CLIENT_QUEUE_SIZE = int(os.getenv("WS_CLIENT_QUEUE_SIZE", "64"))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+
+# Subscribers of this channel receive every channel's messages
+ALL_CHANNELS = "*"
+
+
+ENCODINGS = ("json", "msgpack") if MSGPACK_AVAILABLE else ("json",)
+
+
+def encode_message(message: Any, encoding: str = "json"):
+    """Encode a message once for every recipient (str for json, bytes for msgpack)"""
+    if encoding == "msgpack":
+        return msgpack.packb(message, default=str, use_bin_type=True)
+    return json.dumps(message, default=str, separators=(",", ":"), ensure_ascii=False)
+
+
+class HubClient:
+    """
+    One connected socket with its bounded send queue
+
+    Args:
+        client_id: Client identifier
+        send: Coroutine function sending one text frame (e.g. websocket.send_text)
+        send_bytes: Coroutine function sending one binary frame (needed for msgpack)
+        queue_size: Pending messages kept before the oldest is dropped
+        send_timeout: Seconds a single send may take before the client is closed
+        context: Manager-specific object (used by publish predicates)
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        send: Callable[[str], Awaitable[Any]],
+        send_bytes: Optional[Callable[[bytes], Awaitable[Any]]] = None,
+        queue_size: int = WS_CLIENT_QUEUE_SIZE,
+        send_timeout: float = WS_SEND_TIMEOUT,
+        context: Any = None
+    ):
+        self.client_id = client_id
+        self.send = send
+        self.send_bytes = send_bytes
+        self.encoding = "json"
+        self.queue_size = max(1, queue_size)
+        self.send_timeout = send_timeout
+        self.context = context
+        self.channels: Set[str] = set()
+        self.closed = False
+
+        # Entries are [key, payload]; keyed entries may be coalesced in place
+        self._queue: Deque[List[Any]] = deque()
+        self._pending: Dict[str, List[Any]] = {}
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._on_error: Optional[Callable[["HubClient"], None]] = None
+
+        self.sent = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def start(self, on_error: Optional[Callable[["HubClient"], None]] = None):
+        self._on_error = on_error
+        self._task = asyncio.create_task(self._writer())
+
+    def enqueue(self, payload, key: Optional[str] = None) -> bool:
+        """
+        Queue an encoded frame without waiting
+
+        Args:
+            payload: Encoded message (bytes are sent as a binary frame)
+            key: Coalescing key (channel); None for messages that must not be merged
+
+        Returns:
+            False if the client is closed
+        """
+        if self.closed:
+            return False
+
+        if key is not None and key in self._pending:
+            self._pending[key][1] = payload
+            self.coalesced += 1
+            return True
+
+        if len(self._queue) >= self.queue_size:
+            old_key, _ = self._queue.popleft()
+            if old_key is not None:
+                self._pending.pop(old_key, None)
+            self.dropped += 1
+
+        entry = [key, payload]
+        self._queue.append(entry)
+        if key is not None:
+            self._pending[key] = entry
+        self._ready.set()
+        return True
+
+    async def _writer(self):
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                key, payload = self._queue.popleft()
+                if key is not None:
+                    self._pending.pop(key, None)
+                send = self.send_bytes if isinstance(payload, bytes) else self.send
+                await asyncio.wait_for(send(payload), self.send_timeout)
+                self.sent += 1
+                self.bytes_sent += len(payload)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"Send to {self.client_id} failed: {type(e).__name__}: {e}")
+            self.closed = True
+            if self._on_error:
+                self._on_error(self)
+
+    def close(self) -> Optional[asyncio.Task]:
+        """Stop the writer; returns the cancelled task for callers that want to await it"""
+        self.closed = True
+        self._queue.clear()
+        self._pending.clear()
+        task, self._task = self._task, None
+        if task and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+            return task
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "channels": sorted(self.channels),
+            "encoding": self.encoding,
+            "queued": len(self._queue),
+            "sent": self.sent,
+            "bytes_sent": self.bytes_sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+
+class ChannelHub:
+    """
+    Channel subscriptions, encode-once publishing and shared channel producers
+
+    Args:
+        name: Name used in logs
+        fetch: Optional coroutine fetch(channel) -> message or None; when set,
+            one producer task per subscribed channel publishes its result
+        interval: Seconds between producer fetches
+        queue_size: Per-client send queue size
+        send_timeout: Per-send timeout
+    """
+
+    def __init__(
+        self,
+        name: str = "hub",
+        fetch: Optional[Callable[[str], Awaitable[Optional[Dict[str, Any]]]]] = None,
+        interval: float = 30.0,
+        queue_size: int = WS_CLIENT_QUEUE_SIZE,
+        send_timeout: float = WS_SEND_TIMEOUT
+    ):
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+
+        self.clients: Dict[str, HubClient] = {}
+        self.channels: Dict[str, Set[str]] = {}
+        self._on_close: Dict[str, Callable[[str], Awaitable[Any]]] = {}
+
+        self._producers: Dict[str, asyncio.Task] = {}
+        self._latest: Dict[str, tuple] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cleanup_tasks: Set[asyncio.Task] = set()
+
+        self.published = 0
+        self.fetches = 0
+
+    # ------------------------------------------------------------------
+    # Clients and subscriptions
+    # ------------------------------------------------------------------
+
+    def register(
+        self,
+        client_id: str,
+        send: Callable[[str], Awaitable[Any]],
+        context: Any = None,
+        on_close: Optional[Callable[[str], Any]] = None,
+        send_bytes: Optional[Callable[[bytes], Awaitable[Any]]] = None
+    ) -> HubClient:
+        """
+        Register a connected client and start its writer task
+
+        Args:
+            client_id: Client identifier
+            send: Coroutine function sending one encoded frame
+            context: Manager-specific object passed to publish predicates
+            on_close: Called (or awaited) with client_id when a send fails;
+                defaults to unregister
+            send_bytes: Coroutine function sending one binary frame (enables msgpack)
+
+        Returns:
+            The HubClient
+        """
+        if client_id in self.clients:
+            self.unregister(client_id)
+        client = HubClient(client_id, send, send_bytes, self.queue_size, self.send_timeout, context)
+        self.clients[client_id] = client
+        if on_close:
+            self._on_close[client_id] = on_close
+        client.start(on_error=self._send_failed)
+        return client
+
+    def unregister(self, client_id: str):
+        """Remove a client, its subscriptions and idle producers"""
+        client = self.clients.pop(client_id, None)
+        self._on_close.pop(client_id, None)
+        if not client:
+            return
+        for channel in list(client.channels):
+            self._remove_subscription(client, channel)
+        client.close()
+
+    def _send_failed(self, client: HubClient):
+        on_close = self._on_close.get(client.client_id)
+        if on_close is None:
+            self.unregister(client.client_id)
+            return
+        result = on_close(client.client_id)
+        if asyncio.iscoroutine(result):
+            task = asyncio.create_task(result)
+            self._cleanup_tasks.add(task)
+            task.add_done_callback(self._cleanup_tasks.discard)
+
+    def set_encoding(self, client_id: str, encoding: str) -> bool:
+        """
+        Choose a client's frame encoding
+
+        Returns:
+            False if the encoding is unknown, unavailable or needs a binary sender
+        """
+        client = self.clients.get(client_id)
+        if client is None or encoding not in ENCODINGS:
+            return False
+        if encoding != "json" and client.send_bytes is None:
+            return False
+        client.encoding = encoding
+        return True
+
+    def subscribe(self, client_id: str, channel: str) -> bool:
+        """Subscribe a client; starts the channel producer for its first subscriber"""
+        client = self.clients.get(client_id)
+        if not client:
+            return False
+        client.channels.add(channel)
+        self.channels.setdefault(channel, set()).add(client_id)
+        if self.fetch and channel != ALL_CHANNELS and channel not in self._producers:
+            self._producers[channel] = asyncio.create_task(self._produce(channel))
+        return True
+
+    def unsubscribe(self, client_id: str, channel: str):
+        client = self.clients.get(client_id)
+        if client:
+            self._remove_subscription(client, channel)
+
+    def _remove_subscription(self, client: HubClient, channel: str):
+        client.channels.discard(channel)
+        subscribers = self.channels.get(channel)
+        if subscribers is None:
+            return
+        subscribers.discard(client.client_id)
+        if not subscribers:
+            del self.channels[channel]
+            producer = self._producers.pop(channel, None)
+            if producer:
+                producer.cancel()
+            self._latest.pop(channel, None)
+
+    def subscribers(self, channel: str) -> Set[str]:
+        """Client IDs receiving messages published on a channel"""
+        targets = self.channels.get(channel, set())
+        everything = self.channels.get(ALL_CHANNELS)
+        if everything and channel != ALL_CHANNELS:
+            return targets | everything
+        return targets
+
+    def has_subscribers(self, channel: str) -> bool:
+        return bool(self.channels.get(channel) or self.channels.get(ALL_CHANNELS))
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(
+        self,
+        channel: Optional[str],
+        message: Any,
+        predicate: Optional[Callable[[HubClient], bool]] = None,
+        coalesce: bool = True
+    ) -> int:
+        """
+        Encode a message once (per encoding in use) and queue it for every subscriber
+
+        Args:
+            channel: Channel name; None sends to every registered client
+            message: JSON-serializable message (or an already encoded str)
+            predicate: Optional per-client filter
+            coalesce: Let a newer message on the channel replace an unsent one
+
+        Returns:
+            Number of clients the message was queued for
+        """
+        if channel is None:
+            targets = self.clients.keys()
+        else:
+            targets = self.subscribers(channel)
+        if not targets:
+            return 0
+
+        payloads = {}
+        key = channel if coalesce else None
+        queued = 0
+        for client_id in list(targets):
+            client = self.clients.get(client_id)
+            if client is None or (predicate and not predicate(client)):
+                continue
+            payload = payloads.get(client.encoding)
+            if payload is None:
+                payload = payloads[client.encoding] = self._encode(message, client.encoding)
+            if client.enqueue(payload, key):
+                queued += 1
+        self.published += 1
+        return queued
+
+    def send(self, client_id: str, message: Any) -> bool:
+        """Queue a message for one client (never coalesced)"""
+        client = self.clients.get(client_id)
+        if not client:
+            return False
+        return client.enqueue(self._encode(message, client.encoding))
+
+    @staticmethod
+    def _encode(message: Any, encoding: str):
+        # Pre-encoded text is passed through unchanged
+        if isinstance(message, (str, bytes)):
+            return message
+        return encode_message(message, encoding)
+
+    # ------------------------------------------------------------------
+    # Shared channel producers
+    # ------------------------------------------------------------------
+
+    async def current(self, channel: str) -> Optional[Dict[str, Any]]:
+        """
+        Latest producer message for a channel
+
+        Served from the last fetch while it is younger than the interval;
+        concurrent callers share one in-flight fetch.
+        """
+        latest = self._latest.get(channel)
+        if latest and time.monotonic() - latest[0] < self.interval:
+            return latest[1]
+        return await self._fetch_shared(channel)
+
+    async def _fetch_shared(self, channel: str) -> Optional[Dict[str, Any]]:
+        inflight = self._inflight.get(channel)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[channel] = future
+        try:
+            self.fetches += 1
+            message = await self.fetch(channel)
+            if message is not None and self.has_subscribers(channel):
+                self._latest[channel] = (time.monotonic(), message)
+            future.set_result(message)
+            return message
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved: callers sharing the fetch re-raise it themselves
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(channel, None)
+
+    async def _produce(self, channel: str):
+        """Refresh a channel every interval and publish it to its subscribers"""
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    message = await self._fetch_shared(channel)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"[{self.name}] update failed for {channel}: {e}")
+                    continue
+                if message is not None:
+                    self.publish(channel, message)
+        except asyncio.CancelledError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Lifecycle and stats
+    # ------------------------------------------------------------------
+
+    async def close(self):
+        """Stop producers and writer tasks"""
+        producers = list(self._producers.values())
+        self._producers.clear()
+        for task in producers:
+            task.cancel()
+        writers = [self.clients[client_id].close() for client_id in list(self.clients)]
+        self.clients.clear()
+        self.channels.clear()
+        self._on_close.clear()
+        await asyncio.gather(*producers, *[w for w in writers if w], return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        clients = list(self.clients.values())
+        return {
+            "clients": len(clients),
+            "channels": {channel: len(ids) for channel, ids in self.channels.items()},
+            "producers": sorted(self._producers),
+            "published": self.published,
+            "fetches": self.fetches,
+            "queued": sum(len(c._queue) for c in clients),
+            "bytes_sent": sum(c.bytes_sent for c in clients),
+            "dropped": sum(c.dropped for c in clients),
+            "coalesced": sum(c.coalesced for c in clients),
+        }
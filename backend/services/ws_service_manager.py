@@ -13,6 +13,8 @@ from fastapi import WebSocket, WebSocketDisconnect
 from enum import Enum
 import logging
 
+from backend.services.ws_hub import ALL_CHANNELS, ENCODINGS, ChannelHub
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,9 +46,10 @@ class ServiceType(str, Enum):
 class WebSocketConnection:
     """Represents a single WebSocket connection with subscription management"""
 
-    def __init__(self, websocket: WebSocket, client_id: str):
+    def __init__(self, websocket: WebSocket, client_id: str, hub: Optional[ChannelHub] = None):
         self.websocket = websocket
         self.client_id = client_id
+        self.hub = hub
         self.subscriptions: Set[ServiceType] = set()
         self.connected_at = datetime.utcnow()
         self.last_activity = datetime.utcnow()
@@ -56,9 +59,17 @@ class WebSocketConnection:
         """
         Send a message to the client
 
+        With a hub the message is queued on the client's send queue, so
+        replies stay ordered with broadcasts.
+
         Returns:
             bool: True if successful, False if failed
         """
+        if self.hub is not None:
+            sent = self.hub.send(self.client_id, message)
+            if sent:
+                self.last_activity = datetime.utcnow()
+            return sent
         try:
             await self.websocket.send_json(message)
             self.last_activity = datetime.utcnow()
@@ -67,14 +78,22 @@ class WebSocketConnection:
             logger.error(f"Error sending message to client {self.client_id}: {e}")
             return False
 
+    @staticmethod
+    def _channel(service: ServiceType) -> str:
+        return ALL_CHANNELS if service == ServiceType.ALL else service.value
+
     def subscribe(self, service: ServiceType):
         """Subscribe to a service"""
         self.subscriptions.add(service)
+        if self.hub is not None:
+            self.hub.subscribe(self.client_id, self._channel(service))
         logger.info(f"Client {self.client_id} subscribed to {service.value}")
 
     def unsubscribe(self, service: ServiceType):
         """Unsubscribe from a service"""
         self.subscriptions.discard(service)
+        if self.hub is not None:
+            self.hub.unsubscribe(self.client_id, self._channel(service))
         logger.info(f"Client {self.client_id} unsubscribed from {service.value}")
 
     def is_subscribed(self, service: ServiceType) -> bool:
@@ -90,9 +109,26 @@ class WebSocketServiceManager:
     def __init__(self):
         self.connections: Dict[str, WebSocketConnection] = {}
         self.service_handlers: Dict[ServiceType, List[Callable]] = {}
+        self.hub = ChannelHub("ws_service_manager")
+        # Full-state messages for services that broadcast deltas
+        self.snapshot_providers: Dict[ServiceType, Callable[[], Optional[Dict[str, Any]]]] = {}
         self._lock = asyncio.Lock()
         self._client_counter = 0
 
+    def register_snapshot_provider(
+        self,
+        service: ServiceType,
+        provider: Callable[[], Optional[Dict[str, Any]]]
+    ):
+        """
+        Register the snapshot sent to new subscribers of a delta-encoded service
+
+        Args:
+            service: The service type
+            provider: Returns the current snapshot message (or None if there is none yet)
+        """
+        self.snapshot_providers[service] = provider
+
     def generate_client_id(self) -> str:
         """Generate a unique client ID"""
         self._client_counter += 1
@@ -112,8 +148,12 @@ class WebSocketServiceManager:
         client_id = self.generate_client_id()
 
         async with self._lock:
-            connection = WebSocketConnection(websocket, client_id)
+            connection = WebSocketConnection(websocket, client_id, hub=self.hub)
             self.connections[client_id] = connection
+            self.hub.register(
+                client_id, websocket.send_text, context=connection,
+                on_close=self.disconnect, send_bytes=websocket.send_bytes
+            )
 
         logger.info(f"New WebSocket connection: {client_id}")
 
@@ -122,9 +162,15 @@ class WebSocketServiceManager:
             "type": "connection_established",
             "client_id": client_id,
             "timestamp": datetime.utcnow().isoformat(),
-            "available_services": [s.value for s in ServiceType]
+            "available_services": [s.value for s in ServiceType],
+            "encodings": list(ENCODINGS)
         })
 
+        # Clients may ask for compact binary frames with ?encoding=msgpack
+        encoding = websocket.query_params.get("encoding") if hasattr(websocket, "query_params") else None
+        if encoding:
+            await self._set_encoding(connection, encoding)
+
         return connection
 
     async def disconnect(self, client_id: str):
@@ -137,6 +183,7 @@ class WebSocketServiceManager:
         async with self._lock:
             if client_id in self.connections:
                 connection = self.connections[client_id]
+                self.hub.unregister(client_id)
                 try:
                     await connection.websocket.close()
                 except:
@@ -167,20 +214,58 @@ class WebSocketServiceManager:
             "timestamp": datetime.utcnow().isoformat()
         }
 
-        disconnected_clients = []
+        # Encoded once and queued per subscriber; failed sends disconnect
+        predicate = (lambda client: filter_func(client.context)) if filter_func else None
+        self.hub.publish(service.value, message, predicate=predicate)
 
-        async with self._lock:
-            for client_id, connection in self.connections.items():
-                # Check subscription and optional filter
-                if connection.is_subscribed(service):
-                    if filter_func is None or filter_func(connection):
-                        success = await connection.send_message(message)
-                        if not success:
-                            disconnected_clients.append(client_id)
-
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            await self.disconnect(client_id)
+    async def broadcast_to_service(
+        self,
+        service: ServiceType,
+        payload: Dict[str, Any],
+        coalesce: bool = True
+    ):
+        """
+        Broadcast a complete payload (with its own type/timestamp) to a service's subscribers
+
+        Args:
+            service: The service sending the message
+            payload: Message body; the service name is added
+            coalesce: Let a newer payload replace one a slow client has not received
+                yet (disable for deltas, where every message matters)
+        """
+        self.hub.publish(service.value, {"service": service.value, **payload}, coalesce=coalesce)
+
+    async def send_snapshots(self, connection: WebSocketConnection, service: ServiceType) -> int:
+        """
+        Send the current snapshot of a delta-encoded service (all of them for 'all')
+
+        Returns:
+            Number of snapshots sent
+        """
+        services = list(self.snapshot_providers) if service == ServiceType.ALL else [service]
+        sent = 0
+        for target in services:
+            provider = self.snapshot_providers.get(target)
+            snapshot = provider() if provider else None
+            if snapshot is not None:
+                await connection.send_message({"service": target.value, **snapshot})
+                sent += 1
+        return sent
+
+    async def _set_encoding(self, connection: WebSocketConnection, encoding: str) -> bool:
+        if self.hub.set_encoding(connection.client_id, encoding):
+            connection.metadata["encoding"] = encoding
+            return True
+        await connection.send_message({
+            "service": "system",
+            "type": "error",
+            "data": {
+                "message": f"Unsupported encoding: {encoding}",
+                "encodings": list(ENCODINGS)
+            },
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        return False
 
     async def send_to_client(
         self,
@@ -201,16 +286,15 @@ class WebSocketServiceManager:
         Returns:
             bool: True if successful
         """
-        async with self._lock:
-            if client_id in self.connections:
-                connection = self.connections[client_id]
-                message = {
-                    "service": service.value,
-                    "type": message_type,
-                    "data": data,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                return await connection.send_message(message)
+        if client_id in self.connections:
+            connection = self.connections[client_id]
+            message = {
+                "service": service.value,
+                "type": message_type,
+                "data": data,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            return await connection.send_message(message)
         return False
 
     async def handle_client_message(
@@ -223,8 +307,10 @@ class WebSocketServiceManager:
 
         Expected message format:
         {
-            "action": "subscribe" | "unsubscribe" | "get_status" | "ping",
-            "service": "service_name" (for subscribe/unsubscribe),
+            "action": "subscribe" | "unsubscribe" | "get_snapshot" | "set_encoding"
+                      | "get_status" | "ping",
+            "service": "service_name" (for subscribe/unsubscribe/get_snapshot),
+            "encoding": "json" | "msgpack" (for set_encoding),
             "data": {} (optional additional data)
         }
         """
@@ -245,6 +331,8 @@ class WebSocketServiceManager:
                         },
                         "timestamp": datetime.utcnow().isoformat()
                     })
+                    # Delta-encoded services start from a full snapshot
+                    await self.send_snapshots(connection, service)
                 except ValueError:
                     await connection.send_message({
                         "service": "system",
@@ -293,6 +381,30 @@ class WebSocketServiceManager:
                 "timestamp": datetime.utcnow().isoformat()
             })
 
+        elif action == "get_snapshot":
+            # Sent by clients that detected a sequence gap
+            try:
+                service = ServiceType(message.get("service"))
+            except ValueError:
+                service = None
+            if service is None or not await self.send_snapshots(connection, service):
+                await connection.send_message({
+                    "service": "system",
+                    "type": "error",
+                    "data": {"message": f"No snapshot for service: {message.get('service')}"},
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+
+        elif action == "set_encoding":
+            encoding = message.get("encoding", "json")
+            if await self._set_encoding(connection, encoding):
+                await connection.send_message({
+                    "service": "system",
+                    "type": "encoding_changed",
+                    "data": {"encoding": encoding},
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+
         elif action == "ping":
             await connection.send_message({
                 "service": "system",
@@ -307,7 +419,9 @@ class WebSocketServiceManager:
                 "type": "error",
                 "data": {
                     "message": f"Unknown action: {action}",
-                    "supported_actions": ["subscribe", "unsubscribe", "get_status", "ping"]
+                    "supported_actions": [
+                        "subscribe", "unsubscribe", "get_snapshot", "set_encoding", "get_status", "ping"
+                    ]
                 },
                 "timestamp": datetime.utcnow().isoformat()
             })
@@ -330,16 +444,8 @@ class WebSocketServiceManager:
 
         while True:
             try:
-                # Check if anyone is subscribed
-                has_subscribers = False
-                async with self._lock:
-                    for connection in self.connections.values():
-                        if connection.is_subscribed(service):
-                            has_subscribers = True
-                            break
-
                 # Only fetch data if there are subscribers
-                if has_subscribers:
+                if self.hub.has_subscribers(service.value):
                     data = await data_generator()
                     if data:
                         await self.broadcast(
@@ -377,7 +483,8 @@ class WebSocketServiceManager:
                 }
                 for conn in self.connections.values()
             ],
-            "subscription_counts": subscription_counts
+            "subscription_counts": subscription_counts,
+            "hub": self.hub.stats()
         }
 
 
@@ -10,10 +10,12 @@ from datetime import datetime
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
 
 from backend.services.data_collector_service import DataCollectorService
 from database.models import Base
+from database.sqlite_tuning import apply_sqlite_profile
 from utils.logger import setup_logger
 
 logger = setup_logger("background_worker")
@@ -55,6 +57,8 @@ class BackgroundCollectorWorker:
                 echo=False,
                 future=True
             )
+            # Same WAL / busy-timeout profile as the API's engines
+            apply_sqlite_profile(self.engine.sync_engine)
             
             # Create tables if they don't exist
             async with self.engine.begin() as conn:
@@ -233,6 +237,12 @@ class BackgroundCollectorWorker:
         self.stop()
         
         if self.engine:
+            if self.engine.dialect.name == "sqlite":
+                try:
+                    async with self.engine.connect() as conn:
+                        await conn.execute(text("PRAGMA optimize"))
+                except Exception as e:
+                    logger.warning(f"PRAGMA optimize failed: {e}")
             await self.engine.dispose()
             logger.info("✓ Database connection closed")
     
@@ -314,7 +314,7 @@ class DataPersistence:
         Returns:
             Number of whale transactions saved
         """
-        saved_count = 0
+        pending = []
 
         for result in results:
             if not result.get('success', False):
@@ -350,21 +350,23 @@ class DataPersistence:
                         from_address = tx.get('from', {}).get('address', '') if isinstance(tx.get('from'), dict) else ''
                         to_address = tx.get('to', {}).get('address', '') if isinstance(tx.get('to'), dict) else ''
 
-                        db_manager.save_whale_transaction(
-                            blockchain=tx.get('blockchain', 'unknown'),
-                            transaction_hash=tx.get('hash', ''),
-                            from_address=from_address,
-                            to_address=to_address,
-                            amount=float(tx.get('amount', 0)),
-                            amount_usd=float(tx.get('amount_usd', 0)),
-                            source=provider,
-                            timestamp=timestamp
-                        )
-                        saved_count += 1
+                        pending.append({
+                            'blockchain': tx.get('blockchain', 'unknown'),
+                            'transaction_hash': tx.get('hash', ''),
+                            'from_address': from_address,
+                            'to_address': to_address,
+                            'amount': float(tx.get('amount', 0)),
+                            'amount_usd': float(tx.get('amount_usd', 0)),
+                            'source': provider,
+                            'timestamp': timestamp
+                        })
 
             except Exception as e:
                 logger.error(f"Error saving whale data from {provider}: {e}", exc_info=True)
 
+        # One transaction for the whole batch; known hashes are skipped
+        saved_count = db_manager.save_whale_transactions_bulk(pending)
+
         self.stats['whale_txs_saved'] += saved_count
         if saved_count > 0:
             logger.info(f"Saved {saved_count} whale transactions to database")
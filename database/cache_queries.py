@@ -11,7 +11,8 @@ CRITICAL RULES:
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
-from sqlalchemy import desc, and_, func
+from sqlalchemy import desc, and_, func, text
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 
 from database.models import CachedMarketData, CachedOHLC
@@ -20,6 +21,9 @@ from utils.logger import setup_logger
 
 logger = setup_logger("cache_queries")
 
+# Conflict target for OHLC upserts (declared on CachedOHLC as well)
+OHLC_UNIQUE_INDEX = "ux_cached_ohlc_symbol_interval_timestamp"
+
 
 class CacheQueries:
     """
@@ -30,6 +34,7 @@ class CacheQueries:
     
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self._ohlc_index_ready = False
     
     def get_cached_market_data(
         self,
@@ -53,7 +58,7 @@ class CacheQueries:
             List of dictionaries with REAL market data from database
         """
         try:
-            with self.db.get_session() as session:
+            with self.db.get_read_session() as session:
                 # Subquery to get latest fetched_at for each symbol
                 subq = session.query(
                     CachedMarketData.symbol,
@@ -127,7 +132,7 @@ class CacheQueries:
             List of dictionaries with REAL OHLC data from database
         """
         try:
-            with self.db.get_session() as session:
+            with self.db.get_read_session() as session:
                 # Query for OHLC data
                 query = session.query(CachedOHLC).filter(
                     and_(
@@ -194,30 +199,64 @@ class CacheQueries:
         Returns:
             bool: True if saved successfully
         """
+        saved = self.save_market_data_bulk([{
+            "symbol": symbol,
+            "price": price,
+            "market_cap": market_cap,
+            "volume_24h": volume_24h,
+            "change_24h": change_24h,
+            "high_24h": high_24h,
+            "low_24h": low_24h,
+            "provider": provider
+        }])
+        return saved == 1
+    
+    def save_market_data_bulk(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Save many market data records in a single transaction
+        
+        CRITICAL: Only used by background workers to store REAL API data
+        
+        Malformed records (missing symbol/price) are skipped and logged.
+        
+        Args:
+            records: Dictionaries with symbol, price, provider and the optional
+                market_cap/volume_24h/change_24h/high_24h/low_24h fields
+            
+        Returns:
+            int: Number of records saved (0 on error)
+        """
+        if not records:
+            return 0
+        
         try:
+            fetched_at = datetime.utcnow()
+            rows = self._valid_rows(records, "market data", lambda data: {
+                "symbol": self._required(data, "symbol"),
+                "price": float(self._required(data, "price")),
+                "market_cap": data.get("market_cap"),
+                "volume_24h": data.get("volume_24h"),
+                "change_24h": data.get("change_24h"),
+                "high_24h": data.get("high_24h"),
+                "low_24h": data.get("low_24h"),
+                "provider": data.get("provider") or "unknown",
+                "fetched_at": fetched_at
+            })
+            if not rows:
+                return 0
+            
             with self.db.get_session() as session:
-                # Create new record with REAL data
-                record = CachedMarketData(
-                    symbol=symbol,
-                    price=price,
-                    market_cap=market_cap,
-                    volume_24h=volume_24h,
-                    change_24h=change_24h,
-                    high_24h=high_24h,
-                    low_24h=low_24h,
-                    provider=provider,
-                    fetched_at=datetime.utcnow()
-                )
-                
-                session.add(record)
+                # Market data keeps history per symbol, so this is a plain
+                # multi-row insert (one transaction, one fsync)
+                session.execute(insert(CachedMarketData), rows)
                 session.commit()
-                
-                logger.info(f"Saved market data for {symbol} from {provider}")
-                return True
+            
+            logger.info(f"Saved {len(rows)} market data records")
+            return len(rows)
                 
         except Exception as e:
-            logger.error(f"Error saving market data for {symbol}: {e}", exc_info=True)
-            return False
+            logger.error(f"Error saving market data batch: {e}", exc_info=True)
+            return 0
     
     def save_ohlc_candle(
         self,
@@ -250,55 +289,143 @@ class CacheQueries:
         Returns:
             bool: True if saved successfully
         """
+        saved = self.save_ohlc_candles_bulk([{
+            "symbol": symbol,
+            "interval": interval,
+            "timestamp": timestamp,
+            "open": open_price,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+            "provider": provider
+        }])
+        return saved == 1
+    
+    def save_ohlc_candles_bulk(self, candles: List[Dict[str, Any]]) -> int:
+        """
+        Upsert many OHLC candles in a single transaction
+        
+        Uses INSERT ... ON CONFLICT(symbol, interval, timestamp) DO UPDATE, so
+        re-fetched candles replace the stored values instead of duplicating them.
+        
+        CRITICAL: Only used by background workers to store REAL candle data
+        
+        Malformed candles (missing keys, non-numeric prices) are skipped and
+        logged.
+        
+        Args:
+            candles: Dictionaries with symbol, interval, timestamp, open, high,
+                low, close, volume and provider (OHLC worker format)
+            
+        Returns:
+            int: Number of candles written (0 on error)
+        """
+        if not candles:
+            return 0
+        
         try:
+            fetched_at = datetime.utcnow()
+            rows = self._valid_rows(candles, "OHLC candle", lambda data: {
+                "symbol": self._required(data, "symbol"),
+                "interval": self._required(data, "interval"),
+                "timestamp": self._required(data, "timestamp"),
+                **{
+                    column: float(self._required(data, column))
+                    for column in ("open", "high", "low", "close", "volume")
+                },
+                "provider": data.get("provider") or "unknown",
+                "fetched_at": fetched_at
+            })
+            if not rows:
+                return 0
+            
+            stmt = insert(CachedOHLC)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["symbol", "interval", "timestamp"],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ("open", "high", "low", "close", "volume", "provider", "fetched_at")
+                }
+            )
+            
             with self.db.get_session() as session:
-                # Check if candle already exists
-                existing = session.query(CachedOHLC).filter(
-                    and_(
-                        CachedOHLC.symbol == symbol,
-                        CachedOHLC.interval == interval,
-                        CachedOHLC.timestamp == timestamp
-                    )
-                ).first()
-                
-                if existing:
-                    # Update existing candle
-                    existing.open = open_price
-                    existing.high = high
-                    existing.low = low
-                    existing.close = close
-                    existing.volume = volume
-                    existing.provider = provider
-                    existing.fetched_at = datetime.utcnow()
-                else:
-                    # Create new candle with REAL data
-                    record = CachedOHLC(
-                        symbol=symbol,
-                        interval=interval,
-                        timestamp=timestamp,
-                        open=open_price,
-                        high=high,
-                        low=low,
-                        close=close,
-                        volume=volume,
-                        provider=provider,
-                        fetched_at=datetime.utcnow()
-                    )
-                    session.add(record)
-                
+                self._ensure_ohlc_unique_index(session)
+                session.execute(stmt, rows)
                 session.commit()
-                
-                logger.debug(f"Saved OHLC candle for {symbol} {interval} at {timestamp}")
-                return True
+            self._ohlc_index_ready = True
+            
+            logger.debug(f"Upserted {len(rows)} OHLC candles")
+            return len(rows)
                 
         except Exception as e:
-            logger.error(f"Error saving OHLC candle for {symbol}: {e}", exc_info=True)
-            return False
+            logger.error(f"Error saving OHLC candle batch: {e}", exc_info=True)
+            return 0
+    
+    @staticmethod
+    def _required(data: Dict[str, Any], key: str) -> Any:
+        """Value of a required record field (ValueError if missing or empty)"""
+        value = data.get(key)
+        if value is None or value == "":
+            raise ValueError(f"missing {key}")
+        return value
+    
+    def _valid_rows(self, records: List[Dict[str, Any]], kind: str, build) -> List[Dict[str, Any]]:
+        """
+        Build insert rows, skipping records that fail validation
+        
+        Args:
+            records: Input records
+            kind: Record kind for log messages
+            build: Maps one record to a row (raises on malformed input)
+            
+        Returns:
+            Rows of the valid records
+        """
+        rows = []
+        for data in records:
+            try:
+                rows.append(build(data))
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                symbol = data.get("symbol") if isinstance(data, dict) else None
+                logger.warning(f"Skipping malformed {kind} record for {symbol}: {e}")
+        return rows
+    
+    def _ensure_ohlc_unique_index(self, session: Session):
+        """
+        Make sure the (symbol, interval, timestamp) unique index exists
+        
+        Tables created before the index was added to the model may hold
+        duplicate candles; those are collapsed to the most recent row first
+        (only when the index has to be created).
+        """
+        if self._ohlc_index_ready:
+            return
+        
+        exists = session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"),
+            {"name": OHLC_UNIQUE_INDEX}
+        ).first()
+        if exists:
+            return
+        
+        logger.info(f"Creating {OHLC_UNIQUE_INDEX} (collapsing duplicate candles first)")
+        session.execute(text(
+            "DELETE FROM cached_ohlc WHERE id NOT IN ("
+            "SELECT MAX(id) FROM cached_ohlc GROUP BY symbol, interval, timestamp)"
+        ))
+        session.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {OHLC_UNIQUE_INDEX} "
+            "ON cached_ohlc (symbol, interval, timestamp)"
+        ))
     
     def cleanup_old_data(self, days: int = 7) -> Dict[str, int]:
         """
         Remove old cached data to manage storage
         
+        Deletes in short batches so cache writers are not blocked for the
+        whole cleanup (see DatabaseManager.delete_in_batches).
+        
         Args:
             days: Remove data older than N days
             
@@ -306,28 +433,22 @@ class CacheQueries:
             Dictionary with counts of deleted records
         """
         try:
-            with self.db.get_session() as session:
-                cutoff_time = datetime.utcnow() - timedelta(days=days)
-                deleted_counts = {}
-                
-                # Clean old market data
-                deleted = session.query(CachedMarketData).filter(
-                    CachedMarketData.fetched_at < cutoff_time
-                ).delete()
-                deleted_counts['market_data'] = deleted
-                
-                # Clean old OHLC data
-                deleted = session.query(CachedOHLC).filter(
-                    CachedOHLC.fetched_at < cutoff_time
-                ).delete()
-                deleted_counts['ohlc'] = deleted
-                
-                session.commit()
-                
-                total_deleted = sum(deleted_counts.values())
-                logger.info(f"Cleaned up {total_deleted} old cache records (older than {days} days)")
-                
-                return deleted_counts
+            cutoff_time = datetime.utcnow() - timedelta(days=days)
+            deleted_counts = {
+                'market_data': self.db.delete_in_batches(
+                    CachedMarketData, CachedMarketData.fetched_at < cutoff_time
+                ),
+                'ohlc': self.db.delete_in_batches(
+                    CachedOHLC, CachedOHLC.fetched_at < cutoff_time
+                ),
+            }
+            
+            total_deleted = sum(deleted_counts.values())
+            if total_deleted:
+                self.db.reclaim_space()
+            logger.info(f"Cleaned up {total_deleted} old cache records (older than {days} days)")
+            
+            return deleted_counts
                 
         except Exception as e:
             logger.error(f"Error cleaning up old data: {e}", exc_info=True)
@@ -6,6 +6,7 @@ Extends DatabaseManager with methods to access collected cryptocurrency data
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from sqlalchemy import desc, func, and_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from database.models import (
@@ -84,7 +85,7 @@ class DataAccessMixin:
         try:
             cutoff_time = datetime.now() - timedelta(seconds=max_age_seconds)
             
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 # Get recent market prices
                 prices = session.query(MarketPrice).filter(
                     MarketPrice.timestamp >= cutoff_time
@@ -163,7 +164,7 @@ class DataAccessMixin:
     def get_latest_prices(self, limit: int = 100) -> List[MarketPrice]:
         """Get latest prices for all cryptocurrencies"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 # Get latest price for each symbol
                 subquery = (
                     session.query(
@@ -197,7 +198,7 @@ class DataAccessMixin:
     def get_latest_price_by_symbol(self, symbol: str) -> Optional[MarketPrice]:
         """Get latest price for a specific cryptocurrency"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 price = (
                     session.query(MarketPrice)
                     .filter(MarketPrice.symbol == symbol.upper())
@@ -213,7 +214,7 @@ class DataAccessMixin:
     def get_price_history(self, symbol: str, hours: int = 24) -> List[MarketPrice]:
         """Get price history for a cryptocurrency"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff = datetime.utcnow() - timedelta(hours=hours)
                 
                 history = (
@@ -275,7 +276,7 @@ class DataAccessMixin:
     ) -> List[NewsArticle]:
         """Get latest news articles"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 query = session.query(NewsArticle)
                 
                 if source:
@@ -300,7 +301,7 @@ class DataAccessMixin:
     def get_news_by_id(self, news_id: int) -> Optional[NewsArticle]:
         """Get a specific news article by ID"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 article = session.query(NewsArticle).filter(NewsArticle.id == news_id).first()
                 return article
         
@@ -363,7 +364,7 @@ class DataAccessMixin:
     def get_latest_sentiment(self) -> Optional[SentimentMetric]:
         """Get latest sentiment metric"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 metric = (
                     session.query(SentimentMetric)
                     .order_by(desc(SentimentMetric.timestamp))
@@ -378,7 +379,7 @@ class DataAccessMixin:
     def get_sentiment_history(self, hours: int = 168) -> List[SentimentMetric]:
         """Get sentiment history"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff = datetime.utcnow() - timedelta(hours=hours)
                 
                 history = (
@@ -442,6 +443,59 @@ class DataAccessMixin:
             logger.error(f"Error saving whale transaction: {e}", exc_info=True)
             return None
 
+    def save_whale_transactions_bulk(self, transactions: List[Dict[str, Any]]) -> int:
+        """
+        Save many whale transactions in a single transaction
+
+        Uses INSERT ... ON CONFLICT(transaction_hash) DO NOTHING, so already
+        stored transactions are skipped without a lookup per row. Malformed
+        transactions (missing fields, non-numeric amounts) are skipped and
+        logged.
+
+        Args:
+            transactions: Dictionaries with the save_whale_transaction fields
+
+        Returns:
+            Number of new transactions stored
+        """
+        rows = []
+        now = datetime.utcnow()
+        for tx in transactions:
+            try:
+                rows.append({
+                    "blockchain": tx["blockchain"],
+                    "transaction_hash": tx["transaction_hash"],
+                    "from_address": tx["from_address"],
+                    "to_address": tx["to_address"],
+                    "amount": float(tx["amount"]),
+                    "amount_usd": float(tx["amount_usd"]),
+                    "source": tx["source"],
+                    "timestamp": tx.get("timestamp") or now,
+                    "created_at": now
+                })
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                tx_hash = tx.get("transaction_hash") if isinstance(tx, dict) else None
+                logger.warning(f"Skipping malformed whale transaction record for {tx_hash}: {e}")
+        if not rows:
+            return 0
+
+        try:
+            with self.get_session() as session:
+                # Core execution on the session connection reports rowcount
+                result = session.connection().execute(
+                    sqlite_insert(WhaleTransaction).on_conflict_do_nothing(
+                        index_elements=["transaction_hash"]
+                    ),
+                    rows
+                )
+                inserted = max(result.rowcount, 0)
+            logger.debug(f"Saved {inserted} new whale transactions ({len(rows) - inserted} duplicates)")
+            return inserted
+
+        except Exception as e:
+            logger.error(f"Error saving whale transactions: {e}", exc_info=True)
+            return 0
+
     def get_whale_transactions(
         self,
         limit: int = 50,
@@ -450,7 +504,7 @@ class DataAccessMixin:
     ) -> List[WhaleTransaction]:
         """Get recent whale transactions"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 query = session.query(WhaleTransaction)
                 
                 if blockchain:
@@ -475,7 +529,7 @@ class DataAccessMixin:
     def get_whale_stats(self, hours: int = 24) -> Dict[str, Any]:
         """Get whale activity statistics"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff = datetime.utcnow() - timedelta(hours=hours)
                 
                 transactions = (
@@ -558,7 +612,7 @@ class DataAccessMixin:
     def get_latest_gas_prices(self) -> Dict[str, Any]:
         """Get latest gas prices for all blockchains"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 # Get latest gas price for each blockchain
                 subquery = (
                     session.query(
@@ -635,7 +689,7 @@ class DataAccessMixin:
     def get_blockchain_stats(self) -> Dict[str, Any]:
         """Get latest blockchain statistics"""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 # Get latest stat for each blockchain
                 subquery = (
                     session.query(
@@ -7,6 +7,7 @@ from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
 from config import config
 from database.models import Base, Provider, ProviderStatusEnum
+from database.sqlite_tuning import apply_sqlite_profile
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,7 @@ engine = create_engine(
     config.DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in config.DATABASE_URL else {}
 )
+apply_sqlite_profile(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
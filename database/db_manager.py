@@ -4,12 +4,13 @@ Provides comprehensive database operations for the crypto API monitoring system
 """
 
 import os
+import time
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 
-from sqlalchemy import create_engine, func, and_, or_, desc, text
+from sqlalchemy import func, and_, or_, desc, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
@@ -35,11 +36,21 @@ from database.models import (
     BlockchainStat
 )
 from database.data_access import DataAccessMixin
+from database.sqlite_tuning import create_sqlite_engines, get_sqlite_profile, incremental_vacuum, optimize_sqlite
+from database.stats_rollup import (
+    ROLLUP_SOURCES, compact_source, prune_rollups, reset_if_empty, rollup_totals, sum_totals
+)
 from utils.logger import setup_logger
 
 # Initialize logger
 logger = setup_logger("db_manager", level="INFO")
 
+# Retention deletes this many rows per write transaction, then pauses so
+# queued writers get the lock
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+RETENTION_PAUSE = float(os.getenv("RETENTION_PAUSE_MS", "10")) / 1000
+VACUUM_STEP_PAGES = 1024  # 4 MB per incremental vacuum step with 4 KB pages
+
 
 class DatabaseManager(DataAccessMixin):
     """
@@ -47,33 +58,43 @@ class DatabaseManager(DataAccessMixin):
     Handles all database operations with proper error handling and logging
     """
 
-    def __init__(self, db_path: str = "data/api_monitor.db"):
+    def __init__(self, db_path: str = "data/api_monitor.db", profile: Optional[str] = None):
         """
         Initialize database manager
 
         Args:
             db_path: Path to SQLite database file
+            profile: SQLite tuning profile (default: SQLITE_PROFILE env, "performance")
         """
         self.db_path = db_path
         self._ensure_data_directory()
+        self.profile = get_sqlite_profile(profile)
 
-        # Create SQLAlchemy engine
+        # Writer engine plus a query_only engine for reads (same engine when
+        # the profile has no read pool)
         db_url = f"sqlite:///{self.db_path}"
-        self.engine = create_engine(
+        self.engine, self.read_engine = create_sqlite_engines(
             db_url,
-            echo=False,  # Set to True for SQL debugging
-            connect_args={"check_same_thread": False}  # SQLite specific
+            self.profile,
+            echo=False  # Set to True for SQL debugging
         )
 
-        # Create session factory
+        # Create session factories
         self.SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
             bind=self.engine,
             expire_on_commit=False  # Allow access to attributes after commit
         )
+        self.ReadSessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=self.read_engine,
+            expire_on_commit=False
+        )
+
 
-        logger.info(f"Database manager initialized with database: {self.db_path}")
+        logger.info(f"Database manager initialized with database: {self.db_path} (profile: {self.profile.name})")
 
     def _ensure_data_directory(self):
         """Ensure the data directory exists"""
@@ -104,6 +125,35 @@ class DatabaseManager(DataAccessMixin):
         finally:
             session.close()
 
+    @contextmanager
+    def get_read_session(self) -> Session:
+        """
+        Context manager for read-only sessions
+        Uses the read pool, so it never waits for the writer
+
+        Yields:
+            SQLAlchemy session (query_only connection)
+        """
+        session = self.ReadSessionLocal()
+        try:
+            yield session
+        finally:
+            # close() ends the read transaction without expiring loaded objects
+            session.close()
+
+    def optimize(self) -> bool:
+        """
+        Run PRAGMA optimize and release pooled connections (call on shutdown)
+
+        Returns:
+            True if optimize ran
+        """
+        optimized = optimize_sqlite(self.engine)
+        self.engine.dispose()
+        if self.read_engine is not self.engine:
+            self.read_engine.dispose()
+        return optimized
+
     def init_database(self) -> bool:
         """
         Initialize database by creating all tables
@@ -113,6 +163,10 @@ class DatabaseManager(DataAccessMixin):
         """
         try:
             Base.metadata.create_all(bind=self.engine)
+            # create_all skips indexes added to tables that already exist
+            for source in ROLLUP_SOURCES.values():
+                for index in source.model.__table__.indexes:
+                    index.create(bind=self.engine, checkfirst=True)
             logger.info("Database tables created successfully")
             return True
         except SQLAlchemyError as e:
@@ -204,7 +258,7 @@ class DatabaseManager(DataAccessMixin):
             Provider object or None if not found
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 if provider_id:
                     provider = session.query(Provider).filter(Provider.id == provider_id).first()
                 elif name:
@@ -232,7 +286,7 @@ class DatabaseManager(DataAccessMixin):
             List of Provider objects
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 query = session.query(Provider)
 
                 if category:
@@ -382,7 +436,7 @@ class DatabaseManager(DataAccessMixin):
             List of ConnectionAttempt objects
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
                 query = session.query(ConnectionAttempt).filter(
                     ConnectionAttempt.timestamp >= cutoff_time
@@ -484,7 +538,7 @@ class DatabaseManager(DataAccessMixin):
             List of DataCollection objects
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
                 query = session.query(DataCollection).filter(
                     DataCollection.actual_fetch_time >= cutoff_time
@@ -571,7 +625,7 @@ class DatabaseManager(DataAccessMixin):
             List of RateLimitUsage objects
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
                 query = session.query(RateLimitUsage).filter(
                     RateLimitUsage.timestamp >= cutoff_time
@@ -647,7 +701,7 @@ class DatabaseManager(DataAccessMixin):
             ScheduleConfig object or None if not found
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 config = session.query(ScheduleConfig).filter(
                     ScheduleConfig.provider_id == provider_id
                 ).first()
@@ -702,7 +756,7 @@ class DatabaseManager(DataAccessMixin):
             List of ScheduleConfig objects
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 query = session.query(ScheduleConfig)
 
                 if enabled_only:
@@ -781,7 +835,7 @@ class DatabaseManager(DataAccessMixin):
             List of ScheduleCompliance objects
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
                 query = session.query(ScheduleCompliance).filter(
                     ScheduleCompliance.timestamp >= cutoff_time
@@ -874,7 +928,7 @@ class DatabaseManager(DataAccessMixin):
             List of FailureLog objects
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
                 query = session.query(FailureLog).filter(
                     FailureLog.timestamp >= cutoff_time
@@ -958,7 +1012,7 @@ class DatabaseManager(DataAccessMixin):
             List of Alert objects
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
                 query = session.query(Alert).filter(
                     Alert.timestamp >= cutoff_time
@@ -1075,7 +1129,7 @@ class DatabaseManager(DataAccessMixin):
             List of SystemMetrics objects
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
                 metrics = session.query(SystemMetrics).filter(
                     SystemMetrics.timestamp >= cutoff_time
@@ -1097,7 +1151,7 @@ class DatabaseManager(DataAccessMixin):
             Latest SystemMetrics object or None
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 metrics = session.query(SystemMetrics).order_by(
                     desc(SystemMetrics.timestamp)
                 ).first()
@@ -1113,10 +1167,40 @@ class DatabaseManager(DataAccessMixin):
     # Advanced Analytics Methods
     # ============================================================================
 
+    def compact_stats(self) -> Dict[str, int]:
+        """
+        Roll new connection/collection/failure logs into the stats rollups
+
+        Run by the scheduler job and before retention; the stats reads never
+        compact (they add the raw tail past the watermark instead).
+
+        Returns:
+            Raw rows compacted per source
+        """
+        compacted = {}
+        try:
+            for name in ROLLUP_SOURCES:
+                compacted[name] = 0
+                while True:
+                    # One transaction per batch keeps the write lock short
+                    with self.get_session() as session:
+                        count = compact_source(session, name)
+                    compacted[name] += count
+                    if count == 0:
+                        break
+            with self.get_session() as session:
+                prune_rollups(session)
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to compact provider stats: {str(e)}", exc_info=True)
+        return compacted
+
     def get_provider_stats(self, provider_id: int, hours: int = 24) -> Dict[str, Any]:
         """
         Get comprehensive statistics for a provider
 
+        Reads the minute/hour rollups plus the not yet compacted raw rows,
+        so the cost does not grow with the window or the retention.
+
         Args:
             provider_id: Provider ID
             hours: Time window in hours
@@ -1125,7 +1209,7 @@ class DatabaseManager(DataAccessMixin):
             Dictionary with provider statistics
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
 
                 # Get provider info
@@ -1133,40 +1217,22 @@ class DatabaseManager(DataAccessMixin):
                 if not provider:
                     return {}
 
-                # Connection attempt stats
-                connection_stats = session.query(
-                    func.count(ConnectionAttempt.id).label('total_attempts'),
-                    func.sum(func.case((ConnectionAttempt.status == 'success', 1), else_=0)).label('successful'),
-                    func.sum(func.case((ConnectionAttempt.status == 'failed', 1), else_=0)).label('failed'),
-                    func.sum(func.case((ConnectionAttempt.status == 'timeout', 1), else_=0)).label('timeout'),
-                    func.sum(func.case((ConnectionAttempt.status == 'rate_limited', 1), else_=0)).label('rate_limited'),
-                    func.avg(ConnectionAttempt.response_time_ms).label('avg_response_time')
-                ).filter(
-                    ConnectionAttempt.provider_id == provider_id,
-                    ConnectionAttempt.timestamp >= cutoff_time
-                ).first()
-
-                # Data collection stats
-                collection_stats = session.query(
-                    func.count(DataCollection.id).label('total_collections'),
-                    func.sum(DataCollection.record_count).label('total_records'),
-                    func.sum(DataCollection.payload_size_bytes).label('total_bytes'),
-                    func.avg(DataCollection.data_quality_score).label('avg_quality'),
-                    func.avg(DataCollection.staleness_minutes).label('avg_staleness')
-                ).filter(
-                    DataCollection.provider_id == provider_id,
-                    DataCollection.actual_fetch_time >= cutoff_time
-                ).first()
+                connection_stats = sum_totals(
+                    rollup_totals(session, 'connection_attempts', cutoff_time, provider_id=provider_id)
+                )
+                collection_stats = sum_totals(
+                    rollup_totals(session, 'data_collections', cutoff_time, provider_id=provider_id)
+                )
+                failure_stats = sum_totals(
+                    rollup_totals(session, 'failure_logs', cutoff_time, provider_id=provider_id)
+                )
 
-                # Failure stats
-                failure_count = session.query(func.count(FailureLog.id)).filter(
-                    FailureLog.provider_id == provider_id,
-                    FailureLog.timestamp >= cutoff_time
-                ).scalar()
+                def mean(total: str, count: str, stats: Dict[str, float]) -> float:
+                    return stats.get(total, 0) / stats[count] if stats.get(count) else 0
 
                 # Calculate success rate
-                total_attempts = connection_stats.total_attempts or 0
-                successful = connection_stats.successful or 0
+                total_attempts = int(connection_stats.get('attempts', 0))
+                successful = int(connection_stats.get('successful', 0))
                 success_rate = (successful / total_attempts * 100) if total_attempts > 0 else 0
 
                 return {
@@ -1176,20 +1242,22 @@ class DatabaseManager(DataAccessMixin):
                     'connection_stats': {
                         'total_attempts': total_attempts,
                         'successful': successful,
-                        'failed': connection_stats.failed or 0,
-                        'timeout': connection_stats.timeout or 0,
-                        'rate_limited': connection_stats.rate_limited or 0,
+                        'failed': int(connection_stats.get('failed', 0)),
+                        'timeout': int(connection_stats.get('timeout', 0)),
+                        'rate_limited': int(connection_stats.get('rate_limited', 0)),
                         'success_rate': round(success_rate, 2),
-                        'avg_response_time_ms': round(connection_stats.avg_response_time or 0, 2)
+                        'avg_response_time_ms': round(
+                            mean('response_time_sum', 'response_time_count', connection_stats), 2
+                        )
                     },
                     'data_collection_stats': {
-                        'total_collections': collection_stats.total_collections or 0,
-                        'total_records': collection_stats.total_records or 0,
-                        'total_bytes': collection_stats.total_bytes or 0,
-                        'avg_quality_score': round(collection_stats.avg_quality or 0, 2),
-                        'avg_staleness_minutes': round(collection_stats.avg_staleness or 0, 2)
+                        'total_collections': int(collection_stats.get('collections', 0)),
+                        'total_records': int(collection_stats.get('records', 0)),
+                        'total_bytes': int(collection_stats.get('payload_bytes', 0)),
+                        'avg_quality_score': round(mean('quality_sum', 'quality_count', collection_stats), 2),
+                        'avg_staleness_minutes': round(mean('staleness_sum', 'staleness_count', collection_stats), 2)
                     },
-                    'failure_count': failure_count or 0
+                    'failure_count': int(failure_stats.get('failures', 0))
                 }
         except SQLAlchemyError as e:
             logger.error(f"Failed to get provider stats: {str(e)}", exc_info=True)
@@ -1206,48 +1274,42 @@ class DatabaseManager(DataAccessMixin):
             Dictionary with failure analysis
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 cutoff_time = datetime.utcnow() - timedelta(hours=hours)
 
-                # Failures by error type
-                error_type_stats = session.query(
-                    FailureLog.error_type,
-                    func.count(FailureLog.id).label('count')
-                ).filter(
-                    FailureLog.timestamp >= cutoff_time
-                ).group_by(FailureLog.error_type).all()
-
-                # Failures by provider
-                provider_stats = session.query(
-                    Provider.name,
-                    func.count(FailureLog.id).label('count')
-                ).join(
-                    FailureLog, Provider.id == FailureLog.provider_id
-                ).filter(
-                    FailureLog.timestamp >= cutoff_time
-                ).group_by(Provider.name).order_by(desc('count')).limit(10).all()
+                totals = rollup_totals(session, 'failure_logs', cutoff_time, group_by=('provider_id', 'error_type'))
 
-                # Retry statistics
-                retry_stats = session.query(
-                    func.sum(func.case((FailureLog.retry_attempted == True, 1), else_=0)).label('total_retries'),
-                    func.sum(func.case((FailureLog.retry_result == 'success', 1), else_=0)).label('successful_retries')
-                ).filter(
-                    FailureLog.timestamp >= cutoff_time
-                ).first()
+                # Failures by error type and by provider
+                by_error_type: Dict[str, int] = {}
+                by_provider: Dict[int, int] = {}
+                for (provider_id, error_type), counters in totals.items():
+                    by_error_type[error_type] = by_error_type.get(error_type, 0) + int(counters['failures'])
+                    by_provider[provider_id] = by_provider.get(provider_id, 0) + int(counters['failures'])
+
+                names = dict(
+                    session.query(Provider.id, Provider.name).filter(Provider.id.in_(list(by_provider))).all()
+                ) if by_provider else {}
+                top_providers = sorted(
+                    ((names[pid], count) for pid, count in by_provider.items() if pid in names),
+                    key=lambda item: item[1],
+                    reverse=True
+                )[:10]
 
-                total_retries = retry_stats.total_retries or 0
-                successful_retries = retry_stats.successful_retries or 0
+                # Retry statistics
+                retry_stats = sum_totals(totals)
+                total_retries = int(retry_stats.get('retries', 0))
+                successful_retries = int(retry_stats.get('successful_retries', 0))
                 retry_success_rate = (successful_retries / total_retries * 100) if total_retries > 0 else 0
 
                 return {
                     'time_window_hours': hours,
                     'failures_by_error_type': [
-                        {'error_type': stat.error_type, 'count': stat.count}
-                        for stat in error_type_stats
+                        {'error_type': error_type, 'count': count}
+                        for error_type, count in by_error_type.items()
                     ],
                     'top_failing_providers': [
-                        {'provider': stat.name, 'failure_count': stat.count}
-                        for stat in provider_stats
+                        {'provider': name, 'failure_count': count}
+                        for name, count in top_providers
                     ],
                     'retry_statistics': {
                         'total_retries': total_retries,
@@ -1356,72 +1418,115 @@ class DatabaseManager(DataAccessMixin):
             logger.error(f"Failed to get recent logs: {str(e)}", exc_info=True)
             return []
 
+    def delete_in_batches(
+        self,
+        model,
+        condition,
+        batch_size: Optional[int] = None,
+        pause: Optional[float] = None
+    ) -> int:
+        """
+        Delete matching rows in short write transactions
+
+        Candidate ids are read on the read pool (no write lock), then each
+        batch is deleted by id in its own transaction, pausing in between so
+        collectors' writes interleave instead of waiting for one big DELETE.
+
+        Args:
+            model: Model class (must have an integer `id` primary key)
+            condition: SQLAlchemy filter selecting the rows to delete
+            batch_size: Rows per transaction (default RETENTION_BATCH_SIZE)
+            pause: Seconds to yield between batches (default RETENTION_PAUSE)
+
+        Returns:
+            Number of rows deleted
+        """
+        batch_size = batch_size or RETENTION_BATCH_SIZE
+        pause = RETENTION_PAUSE if pause is None else pause
+        deleted = 0
+        while True:
+            with self.get_read_session() as session:
+                ids = [row[0] for row in session.query(model.id).filter(condition).limit(batch_size).all()]
+            if not ids:
+                break
+            with self.get_session() as session:
+                # Re-check the condition: rows may have changed since the read
+                batch_deleted = session.query(model).filter(
+                    model.id.in_(ids), condition
+                ).delete(synchronize_session=False)
+            deleted += batch_deleted
+            if len(ids) < batch_size or batch_deleted == 0:
+                break
+            time.sleep(pause)
+        return deleted
+
+    def reclaim_space(self, max_pages: Optional[int] = None) -> int:
+        """
+        Release free pages with incremental vacuum, a few MB per transaction
+
+        Args:
+            max_pages: Stop after this many pages (default: all free pages)
+
+        Returns:
+            Pages released (0 unless the file uses auto_vacuum=INCREMENTAL)
+        """
+        released = 0
+        while max_pages is None or released < max_pages:
+            step = VACUUM_STEP_PAGES if max_pages is None else min(VACUUM_STEP_PAGES, max_pages - released)
+            with self.get_session() as session:
+                pages = incremental_vacuum(session.connection(), step)
+            released += pages
+            if pages < step:
+                break
+            time.sleep(RETENTION_PAUSE)
+        return released
+
     def cleanup_old_data(self, days: int = 30) -> Dict[str, int]:
         """
         Remove old records from the database to manage storage
 
+        Deletes in batches (see delete_in_batches) so the write lock is only
+        held for one batch at a time, then releases the freed pages.
+
         Args:
             days: Remove records older than N days
 
         Returns:
             Dictionary with count of deleted records per table
         """
+        # Roll up first so the provider stats keep the deleted history
+        self.compact_stats()
         try:
-            with self.get_session() as session:
-                cutoff_time = datetime.utcnow() - timedelta(days=days)
-                deleted_counts = {}
-
-                # Clean connection attempts
-                deleted = session.query(ConnectionAttempt).filter(
-                    ConnectionAttempt.timestamp < cutoff_time
-                ).delete()
-                deleted_counts['connection_attempts'] = deleted
-
-                # Clean data collections
-                deleted = session.query(DataCollection).filter(
-                    DataCollection.actual_fetch_time < cutoff_time
-                ).delete()
-                deleted_counts['data_collections'] = deleted
-
-                # Clean rate limit usage
-                deleted = session.query(RateLimitUsage).filter(
-                    RateLimitUsage.timestamp < cutoff_time
-                ).delete()
-                deleted_counts['rate_limit_usage'] = deleted
-
-                # Clean schedule compliance
-                deleted = session.query(ScheduleCompliance).filter(
-                    ScheduleCompliance.timestamp < cutoff_time
-                ).delete()
-                deleted_counts['schedule_compliance'] = deleted
-
-                # Clean failure logs
-                deleted = session.query(FailureLog).filter(
-                    FailureLog.timestamp < cutoff_time
-                ).delete()
-                deleted_counts['failure_logs'] = deleted
-
-                # Clean acknowledged alerts
-                deleted = session.query(Alert).filter(
-                    and_(
-                        Alert.timestamp < cutoff_time,
-                        Alert.acknowledged == True
-                    )
-                ).delete()
-                deleted_counts['alerts'] = deleted
-
-                # Clean system metrics
-                deleted = session.query(SystemMetrics).filter(
-                    SystemMetrics.timestamp < cutoff_time
-                ).delete()
-                deleted_counts['system_metrics'] = deleted
-
-                session.commit()
-
-                total_deleted = sum(deleted_counts.values())
-                logger.info(f"Cleaned up {total_deleted} old records (older than {days} days)")
+            cutoff_time = datetime.utcnow() - timedelta(days=days)
+            retention = {
+                'connection_attempts': (ConnectionAttempt, ConnectionAttempt.timestamp < cutoff_time),
+                'data_collections': (DataCollection, DataCollection.actual_fetch_time < cutoff_time),
+                'rate_limit_usage': (RateLimitUsage, RateLimitUsage.timestamp < cutoff_time),
+                'schedule_compliance': (ScheduleCompliance, ScheduleCompliance.timestamp < cutoff_time),
+                'failure_logs': (FailureLog, FailureLog.timestamp < cutoff_time),
+                # Only acknowledged alerts
+                'alerts': (Alert, and_(Alert.timestamp < cutoff_time, Alert.acknowledged == True)),
+                'system_metrics': (SystemMetrics, SystemMetrics.timestamp < cutoff_time),
+            }
 
-                return deleted_counts
+            deleted_counts = {
+                table: self.delete_in_batches(model, condition)
+                for table, (model, condition) in retention.items()
+            }
+            # Emptied log tables reuse ids from 1: restart their rollup watermark
+            with self.get_session() as session:
+                for name in ROLLUP_SOURCES:
+                    if deleted_counts.get(name):
+                        reset_if_empty(session, name)
+
+            total_deleted = sum(deleted_counts.values())
+            released = self.reclaim_space() if total_deleted else 0
+            logger.info(
+                f"Cleaned up {total_deleted} old records (older than {days} days), "
+                f"released {released} free pages"
+            )
+
+            return deleted_counts
         except SQLAlchemyError as e:
             logger.error(f"Failed to cleanup old data: {str(e)}", exc_info=True)
             return {}
@@ -1434,7 +1539,7 @@ class DatabaseManager(DataAccessMixin):
             Dictionary with database statistics
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 stats = {
                     'providers': session.query(func.count(Provider.id)).scalar(),
                     'connection_attempts': session.query(func.count(ConnectionAttempt.id)).scalar(),
@@ -1466,7 +1571,7 @@ class DatabaseManager(DataAccessMixin):
             Dictionary with health check results
         """
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 # Test connection with a simple query
                 result = session.execute(text("SELECT 1")).scalar()
 
@@ -3,7 +3,7 @@ SQLAlchemy Database Models
 Defines all database tables for the crypto API monitoring system
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, Enum, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -81,6 +81,11 @@ class ConnectionAttempt(Base):
     # Relationships
     provider = relationship("Provider", back_populates="connection_attempts")
 
+    # Per-provider recent logs (ORDER BY timestamp DESC LIMIT n)
+    __table_args__ = (
+        Index('ix_connection_attempts_provider_timestamp', 'provider_id', 'timestamp'),
+    )
+
 
 class DataCollection(Base):
     """Data collections table"""
@@ -102,6 +107,10 @@ class DataCollection(Base):
     # Relationships
     provider = relationship("Provider", back_populates="data_collections")
 
+    __table_args__ = (
+        Index('ix_data_collections_provider_fetch_time', 'provider_id', 'actual_fetch_time'),
+    )
+
 
 class RateLimitUsage(Base):
     """Rate limit usage tracking table"""
@@ -167,6 +176,10 @@ class FailureLog(Base):
     retry_result = Column(String(100), nullable=True)
     remediation_applied = Column(String(255), nullable=True)
 
+    __table_args__ = (
+        Index('ix_failure_logs_provider_timestamp', 'provider_id', 'timestamp'),
+    )
+
 
 class Alert(Base):
     """Alerts table"""
@@ -198,6 +211,92 @@ class SystemMetrics(Base):
     system_health = Column(String(50), default="healthy")
 
 
+# ============================================================================
+# Provider Stats Rollup Tables
+# ============================================================================
+# Per-provider counters of connection_attempts / data_collections /
+# failure_logs, compacted into minute and hour buckets by
+# database.stats_rollup. Averages are stored as sum + count so buckets add up.
+
+class ProviderStatsRollupMixin:
+    """Counter columns shared by the minute and hour provider rollups"""
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    provider_id = Column(Integer, nullable=False)
+    bucket = Column(DateTime, nullable=False)  # Bucket start (UTC)
+    attempts = Column(Integer, default=0, nullable=False)
+    successful = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    timeout = Column(Integer, default=0, nullable=False)
+    rate_limited = Column(Integer, default=0, nullable=False)
+    response_time_sum = Column(Float, default=0, nullable=False)
+    response_time_count = Column(Integer, default=0, nullable=False)
+    collections = Column(Integer, default=0, nullable=False)
+    records = Column(Integer, default=0, nullable=False)
+    payload_bytes = Column(Integer, default=0, nullable=False)
+    quality_sum = Column(Float, default=0, nullable=False)
+    quality_count = Column(Integer, default=0, nullable=False)
+    staleness_sum = Column(Float, default=0, nullable=False)
+    staleness_count = Column(Integer, default=0, nullable=False)
+
+
+class FailureStatsRollupMixin:
+    """Counter columns shared by the minute and hour failure rollups"""
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    provider_id = Column(Integer, nullable=False)
+    bucket = Column(DateTime, nullable=False)
+    error_type = Column(String(100), nullable=False)
+    failures = Column(Integer, default=0, nullable=False)
+    retries = Column(Integer, default=0, nullable=False)
+    successful_retries = Column(Integer, default=0, nullable=False)
+
+
+class ProviderStatsMinute(ProviderStatsRollupMixin, Base):
+    """Provider counters per minute (kept for the recent edge of stats windows)"""
+    __tablename__ = 'provider_stats_minute'
+    __table_args__ = (
+        Index('ux_provider_stats_minute', 'provider_id', 'bucket', unique=True),
+        Index('ix_provider_stats_minute_bucket', 'bucket'),
+    )
+
+
+class ProviderStatsHour(ProviderStatsRollupMixin, Base):
+    """Provider counters per hour"""
+    __tablename__ = 'provider_stats_hour'
+    __table_args__ = (
+        Index('ux_provider_stats_hour', 'provider_id', 'bucket', unique=True),
+        Index('ix_provider_stats_hour_bucket', 'bucket'),
+    )
+
+
+class FailureStatsMinute(FailureStatsRollupMixin, Base):
+    """Failures per provider and error type per minute"""
+    __tablename__ = 'failure_stats_minute'
+    __table_args__ = (
+        Index('ux_failure_stats_minute', 'provider_id', 'bucket', 'error_type', unique=True),
+        Index('ix_failure_stats_minute_bucket', 'bucket'),
+    )
+
+
+class FailureStatsHour(FailureStatsRollupMixin, Base):
+    """Failures per provider and error type per hour"""
+    __tablename__ = 'failure_stats_hour'
+    __table_args__ = (
+        Index('ux_failure_stats_hour', 'provider_id', 'bucket', 'error_type', unique=True),
+        Index('ix_failure_stats_hour_bucket', 'bucket'),
+    )
+
+
+class StatsRollupState(Base):
+    """Compaction watermark per raw log table (last rolled-up id)"""
+    __tablename__ = 'stats_rollup_state'
+
+    source = Column(String(100), primary_key=True)
+    last_id = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class SourcePool(Base):
     """Source pools for intelligent rotation"""
     __tablename__ = 'source_pools'
@@ -421,8 +520,9 @@ class CachedOHLC(Base):
     
     # Composite index for fast queries
     __table_args__ = (
-        # Unique constraint to prevent duplicate candles
-        # (symbol, interval, timestamp) should be unique
+        # Unique constraint to prevent duplicate candles; also the conflict
+        # target for bulk upserts (see CacheQueries.save_ohlc_candles_bulk)
+        Index('ux_cached_ohlc_symbol_interval_timestamp', 'symbol', 'interval', 'timestamp', unique=True),
     )
 
 
@@ -0,0 +1,252 @@
+"""
+SQLite Tuning Profiles
+Connection-level settings applied to every SQLite engine of the app.
+
+A profile sets the pragmas each new connection runs (WAL journal,
+synchronous level, busy timeout, page cache, mmap) and how connections are
+pooled: one writer connection and, when read_pool_size > 0, a separate
+pool of query_only connections for API reads. In WAL mode readers never
+block the writer and vice versa; writers wait on each other through the
+busy timeout instead of failing with "database is locked". Writer
+connections of the pooled profiles open write transactions with BEGIN
+IMMEDIATE, so a transaction takes the write lock (waiting in the busy
+handler) before its first write instead of failing to upgrade mid-way.
+
+Environment:
+    SQLITE_PROFILE            performance (default), durable or off
+    SQLITE_BUSY_TIMEOUT_MS    override busy timeout
+    SQLITE_CACHE_SIZE_KB      override page cache size
+    SQLITE_MMAP_SIZE          override mmap size (bytes)
+    SQLITE_READ_POOL_SIZE     override read pool size
+"""
+
+import os
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from utils.logger import setup_logger
+
+logger = setup_logger("sqlite_tuning")
+
+MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """Pragmas and pool sizes of one tuning profile (None/0 keeps the SQLite default)"""
+
+    name: str
+    auto_vacuum: Optional[str] = None  # Only takes effect on new database files
+    journal_mode: Optional[str] = None
+    synchronous: Optional[str] = None
+    busy_timeout_ms: int = 0
+    cache_size_kb: int = 0
+    mmap_size: int = 0
+    temp_store: Optional[str] = None
+    read_pool_size: int = 0  # 0: reads share the writer engine
+    writer_pool_size: int = 0  # 0: SQLAlchemy's default pool
+    writer_max_overflow: int = 4  # extra connections for nested / request-scoped sessions
+
+
+SQLITE_PROFILES: Dict[str, SQLiteProfile] = {
+    # SQLite defaults: rollback journal, synchronous=FULL, one shared pool
+    "off": SQLiteProfile("off"),
+    "performance": SQLiteProfile(
+        "performance",
+        auto_vacuum="INCREMENTAL",
+        journal_mode="WAL",
+        synchronous="NORMAL",  # durable across app crashes; WAL fsyncs at checkpoints
+        busy_timeout_ms=5000,
+        cache_size_kb=64 * 1024,
+        mmap_size=256 * MB,
+        temp_store="MEMORY",
+        read_pool_size=4,
+        writer_pool_size=1,
+    ),
+    "durable": SQLiteProfile(
+        "durable",
+        auto_vacuum="INCREMENTAL",
+        journal_mode="WAL",
+        synchronous="FULL",
+        busy_timeout_ms=5000,
+        cache_size_kb=16 * 1024,
+        read_pool_size=4,
+        writer_pool_size=1,
+    ),
+}
+
+DEFAULT_SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+
+_ENV_OVERRIDES = {
+    "busy_timeout_ms": "SQLITE_BUSY_TIMEOUT_MS",
+    "cache_size_kb": "SQLITE_CACHE_SIZE_KB",
+    "mmap_size": "SQLITE_MMAP_SIZE",
+    "read_pool_size": "SQLITE_READ_POOL_SIZE",
+}
+
+
+def get_sqlite_profile(profile: Optional[Any] = None) -> SQLiteProfile:
+    """
+    Resolve a profile by name (or pass a SQLiteProfile through)
+
+    Args:
+        profile: Profile name, SQLiteProfile, or None for SQLITE_PROFILE
+
+    Returns:
+        The profile with environment overrides applied
+    """
+    if isinstance(profile, SQLiteProfile):
+        return profile
+    name = profile or DEFAULT_SQLITE_PROFILE
+    if name not in SQLITE_PROFILES:
+        logger.warning(f"Unknown SQLite profile '{name}', using 'performance'")
+        name = "performance"
+    overrides = {
+        field: int(os.environ[env]) for field, env in _ENV_OVERRIDES.items() if os.getenv(env)
+    }
+    return replace(SQLITE_PROFILES[name], **overrides)
+
+
+def profile_pragmas(profile: SQLiteProfile, read_only: bool = False) -> List[str]:
+    """PRAGMA statements run on each new connection"""
+    pragmas = []
+    if profile.auto_vacuum and not read_only:
+        pragmas.append(f"PRAGMA auto_vacuum={profile.auto_vacuum}")
+    if profile.journal_mode and not read_only:
+        pragmas.append(f"PRAGMA journal_mode={profile.journal_mode}")
+    if profile.synchronous:
+        pragmas.append(f"PRAGMA synchronous={profile.synchronous}")
+    if profile.busy_timeout_ms:
+        pragmas.append(f"PRAGMA busy_timeout={profile.busy_timeout_ms}")
+    if profile.cache_size_kb:
+        pragmas.append(f"PRAGMA cache_size=-{profile.cache_size_kb}")
+    if profile.mmap_size:
+        pragmas.append(f"PRAGMA mmap_size={profile.mmap_size}")
+    if profile.temp_store:
+        pragmas.append(f"PRAGMA temp_store={profile.temp_store}")
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def apply_sqlite_profile(engine: Engine, profile: Optional[Any] = None, read_only: bool = False) -> SQLiteProfile:
+    """
+    Run the profile's pragmas on every new connection of an engine
+
+    Works for async engines too (pass `async_engine.sync_engine`).
+
+    Args:
+        engine: SQLAlchemy engine (SQLite only, others are left untouched)
+        profile: Profile name or SQLiteProfile
+        read_only: Make connections query_only (and skip journal_mode)
+
+    Returns:
+        The applied profile
+    """
+    profile = get_sqlite_profile(profile)
+    if engine.dialect.name != "sqlite":
+        return profile
+    pragmas = profile_pragmas(profile, read_only=read_only)
+    if not pragmas:
+        return profile
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return profile
+
+
+def create_sqlite_engines(db_url: str, profile: Optional[Any] = None, **engine_kwargs):
+    """
+    Create the writer engine and the read-only engine for a SQLite URL
+
+    Args:
+        db_url: sqlite:/// URL
+        profile: Profile name or SQLiteProfile
+        **engine_kwargs: Extra create_engine() arguments
+
+    Returns:
+        (writer_engine, read_engine); read_engine is the writer engine
+        when the profile has no read pool
+    """
+    profile = get_sqlite_profile(profile)
+    connect_args = {"check_same_thread": False}
+    if profile.busy_timeout_ms:
+        connect_args["timeout"] = profile.busy_timeout_ms / 1000
+
+    writer_kwargs = dict(engine_kwargs)
+    writer_args = dict(connect_args)
+    if profile.writer_pool_size:
+        writer_kwargs.update(pool_size=profile.writer_pool_size, max_overflow=profile.writer_max_overflow)
+        # pysqlite opens the transaction on the first DML statement; make it
+        # BEGIN IMMEDIATE so concurrent writers queue in the busy handler
+        writer_args["isolation_level"] = "IMMEDIATE"
+    writer = create_engine(db_url, connect_args=writer_args, **writer_kwargs)
+    apply_sqlite_profile(writer, profile)
+
+    if not profile.read_pool_size:
+        return writer, writer
+    reader = create_engine(
+        db_url,
+        connect_args=connect_args,
+        pool_size=profile.read_pool_size,
+        max_overflow=profile.read_pool_size,
+        **engine_kwargs
+    )
+    apply_sqlite_profile(reader, profile, read_only=True)
+    return writer, reader
+
+
+def optimize_sqlite(engine: Engine) -> bool:
+    """Run PRAGMA optimize (refreshes query planner statistics where useful)"""
+    if engine.dialect.name != "sqlite":
+        return False
+    try:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA optimize")
+        return True
+    except Exception as e:
+        logger.warning(f"PRAGMA optimize failed: {e}")
+        return False
+
+
+def incremental_vacuum(connection, max_pages: int) -> int:
+    """
+    Return up to max_pages free pages to the filesystem
+
+    Only works on files created with auto_vacuum=INCREMENTAL (existing files
+    need one full VACUUM after setting it); a no-op otherwise.
+
+    Args:
+        connection: SQLAlchemy connection (inside the caller's write transaction)
+        max_pages: Upper bound on pages released in this step
+
+    Returns:
+        Pages released
+    """
+    if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:  # 2 = INCREMENTAL
+        return 0
+    free_pages = connection.exec_driver_sql("PRAGMA freelist_count").scalar() or 0
+    pages = min(free_pages, max_pages)
+    if pages:
+        # The pragma frees one page per step and returns no columns, so
+        # execute() stops after the first page; executescript() steps it to
+        # completion (it commits first - nothing is pending after the reads)
+        connection.connection.dbapi_connection.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+    return pages
+
+
+def sqlite_settings(engine: Engine) -> Dict[str, Any]:
+    """Current values of the tuned pragmas on one connection of an engine"""
+    names = ("auto_vacuum", "journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "temp_store", "query_only")
+    with engine.connect() as conn:
+        return {name: conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names}
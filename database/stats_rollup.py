@@ -0,0 +1,369 @@
+"""
+Provider Stats Rollups
+Incremental minute/hour rollups of the raw provider log tables.
+
+connection_attempts, data_collections and failure_logs grow with
+retention, so the stats APIs no longer aggregate them per request. A
+compaction pass adds every raw row past the per-table id watermark into
+minute and hour buckets (INSERT ... ON CONFLICT DO UPDATE SET x = x + n)
+in the same transaction that advances the watermark. The watermark moves
+by compare-and-set, so concurrent compactors never add a range twice.
+Reads combine:
+
+    hour buckets      whole hours inside the window
+    minute buckets    the partial first hour of the window
+    raw tail          rows with id > watermark (not compacted yet)
+
+so a 30-day window reads ~720 hour rows per provider plus a tail bounded
+by the compaction interval, however much history is kept. Windows start
+on the cutoff's minute; minute buckets are kept for
+STATS_MINUTE_RETENTION_HOURS, and windows reaching further back start on
+the next whole hour.
+
+The log tables have no AUTOINCREMENT, so SQLite reuses ids once a table
+is emptied. A watermark above the largest id is reset to 0 (the table was
+emptied since the last pass), and retention resets it when it empties a
+table, so reused ids are never taken for compacted ones.
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, case, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from database.models import (
+    ConnectionAttempt,
+    DataCollection,
+    FailureLog,
+    FailureStatsHour,
+    FailureStatsMinute,
+    ProviderStatsHour,
+    ProviderStatsMinute,
+    StatsRollupState
+)
+from utils.logger import setup_logger
+
+logger = setup_logger("stats_rollup")
+
+MINUTE_RETENTION = timedelta(hours=int(os.getenv("STATS_MINUTE_RETENTION_HOURS", "48")))
+HOUR_RETENTION = timedelta(days=int(os.getenv("STATS_HOUR_RETENTION_DAYS", "90")))
+COMPACT_BATCH = 50_000  # Raw ids per source per compaction transaction
+
+
+# ============================================================================
+# Sources
+# ============================================================================
+
+def _connection_aggregates() -> Dict[str, Any]:
+    m = ConnectionAttempt
+    return {
+        'attempts': func.count(m.id),
+        'successful': func.sum(case((m.status == 'success', 1), else_=0)),
+        'failed': func.sum(case((m.status == 'failed', 1), else_=0)),
+        'timeout': func.sum(case((m.status == 'timeout', 1), else_=0)),
+        'rate_limited': func.sum(case((m.status == 'rate_limited', 1), else_=0)),
+        'response_time_sum': func.total(m.response_time_ms),
+        'response_time_count': func.count(m.response_time_ms),
+    }
+
+
+def _collection_aggregates() -> Dict[str, Any]:
+    m = DataCollection
+    return {
+        'collections': func.count(m.id),
+        'records': func.total(m.record_count),
+        'payload_bytes': func.total(m.payload_size_bytes),
+        'quality_sum': func.total(m.data_quality_score),
+        'quality_count': func.count(m.data_quality_score),
+        'staleness_sum': func.total(m.staleness_minutes),
+        'staleness_count': func.count(m.staleness_minutes),
+    }
+
+
+def _failure_aggregates() -> Dict[str, Any]:
+    m = FailureLog
+    return {
+        'failures': func.count(m.id),
+        'retries': func.sum(case((m.retry_attempted == True, 1), else_=0)),  # noqa: E712
+        'successful_retries': func.sum(case((m.retry_result == 'success', 1), else_=0)),
+    }
+
+
+@dataclass(frozen=True)
+class RollupSource:
+    """A raw log table and the rollup tables it is compacted into"""
+
+    model: Any
+    time_column: Any
+    minute_model: Any
+    hour_model: Any
+    aggregates: Callable[[], Dict[str, Any]]
+    keys: Tuple[str, ...] = ('provider_id',)
+
+
+ROLLUP_SOURCES: Dict[str, RollupSource] = {
+    'connection_attempts': RollupSource(
+        ConnectionAttempt, ConnectionAttempt.timestamp,
+        ProviderStatsMinute, ProviderStatsHour, _connection_aggregates
+    ),
+    'data_collections': RollupSource(
+        DataCollection, DataCollection.actual_fetch_time,
+        ProviderStatsMinute, ProviderStatsHour, _collection_aggregates
+    ),
+    'failure_logs': RollupSource(
+        FailureLog, FailureLog.timestamp,
+        FailureStatsMinute, FailureStatsHour, _failure_aggregates,
+        keys=('provider_id', 'error_type')
+    ),
+}
+
+
+# ============================================================================
+# Compaction
+# ============================================================================
+
+def _upsert_add(session: Session, model, keys: Tuple[str, ...], counters: List[str], rows: List[Dict]):
+    """Insert buckets, adding to the counters of buckets that already exist"""
+    if not rows:
+        return
+    stmt = insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[*keys, 'bucket'],
+        set_={name: getattr(model, name) + stmt.excluded[name] for name in counters}
+    )
+    # Core executemany: the ORM bulk path costs more than the SQL here
+    session.connection().execute(stmt, rows)
+
+
+def _group_key(column):
+    """
+    GROUP BY expression for range queries (raw id ranges, rollup buckets)
+
+    Grouping on the bare column lets SQLite satisfy the GROUP BY by scanning
+    a whole (provider_id, ...) index; an expression keeps the plan a range
+    scan over the rows inside the range only.
+    """
+    return column + 0 if isinstance(column.type, Integer) else column.concat('')
+
+
+def _raw_minute_groups(session: Session, source: RollupSource, keys: Tuple[str, ...],
+                       after_id: int, upto_id: Optional[int] = None) -> List[Tuple[Dict, datetime, Dict]]:
+    """Aggregate raw rows in an id range per keys and minute"""
+    model = source.model
+    aggregates = source.aggregates()
+    group_keys = [_group_key(getattr(model, key)) for key in keys]
+    minute = func.strftime('%Y-%m-%d %H:%M:00', source.time_column)
+    query = session.query(*group_keys, minute, *aggregates.values()).filter(model.id > after_id)
+    if upto_id is not None:
+        query = query.filter(model.id <= upto_id)
+
+    groups = []
+    for row in query.group_by(*group_keys, minute).all():
+        groups.append((
+            dict(zip(keys, row[:len(keys)])),
+            datetime.fromisoformat(row[len(keys)]),
+            dict(zip(aggregates, row[len(keys) + 1:]))
+        ))
+    return groups
+
+
+def _claim_range(session: Session, name: str, last_id: int, upper: int) -> bool:
+    """
+    Advance the watermark from last_id to upper if it is still last_id
+
+    Compare-and-set, so concurrent compactors (scheduler job, cleanup,
+    other processes) cannot add the same id range twice.
+    It is the first write of the pass, so the winner holds the write lock
+    until its rollups are committed and a loser sees the new watermark.
+    """
+    claimed = session.query(StatsRollupState).filter(
+        StatsRollupState.source == name,
+        StatsRollupState.last_id == last_id
+    ).update({'last_id': upper, 'updated_at': datetime.utcnow()}, synchronize_session=False)
+    return claimed == 1
+
+
+def _watermark(session: Session, name: str) -> Optional[int]:
+    return session.query(StatsRollupState.last_id).filter(StatsRollupState.source == name).scalar()
+
+
+def reset_if_empty(session: Session, name: str) -> bool:
+    """
+    Reset the watermark of a source whose raw table is empty
+
+    Call after deleting raw rows: new rows will reuse ids from 1, below the
+    old watermark. Compare-and-set against the watermark read before the
+    emptiness check, so a compactor that already started over is kept.
+    """
+    last_id = _watermark(session, name)
+    if not last_id or session.query(ROLLUP_SOURCES[name].model.id).first() is not None:
+        return False
+    return _claim_range(session, name, last_id, 0)
+
+
+def compact_source(session: Session, name: str, batch: int = COMPACT_BATCH) -> int:
+    """
+    Roll up the next batch of raw rows of one source
+
+    Args:
+        session: Write session (the caller commits)
+        name: Key of ROLLUP_SOURCES
+        batch: Maximum id range to compact
+
+    Returns:
+        Size of the id range compacted (0 when caught up or when another
+        compactor claimed the range first)
+    """
+    source = ROLLUP_SOURCES[name]
+    last_id = _watermark(session, name)
+    if last_id is None:
+        session.connection().execute(
+            insert(StatsRollupState).values(source=name, last_id=0).on_conflict_do_nothing()
+        )
+        last_id = _watermark(session, name)
+
+    max_id = session.query(func.max(source.model.id)).scalar() or 0
+    if max_id < last_id:
+        # Emptied since the last pass: the remaining ids were reused from 1
+        if not _claim_range(session, name, last_id, 0):
+            return 0
+        logger.info(f"Rollup watermark of {name} reset ({last_id} > max id {max_id})")
+        last_id = 0
+    upper = min(max_id, last_id + batch)
+    if upper <= last_id:
+        return 0
+
+    counters = list(source.aggregates())
+    minute_cutoff = datetime.utcnow() - MINUTE_RETENTION
+    minute_rows, hour_rows = [], {}
+    for key_values, bucket, values in _raw_minute_groups(session, source, source.keys, last_id, upper):
+        if bucket >= minute_cutoff:
+            minute_rows.append({**key_values, 'bucket': bucket, **values})
+
+        hour_key = (*key_values.values(), bucket.replace(minute=0))
+        hour_row = hour_rows.setdefault(hour_key, {**key_values, 'bucket': hour_key[-1], **dict.fromkeys(counters, 0)})
+        for counter in counters:
+            hour_row[counter] += values[counter] or 0
+
+    if not _claim_range(session, name, last_id, upper):
+        logger.debug(f"Rollup of {name} ids {last_id}..{upper} already claimed by another compactor")
+        return 0
+    _upsert_add(session, source.minute_model, source.keys, counters, minute_rows)
+    _upsert_add(session, source.hour_model, source.keys, counters, list(hour_rows.values()))
+    return upper - last_id
+
+
+def prune_rollups(session: Session, now: Optional[datetime] = None) -> int:
+    """Drop minute buckets past MINUTE_RETENTION and hour buckets past HOUR_RETENTION"""
+    now = now or datetime.utcnow()
+    deleted = 0
+    for minute_model, hour_model in {(s.minute_model, s.hour_model) for s in ROLLUP_SOURCES.values()}:
+        deleted += session.query(minute_model).filter(minute_model.bucket < now - MINUTE_RETENTION).delete()
+        deleted += session.query(hour_model).filter(hour_model.bucket < now - HOUR_RETENTION).delete()
+    return deleted
+
+
+# ============================================================================
+# Reads
+# ============================================================================
+
+def _window_buckets(cutoff: datetime, now: datetime) -> Tuple[Optional[datetime], datetime]:
+    """
+    Split a window into (minute_start, hour_start)
+
+    Minute buckets cover [minute_start, hour_start) and hour buckets
+    [hour_start, now]. minute_start is None once the edge is older than
+    the minute retention.
+    """
+    minute_start = cutoff.replace(second=0, microsecond=0)
+    hour_start = minute_start.replace(minute=0)
+    if hour_start < minute_start:
+        hour_start += timedelta(hours=1)
+    if minute_start < now - MINUTE_RETENTION:
+        return None, hour_start
+    return minute_start, hour_start
+
+
+def rollup_totals(
+    session: Session,
+    name: str,
+    cutoff: datetime,
+    group_by: Tuple[str, ...] = ('provider_id',),
+    provider_id: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> Dict[Tuple, Dict[str, float]]:
+    """
+    Counters of one source since cutoff: rollups plus the raw tail
+
+    Run all reads of one request in the same session so the watermark,
+    rollups and tail come from one snapshot.
+
+    Args:
+        session: Read session
+        name: Key of ROLLUP_SOURCES
+        cutoff: Window start
+        group_by: Subset of the source keys to group by
+        provider_id: Only this provider
+        now: Current time (UTC)
+
+    Returns:
+        {group key tuple: {counter: total}}
+    """
+    source = ROLLUP_SOURCES[name]
+    now = now or datetime.utcnow()
+    counters = list(source.aggregates())
+    totals: Dict[Tuple, Dict[str, float]] = {}
+
+    def add(rows):
+        for row in rows:
+            key = tuple(row[:len(group_by)])
+            bucket = totals.setdefault(key, dict.fromkeys(counters, 0))
+            for counter, value in zip(counters, row[len(group_by):]):
+                bucket[counter] += value or 0
+
+    minute_start, hour_start = _window_buckets(cutoff, now)
+    window_start = hour_start if minute_start is None else minute_start
+    ranges = [(source.hour_model, hour_start, None)]
+    if window_start < hour_start:
+        ranges.append((source.minute_model, minute_start, hour_start))
+    for model, start, end in ranges:
+        group_keys = [_group_key(getattr(model, key)) for key in group_by]
+        query = session.query(
+            *group_keys,
+            *[func.sum(getattr(model, counter)) for counter in counters]
+        ).filter(model.bucket >= start)
+        if end is not None:
+            query = query.filter(model.bucket < end)
+        if provider_id is not None:
+            query = query.filter(model.provider_id == provider_id)
+        add(query.group_by(*group_keys).all())
+
+    # Raw tail: rows past the watermark inside the window, filtered in SQL so
+    # a lagging compaction only costs the window's rows of this provider
+    model = source.model
+    state = session.get(StatsRollupState, name)
+    last_id = state.last_id if state else 0
+    if last_id and (session.query(func.max(model.id)).scalar() or 0) < last_id:
+        last_id = 0  # Emptied and refilled since the last pass (see module docstring)
+    group_keys = [_group_key(getattr(model, key)) for key in group_by]
+    query = session.query(*group_keys, *source.aggregates().values()).filter(
+        model.id > last_id,
+        source.time_column >= window_start
+    )
+    if provider_id is not None:
+        query = query.filter(model.provider_id == provider_id)
+    add(query.group_by(*group_keys).all())
+    return totals
+
+
+def sum_totals(totals: Dict[Tuple, Dict[str, float]]) -> Dict[str, float]:
+    """Collapse grouped totals into one counter dict"""
+    merged: Dict[str, float] = {}
+    for counters in totals.values():
+        for counter, value in counters.items():
+            merged[counter] = merged.get(counter, 0) + value
+    return merged
@@ -25,6 +25,7 @@ except ImportError:
     print("⚠️  WARNING: huggingface_hub and datasets libraries not available")
     print("   Install with: pip install huggingface_hub datasets")
 
+from hf_shard_writer import DATASET_KEY_COLUMNS, HfHubTarget, LocalDirectoryHub, ShardedAppendWriter
 from utils.logger import setup_logger
 
 logger = setup_logger("hf_dataset_uploader")
@@ -38,15 +39,21 @@ class HuggingFaceDatasetUploader:
     1. Upload market data (prices, volumes, etc.)
     2. Upload OHLC/candlestick data
     3. Automatic dataset creation if not exists
-    4. Incremental updates (append new data)
+    4. Incremental updates (append new data as date-partitioned Parquet shards)
     5. Dataset versioning and metadata
+
+    Upload modes (HF_UPLOAD_MODE):
+    - "sharded" (default): append only new rows as Parquet shards (see hf_shard_writer)
+    - "full": download the dataset, concat, deduplicate and push everything again
     """
 
     def __init__(
         self,
         hf_token: Optional[str] = None,
         dataset_namespace: Optional[str] = None,
-        auto_create: bool = True
+        auto_create: bool = True,
+        upload_mode: Optional[str] = None,
+        local_hub_dir: Optional[str] = None
     ):
         """
         Initialize HuggingFace Dataset Uploader
@@ -55,7 +62,26 @@ class HuggingFaceDatasetUploader:
             hf_token: HuggingFace API token (or from HF_TOKEN env var)
             dataset_namespace: Dataset namespace (username or org name)
             auto_create: Automatically create datasets if they don't exist
+            upload_mode: "sharded" or "full" (or from HF_UPLOAD_MODE env var)
+            local_hub_dir: Write shards to this directory instead of the Hub
+                (or from HF_LOCAL_HUB_DIR env var); no token required
         """
+        self.upload_mode = (upload_mode or os.getenv("HF_UPLOAD_MODE", "sharded")).lower()
+        self.local_hub_dir = local_hub_dir or os.getenv("HF_LOCAL_HUB_DIR")
+        self.auto_create = auto_create
+        self._verified_datasets = set()
+
+        if self.local_hub_dir:
+            # Offline stand-in for the Hub (sharded mode only)
+            self.upload_mode = "sharded"
+            self.token = None
+            self.api = None
+            self.namespace = dataset_namespace or os.getenv("HF_USERNAME") or "crypto-data-hub"
+            self._init_dataset_names()
+            self.shard_writer = self._create_shard_writer(LocalDirectoryHub(self.local_hub_dir))
+            logger.info(f"HuggingFace Dataset Uploader using local hub directory: {self.local_hub_dir}")
+            return
+
         if not HF_HUB_AVAILABLE:
             raise ImportError(
                 "huggingface_hub and datasets libraries required. "
@@ -81,20 +107,13 @@ class HuggingFaceDatasetUploader:
                 logger.warning(f"Could not detect HuggingFace username: {e}")
                 self.namespace = "crypto-data-hub"  # Default namespace
 
-        self.auto_create = auto_create
         self.api = HfApi(token=self.token)
-
-        # Dataset names - ALL data types
-        self.market_data_dataset = f"{self.namespace}/crypto-market-data"
-        self.ohlc_dataset = f"{self.namespace}/crypto-ohlc-data"
-        self.news_dataset = f"{self.namespace}/crypto-news-data"
-        self.sentiment_dataset = f"{self.namespace}/crypto-sentiment-data"
-        self.onchain_dataset = f"{self.namespace}/crypto-onchain-data"
-        self.whale_dataset = f"{self.namespace}/crypto-whale-data"
-        self.explorer_dataset = f"{self.namespace}/crypto-explorer-data"
+        self._init_dataset_names()
+        self.shard_writer = self._create_shard_writer(HfHubTarget(self.api, self.token))
 
         logger.info(f"HuggingFace Dataset Uploader initialized")
         logger.info(f"  Namespace: {self.namespace}")
+        logger.info(f"  Upload mode: {self.upload_mode}")
         logger.info(f"  Datasets:")
         logger.info(f"    - Market: {self.market_data_dataset}")
         logger.info(f"    - OHLC: {self.ohlc_dataset}")
@@ -104,6 +123,34 @@ class HuggingFaceDatasetUploader:
         logger.info(f"    - Whale: {self.whale_dataset}")
         logger.info(f"    - Explorer: {self.explorer_dataset}")
 
+    def _init_dataset_names(self):
+        # Dataset names - ALL data types
+        self.market_data_dataset = f"{self.namespace}/crypto-market-data"
+        self.ohlc_dataset = f"{self.namespace}/crypto-ohlc-data"
+        self.news_dataset = f"{self.namespace}/crypto-news-data"
+        self.sentiment_dataset = f"{self.namespace}/crypto-sentiment-data"
+        self.onchain_dataset = f"{self.namespace}/crypto-onchain-data"
+        self.whale_dataset = f"{self.namespace}/crypto-whale-data"
+        self.explorer_dataset = f"{self.namespace}/crypto-explorer-data"
+
+    def _create_shard_writer(self, target) -> ShardedAppendWriter:
+        return ShardedAppendWriter(
+            target,
+            state_dir=os.getenv("HF_SHARD_STATE_DIR", "data/hf_shards"),
+            compact_threshold=int(os.getenv("HF_SHARD_COMPACT_THRESHOLD", "24")),
+            key_retention_days=int(os.getenv("HF_SHARD_KEY_RETENTION_DAYS", "7"))
+        )
+
+    def _append_shards(self, dataset_name: str, dataset_type: str, records: List[Dict[str, Any]]) -> bool:
+        """Append only new and revised rows as Parquet shards (no download of existing data)"""
+        rows = self.shard_writer.append(
+            dataset_name,
+            records,
+            key_columns=DATASET_KEY_COLUMNS.get(dataset_type)
+        )
+        logger.info(f"✅ Appended {rows} new or revised {dataset_type} records to {dataset_name} ({len(records) - rows} unchanged)")
+        return True
+
     def _ensure_dataset_exists(self, dataset_name: str, description: str) -> bool:
         """
         Ensure dataset exists on HuggingFace Hub
@@ -115,11 +162,15 @@ class HuggingFaceDatasetUploader:
         Returns:
             bool: True if dataset exists or was created
         """
+        if self.local_hub_dir or dataset_name in self._verified_datasets:
+            return True
+
         try:
             # Check if dataset exists
             try:
                 self.api.dataset_info(dataset_name, token=self.token)
                 logger.info(f"Dataset exists: {dataset_name}")
+                self._verified_datasets.add(dataset_name)
                 return True
             except Exception as check_error:
                 # Check if it's an authentication error
@@ -200,6 +251,7 @@ All data is real - no mock or fake data.
                     )
 
                     logger.info(f"✅ Created dataset: {dataset_name}")
+                    self._verified_datasets.add(dataset_name)
                     return True
                 else:
                     logger.error(f"Dataset does not exist and auto_create=False: {dataset_name}")
@@ -252,6 +304,9 @@ All data is real - no mock or fake data.
                 if "fetched_at" not in data:
                     data["fetched_at"] = current_time
 
+            if append and self.upload_mode == "sharded":
+                return self._append_shards(self.market_data_dataset, "market", market_data)
+
             # Convert to pandas DataFrame
             df = pd.DataFrame(market_data)
 
@@ -342,6 +397,9 @@ All data is real - no mock or fake data.
                 if "fetched_at" not in data:
                     data["fetched_at"] = current_time
 
+            if append and self.upload_mode == "sharded":
+                return self._append_shards(self.ohlc_dataset, "ohlc", ohlc_data)
+
             # Convert to pandas DataFrame
             df = pd.DataFrame(ohlc_data)
 
@@ -408,6 +466,9 @@ All data is real - no mock or fake data.
             ):
                 return False
 
+            if append and self.upload_mode == "sharded":
+                return self._append_shards(self.news_dataset, "news", news_data)
+
             df = pd.DataFrame(news_data)
             dataset = Dataset.from_pandas(df)
 
@@ -445,6 +506,9 @@ All data is real - no mock or fake data.
             ):
                 return False
 
+            if append and self.upload_mode == "sharded":
+                return self._append_shards(self.sentiment_dataset, "sentiment", sentiment_data)
+
             df = pd.DataFrame(sentiment_data)
             dataset = Dataset.from_pandas(df)
 
@@ -481,6 +545,9 @@ All data is real - no mock or fake data.
             ):
                 return False
 
+            if append and self.upload_mode == "sharded":
+                return self._append_shards(self.onchain_dataset, "onchain", onchain_data)
+
             df = pd.DataFrame(onchain_data)
             dataset = Dataset.from_pandas(df)
 
@@ -517,6 +584,9 @@ All data is real - no mock or fake data.
             ):
                 return False
 
+            if append and self.upload_mode == "sharded":
+                return self._append_shards(self.whale_dataset, "whale", whale_data)
+
             df = pd.DataFrame(whale_data)
             dataset = Dataset.from_pandas(df)
 
@@ -553,6 +623,9 @@ All data is real - no mock or fake data.
             ):
                 return False
 
+            if append and self.upload_mode == "sharded":
+                return self._append_shards(self.explorer_dataset, "explorer", explorer_data)
+
             df = pd.DataFrame(explorer_data)
             dataset = Dataset.from_pandas(df)
 
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Sharded Append Writer for HuggingFace Datasets
+Appends only new rows to a dataset repo as date-partitioned Parquet shards.
+
+Layout in the dataset repo:
+    data/date=YYYY-MM-DD/part-<utc timestamp>-<n>.parquet
+    data/date=YYYY-MM-DD/compact-<utc timestamp>.parquet
+
+A local manifest (one JSON file per repo) records which row keys were already
+uploaded (with a hash of the row contents), the shards of each partition and a
+watermark (latest partition seen). A row whose key was uploaded before but
+whose contents changed (e.g. the still-open candle fetched again) is a
+revision: it goes into the new shard and the last version of a key wins when
+shards are read or compacted. Keys are kept only for the most recent
+`key_retention_days` partitions; when rows for an older partition arrive,
+its keys are rebuilt from its shards for that append. Partitions that grow
+past `compact_threshold` shards are merged into a single file in one commit.
+
+The first append of a process also points the dataset card (README.md
+`configs`) at both the shards and the `data/train-*` files written by
+`push_to_hub`, so `load_dataset(repo_id, split="train")` sees every row.
+Readers that load shards this way should pass the frame through
+`drop_revisions()` to keep only the newest version of each key.
+
+The hub is abstracted behind a small target interface so a local directory can
+stand in for the HuggingFace Hub (offline runs and tests).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from utils.logger import setup_logger
+
+logger = setup_logger("hf_shard_writer")
+
+PARTITION_PREFIX = "data/date="
+
+# Columns that change on every fetch and do not make a row a revision
+VOLATILE_COLUMNS = ("fetched_at",)
+
+# Row keys used to deduplicate appends and reads (None = all columns)
+DATASET_KEY_COLUMNS = {
+    "market": ["symbol", "timestamp"],
+    "ohlc": ["symbol", "interval", "timestamp"],
+    "news": ["url"],
+    "sentiment": None,
+    "onchain": None,
+    "whale": ["transaction_hash", "hash"],
+    "explorer": None,
+}
+
+# Dataset card `configs` mapping the train split to push_to_hub files and shards
+CARD_CONFIGS = (
+    "configs:\n"
+    "- config_name: default\n"
+    "  data_files:\n"
+    "  - split: train\n"
+    "    path:\n"
+    "    - data/train-*\n"
+    f"    - {PARTITION_PREFIX}*/*.parquet\n"
+)
+
+
+def _row_keys(df: pd.DataFrame, key_columns: Optional[Sequence[str]]) -> pd.Series:
+    columns = [c for c in (key_columns or []) if c in df.columns] or list(df.columns)
+    joined = df[columns].astype(str).agg("\x1f".join, axis=1)
+    return joined.map(lambda value: hashlib.sha1(value.encode()).hexdigest()[:20])
+
+
+def drop_revisions(df: pd.DataFrame, key_columns: Optional[Sequence[str]]) -> pd.DataFrame:
+    """
+    Keep the newest version of every key
+
+    Newest is the latest `fetched_at` when the column exists, otherwise the
+    last row (shards are read oldest first). Row order is preserved.
+    """
+    if df.empty:
+        return df
+    ordered = df.reset_index(drop=True)
+    if "fetched_at" in ordered.columns:
+        ordered = ordered.sort_values("fetched_at", kind="stable", na_position="first")
+    latest = ordered[~_row_keys(ordered, key_columns).duplicated(keep="last")]
+    return latest.sort_index().reset_index(drop=True)
+
+
+def card_with_shard_configs(card: str) -> str:
+    """Dataset card text with its YAML `configs` replaced by CARD_CONFIGS"""
+    lines = card.splitlines(keepends=True)
+    closing = [i for i, line in enumerate(lines[1:], start=1) if line.strip() == "---"]
+    if lines and lines[0].strip() == "---" and closing:
+        header, body = lines[1:closing[0]], lines[closing[0] + 1:]
+    else:
+        header, body = [], lines
+
+    kept = []
+    skipping = False
+    for line in header:
+        if line.strip() and not line[0].isspace() and not line.startswith("-"):
+            # Top-level key: drop the old `configs` block up to the next key
+            skipping = line.startswith("configs:")
+        if not skipping:
+            kept.append(line)
+    if kept and not kept[-1].endswith("\n"):
+        kept[-1] += "\n"
+    return "---\n" + "".join(kept) + CARD_CONFIGS + "---\n" + "".join(body)
+
+
+# ============================================================================
+# Hub targets
+# ============================================================================
+
+class LocalDirectoryHub:
+    """Stand-in for the HuggingFace Hub that commits files into a local directory"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def commit(
+        self,
+        repo_id: str,
+        additions: Dict[str, str],
+        deletions: Sequence[str] = (),
+        message: str = ""
+    ) -> None:
+        repo_dir = self.root / repo_id
+        for path_in_repo, local_path in additions.items():
+            target = repo_dir / path_in_repo
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(local_path, target)
+        for path_in_repo in deletions:
+            (repo_dir / path_in_repo).unlink(missing_ok=True)
+
+    def fetch(self, repo_id: str, path_in_repo: str, local_path: str) -> str:
+        Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.root / repo_id / path_in_repo, local_path)
+        return local_path
+
+
+class HfHubTarget:
+    """Commits shards to a HuggingFace dataset repo (additions + deletions in one commit)"""
+
+    def __init__(self, api, token: Optional[str] = None):
+        self.api = api
+        self.token = token
+
+    def commit(
+        self,
+        repo_id: str,
+        additions: Dict[str, str],
+        deletions: Sequence[str] = (),
+        message: str = ""
+    ) -> None:
+        from huggingface_hub import CommitOperationAdd, CommitOperationDelete
+
+        operations = [
+            CommitOperationAdd(path_in_repo=path_in_repo, path_or_fileobj=local_path)
+            for path_in_repo, local_path in additions.items()
+        ]
+        operations += [CommitOperationDelete(path_in_repo=path) for path in deletions]
+        self.api.create_commit(
+            repo_id=repo_id,
+            repo_type="dataset",
+            operations=operations,
+            commit_message=message or "Append data shards",
+            token=self.token
+        )
+
+    def fetch(self, repo_id: str, path_in_repo: str, local_path: str) -> str:
+        from huggingface_hub import hf_hub_download
+
+        downloaded = hf_hub_download(
+            repo_id=repo_id,
+            filename=path_in_repo,
+            repo_type="dataset",
+            token=self.token
+        )
+        Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(downloaded, local_path)
+        return local_path
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+class ShardedAppendWriter:
+    """
+    Incremental, deduplicated Parquet shard appends for dataset repos
+
+    Every append uploads only rows whose key is not in the manifest (or whose
+    contents changed), so the cost of an append depends on the batch size,
+    not on the dataset history.
+    """
+
+    def __init__(
+        self,
+        target,
+        state_dir: str = "data/hf_shards",
+        compact_threshold: int = 24,
+        key_retention_days: int = 7
+    ):
+        """
+        Args:
+            target: LocalDirectoryHub or HfHubTarget
+            state_dir: Local directory for manifests and the shard mirror
+            compact_threshold: Compact a partition once it has this many shards
+            key_retention_days: Partitions whose keys are kept for dedup
+        """
+        self.target = target
+        self.state_dir = Path(state_dir)
+        self.compact_threshold = compact_threshold
+        self.key_retention_days = key_retention_days
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+        self._cards_checked = set()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _repo_dir(self, repo_id: str) -> Path:
+        return self.state_dir / repo_id.replace("/", "__")
+
+    def _manifest_path(self, repo_id: str) -> Path:
+        return self._repo_dir(repo_id) / "manifest.json"
+
+    def manifest(self, repo_id: str) -> Dict[str, Any]:
+        """Load (or create) the manifest of a repo"""
+        if repo_id not in self._manifests:
+            path = self._manifest_path(repo_id)
+            if path.exists():
+                manifest = json.loads(path.read_text())
+                for entry in manifest["partitions"].values():
+                    if isinstance(entry.get("keys"), list):
+                        # Older manifests kept keys only: the next version of
+                        # each row is uploaded once as a revision
+                        entry["keys"] = dict.fromkeys(entry["keys"], "")
+            else:
+                manifest = {"repo_id": repo_id, "watermark": None, "partitions": {}}
+            self._manifests[repo_id] = manifest
+        return self._manifests[repo_id]
+
+    def _save_manifest(self, repo_id: str) -> None:
+        path = self._manifest_path(repo_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._manifests[repo_id]))
+        os.replace(tmp, path)
+
+    def _prune_keys(self, manifest: Dict[str, Any]) -> None:
+        if not manifest["watermark"]:
+            return
+        cutoff = self._key_cutoff(manifest)
+        for partition, entry in manifest["partitions"].items():
+            if partition < cutoff and entry.get("keys"):
+                entry["keys"] = {}
+
+    def _key_cutoff(self, manifest: Dict[str, Any]) -> str:
+        watermark = datetime.strptime(manifest["watermark"], "%Y-%m-%d")
+        return (watermark - timedelta(days=self.key_retention_days)).strftime("%Y-%m-%d")
+
+    # ------------------------------------------------------------------
+    # Append
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row_keys(df: pd.DataFrame, key_columns: Optional[Sequence[str]]) -> pd.Series:
+        return _row_keys(df, key_columns)
+
+    @classmethod
+    def _row_hashes(cls, df: pd.DataFrame) -> pd.Series:
+        """Hash of the row contents, used to detect revisions of uploaded keys"""
+        columns = sorted(c for c in df.columns if c not in VOLATILE_COLUMNS and not c.startswith("_"))
+        return cls._row_keys(df, columns)
+
+    def _shard_frames(self, repo_id: str, shards: Sequence[str]) -> List[pd.DataFrame]:
+        """Read shards from the local mirror, fetching the ones it lacks"""
+        frames = []
+        for path_in_repo in shards:
+            local_path = self._repo_dir(repo_id) / path_in_repo
+            if not local_path.exists():
+                self.target.fetch(repo_id, path_in_repo, str(local_path))
+            frames.append(pd.read_parquet(local_path))
+        return frames
+
+    def _partition_keys(self, repo_id: str, manifest: Dict[str, Any], partition: str, cold: bool) -> Dict[str, str]:
+        """Uploaded key -> row hash of a partition (rebuilt from shards outside the key window)"""
+        entry = manifest["partitions"].get(partition)
+        if not entry:
+            return {}
+        if not cold or entry.get("keys"):
+            return entry.get("keys", {})
+        shards = self._shard_frames(repo_id, entry["shards"])
+        if not shards:
+            return {}
+        uploaded = drop_revisions(pd.concat(shards, ignore_index=True), manifest.get("key_columns"))
+        entry["keys"] = dict(zip(self._row_keys(uploaded, manifest.get("key_columns")), self._row_hashes(uploaded)))
+        return entry["keys"]
+
+    def _card_addition(self, repo_id: str) -> Dict[str, str]:
+        """README.md pointing the train split at the shards (once per process and repo)"""
+        if repo_id in self._cards_checked:
+            return {}
+        local_path = self._repo_dir(repo_id) / "README.md"
+        try:
+            card = Path(self.target.fetch(repo_id, "README.md", str(local_path))).read_text()
+        except Exception:
+            card = f"# {repo_id}\n"
+        updated = card_with_shard_configs(card)
+        if updated == card:
+            self._cards_checked.add(repo_id)
+            return {}
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        local_path.write_text(updated)
+        return {"README.md": str(local_path)}
+
+    @staticmethod
+    def _partitions(df: pd.DataFrame, partition_column: str) -> pd.Series:
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        if partition_column not in df.columns:
+            return pd.Series(today, index=df.index)
+        values = df[partition_column]
+        if pd.api.types.is_numeric_dtype(values):
+            # Epoch seconds or milliseconds
+            unit = "ms" if values.max() > 1e11 else "s"
+            parsed = pd.to_datetime(values, unit=unit, utc=True, errors="coerce")
+        else:
+            parsed = pd.to_datetime(values, utc=True, errors="coerce", format="mixed")
+        return parsed.dt.strftime("%Y-%m-%d").fillna(today)
+
+    def append(
+        self,
+        repo_id: str,
+        records: List[Dict[str, Any]],
+        key_columns: Optional[Sequence[str]] = None,
+        partition_column: str = "timestamp"
+    ) -> int:
+        """
+        Upload new and revised rows as one shard per date partition
+
+        Args:
+            repo_id: Dataset repo (namespace/name)
+            records: Rows to append
+            key_columns: Columns identifying a row (all columns if None)
+            partition_column: Timestamp column used for date partitioning
+
+        Returns:
+            Number of new or revised rows uploaded
+        """
+        if not records:
+            return 0
+
+        manifest = self.manifest(repo_id)
+        manifest["key_columns"] = list(key_columns) if key_columns else None
+        df = pd.DataFrame(records)
+        df["_key"] = self._row_keys(df, key_columns)
+        df["_hash"] = self._row_hashes(df)
+        df["_partition"] = self._partitions(df, partition_column)
+        # Within a batch the last version of a row wins
+        df = df.drop_duplicates(subset="_key", keep="last")
+
+        cutoff = self._key_cutoff(manifest) if manifest["watermark"] else None
+        fresh = []
+        for partition, group in df.groupby("_partition", sort=True):
+            # Keys of partitions older than the dedup window are rebuilt from their shards
+            known = self._partition_keys(repo_id, manifest, partition, bool(cutoff and partition < cutoff))
+            group = group[group["_key"].map(known.get) != group["_hash"]]
+            if not group.empty:
+                fresh.append((partition, group))
+
+        if not fresh:
+            self._prune_keys(manifest)
+            logger.debug(f"No new rows for {repo_id}")
+            return 0
+
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        additions: Dict[str, str] = {}
+        for n, (partition, group) in enumerate(fresh):
+            path_in_repo = f"{PARTITION_PREFIX}{partition}/part-{stamp}-{n}.parquet"
+            local_path = self._repo_dir(repo_id) / path_in_repo
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            group.drop(columns=["_key", "_hash", "_partition"]).to_parquet(local_path, index=False)
+            additions[path_in_repo] = str(local_path)
+
+        shard_paths = list(additions)
+        additions.update(self._card_addition(repo_id))
+        rows = sum(len(group) for _, group in fresh)
+        self.target.commit(repo_id, additions, message=f"Append {rows} rows")
+        self._cards_checked.add(repo_id)
+
+        for (partition, group), path_in_repo in zip(fresh, shard_paths):
+            entry = manifest["partitions"].setdefault(partition, {"shards": [], "keys": {}, "rows": 0})
+            entry["shards"].append(path_in_repo)
+            entry["keys"].update(zip(group["_key"], group["_hash"]))
+            entry["rows"] += len(group)
+            if not manifest["watermark"] or partition > manifest["watermark"]:
+                manifest["watermark"] = partition
+        self._prune_keys(manifest)
+        self._save_manifest(repo_id)
+
+        logger.info(f"Appended {rows} rows to {repo_id} in {len(additions)} shard(s)")
+
+        for partition, _ in fresh:
+            if len(manifest["partitions"][partition]["shards"]) >= self.compact_threshold:
+                self.compact(repo_id, partition)
+
+        return rows
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def compact(self, repo_id: str, partition: Optional[str] = None) -> int:
+        """
+        Merge the shards of a partition (or of every partition) into one file,
+        keeping the last version of every key
+
+        Returns:
+            Number of partitions compacted
+        """
+        manifest = self.manifest(repo_id)
+        partitions = [partition] if partition else sorted(manifest["partitions"])
+        compacted = 0
+
+        for name in partitions:
+            entry = manifest["partitions"].get(name)
+            if not entry or len(entry["shards"]) < 2:
+                continue
+
+            frames = self._shard_frames(repo_id, entry["shards"])
+            merged = drop_revisions(pd.concat(frames, ignore_index=True), manifest.get("key_columns"))
+
+            stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+            path_in_repo = f"{PARTITION_PREFIX}{name}/compact-{stamp}.parquet"
+            local_path = self._repo_dir(repo_id) / path_in_repo
+            merged.to_parquet(local_path, index=False)
+
+            old_shards = list(entry["shards"])
+            self.target.commit(
+                repo_id,
+                {path_in_repo: str(local_path)},
+                deletions=old_shards,
+                message=f"Compact {len(old_shards)} shards of {name}"
+            )
+
+            for old in old_shards:
+                (self._repo_dir(repo_id) / old).unlink(missing_ok=True)
+            entry["shards"] = [path_in_repo]
+            entry["rows"] = len(merged)
+            compacted += 1
+            logger.info(f"Compacted {len(old_shards)} shards of {repo_id} {name} ({len(merged)} rows)")
+
+        if compacted:
+            self._save_manifest(repo_id)
+        return compacted
+
+    def read(self, repo_id: str) -> pd.DataFrame:
+        """
+        Read every shard of the local mirror (mainly for checks and tests)
+
+        Revisions are resolved: only the last version of every key is returned.
+        """
+        manifest = self.manifest(repo_id)
+        frames = [
+            pd.read_parquet(self._repo_dir(repo_id) / path)
+            for name in sorted(manifest["partitions"])
+            for path in manifest["partitions"][name]["shards"]
+            if (self._repo_dir(repo_id) / path).exists()
+        ]
+        if not frames:
+            return pd.DataFrame()
+        return drop_revisions(pd.concat(frames, ignore_index=True), manifest.get("key_columns"))
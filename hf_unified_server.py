@@ -25,39 +25,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-# Import routers
-from backend.routers.unified_service_api import router as service_router
-from backend.routers.real_data_api import router as real_data_router
-from backend.routers.direct_api import router as direct_api_router
-from backend.routers.crypto_api_hub_router import router as crypto_hub_router
-from backend.routers.crypto_api_hub_self_healing import router as self_healing_router
-from backend.routers.futures_api import router as futures_router
-from backend.routers.ai_api import router as ai_router
-from backend.routers.config_api import router as config_router
-from backend.routers.multi_source_api import router as multi_source_router
-from backend.routers.trading_backtesting_api import router as trading_router
-from backend.routers.comprehensive_resources_api import router as comprehensive_resources_router
-from backend.routers.resource_hierarchy_api import router as resource_hierarchy_router
-from backend.routers.dynamic_model_api import router as dynamic_model_router
-from backend.routers.background_worker_api import router as background_worker_router
-from backend.routers.intelligent_provider_api import router as intelligent_provider_router  # NEW: Intelligent load-balanced providers
-from backend.routers.hf_space_crypto_api import router as hf_space_crypto_router  # HuggingFace Space Crypto Resources API
-from backend.routers.health_monitor_api import router as health_monitor_router  # NEW: Service Health Monitor
-from backend.routers.indicators_api import router as indicators_router  # Technical Indicators API
-from backend.routers.new_sources_api import router as new_sources_router  # NEW: Integrated data sources (Crypto API Clean + Crypto DT Source)
-from backend.routers.system_metrics_api import router as system_metrics_router  # System metrics and monitoring
-from backend.routers.system_status_api import router as system_status_router  # Comprehensive system status for modal
-
-# NEW EXPANDED API ENDPOINTS (26+ endpoints for CryptoOne integration)
-from backend.routers.expanded_market_api import router as expanded_market_router  # Market expansion: search, details, history, chart, categories, gainers, losers
-from backend.routers.trading_analysis_api import router as trading_analysis_router  # Trading & Analysis: volume, orderbook, indicators, backtest, correlations
-from backend.routers.enhanced_ai_api import router as enhanced_ai_router  # Enhanced AI: predictions, sentiment, analyze, models
-from backend.routers.news_social_api import router as news_social_router  # News & Social: coin news, trending, sentiment, events
-from backend.routers.portfolio_alerts_api import router as portfolio_alerts_router  # Portfolio & Alerts: simulate, alerts, watchlist
-from backend.routers.system_metadata_api import router as system_metadata_router  # System & Metadata: exchanges, coins metadata, cache stats
-
-# COMPREHENSIVE RESOURCES DATABASE API (400+ resources from api-resources folder)
-from backend.routers.comprehensive_resources_database_api import router as resources_db_router  # Complete database: 274+ unified + 162+ pipeline resources
+# Routers are declared further down and imported lazily (backend/routers/lazy_registry.py)
+from backend.routers.lazy_registry import LazyRouterRegistry
 
 # Import metrics middleware
 from backend.middleware import MetricsMiddleware
@@ -187,8 +156,6 @@ _OHLCV_VERIFICATION_CACHE: Optional[Dict[str, Any]] = _load_json_file(OHLCV_VERI
 # Resources Monitor - Dynamic monitoring
 from api.resources_monitor import get_resources_monitor
 
-# Background Worker for Data Collection
-from backend.workers import start_background_worker, stop_background_worker
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -211,6 +178,14 @@ async def lifespan(app: FastAPI):
     logger.info(f"   Platform: {platform.system()} {platform.release()}")
     logger.info("=" * 70)
     
+    # Load persisted provider responses so the first requests are not cold
+    try:
+        from backend.cache.tiered_cache import get_tiered_cache
+        warmed = await asyncio.to_thread(get_tiered_cache().warm)
+        logger.info(f"✅ Cache warmed with {warmed} persisted entries")
+    except Exception as e:
+        logger.warning(f"⚠️  Cache warm-up skipped: {e}")
+    
     # Start resources monitor (non-critical)
     try:
         monitor = get_resources_monitor()
@@ -241,6 +216,8 @@ async def lifespan(app: FastAPI):
         logger.warning("   Continuing with fallback sentiment analysis...")
     
     # Start background data collection worker (non-critical)
+    # Imported here: it pulls in SQLAlchemy asyncio and the collectors
+    from backend.workers import start_background_worker, stop_background_worker
     try:
         worker = await start_background_worker()
         logger.info("✅ Background data collection worker started")
@@ -249,10 +226,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️  Background worker disabled: {e}")
     
+    # Import the remaining routers in the background once the port is bound
+    lazy_routers.start_warmup()
+    
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down HuggingFace Unified Server...")
+    await lazy_routers.stop_warmup()
     
     # Stop background worker
     try:
@@ -266,6 +247,46 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Resources monitor stopped")
     except Exception as e:
         logger.error(f"⚠️ Error stopping resources monitor: {e}")
+    
+    # Close pooled HTTP clients
+    try:
+        from utils.http_pool import close_http_pools
+        await close_http_pools()
+        logger.info("✅ HTTP client pools closed")
+    except Exception as e:
+        logger.error(f"⚠️ Error closing HTTP client pools: {e}")
+    
+    # Stop parameter sweeps and their process pool (only if one was started)
+    if "backend.services.parameter_sweep" in sys.modules:
+        try:
+            sys.modules["backend.services.parameter_sweep"].get_sweep_manager().shutdown()
+            logger.info("✅ Parameter sweep pool stopped")
+        except Exception as e:
+            logger.error(f"⚠️ Error stopping parameter sweep pool: {e}")
+    
+    # Persist buffered pool selection counters (only if pools were used)
+    if "monitoring.source_pool_manager" in sys.modules:
+        try:
+            sys.modules["monitoring.source_pool_manager"].get_pool_selector().shutdown()
+            logger.info("✅ Pool selection state flushed")
+        except Exception as e:
+            logger.error(f"⚠️ Error flushing pool selection state: {e}")
+    
+    # Persist pending cache writes
+    try:
+        from backend.cache.tiered_cache import get_tiered_cache
+        get_tiered_cache().close()
+        logger.info("✅ Cache flushed")
+    except Exception as e:
+        logger.error(f"⚠️ Error flushing cache: {e}")
+
+    # Refresh SQLite planner statistics and close pooled connections
+    if "database.db_manager" in sys.modules:
+        try:
+            sys.modules["database.db_manager"].db_manager.optimize()
+            logger.info("✅ Database optimized")
+        except Exception as e:
+            logger.error(f"⚠️ Error optimizing database: {e}")
 
 # Create FastAPI app
 app = FastAPI(
@@ -356,217 +377,62 @@ async def rate_limit_middleware(request: Request, call_next):
     return response
 
 # Include routers
-try:
-    app.include_router(service_router)  # Main unified service
-except Exception as e:
-    logger.error(f"Failed to include service_router: {e}")
-
-try:
-    app.include_router(real_data_router, prefix="/real")  # Existing real data endpoints
-except Exception as e:
-    logger.error(f"Failed to include real_data_router: {e}")
-
-try:
-    app.include_router(direct_api_router)  # NEW: Direct API with external services and HF models
-except Exception as e:
-    logger.error(f"Failed to include direct_api_router: {e}")
-
-try:
-    app.include_router(crypto_hub_router)  # Crypto API Hub Dashboard API
-except Exception as e:
-    logger.error(f"Failed to include crypto_hub_router: {e}")
-
-try:
-    app.include_router(self_healing_router)  # Self-Healing Crypto API Hub
-except Exception as e:
-    logger.error(f"Failed to include self_healing_router: {e}")
-
-try:
-    app.include_router(futures_router)  # Futures Trading API
-    logger.info("✓ ✅ Futures Trading Router loaded")
-except Exception as e:
-    logger.error(f"Failed to include futures_router: {e}")
-
-try:
-    app.include_router(ai_router)  # AI & ML API (Backtesting, Training)
-    logger.info("✓ ✅ AI & ML Router loaded")
-except Exception as e:
-    logger.error(f"Failed to include ai_router: {e}")
-
-try:
-    app.include_router(config_router)  # Configuration Management API
-    logger.info("✓ ✅ Configuration Router loaded")
-except Exception as e:
-    logger.error(f"Failed to include config_router: {e}")
-
-try:
-    app.include_router(multi_source_router)  # Multi-Source Fallback API (137+ sources)
-    logger.info("✓ ✅ Multi-Source Fallback Router loaded (137+ sources)")
-except Exception as e:
-    logger.error(f"Failed to include multi_source_router: {e}")
-
-try:
-    app.include_router(trading_router)  # Trading & Backtesting API (Smart Binance & KuCoin)
-    logger.info("✓ ✅ Trading & Backtesting Router loaded (Smart Exchange Integration)")
-except Exception as e:
-    logger.error(f"Failed to include trading_router: {e}")
-
-try:
-    from api.resources_endpoint import router as resources_router
-    app.include_router(resources_router)  # Resources Statistics API
-    logger.info("✓ ✅ Resources Statistics Router loaded")
-except Exception as e:
-    logger.error(f"Failed to include resources_router: {e}")
-
-try:
-    from backend.routers.market_api import router as market_api_router
-    app.include_router(market_api_router)  # Market API (Price, OHLC, Sentiment, WebSocket)
-    logger.info("✓ ✅ Market API Router loaded (Price, OHLC, Sentiment, WebSocket)")
-except Exception as e:
-    logger.error(f"Failed to include market_api_router: {e}")
-
-try:
-    from backend.routers.technical_analysis_api import router as technical_router
-    app.include_router(technical_router)  # Technical Analysis API
-    logger.info("✓ ✅ Technical Analysis Router loaded (TA Quick, FA Eval, On-Chain Health, Risk Assessment, Comprehensive)")
-except Exception as e:
-    logger.error(f"Failed to include technical_router: {e}")
-
-try:
-    app.include_router(comprehensive_resources_router)  # Comprehensive Resources API (ALL free resources)
-    logger.info("✓ ✅ Comprehensive Resources Router loaded (51+ FREE resources: Market Data, News, Sentiment, On-Chain, HF Datasets)")
-except Exception as e:
-    logger.error(f"Failed to include comprehensive_resources_router: {e}")
-
-try:
-    app.include_router(resource_hierarchy_router)  # Resource Hierarchy Monitoring API
-    logger.info("✓ ✅ Resource Hierarchy Router loaded (86+ resources in 5-level hierarchy - NO IDLE RESOURCES)")
-except Exception as e:
-    logger.error(f"Failed to include resource_hierarchy_router: {e}")
-
-try:
-    app.include_router(dynamic_model_router)  # Dynamic Model Loader API
-    logger.info("✓ ✅ Dynamic Model Loader Router loaded (Intelligent auto-detection & registration)")
-except Exception as e:
-    logger.error(f"Failed to include dynamic_model_router: {e}")
-
-try:
-    app.include_router(background_worker_router)  # Background Data Collection Worker API
-    logger.info("✓ ✅ Background Worker Router loaded (Auto-collection every 5/15 min)")
-except Exception as e:
-    logger.error(f"Failed to include background_worker_router: {e}")
-
-# Intelligent Provider API with TRUE Load Balancing (NEW - CRITICAL FIX)
-try:
-    app.include_router(intelligent_provider_router)  # Intelligent round-robin load balancing
-    logger.info("✓ ✅ Intelligent Provider Router loaded (Round-robin, health-based, no fake data)")
-except Exception as e:
-    logger.error(f"Failed to include intelligent_provider_router: {e}")
-
-try:
-    from backend.routers.realtime_monitoring_api import router as realtime_monitoring_router
-    app.include_router(realtime_monitoring_router)  # Real-Time Monitoring API
-    logger.info("✓ ✅ Real-Time Monitoring Router loaded (Animated Dashboard)")
-except Exception as e:
-    logger.error(f"Failed to include realtime_monitoring_router: {e}")
-
-# Technical Indicators Services API
-try:
-    from backend.routers.indicators_api import router as indicators_router
-    app.include_router(indicators_router)  # Technical Indicators API (BB, StochRSI, ATR, SMA, EMA, MACD, RSI)
-    logger.info("✓ ✅ Technical Indicators Router loaded (Bollinger Bands, StochRSI, ATR, SMA, EMA, MACD, RSI)")
-except Exception as e:
-    logger.error(f"Failed to include indicators_router: {e}")
-
-# Service Health Monitor API
-try:
-    from backend.routers.health_monitor_api import router as health_monitor_router
-    app.include_router(health_monitor_router)  # Service Health Monitor (real-time status of all services)
-    logger.info("✓ ✅ Service Health Monitor Router loaded (Real-time service status monitoring)")
-except Exception as e:
-    logger.error(f"Failed to include health_monitor_router: {e}")
-
-# HuggingFace Space Crypto Resources API (External aggregated source)
-try:
-    app.include_router(hf_space_crypto_router)  # HF Space Crypto API (market, sentiment, resources database)
-    logger.info("✓ ✅ HF Space Crypto Router loaded (281 resources, 12 categories, market data, sentiment)")
-except Exception as e:
-    logger.error(f"Failed to include hf_space_crypto_router: {e}")
-
-# NEW INTEGRATED DATA SOURCES (Crypto API Clean + Crypto DT Source)
-try:
-    app.include_router(new_sources_router)  # Newly integrated comprehensive data sources
-    logger.info("✓ ✅ New Sources Router loaded (Crypto API Clean: 281+ resources | Crypto DT Source: Unified API v2.0)")
-except Exception as e:
-    logger.error(f"Failed to include new_sources_router: {e}")
-
-# SYSTEM METRICS & MONITORING (Real-time system monitoring)
-try:
-    app.include_router(system_metrics_router)  # System metrics API (CPU, memory, requests, response times)
-    logger.info("✓ ✅ System Metrics Router loaded (Real-time CPU, Memory, Request Rate, Response Time, Error Rate)")
-except Exception as e:
-    logger.error(f"Failed to include system_metrics_router: {e}")
-
-# System Status API (Comprehensive status for modal)
-try:
-    app.include_router(system_status_router)  # Comprehensive system status (services, endpoints, coins, resources)
-    logger.info("✓ ✅ System Status Router loaded (Comprehensive status for System Status Modal)")
-except Exception as e:
-    logger.error(f"Failed to include system_status_router: {e}")
+# Each router is declared with the URL prefixes it serves and imported on the
+# first request under one of them (or by the warm-up started in lifespan).
+# Declaration order is include order, so route precedence is unchanged.
+lazy_routers = LazyRouterRegistry(app, load_all_paths=("/openapi.json", "/docs", "/redoc", "/api/endpoints"))
+
+lazy_routers.declare("unified_service_api", "backend.routers.unified_service_api", ["/api/service", "/ws"])  # Main unified service
+lazy_routers.declare(
+    "real_data_api", "backend.routers.real_data_api", ["/real"], prefix="/real"
+)  # Existing real data endpoints
+lazy_routers.declare("direct_api", "backend.routers.direct_api", ["/api/v1"])  # Direct API with external services and HF models
+lazy_routers.declare("crypto_hub", "backend.routers.crypto_api_hub_router", ["/api/crypto-hub"])  # Crypto API Hub Dashboard API
+lazy_routers.declare("self_healing", "backend.routers.crypto_api_hub_self_healing", ["/api/crypto-hub"])  # Self-Healing Crypto API Hub
+lazy_routers.declare("futures", "backend.routers.futures_api", ["/api/futures"])  # Futures Trading API
+lazy_routers.declare("ai_ml", "backend.routers.ai_api", ["/api/ai"])  # AI & ML API (Backtesting, Training)
+lazy_routers.declare("config", "backend.routers.config_api", ["/api/config"])  # Configuration Management API
+lazy_routers.declare("multi_source", "backend.routers.multi_source_api", ["/api/multi-source"])  # Multi-Source Fallback API (137+ sources)
+lazy_routers.declare("trading_backtesting", "backend.routers.trading_backtesting_api", ["/api/trading"])  # Smart Binance & KuCoin
+lazy_routers.declare("resources_stats", "api.resources_endpoint", ["/api/resources"])  # Resources Statistics API
+lazy_routers.declare("market_api", "backend.routers.market_api", ["/api/market", "/api/sentiment", "/ws"])  # Price, OHLC, Sentiment, WebSocket
+lazy_routers.declare("technical_analysis", "backend.routers.technical_analysis_api", ["/api/technical"])  # TA, FA, On-Chain, Risk
+lazy_routers.declare("comprehensive_resources", "backend.routers.comprehensive_resources_api", ["/api/resources"])  # ALL free resources
+lazy_routers.declare("resource_hierarchy", "backend.routers.resource_hierarchy_api", ["/api/hierarchy"])  # Resource Hierarchy Monitoring
+lazy_routers.declare("dynamic_model_loader", "backend.routers.dynamic_model_api", ["/api/dynamic-models"])  # Dynamic Model Loader API
+lazy_routers.declare("background_worker", "backend.routers.background_worker_api", ["/api/worker"])  # Background Data Collection Worker
+lazy_routers.declare("intelligent_provider", "backend.routers.intelligent_provider_api", ["/api/providers"])  # Round-robin load balancing
+lazy_routers.declare("realtime_monitoring", "backend.routers.realtime_monitoring_api", ["/api/monitoring"])  # Real-Time Monitoring API
+lazy_routers.declare("technical_indicators", "backend.routers.indicators_api", ["/api/indicators"])  # BB, StochRSI, ATR, SMA, EMA, MACD, RSI
+lazy_routers.declare("health_monitor", "backend.routers.health_monitor_api", ["/api/health"])  # Service Health Monitor
+lazy_routers.declare("hf_space_crypto", "backend.routers.hf_space_crypto_api", ["/api/hf-space"])  # HF Space Crypto Resources API
+lazy_routers.declare("new_sources", "backend.routers.new_sources_api", ["/api/new-sources"])  # Crypto API Clean + Crypto DT Source
+lazy_routers.declare("system_metrics", "backend.routers.system_metrics_api", ["/api/system"])  # CPU, memory, requests, response times
+lazy_routers.declare("system_status", "backend.routers.system_status_api", ["/api/system"])  # Comprehensive status for modal
 
-# ============================================================================
 # EXPANDED API ENDPOINTS (26+ new endpoints for complete data coverage)
-# ============================================================================
-
-# Expanded Market API (7 endpoints)
-try:
-    app.include_router(expanded_market_router)
-    logger.info("✓ ✅ Expanded Market Router loaded (7 endpoints: search, details, history, chart, categories, gainers, losers)")
-except Exception as e:
-    logger.error(f"Failed to include expanded_market_router: {e}")
-
-# Trading Analysis API (5 endpoints)
-try:
-    app.include_router(trading_analysis_router)
-    logger.info("✓ ✅ Trading Analysis Router loaded (5 endpoints: volume, orderbook, indicators, backtest, correlations)")
-except Exception as e:
-    logger.error(f"Failed to include trading_analysis_router: {e}")
-
-# Enhanced AI API (4 endpoints)
-try:
-    app.include_router(enhanced_ai_router)
-    logger.info("✓ ✅ Enhanced AI Router loaded (4 endpoints: predictions, sentiment, analyze, models)")
-except Exception as e:
-    logger.error(f"Failed to include enhanced_ai_router: {e}")
-
-# News & Social API (4 endpoints)
-try:
-    app.include_router(news_social_router)
-    logger.info("✓ ✅ News & Social Router loaded (4 endpoints: coin news, trending, sentiment, events)")
-except Exception as e:
-    logger.error(f"Failed to include news_social_router: {e}")
-
-# Portfolio & Alerts API (3 endpoints)
-try:
-    app.include_router(portfolio_alerts_router)
-    logger.info("✓ ✅ Portfolio & Alerts Router loaded (3 endpoints: simulate, alerts, watchlist)")
-except Exception as e:
-    logger.error(f"Failed to include portfolio_alerts_router: {e}")
-
-# System & Metadata API (3 endpoints)
-try:
-    app.include_router(system_metadata_router)
-    logger.info("✓ ✅ System & Metadata Router loaded (3 endpoints: exchanges, coins metadata, cache stats)")
-except Exception as e:
-    logger.error(f"Failed to include system_metadata_router: {e}")
-
-# Comprehensive Resources Database API (6 endpoints)
-try:
-    app.include_router(resources_db_router)
-    logger.info("✓ ✅ Comprehensive Resources Database Router loaded (6 endpoints: 400+ resources from api-resources)")
-    logger.info("   📊 Database: 274 unified + 162 pipeline | Categories: RPC, Explorers, Market, News, Sentiment, Analytics, Whale, DeFi, NFT")
-except Exception as e:
-    logger.error(f"Failed to include resources_db_router: {e}")
+lazy_routers.declare(
+    "expanded_market", "backend.routers.expanded_market_api", ["/api/coins", "/api/market"]
+)  # search, details, history, chart, categories, gainers, losers
+lazy_routers.declare(
+    "trading_analysis", "backend.routers.trading_analysis_api",
+    ["/api/backtest", "/api/correlations", "/api/indicators", "/api/trading"]
+)  # volume, orderbook, indicators, backtest, correlations
+lazy_routers.declare("enhanced_ai", "backend.routers.enhanced_ai_api", ["/api/ai"])  # predictions, sentiment, analyze, models
+lazy_routers.declare(
+    "news_social", "backend.routers.news_social_api", ["/api/events", "/api/news", "/api/social"]
+)  # coin news, trending, sentiment, events
+lazy_routers.declare(
+    "portfolio_alerts", "backend.routers.portfolio_alerts_api", ["/api/alerts", "/api/portfolio", "/api/watchlist"]
+)  # simulate, alerts, watchlist
+lazy_routers.declare(
+    "system_metadata", "backend.routers.system_metadata_api", ["/api/cache", "/api/exchanges", "/api/metadata"]
+)  # exchanges, coins metadata, cache stats
+lazy_routers.declare(
+    "resources_database", "backend.routers.comprehensive_resources_database_api", ["/api/resources"]
+)  # 274 unified + 162 pipeline resources from api-resources
+
+lazy_routers.install()
 
 logger.info("=" * 70)
 logger.info("🎉 API EXPANSION COMPLETE: 26+ new endpoints added!")
@@ -778,26 +644,13 @@ logger.info("=" * 70)
 @app.get("/api/routers")
 async def get_routers_status():
     """Get status of all loaded routers"""
-    routers_status = {
-        "unified_service_api": "loaded" if service_router else "not_available",
-        "real_data_api": "loaded" if real_data_router else "not_available",
-        "direct_api": "loaded" if direct_api_router else "not_available",
-        "crypto_hub": "loaded" if crypto_hub_router else "not_available",
-        "self_healing": "loaded" if self_healing_router else "not_available",
-        "futures": "loaded" if futures_router else "not_available",
-        "ai_ml": "loaded" if ai_router else "not_available",
-        "config": "loaded" if config_router else "not_available",
-        "multi_source": "loaded" if multi_source_router else "not_available",
-        "trading_backtesting": "loaded" if trading_router else "not_available",
-        "market_api": "loaded",
-        "technical_analysis": "loaded",
-        "technical_indicators": "loaded",  # NEW: BB, StochRSI, ATR, SMA, EMA, MACD, RSI
-        "dynamic_model_loader": "loaded" if dynamic_model_router else "not_available"
-    }
+    lazy_status = lazy_routers.status()
+    routers_status = {name: info["status"] for name, info in lazy_status.items()}
     return {
         "routers": routers_status,
         "total_loaded": sum(1 for v in routers_status.values() if v == "loaded"),
         "total_available": len(routers_status),
+        "details": lazy_status,
         "timestamp": datetime.utcnow().isoformat() + "Z"
     }
 
@@ -1,16 +1,111 @@
 """
 Rate Limit Tracking Module
 Manages rate limits per provider with in-memory tracking
+
+Every provider gets a token bucket implemented as GCRA (generic cell rate
+algorithm): a single "theoretical arrival time" per provider, advanced by one
+emission interval (period / limit) per request, on the monotonic clock.
+``burst`` requests may go out back to back, after which requests are spaced
+at the provider's sustained rate. ``acquire()`` reserves the next free slot
+and sleeps exactly until it, so concurrent callers queue in order instead of
+spinning or failing. Usage for status reporting is counted over a sliding
+window of one period.
+
+The bucket is shared by everything in the process that talks to a provider
+(health checks, pools, the CoinGecko client, the Data Hub); provider names
+are matched case-insensitively.
 """
 
+import asyncio
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from typing import Deque, Dict, Optional, Tuple
 from threading import Lock
 from utils.logger import setup_logger
 
 logger = setup_logger("rate_limiter")
 
+# Seconds per limit type
+LIMIT_PERIODS = {
+    "per_second": 1,
+    "per_minute": 60,
+    "per_hour": 3600,
+    "per_day": 86400,
+}
+
+# Default quotas for providers called directly by the API clients.
+# Applied on first use unless configure_limit()/configure_rate() ran first.
+PROVIDER_QUOTAS = {
+    "coingecko": {"calls": 30, "period": 60, "burst": 5},  # public API ~30/min
+    "coinmarketcap": {"calls": 333, "period": 60},
+    "newsapi": {"calls": 500, "period": 3600},
+    "etherscan": {"calls": 5, "period": 1},
+    "bscscan": {"calls": 5, "period": 1},
+    "tronscan": {"calls": 10, "period": 1},
+    "binance": {"calls": 1200, "period": 60},
+}
+
+
+def _limit_type(period: float) -> str:
+    """Limit type label for a period in seconds"""
+    for limit_type, seconds in LIMIT_PERIODS.items():
+        if seconds == period:
+            return limit_type
+    return f"per_{period:g}s"
+
+
+class RateLimitExceeded(Exception):
+    """Raised by acquire() when the wait for a token exceeds the timeout"""
+
+    def __init__(self, provider: str, wait: float):
+        super().__init__(f"Rate limit reached for {provider}. Next slot in {wait:.1f}s")
+        self.provider = provider
+        self.wait = wait
+
+
+class _Bucket:
+    """GCRA state for one provider"""
+
+    __slots__ = (
+        "name", "limit_type", "limit_value", "period", "burst",
+        "interval", "tat", "window", "last_request",
+    )
+
+    def __init__(self, name: str, limit_type: str, limit_value: int, period: float, burst: int):
+        self.name = name
+        self.tat = 0.0  # theoretical arrival time (monotonic)
+        self.window: Deque[float] = deque()
+        self.last_request: Optional[float] = None
+        self.update(limit_type, limit_value, period, burst)
+
+    def update(self, limit_type: str, limit_value: int, period: float, burst: int):
+        self.limit_type = limit_type
+        self.limit_value = max(1, int(limit_value))
+        self.period = float(period)
+        self.burst = max(1, int(burst))
+        self.interval = self.period / self.limit_value
+
+    def wait_time(self, now: float, tokens: int = 1) -> float:
+        """Seconds until ``tokens`` requests conform (0.0 = now)"""
+        return max(0.0, max(self.tat, now) + (tokens - self.burst) * self.interval - now)
+
+    def take(self, now: float, tokens: int = 1):
+        """Consume ``tokens``, whether or not they conform"""
+        self.tat = max(self.tat, now) + tokens * self.interval
+
+    def record(self, at: float, tokens: int = 1):
+        self.window.extend([at] * tokens)
+        self.last_request = at
+
+    def usage(self, now: float) -> int:
+        """Requests in the sliding window ending at ``now``"""
+        cutoff = now - self.period
+        window = self.window
+        while window and window[0] <= cutoff:
+            window.popleft()
+        return len(window)
+
 
 class RateLimiter:
     """
@@ -19,14 +114,19 @@ class RateLimiter:
 
     def __init__(self):
         """Initialize rate limiter"""
-        self.limits: Dict[str, Dict] = {}
+        self.limits: Dict[str, _Bucket] = {}
         self.lock = Lock()
 
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
     def configure_limit(
         self,
         provider: str,
         limit_type: str,
-        limit_value: int
+        limit_value: int,
+        burst: Optional[int] = None
     ):
         """
         Configure rate limit for a provider
@@ -35,31 +135,65 @@ class RateLimiter:
             provider: Provider name
             limit_type: Type of limit (per_minute, per_hour, per_day, per_second)
             limit_value: Maximum requests allowed
+            burst: Requests allowed back to back (default: limit_value)
         """
+        period = LIMIT_PERIODS.get(limit_type)
+        if period is None:
+            logger.warning(f"Unknown limit type {limit_type} for {provider}")
+            period = 60
+        self.configure_rate(provider, limit_value, period, burst=burst, limit_type=limit_type)
+
+    def configure_rate(
+        self,
+        provider: str,
+        calls: int,
+        period: float,
+        burst: Optional[int] = None,
+        limit_type: Optional[str] = None
+    ):
+        """
+        Configure a rate of ``calls`` per ``period`` seconds for a provider
+
+        Reconfiguring a provider keeps its accounting, so repeated
+        configuration (e.g. on every scheduler start) does not refill the
+        bucket.
+
+        Args:
+            provider: Provider name
+            calls: Requests allowed per period
+            period: Period in seconds
+            burst: Requests allowed back to back (default: calls)
+            limit_type: Label reported by get_status (default: derived from period)
+        """
+        if limit_type is None:
+            limit_type = _limit_type(period)
+        burst = calls if burst is None else burst
+
         with self.lock:
-            # Calculate reset time based on limit type
-            now = datetime.now()
-            if limit_type == "per_second":
-                reset_time = now + timedelta(seconds=1)
-            elif limit_type == "per_minute":
-                reset_time = now + timedelta(minutes=1)
-            elif limit_type == "per_hour":
-                reset_time = now + timedelta(hours=1)
-            elif limit_type == "per_day":
-                reset_time = now + timedelta(days=1)
+            bucket = self.limits.get(provider.lower())
+            if bucket is None:
+                self.limits[provider.lower()] = _Bucket(provider, limit_type, calls, period, burst)
             else:
-                logger.warning(f"Unknown limit type {limit_type} for {provider}")
-                reset_time = now + timedelta(minutes=1)
-
-            self.limits[provider] = {
-                "limit_type": limit_type,
-                "limit_value": limit_value,
-                "current_usage": 0,
-                "reset_time": reset_time,
-                "last_request_time": None
-            }
-
-            logger.info(f"Configured rate limit for {provider}: {limit_value} {limit_type}")
+                bucket.update(limit_type, calls, period, burst)
+
+        logger.info(f"Configured rate limit for {provider}: {calls} {limit_type} (burst {burst})")
+
+    def _bucket(self, provider: str) -> Optional[_Bucket]:
+        """Bucket for provider, created from PROVIDER_QUOTAS on first use (lock held)"""
+        key = provider.lower()
+        bucket = self.limits.get(key)
+        if bucket is None and key in PROVIDER_QUOTAS:
+            quota = PROVIDER_QUOTAS[key]
+            bucket = _Bucket(
+                key, _limit_type(quota["period"]), quota["calls"], quota["period"],
+                quota.get("burst", quota["calls"])
+            )
+            self.limits[key] = bucket
+        return bucket
+
+    # ------------------------------------------------------------------
+    # Checking and consuming
+    # ------------------------------------------------------------------
 
     def can_make_request(self, provider: str) -> Tuple[bool, Optional[str]]:
         """
@@ -71,88 +205,201 @@ class RateLimiter:
         Returns:
             Tuple of (can_proceed, reason_if_blocked)
         """
-        with self.lock:
-            if provider not in self.limits:
-                # No limit configured, allow request
-                return True, None
+        wait = self.time_until_available(provider)
+        if wait <= 0:
+            return True, None
+        return False, f"Rate limit reached. Reset in {int(wait) or 1}s"
 
-            limit_info = self.limits[provider]
-            now = datetime.now()
+    def time_until_available(self, provider: str, tokens: int = 1) -> float:
+        """
+        Seconds until ``tokens`` requests may be made (0.0 = now)
 
-            # Check if we need to reset the counter
-            if now >= limit_info["reset_time"]:
-                self._reset_limit(provider)
-                limit_info = self.limits[provider]
+        Args:
+            provider: Provider name
+            tokens: Number of requests
 
-            # Check if under limit
-            if limit_info["current_usage"] < limit_info["limit_value"]:
-                return True, None
-            else:
-                seconds_until_reset = (limit_info["reset_time"] - now).total_seconds()
-                return False, f"Rate limit reached. Reset in {int(seconds_until_reset)}s"
+        Returns:
+            Wait in seconds; 0.0 for providers without a limit
+        """
+        with self.lock:
+            bucket = self._bucket(provider)
+            if bucket is None:
+                return 0.0
+            return bucket.wait_time(time.monotonic(), tokens)
 
-    def record_request(self, provider: str):
+    def try_acquire(self, provider: str, tokens: int = 1) -> bool:
         """
-        Record a request against the rate limit
+        Take ``tokens`` if they are available right now
 
         Args:
             provider: Provider name
+            tokens: Number of requests
+
+        Returns:
+            True if the request may proceed
         """
         with self.lock:
-            if provider not in self.limits:
-                logger.warning(f"Recording request for unconfigured provider: {provider}")
-                return
+            bucket = self._bucket(provider)
+            if bucket is None:
+                return True
+            now = time.monotonic()
+            if bucket.wait_time(now, tokens) > 0:
+                return False
+            bucket.take(now, tokens)
+            bucket.record(now, tokens)
+            return True
+
+    def reserve(self, provider: str, tokens: int = 1, timeout: Optional[float] = None) -> float:
+        """
+        Reserve the next free slot for ``tokens`` requests
+
+        The slot is taken immediately; the caller must wait the returned
+        number of seconds before sending the request.
+
+        Args:
+            provider: Provider name
+            tokens: Number of requests
+            timeout: Maximum acceptable wait in seconds (None = unbounded)
 
-            limit_info = self.limits[provider]
-            now = datetime.now()
+        Returns:
+            Seconds to wait
 
-            # Check if we need to reset first
-            if now >= limit_info["reset_time"]:
-                self._reset_limit(provider)
-                limit_info = self.limits[provider]
+        Raises:
+            RateLimitExceeded: If the wait would exceed ``timeout``
+        """
+        with self.lock:
+            bucket = self._bucket(provider)
+            if bucket is None:
+                return 0.0
+            now = time.monotonic()
+            wait = bucket.wait_time(now, tokens)
+            if timeout is not None and wait > timeout:
+                raise RateLimitExceeded(bucket.name, wait)
+            bucket.take(now, tokens)
+            bucket.record(now + wait, tokens)
+            return wait
+
+    async def acquire(self, provider: str, tokens: int = 1, timeout: Optional[float] = None) -> float:
+        """
+        Wait until ``tokens`` requests may be made and take them
 
-            # Increment usage
-            limit_info["current_usage"] += 1
-            limit_info["last_request_time"] = now
+        Sleeps exactly until the reserved slot; callers are served in the
+        order they call acquire().
 
-            # Log warning if approaching limit
-            percentage = (limit_info["current_usage"] / limit_info["limit_value"]) * 100
-            if percentage >= 80:
-                logger.warning(
-                    f"Rate limit warning for {provider}: {percentage:.1f}% used "
-                    f"({limit_info['current_usage']}/{limit_info['limit_value']})"
-                )
+        Args:
+            provider: Provider name
+            tokens: Number of requests
+            timeout: Maximum acceptable wait in seconds (None = unbounded)
 
-    def _reset_limit(self, provider: str):
+        Returns:
+            Seconds waited
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed ``timeout``
+        """
+        wait = self.reserve(provider, tokens, timeout)
+        if wait > 0:
+            if wait >= 1:
+                logger.info(f"Rate limit for {provider}: waiting {wait:.1f}s")
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._release(provider, tokens)
+                raise
+        return wait
+
+    def _release(self, provider: str, tokens: int):
+        """Give back a reservation that was never used"""
+        with self.lock:
+            bucket = self._bucket(provider)
+            if bucket is None:
+                return
+            bucket.tat = max(time.monotonic(), bucket.tat - tokens * bucket.interval)
+            for _ in range(min(tokens, len(bucket.window))):
+                bucket.window.pop()
+
+    def record_request(self, provider: str):
         """
-        Reset rate limit counter
+        Record a request against the rate limit
 
         Args:
             provider: Provider name
         """
-        if provider not in self.limits:
-            return
+        with self.lock:
+            bucket = self._bucket(provider)
+            if bucket is None:
+                logger.warning(f"Recording request for unconfigured provider: {provider}")
+                return
 
-        limit_info = self.limits[provider]
-        limit_type = limit_info["limit_type"]
-        now = datetime.now()
+            now = time.monotonic()
+            bucket.take(now)
+            bucket.record(now)
+            usage = bucket.usage(now)
 
-        # Calculate new reset time
-        if limit_type == "per_second":
-            reset_time = now + timedelta(seconds=1)
-        elif limit_type == "per_minute":
-            reset_time = now + timedelta(minutes=1)
-        elif limit_type == "per_hour":
-            reset_time = now + timedelta(hours=1)
-        elif limit_type == "per_day":
-            reset_time = now + timedelta(days=1)
-        else:
-            reset_time = now + timedelta(minutes=1)
+        # Log warning if approaching limit
+        percentage = (usage / bucket.limit_value) * 100
+        if percentage >= 80:
+            logger.warning(
+                f"Rate limit warning for {provider}: {percentage:.1f}% used "
+                f"({usage}/{bucket.limit_value})"
+            )
+
+    def penalize(self, provider: str, seconds: float):
+        """
+        Pause a provider, e.g. after a 429 response
 
-        limit_info["current_usage"] = 0
-        limit_info["reset_time"] = reset_time
+        No requests are granted for ``seconds``; afterwards the provider
+        resumes at its sustained rate (without an immediate burst).
 
-        logger.debug(f"Reset rate limit for {provider}. Next reset: {reset_time}")
+        Args:
+            provider: Provider name
+            seconds: Back-off duration
+        """
+        with self.lock:
+            bucket = self._bucket(provider)
+            if bucket is None:
+                return
+            until = time.monotonic() + seconds
+            bucket.tat = max(bucket.tat, until + (bucket.burst - 1) * bucket.interval)
+
+        logger.warning(f"Rate limit for {provider}: paused for {seconds:.0f}s")
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def _status(self, bucket: _Bucket, provider: str) -> Dict:
+        """Status dict for a bucket (lock held)"""
+        now = time.monotonic()
+        wall_now = datetime.now()
+        usage = bucket.usage(now)
+        percentage = (usage / bucket.limit_value) * 100
+        # Time until the bucket is back to full burst capacity
+        seconds_until_reset = max(0.0, bucket.tat - now)
+        blocked = bucket.wait_time(now) > 0
+
+        status = "ok"
+        if blocked or percentage >= 100:
+            status = "blocked"
+        elif percentage >= 80:
+            status = "warning"
+
+        last_request_time = None
+        if bucket.last_request is not None:
+            last_request_time = (wall_now - timedelta(seconds=now - bucket.last_request)).isoformat()
+
+        return {
+            "provider": provider,
+            "limit_type": bucket.limit_type,
+            "limit_value": bucket.limit_value,
+            "burst": bucket.burst,
+            "current_usage": usage,
+            "percentage": round(percentage, 1),
+            "reset_time": (wall_now + timedelta(seconds=seconds_until_reset)).isoformat(),
+            "reset_in_seconds": int(seconds_until_reset),
+            "status": status,
+            "last_request_time": last_request_time
+        }
 
     def get_status(self, provider: str) -> Optional[Dict]:
         """
@@ -165,37 +412,10 @@ class RateLimiter:
             Dict with limit info or None if not configured
         """
         with self.lock:
-            if provider not in self.limits:
+            bucket = self.limits.get(provider.lower())
+            if bucket is None:
                 return None
-
-            limit_info = self.limits[provider]
-            now = datetime.now()
-
-            # Check if needs reset
-            if now >= limit_info["reset_time"]:
-                self._reset_limit(provider)
-                limit_info = self.limits[provider]
-
-            percentage = (limit_info["current_usage"] / limit_info["limit_value"]) * 100 if limit_info["limit_value"] > 0 else 0
-            seconds_until_reset = max(0, (limit_info["reset_time"] - now).total_seconds())
-
-            status = "ok"
-            if percentage >= 100:
-                status = "blocked"
-            elif percentage >= 80:
-                status = "warning"
-
-            return {
-                "provider": provider,
-                "limit_type": limit_info["limit_type"],
-                "limit_value": limit_info["limit_value"],
-                "current_usage": limit_info["current_usage"],
-                "percentage": round(percentage, 1),
-                "reset_time": limit_info["reset_time"].isoformat(),
-                "reset_in_seconds": int(seconds_until_reset),
-                "status": status,
-                "last_request_time": limit_info["last_request_time"].isoformat() if limit_info["last_request_time"] else None
-            }
+            return self._status(bucket, provider)
 
     def get_all_statuses(self) -> Dict[str, Dict]:
         """
@@ -206,8 +426,8 @@ class RateLimiter:
         """
         with self.lock:
             return {
-                provider: self.get_status(provider)
-                for provider in self.limits.keys()
+                bucket.name: self._status(bucket, bucket.name)
+                for bucket in self.limits.values()
             }
 
     def remove_limit(self, provider: str):
@@ -218,8 +438,7 @@ class RateLimiter:
             provider: Provider name
         """
         with self.lock:
-            if provider in self.limits:
-                del self.limits[provider]
+            if self.limits.pop(provider.lower(), None) is not None:
                 logger.info(f"Removed rate limit for {provider}")
 
 
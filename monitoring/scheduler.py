@@ -422,6 +422,16 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Metrics aggregation failed: {e}", exc_info=True)
 
+    def _stats_rollup_task(self):
+        """
+        Stats rollup task - compacts new provider logs into minute/hour rollups
+        """
+        try:
+            compacted = db_manager.compact_stats()
+            logger.debug(f"Stats rollup completed - {compacted}")
+        except Exception as e:
+            logger.error(f"Stats rollup failed: {e}", exc_info=True)
+
     def _database_cleanup_task(self):
         """
         Database cleanup task - removes old records (>30 days)
@@ -548,6 +558,18 @@ class TaskScheduler:
             )
             logger.info("Scheduled: Metrics aggregation every 5 minutes")
 
+            # Schedule provider stats rollup - every 1 minute
+            self.expected_run_times['stats_rollup'] = now
+            self.scheduler.add_job(
+                func=lambda: self._wrap_task('stats_rollup', self._stats_rollup_task),
+                trigger=IntervalTrigger(minutes=1),
+                id='stats_rollup',
+                name='Provider Stats Rollup',
+                replace_existing=True,
+                max_instances=1
+            )
+            logger.info("Scheduled: Provider stats rollup every 1 minute")
+
             # Schedule database cleanup - daily at 3 AM
             self.expected_run_times['database_cleanup'] = now.replace(hour=3, minute=0, second=0)
             self.scheduler.add_job(
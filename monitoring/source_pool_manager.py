@@ -3,12 +3,17 @@ Intelligent Source Pool Manager
 Manages source pools, rotation, and automatic failover
 """
 
+import heapq
 import json
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-from threading import Lock
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from threading import Event, Lock, Thread
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from database.db_manager import db_manager
 from database.models import (
     SourcePool, PoolMember, RotationHistory, RotationState,
     Provider, RateLimitUsage
@@ -18,6 +23,444 @@ from utils.logger import setup_logger
 
 logger = setup_logger("source_pool_manager")
 
+# Pool snapshots are reloaded from the DB after this many seconds
+POOL_CACHE_TTL = 60.0
+# A background flusher writes buffered usage counters / rotation records
+# this often...
+FLUSH_INTERVAL = 5.0
+# ...or as soon as this many updates are pending
+FLUSH_BATCH_SIZE = 500
+
+
+# ============================================================================
+# In-memory selection state
+# ============================================================================
+
+class ProviderRef:
+    """Lightweight, session-independent provider handle returned by selections"""
+
+    __slots__ = ("id", "name", "category", "endpoint_url", "priority_tier")
+
+    def __init__(self, id: int, name: str, category: str, endpoint_url: str, priority_tier: Optional[int]):
+        self.id = id
+        self.name = name
+        self.category = category
+        self.endpoint_url = endpoint_url
+        self.priority_tier = priority_tier
+
+    def __repr__(self) -> str:
+        return f"ProviderRef(id={self.id}, name={self.name!r})"
+
+
+class _Member:
+    __slots__ = ("provider", "priority", "weight", "use_count", "last_used", "seq")
+
+    def __init__(self, provider: ProviderRef, priority: int, weight: int, use_count: int,
+                 last_used: Optional[datetime], seq: int):
+        self.provider = provider
+        self.priority = priority or 0
+        self.weight = weight or 1
+        self.use_count = use_count or 0
+        self.last_used = last_used
+        self.seq = seq
+
+
+class _PoolState:
+    """
+    Enabled members of one pool, pre-arranged for the pool's strategy:
+
+        round_robin   ring (deque) in least-recently-used order    O(1)
+        priority      list sorted by priority                      O(1)
+        least_used    heap keyed by use_count                      O(log n)
+        weighted      heap keyed by -weight / (use_count + 1)      O(log n)
+
+    Rate-limited members are skipped; if every member is rate-limited the
+    selection ignores rate limits (like the previous implementation).
+    """
+
+    def __init__(self, pool: SourcePool, members: List[_Member], state: Optional[RotationState]):
+        self.pool_id = pool.id
+        self.name = pool.name
+        self.strategy = pool.rotation_strategy or "round_robin"
+        self.enabled = bool(pool.enabled)
+        self.loaded_at = time.monotonic()
+        self.members = {m.provider.id: m for m in members}
+        self.current_provider_id = state.current_provider_id if state else None
+
+        if self.strategy == "priority":
+            self._ordered = sorted(members, key=lambda m: (-m.priority, m.seq))
+        elif self.strategy in ("least_used", "weighted"):
+            self._heap = [(self._heap_key(m), m.seq, m.provider.id) for m in members]
+            heapq.heapify(self._heap)
+        else:
+            never_used = [m for m in members if m.last_used is None]
+            used = sorted((m for m in members if m.last_used is not None), key=lambda m: m.last_used)
+            self._ring = deque(m.provider.id for m in never_used + used)
+
+    def _heap_key(self, member: _Member) -> float:
+        if self.strategy == "least_used":
+            return member.use_count
+        return -member.weight / (member.use_count + 1)
+
+    def select(
+        self,
+        is_available: Callable[[ProviderRef], bool],
+        fallback: Callable[[ProviderRef], bool]
+    ) -> Optional[_Member]:
+        """Next member passing is_available, else the next one passing fallback"""
+        if not self.members:
+            return None
+        member = self._select(is_available) or self._select(fallback)
+        if member is not None:
+            member.use_count += 1
+            member.last_used = datetime.utcnow()
+            if self.strategy in ("least_used", "weighted"):
+                heapq.heappush(self._heap, (self._heap_key(member), member.seq, member.provider.id))
+        return member
+
+    def _select(self, is_available: Callable[[ProviderRef], bool]) -> Optional[_Member]:
+        if self.strategy == "priority":
+            return next((m for m in self._ordered if is_available(m.provider)), None)
+
+        if self.strategy in ("least_used", "weighted"):
+            skipped = []
+            chosen = None
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                member = self.members[entry[2]]
+                if is_available(member.provider):
+                    chosen = member
+                    break
+                skipped.append(entry)
+            for entry in skipped:
+                heapq.heappush(self._heap, entry)
+            return chosen
+
+        for i, provider_id in enumerate(self._ring):
+            member = self.members[provider_id]
+            if is_available(member.provider):
+                del self._ring[i]
+                self._ring.append(provider_id)
+                return member
+        return None
+
+
+class PoolSelector:
+    """
+    Process-wide cache of pool membership and rotation state
+
+    Selections only touch memory; use counts, rotation state and rotation
+    history are buffered and written in one transaction by a background
+    flusher thread (every flush_interval seconds, or sooner once
+    flush_batch_size updates are pending), by flush(), and by shutdown().
+    Flushes write through db_manager.get_session(), and the selection lock
+    is not held during the write.
+    """
+
+    def __init__(self, ttl: float = POOL_CACHE_TTL, flush_interval: float = FLUSH_INTERVAL,
+                 flush_batch_size: int = FLUSH_BATCH_SIZE):
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.lock = Lock()
+        # One flush (or snapshot reload) at a time, so batches are written in order
+        self._flush_lock = Lock()
+        self._pools: Dict[int, _PoolState] = {}
+        self._last_flush = time.monotonic()
+        self._flush_wakeup = Event()
+        self._flush_stop = Event()
+        self._flusher: Optional[Thread] = None
+        self._reset_pending()
+
+    def _reset_pending(self):
+        # (pool_id, provider_id) -> [uses, successes, failures, last_used]
+        self._member_deltas: Dict[Tuple[int, int], List[Any]] = {}
+        # pool_id -> [current_provider_id, rotations, last_rotation]
+        self._state_deltas: Dict[int, List[Any]] = {}
+        self._rotations: List[Dict[str, Any]] = []
+        self._pending_ops = 0
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def invalidate(self, pool_id: Optional[int] = None):
+        """Drop cached snapshots (one pool or all) so they are reloaded on next use"""
+        with self.lock:
+            if pool_id is None:
+                self._pools.clear()
+            else:
+                self._pools.pop(pool_id, None)
+
+    def _load(self, session: Session, pool_id: int) -> Optional[_PoolState]:
+        pool = session.query(SourcePool).filter_by(id=pool_id).first()
+        if not pool:
+            return None
+        rows = (
+            session.query(PoolMember, Provider)
+            .join(Provider, Provider.id == PoolMember.provider_id)
+            .filter(PoolMember.pool_id == pool_id, PoolMember.enabled == True)  # noqa: E712
+            .order_by(PoolMember.id)
+            .all()
+        )
+        members = [
+            _Member(
+                ProviderRef(provider.id, provider.name, provider.category, provider.endpoint_url, provider.priority_tier),
+                member.priority, member.weight, member.use_count, member.last_used, seq
+            )
+            for seq, (member, provider) in enumerate(rows)
+        ]
+        state = session.query(RotationState).filter_by(pool_id=pool_id).first()
+        return _PoolState(pool, members, state)
+
+    def _ensure_pool(self, session: Session, pool_id: int):
+        """(Re)load the snapshot of a pool when missing or older than the TTL"""
+        with self.lock:
+            pool = self._pools.get(pool_id)
+            if pool is not None and time.monotonic() - pool.loaded_at < self.ttl:
+                return
+
+        with self._flush_lock:
+            # Persist buffered counters before re-reading them
+            self._write(self._take_pending())
+            pool = self._load(session, pool_id)
+            with self.lock:
+                if pool is None:
+                    self._pools.pop(pool_id, None)
+                    return
+                # Updates buffered since the write above are not in the DB yet
+                for (delta_pool_id, provider_id), (uses, _, _, last_used) in self._member_deltas.items():
+                    member = pool.members.get(provider_id) if delta_pool_id == pool_id else None
+                    if member is not None:
+                        member.use_count += uses
+                        member.last_used = last_used or member.last_used
+                if pool_id in self._state_deltas:
+                    pool.current_provider_id = self._state_deltas[pool_id][0]
+                self._pools[pool_id] = pool
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def select(
+        self,
+        session: Session,
+        pool_id: int,
+        exclude_rate_limited: bool = True,
+        exclude_provider_id: Optional[int] = None,
+        reason: str = "rotation",
+        notes: Optional[str] = None
+    ) -> Optional[ProviderRef]:
+        """
+        Pick the next provider of a pool and buffer the usage/rotation updates
+
+        Args:
+            session: Session used for (re)loading snapshots
+            pool_id: Pool ID
+            exclude_rate_limited: Skip providers whose rate limit is exhausted
+            exclude_provider_id: Never select this provider (failover)
+            reason: Rotation reason recorded when the provider changes
+            notes: Rotation notes
+
+        Returns:
+            ProviderRef or None if the pool is missing, disabled or empty
+        """
+        self._ensure_pool(session, pool_id)
+        with self.lock:
+            pool = self._pools.get(pool_id)
+            if pool is None or not pool.enabled:
+                logger.warning(f"Pool {pool_id} not found or disabled")
+                return None
+            if not pool.members:
+                logger.warning(f"No enabled members in pool {pool_id}")
+                return None
+
+            def allowed(provider: ProviderRef) -> bool:
+                return provider.id != exclude_provider_id
+
+            def is_available(provider: ProviderRef) -> bool:
+                return allowed(provider) and (
+                    not exclude_rate_limited or rate_limiter.can_make_request(provider.name)[0]
+                )
+
+            # If every member is rate-limited, use the strategy's pick anyway
+            member = pool.select(is_available, fallback=allowed)
+            if member is None:
+                return None
+
+            provider_id = member.provider.id
+            now = member.last_used
+            previous = pool.current_provider_id
+            if previous != provider_id or exclude_provider_id is not None:
+                self._rotations.append({
+                    "pool_id": pool_id,
+                    "from_provider_id": exclude_provider_id if exclude_provider_id is not None else previous,
+                    "to_provider_id": provider_id,
+                    "rotation_reason": reason,
+                    "timestamp": now,
+                    "success": True,
+                    "notes": notes
+                })
+            pool.current_provider_id = provider_id
+
+            delta = self._member_deltas.setdefault((pool_id, provider_id), [0, 0, 0, None])
+            delta[0] += 1
+            delta[3] = now
+            state = self._state_deltas.setdefault(pool_id, [None, 0, None])
+            state[0] = provider_id
+            state[1] += 1
+            state[2] = now
+            self._pending_ops += 1
+
+            self._schedule_flush()
+            return member.provider
+
+    def record_result(self, pool_id: int, provider_id: int, success: bool):
+        """Buffer a success/failure counter update for a pool member"""
+        with self.lock:
+            delta = self._member_deltas.setdefault((pool_id, provider_id), [0, 0, 0, None])
+            delta[1 if success else 2] += 1
+            self._pending_ops += 1
+            self._schedule_flush()
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _schedule_flush(self):
+        """Start the flusher thread if needed; wake it early once a batch is pending (lock held)"""
+        if self._flusher is None and not self._flush_stop.is_set():
+            self._flusher = Thread(target=self._flush_loop, name="pool-selector-flush", daemon=True)
+            self._flusher.start()
+        if self._pending_ops >= self.flush_batch_size:
+            self._flush_wakeup.set()
+
+    def _flush_loop(self):
+        while not self._flush_stop.is_set():
+            self._flush_wakeup.wait(self.flush_interval)
+            self._flush_wakeup.clear()
+            if not self._flush_stop.is_set():
+                self.flush()
+
+    def flush(self) -> int:
+        """
+        Write buffered counters, rotation state and rotation history
+
+        Returns:
+            Updates written
+        """
+        with self._flush_lock:
+            return self._write(self._take_pending())
+
+    def shutdown(self) -> int:
+        """Stop the flusher thread and write what is still buffered (app shutdown)"""
+        self._flush_stop.set()
+        self._flush_wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5)
+        return self.flush()
+
+    def _take_pending(self) -> Optional[Tuple]:
+        """Detach the buffered updates (under the selection lock only briefly)"""
+        with self.lock:
+            self._last_flush = time.monotonic()
+            if not self._pending_ops:
+                return None
+            batch = (self._member_deltas, self._state_deltas, self._rotations, self._pending_ops)
+            self._reset_pending()
+            return batch
+
+    def _restore_pending(self, batch: Tuple):
+        """Put a batch that failed to write back in front of newer updates"""
+        member_deltas, state_deltas, rotations, pending = batch
+        with self.lock:
+            for key, (uses, successes, failures, last_used) in member_deltas.items():
+                delta = self._member_deltas.setdefault(key, [0, 0, 0, None])
+                delta[0] += uses
+                delta[1] += successes
+                delta[2] += failures
+                delta[3] = delta[3] or last_used
+            for pool_id, (current_provider_id, rotations_count, last_rotation) in state_deltas.items():
+                state = self._state_deltas.get(pool_id)
+                if state is None:
+                    self._state_deltas[pool_id] = [current_provider_id, rotations_count, last_rotation]
+                else:
+                    state[1] += rotations_count
+            self._rotations[:0] = rotations
+            self._pending_ops += pending
+
+    def _write(self, batch: Optional[Tuple]) -> int:
+        """Write a detached batch in one transaction (caller holds _flush_lock)"""
+        if batch is None:
+            return 0
+        member_deltas, state_deltas, rotations, pending = batch
+
+        try:
+            with db_manager.get_session() as session:
+                for (pool_id, provider_id), (uses, successes, failures, last_used) in member_deltas.items():
+                    values = {
+                        "use_count": PoolMember.use_count + uses,
+                        "success_count": PoolMember.success_count + successes,
+                        "failure_count": PoolMember.failure_count + failures,
+                    }
+                    if last_used is not None:
+                        values["last_used"] = last_used
+                    session.execute(
+                        update(PoolMember)
+                        .where(PoolMember.pool_id == pool_id, PoolMember.provider_id == provider_id)
+                        .values(**values)
+                    )
+
+                if state_deltas:
+                    states = {
+                        state.pool_id: state
+                        for state in session.query(RotationState).filter(RotationState.pool_id.in_(list(state_deltas)))
+                    }
+                    for pool_id, (current_provider_id, rotations_count, last_rotation) in state_deltas.items():
+                        state = states.get(pool_id)
+                        if state is None:
+                            state = RotationState(pool_id=pool_id, rotation_count=0)
+                            session.add(state)
+                        state.current_provider_id = current_provider_id
+                        state.rotation_count = (state.rotation_count or 0) + rotations_count
+                        state.last_rotation = last_rotation
+
+                if rotations:
+                    session.bulk_insert_mappings(RotationHistory, rotations)
+        except Exception as e:
+            logger.error(f"Failed to flush pool selection state: {e}")
+            # Keep the updates for the next flush
+            self._restore_pending(batch)
+            return 0
+
+        logger.debug(f"Flushed {pending} pool selection updates ({len(rotations)} rotations)")
+        return pending
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cached_pools": len(self._pools),
+            "pending_updates": self._pending_ops,
+            "pending_rotations": len(self._rotations),
+            "seconds_since_flush": round(time.monotonic() - self._last_flush, 1),
+            "flusher_running": self._flusher is not None and self._flusher.is_alive(),
+        }
+
+
+_pool_selector: Optional[PoolSelector] = None
+
+
+def get_pool_selector() -> PoolSelector:
+    """Get global PoolSelector instance"""
+    global _pool_selector
+    if _pool_selector is None:
+        _pool_selector = PoolSelector()
+    return _pool_selector
+
+
+# ============================================================================
+# Pool manager
+# ============================================================================
+
 
 class SourcePoolManager:
     """
@@ -33,6 +476,7 @@ class SourcePoolManager:
         """
         self.db = db_session
         self.lock = Lock()
+        self.selector = get_pool_selector()
         logger.info("Source Pool Manager initialized")
 
     def create_pool(
@@ -75,6 +519,7 @@ class SourcePoolManager:
             self.db.add(state)
             self.db.commit()
 
+            self.selector.invalidate(pool.id)
             logger.info(f"Created source pool: {name} (strategy: {rotation_strategy})")
             return pool
 
@@ -112,6 +557,7 @@ class SourcePoolManager:
             self.db.commit()
             self.db.refresh(member)
 
+            self.selector.invalidate(pool_id)
             logger.info(f"Added provider {provider_id} to pool {pool_id}")
             return member
 
@@ -119,169 +565,32 @@ class SourcePoolManager:
         self,
         pool_id: int,
         exclude_rate_limited: bool = True
-    ) -> Optional[Provider]:
+    ) -> Optional[ProviderRef]:
         """
         Get next provider from pool based on rotation strategy
 
+        Selection runs against the in-memory pool snapshot (no SQL on the
+        hot path); use counts, rotation state and history are flushed in
+        batches by the shared PoolSelector.
+
         Args:
             pool_id: Pool ID
             exclude_rate_limited: Exclude rate-limited providers
 
         Returns:
-            Next Provider or None if none available
-        """
-        with self.lock:
-            # Get pool and its members
-            pool = self.db.query(SourcePool).filter_by(id=pool_id).first()
-            if not pool or not pool.enabled:
-                logger.warning(f"Pool {pool_id} not found or disabled")
-                return None
-
-            # Get enabled members with their providers
-            members = (
-                self.db.query(PoolMember)
-                .filter_by(pool_id=pool_id, enabled=True)
-                .join(Provider)
-                .filter(Provider.id == PoolMember.provider_id)
-                .all()
-            )
-
-            if not members:
-                logger.warning(f"No enabled members in pool {pool_id}")
-                return None
-
-            # Filter out rate-limited providers
-            if exclude_rate_limited:
-                available_members = []
-                for member in members:
-                    provider = self.db.query(Provider).get(member.provider_id)
-                    can_use, _ = rate_limiter.can_make_request(provider.name)
-                    if can_use:
-                        available_members.append(member)
-
-                if not available_members:
-                    logger.warning(f"All providers in pool {pool_id} are rate-limited")
-                    # Return highest priority member anyway
-                    available_members = members
-            else:
-                available_members = members
-
-            # Select provider based on strategy
-            selected_member = self._select_by_strategy(
-                pool.rotation_strategy,
-                available_members
-            )
-
-            if not selected_member:
-                return None
-
-            # Get rotation state
-            state = self.db.query(RotationState).filter_by(pool_id=pool_id).first()
-            if not state:
-                state = RotationState(pool_id=pool_id)
-                self.db.add(state)
-
-            # Record rotation if provider changed
-            old_provider_id = state.current_provider_id
-            if old_provider_id != selected_member.provider_id:
-                self._record_rotation(
-                    pool_id=pool_id,
-                    from_provider_id=old_provider_id,
-                    to_provider_id=selected_member.provider_id,
-                    reason="rotation"
-                )
-
-            # Update state
-            state.current_provider_id = selected_member.provider_id
-            state.last_rotation = datetime.utcnow()
-            state.rotation_count += 1
-
-            # Update member stats
-            selected_member.last_used = datetime.utcnow()
-            selected_member.use_count += 1
-
-            self.db.commit()
-
-            provider = self.db.query(Provider).get(selected_member.provider_id)
-            logger.info(
-                f"Selected provider {provider.name} from pool {pool.name} "
-                f"(strategy: {pool.rotation_strategy})"
-            )
-            return provider
-
-    def _select_by_strategy(
-        self,
-        strategy: str,
-        members: List[PoolMember]
-    ) -> Optional[PoolMember]:
-        """
-        Select a pool member based on rotation strategy
-
-        Args:
-            strategy: Rotation strategy
-            members: Available pool members
-
-        Returns:
-            Selected PoolMember
-        """
-        if not members:
-            return None
-
-        if strategy == "priority":
-            # Select highest priority member
-            return max(members, key=lambda m: m.priority)
-
-        elif strategy == "least_used":
-            # Select least used member
-            return min(members, key=lambda m: m.use_count)
-
-        elif strategy == "weighted":
-            # Weighted random selection (simple implementation)
-            # In production, use proper weighted random
-            return max(members, key=lambda m: m.weight * (1.0 / (m.use_count + 1)))
-
-        else:  # round_robin (default)
-            # Select least recently used
-            never_used = [m for m in members if m.last_used is None]
-            if never_used:
-                return never_used[0]
-            return min(members, key=lambda m: m.last_used)
-
-    def _record_rotation(
-        self,
-        pool_id: int,
-        from_provider_id: Optional[int],
-        to_provider_id: int,
-        reason: str,
-        notes: Optional[str] = None
-    ):
-        """
-        Record a rotation event
-
-        Args:
-            pool_id: Pool ID
-            from_provider_id: Previous provider ID
-            to_provider_id: New provider ID
-            reason: Rotation reason
-            notes: Additional notes
+            ProviderRef (id, name, category, ...) or None if none available
         """
-        rotation = RotationHistory(
-            pool_id=pool_id,
-            from_provider_id=from_provider_id,
-            to_provider_id=to_provider_id,
-            rotation_reason=reason,
-            success=True,
-            notes=notes
-        )
-        self.db.add(rotation)
-        self.db.commit()
+        provider = self.selector.select(self.db, pool_id, exclude_rate_limited=exclude_rate_limited)
+        if provider:
+            logger.debug(f"Selected provider {provider.name} from pool {pool_id}")
+        return provider
 
     def failover(
         self,
         pool_id: int,
         failed_provider_id: int,
         reason: str = "failure"
-    ) -> Optional[Provider]:
+    ) -> Optional[ProviderRef]:
         """
         Perform failover from a failed provider
 
@@ -293,108 +602,54 @@ class SourcePoolManager:
         Returns:
             Next available provider
         """
-        with self.lock:
-            logger.warning(
-                f"Failover triggered for provider {failed_provider_id} "
-                f"in pool {pool_id}. Reason: {reason}"
-            )
-
-            # Update failure count for the failed provider
-            member = (
-                self.db.query(PoolMember)
-                .filter_by(pool_id=pool_id, provider_id=failed_provider_id)
-                .first()
-            )
-            if member:
-                member.failure_count += 1
-                self.db.commit()
-
-            # Get next provider (excluding the failed one)
-            pool = self.db.query(SourcePool).filter_by(id=pool_id).first()
-            if not pool:
-                return None
-
-            members = (
-                self.db.query(PoolMember)
-                .filter_by(pool_id=pool_id, enabled=True)
-                .filter(PoolMember.provider_id != failed_provider_id)
-                .all()
-            )
-
-            if not members:
-                logger.error(f"No alternative providers available in pool {pool_id}")
-                return None
-
-            # Select next provider
-            selected_member = self._select_by_strategy(
-                pool.rotation_strategy,
-                members
-            )
-
-            if not selected_member:
-                return None
-
-            # Record failover
-            self._record_rotation(
-                pool_id=pool_id,
-                from_provider_id=failed_provider_id,
-                to_provider_id=selected_member.provider_id,
-                reason=reason,
-                notes=f"Automatic failover from provider {failed_provider_id}"
-            )
-
-            # Update rotation state
-            state = self.db.query(RotationState).filter_by(pool_id=pool_id).first()
-            if state:
-                state.current_provider_id = selected_member.provider_id
-                state.last_rotation = datetime.utcnow()
-                state.rotation_count += 1
+        logger.warning(
+            f"Failover triggered for provider {failed_provider_id} "
+            f"in pool {pool_id}. Reason: {reason}"
+        )
 
-            # Update member stats
-            selected_member.last_used = datetime.utcnow()
-            selected_member.use_count += 1
+        # Update failure count for the failed provider
+        self.selector.record_result(pool_id, failed_provider_id, success=False)
 
-            self.db.commit()
+        provider = self.selector.select(
+            self.db,
+            pool_id,
+            exclude_rate_limited=False,
+            exclude_provider_id=failed_provider_id,
+            reason=reason,
+            notes=f"Automatic failover from provider {failed_provider_id}"
+        )
+        if not provider:
+            logger.error(f"No alternative providers available in pool {pool_id}")
+            return None
 
-            provider = self.db.query(Provider).get(selected_member.provider_id)
-            logger.info(f"Failover successful: switched to provider {provider.name}")
-            return provider
+        # Failovers are rare and operators expect to see them immediately
+        self.selector.flush()
+        logger.info(f"Failover successful: switched to provider {provider.name}")
+        return provider
 
     def record_success(self, pool_id: int, provider_id: int):
         """
-        Record successful use of a provider
+        Record successful use of a provider (buffered)
 
         Args:
             pool_id: Pool ID
             provider_id: Provider ID
         """
-        with self.lock:
-            member = (
-                self.db.query(PoolMember)
-                .filter_by(pool_id=pool_id, provider_id=provider_id)
-                .first()
-            )
-            if member:
-                member.success_count += 1
-                self.db.commit()
+        self.selector.record_result(pool_id, provider_id, success=True)
 
     def record_failure(self, pool_id: int, provider_id: int):
         """
-        Record failed use of a provider
+        Record failed use of a provider (buffered)
 
         Args:
             pool_id: Pool ID
             provider_id: Provider ID
         """
-        with self.lock:
-            member = (
-                self.db.query(PoolMember)
-                .filter_by(pool_id=pool_id, provider_id=provider_id)
-                .first()
-            )
-            if member:
-                member.failure_count += 1
-                self.db.commit()
+        self.selector.record_result(pool_id, provider_id, success=False)
+
+    def flush(self) -> int:
+        """Write buffered selection counters and rotation history now"""
+        return self.selector.flush()
 
     def get_pool_status(self, pool_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -406,6 +661,9 @@ class SourcePoolManager:
         Returns:
             Pool status dictionary
         """
+        # Status reads the DB: write buffered counters first
+        self.selector.flush()
+
         with self.lock:
             pool = self.db.query(SourcePool).filter_by(id=pool_id).first()
             if not pool:
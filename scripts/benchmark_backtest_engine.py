@@ -0,0 +1,162 @@
+"""
+Backtest Engine Benchmark
+Compares the previous per-candle backtest loop (prefix slice + strategy call
+per bar) with the array engine at 10k / 100k / 1M synthetic candles.
+
+    legacy       the original BacktestingService._run_backtest loop
+    streaming    engine, strategy evaluated bar by bar through on_bar()
+    vectorised   engine, strategy signals() + array fills
+
+The legacy loop is quadratic, so it only runs up to --legacy-max candles.
+
+Usage:
+    python scripts/benchmark_backtest_engine.py [--sizes 10000 100000 1000000] [--strategy simple_moving_average]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from backend.services.backtest_engine import STRATEGIES, OHLCVArrays, get_strategy, run_backtest
+
+
+# ============================================================================
+# Previous implementation (kept here as the baseline)
+# ============================================================================
+
+def legacy_sma(data: List[Dict], current_price: float) -> str:
+    if len(data) < 50:
+        return "HOLD"
+    closes = [d["close"] for d in data[-50:]]
+    sma_short = sum(closes[-10:]) / 10
+    sma_long = sum(closes) / 50
+    if sma_short > sma_long:
+        return "BUY"
+    elif sma_short < sma_long:
+        return "SELL"
+    return "HOLD"
+
+
+def legacy_rsi(data: List[Dict], current_price: float) -> str:
+    if len(data) < 14:
+        return "HOLD"
+    closes = [d["close"] for d in data[-14:]]
+    gains = [max(0, closes[i] - closes[i-1]) for i in range(1, len(closes))]
+    losses = [max(0, closes[i-1] - closes[i]) for i in range(1, len(closes))]
+    avg_gain = sum(gains) / len(gains)
+    avg_loss = sum(losses) / len(losses)
+    rsi = 100 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+    if rsi < 30:
+        return "BUY"
+    elif rsi > 70:
+        return "SELL"
+    return "HOLD"
+
+
+def legacy_macd(data: List[Dict], current_price: float) -> str:
+    if len(data) < 26:
+        return "HOLD"
+    closes = [d["close"] for d in data[-26:]]
+    macd = sum(closes[-12:]) / 12 - sum(closes) / 26
+    if macd > 0:
+        return "BUY"
+    elif macd < 0:
+        return "SELL"
+    return "HOLD"
+
+
+LEGACY_STRATEGIES = {
+    "simple_moving_average": legacy_sma,
+    "rsi_strategy": legacy_rsi,
+    "macd_strategy": legacy_macd,
+}
+
+
+def legacy_backtest(historical_data: List[Dict], strategy_func, capital: float) -> Dict:
+    position = 0.0
+    entry_price = 0.0
+    trades = 0
+    equity_curve = [capital]
+    high_water_mark = capital
+    max_drawdown = 0.0
+    for i, candle in enumerate(historical_data):
+        close_price = candle["close"]
+        signal = strategy_func(historical_data[:i+1], close_price)
+        if signal == "BUY" and position == 0:
+            position = capital / close_price
+            entry_price = close_price
+            capital = 0
+        elif signal == "SELL" and position > 0:
+            capital = position * close_price
+            trades += 1
+            position = 0
+        current_equity = capital + (position * close_price if position > 0 else 0)
+        equity_curve.append(current_equity)
+        high_water_mark = max(high_water_mark, current_equity)
+        max_drawdown = max(max_drawdown, (high_water_mark - current_equity) / high_water_mark * 100)
+    if position > 0:
+        capital = position * historical_data[-1]["close"]
+        trades += 1
+    return {"final": capital, "total_trades": trades, "max_drawdown": max_drawdown}
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def make_candles(n: int, seed: int = 7) -> List[Dict]:
+    rng = np.random.default_rng(seed)
+    closes = 30000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return [
+        {"timestamp": i, "open": c, "high": c * 1.01, "low": c * 0.99, "close": c, "volume": 1.0}
+        for i, c in enumerate(closes.tolist())
+    ]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backtest engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--strategy", default="simple_moving_average", choices=sorted(STRATEGIES))
+    parser.add_argument("--legacy-max", type=int, default=20_000,
+                        help="Largest size to run the quadratic legacy loop on")
+    args = parser.parse_args()
+
+    print(f"strategy: {args.strategy}\n")
+    print(f"{'candles':>10} {'legacy':>10} {'streaming':>10} {'vectorised':>11} {'trades':>7}")
+    for n in args.sizes:
+        candles = make_candles(n)
+        strategy = get_strategy(args.strategy)
+
+        # Includes the list-of-dicts -> arrays conversion the service does
+        vector_time, result = timed(
+            lambda: run_backtest(OHLCVArrays.from_candles(candles), strategy, 10_000.0)
+        )
+        stream_time, streamed = timed(
+            lambda: run_backtest(OHLCVArrays.from_candles(candles), strategy, 10_000.0, stream=True)
+        )
+        assert streamed["total_trades"] == result["total_trades"]
+
+        if n <= args.legacy_max:
+            legacy_time, legacy = timed(legacy_backtest, candles, LEGACY_STRATEGIES[args.strategy], 10_000.0)
+            assert legacy["total_trades"] == result["total_trades"]
+            legacy_col = f"{legacy_time:>9.2f}s"
+        else:
+            legacy_col = f"{'skipped':>10}"
+        print(f"{n:>10,} {legacy_col} {stream_time:>9.2f}s {vector_time:>10.3f}s {result['total_trades']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Indicator Engine Benchmark
+Compares per-request CPU time of the shared NumPy indicator engine against the
+previous pure-Python router implementations at 500 / 5k / 50k candles.
+
+Usage:
+    python scripts/benchmark_indicators.py [--sizes 500 5000 50000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from backend.routers import indicators_api
+
+
+# ============================================================================
+# Previous pure-Python implementations (kept here as the baseline)
+# ============================================================================
+
+def legacy_ema(prices: List[float], period: int) -> float:
+    if len(prices) < period:
+        return prices[-1] if prices else 0
+    multiplier = 2 / (period + 1)
+    ema = sum(prices[:period]) / period
+    for price in prices[period:]:
+        ema = (price * multiplier) + (ema * (1 - multiplier))
+    return ema
+
+
+def legacy_rsi(prices: List[float], period: int = 14) -> float:
+    if len(prices) < period + 1:
+        return 50.0
+    deltas = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
+    gains = [d if d > 0 else 0 for d in deltas[-period:]]
+    losses = [-d if d < 0 else 0 for d in deltas[-period:]]
+    avg_gain = sum(gains) / period
+    avg_loss = sum(losses) / period
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def legacy_stoch_rsi(prices: List[float], rsi_period: int = 14, stoch_period: int = 14) -> float:
+    rsi_values = []
+    for i in range(stoch_period + 3):
+        end_idx = len(prices) - stoch_period + i + 1
+        if end_idx > rsi_period:
+            rsi_values.append(legacy_rsi(prices[:end_idx], rsi_period))
+    recent = rsi_values[-stoch_period:]
+    high, low = max(recent), min(recent)
+    return 50 if high == low else (rsi_values[-1] - low) / (high - low) * 100
+
+
+def legacy_macd(prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> float:
+    macd_line = legacy_ema(prices, fast) - legacy_ema(prices, slow)
+    macd_values = []
+    for i in range(signal + 5):
+        idx = len(prices) - signal - 5 + i
+        if idx > slow:
+            slice_prices = prices[:idx + 1]
+            macd_values.append(legacy_ema(slice_prices, fast) - legacy_ema(slice_prices, slow))
+    signal_line = legacy_ema(macd_values, signal) if len(macd_values) >= signal else macd_line
+    return macd_line - signal_line
+
+
+def legacy_bollinger(prices: List[float], period: int = 20) -> float:
+    recent = prices[-period:]
+    middle = sum(recent) / period
+    return (sum((p - middle) ** 2 for p in recent) / period) ** 0.5
+
+
+def legacy_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+    trs = [
+        max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+        for i in range(1, len(closes))
+    ]
+    return sum(trs[-period:]) / period
+
+
+def legacy_request(prices: List[float]) -> None:
+    """Indicator work done by one /api/indicators/comprehensive call before the engine"""
+    legacy_bollinger(prices)
+    legacy_stoch_rsi(prices)
+    highs = [p * 1.005 for p in prices]
+    lows = [p * 0.995 for p in prices]
+    legacy_atr(highs, lows, prices)
+    sum(prices[-20:]) / 20
+    sum(prices[-50:]) / 50
+    sum(prices[-200:]) / 200
+    legacy_ema(prices, 12)
+    legacy_ema(prices, 26)
+    legacy_macd(prices)
+    legacy_rsi(prices)
+
+
+def engine_request(prices: List[float]) -> None:
+    """Indicator work done by one /api/indicators/comprehensive call with the engine"""
+    indicators_api.calculate_bollinger_bands(prices, 20, 2)
+    indicators_api.calculate_stoch_rsi(prices, 14, 14)
+    highs = [p * 1.005 for p in prices]
+    lows = [p * 0.995 for p in prices]
+    indicators_api.calculate_atr(highs, lows, prices, 14)
+    indicators_api.calculate_sma(prices, 20)
+    indicators_api.calculate_sma(prices, 50)
+    indicators_api.calculate_sma(prices, 200)
+    indicators_api.calculate_ema(prices, 12)
+    indicators_api.calculate_ema(prices, 26)
+    indicators_api.calculate_macd(prices, 12, 26, 9)
+    indicators_api.calculate_rsi(prices, 14)
+
+
+def cpu_ms(func: Callable[[List[float]], None], prices: List[float], repeat: int) -> float:
+    """Best-of-N process CPU time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        func(prices)
+        best = min(best, time.process_time() - start)
+    return best * 1000
+
+
+def run(sizes: List[int], repeat: int) -> List[Dict[str, float]]:
+    rng = np.random.default_rng(42)
+    rows = []
+    for size in sizes:
+        prices = (50000 + np.cumsum(rng.normal(0, 50, size))).tolist()
+        legacy = cpu_ms(legacy_request, prices, repeat)
+        engine = cpu_ms(engine_request, prices, repeat)
+        rows.append({"candles": size, "legacy_ms": legacy, "engine_ms": engine})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'candles':>10} {'legacy ms':>12} {'engine ms':>12} {'speedup':>9}")
+    for row in run(args.sizes, args.repeat):
+        speedup = row["legacy_ms"] / row["engine_ms"] if row["engine_ms"] else float("inf")
+        print(f"{row['candles']:>10} {row['legacy_ms']:>12.2f} {row['engine_ms']:>12.2f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Metrics Middleware Micro-benchmark
+Drives a FastAPI app with a trivial endpoint directly through ASGI (no
+sockets, so only framework + middleware cost is measured) and reports
+requests/sec with:
+
+    none             no middleware
+    base_http        the previous BaseHTTPMiddleware implementation
+                     (re-importing the tracker on every request)
+    asgi             the current raw ASGI MetricsMiddleware
+    asgi + phases    same, with the handler recording two Server-Timing phases
+
+Usage:
+    python scripts/benchmark_metrics_middleware.py [--requests 20000] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.middleware import MetricsMiddleware
+from utils.server_timing import record_phase, timed_phase
+
+
+class BaseHTTPMetricsMiddleware(BaseHTTPMiddleware):
+    """The previous implementation, kept here for comparison"""
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response_time_ms = (time.time() - start_time) * 1000
+        from backend.routers.system_metrics_api import get_metrics_tracker
+        get_metrics_tracker().record_request(response_time_ms, response.status_code >= 400)
+        return response
+
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+    if middleware is not None:
+        app.add_middleware(middleware)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/phases")
+    async def phases():
+        record_phase("upstream", 0.001)
+        with timed_phase("compute"):
+            pass
+        return {"ok": True}
+
+    return app
+
+
+async def drive(app, path: str, requests: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(dict(scope), receive, send)  # build the middleware stack
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the metrics middleware")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3, help="Best of N rounds")
+    args = parser.parse_args()
+
+    cases = [
+        ("none", None, "/ping"),
+        ("base_http", BaseHTTPMetricsMiddleware, "/ping"),
+        ("asgi", MetricsMiddleware, "/ping"),
+        ("asgi + phases", MetricsMiddleware, "/phases"),
+    ]
+    baseline = None
+    print(f"{args.requests} sequential requests per round, best of {args.rounds}\n")
+    for label, middleware, path in cases:
+        best = max(asyncio.run(drive(build_app(middleware), path, args.requests)) for _ in range(args.rounds))
+        baseline = baseline or best
+        print(f"{label:<14} {best:>9,.0f} req/s  ({best / baseline:.0%} of no middleware)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Model Backend Benchmark
+Loads one classification model with each available CPU backend (torch fp32,
+onnx, onnx-int8, int8) and reports load time, process RSS after load,
+per-text latency (p50/p99, one text per call) and top-label agreement with
+the fp32 pipeline.
+
+Each backend runs in its own subprocess so RSS is not shared. Conversions are
+exported to the artifact cache first; the reported load time is the cached
+(second and later start) load.
+
+Usage:
+    python scripts/benchmark_model_backends.py [--model ElKulako/cryptobert] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services import model_backends
+from backend.services.model_backends import PARITY_TEXTS
+
+TASK = "text-classification"
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def load(backend: str, model_id: str):
+    from transformers import pipeline
+
+    reference = lambda: pipeline(TASK, model=model_id, device=-1)
+    if backend == "torch":
+        return reference()
+    return model_backends.load_fast_pipeline(model_id, TASK, backend, reference_factory=reference)
+
+
+def worker(backend: str, model_id: str, runs: int):
+    base_rss = rss_mb()
+    start = time.perf_counter()
+    pipe = load(backend, model_id)
+    load_seconds = time.perf_counter() - start
+    loaded_rss = rss_mb()
+
+    pipe(PARITY_TEXTS[0])  # warm-up
+    latencies = []
+    for _ in range(runs):
+        for text in PARITY_TEXTS:
+            t = time.perf_counter()
+            pipe(text)
+            latencies.append(time.perf_counter() - t)
+    latencies.sort()
+
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "rss_mb": loaded_rss - base_rss,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+        "labels": [model_backends._top_prediction(r)["label"] for r in pipe(PARITY_TEXTS)],
+    }))
+
+
+def run_worker(backend: str, model_id: str, runs: int):
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", backend, "--model", model_id, "--runs", str(runs)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CPU inference backends")
+    parser.add_argument("--model", default="ElKulako/cryptobert", help="HuggingFace model id")
+    parser.add_argument("--runs", type=int, default=5, help="Passes over the probe texts")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.model, args.runs)
+        return
+
+    if not model_backends.TORCH_AVAILABLE:
+        print("torch/transformers are not installed; nothing to benchmark")
+        sys.exit(1)
+
+    backends = ["torch", "int8"] + (["onnx", "onnx-int8"] if model_backends.ONNX_AVAILABLE else [])
+    for backend in backends[1:]:
+        # Export once so the measured load is the cached path
+        start = time.perf_counter()
+        load(backend, args.model)
+        print(f"prepared {backend} in {time.perf_counter() - start:.1f}s")
+
+    results = {backend: run_worker(backend, args.model, args.runs) for backend in backends}
+    reference = results["torch"]["labels"]
+
+    print(f"\n{args.model} ({len(PARITY_TEXTS)} probe texts x {args.runs})\n")
+    print(f"{'backend':<11}{'load s':>8}{'RSS MB':>9}{'p50 ms':>9}{'p99 ms':>9}{'parity':>8}")
+    for backend, r in results.items():
+        agreement = sum(a == b for a, b in zip(reference, r["labels"])) / len(reference)
+        print(
+            f"{backend:<11}{r['load_seconds']:>8.2f}{r['rss_mb']:>9.0f}"
+            f"{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{agreement:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
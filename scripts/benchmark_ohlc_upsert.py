@@ -0,0 +1,153 @@
+"""
+OHLC Cache Write Benchmark
+Compares the previous per-candle save path (SELECT + UPDATE/INSERT + COMMIT for
+every candle) with CacheQueries.save_ohlc_candles_bulk (one INSERT ... ON
+CONFLICT DO UPDATE transaction) on a temporary SQLite database.
+
+Commits are counted with an SQLAlchemy engine event. In SQLite's default
+rollback-journal mode every commit costs at least two fsyncs (journal + database
+file), so fsyncs are reported as 2 x commits.
+
+Usage:
+    python scripts/benchmark_ohlc_upsert.py [--candles 1000] [--symbols 1]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_, event
+
+from database.cache_queries import CacheQueries
+from database.db_manager import DatabaseManager
+from database.models import CachedOHLC
+
+FSYNCS_PER_COMMIT = 2
+
+
+def make_candles(count: int, symbols: int) -> List[Dict[str, Any]]:
+    start = datetime(2024, 1, 1)
+    candles = []
+    for s in range(symbols):
+        for i in range(count):
+            price = 30000 + i
+            candles.append({
+                "symbol": f"SYM{s}USDT",
+                "interval": "1h",
+                "timestamp": start + timedelta(hours=i),
+                "open": price,
+                "high": price + 10,
+                "low": price - 10,
+                "close": price + 5,
+                "volume": 100.0,
+                "provider": "benchmark"
+            })
+    return candles
+
+
+def legacy_save(db: DatabaseManager, candles: List[Dict[str, Any]]) -> int:
+    """Previous save_ohlc_candle loop: one session and commit per candle"""
+    saved = 0
+    for data in candles:
+        with db.get_session() as session:
+            existing = session.query(CachedOHLC).filter(
+                and_(
+                    CachedOHLC.symbol == data["symbol"],
+                    CachedOHLC.interval == data["interval"],
+                    CachedOHLC.timestamp == data["timestamp"]
+                )
+            ).first()
+            if existing:
+                existing.open = data["open"]
+                existing.high = data["high"]
+                existing.low = data["low"]
+                existing.close = data["close"]
+                existing.volume = data["volume"]
+                existing.provider = data["provider"]
+                existing.fetched_at = datetime.utcnow()
+            else:
+                session.add(CachedOHLC(
+                    symbol=data["symbol"],
+                    interval=data["interval"],
+                    timestamp=data["timestamp"],
+                    open=data["open"],
+                    high=data["high"],
+                    low=data["low"],
+                    close=data["close"],
+                    volume=data["volume"],
+                    provider=data["provider"],
+                    fetched_at=datetime.utcnow()
+                ))
+            session.commit()
+        saved += 1
+    return saved
+
+
+def run(label: str, db_dir: str, candles: List[Dict[str, Any]], bulk: bool) -> Dict[str, float]:
+    db = DatabaseManager(os.path.join(db_dir, f"{label}.db"))
+    db.init_database()
+    cache = CacheQueries(db)
+
+    commits = {"count": 0}
+    event.listen(db.engine, "commit", lambda conn: commits.__setitem__("count", commits["count"] + 1))
+
+    results = {}
+    # First pass inserts, second pass re-saves the same candles (update path)
+    for phase in ("insert", "update"):
+        commits["count"] = 0
+        start = time.perf_counter()
+        if bulk:
+            cache.save_ohlc_candles_bulk(candles)
+        else:
+            legacy_save(db, candles)
+        elapsed = time.perf_counter() - start
+        results[phase] = {
+            "seconds": elapsed,
+            "rows_per_sec": len(candles) / elapsed,
+            "commits": commits["count"],
+            "fsyncs": commits["count"] * FSYNCS_PER_COMMIT
+        }
+
+    with db.get_session() as session:
+        results["rows"] = session.query(CachedOHLC).count()
+    db.engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OHLC cache writes")
+    parser.add_argument("--candles", type=int, default=1000, help="Candles per symbol")
+    parser.add_argument("--symbols", type=int, default=1, help="Number of symbols")
+    args = parser.parse_args()
+
+    candles = make_candles(args.candles, args.symbols)
+    print(f"Writing {len(candles)} candles ({args.symbols} symbol(s))\n")
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        before = run("per_candle", db_dir, candles, bulk=False)
+        after = run("bulk_upsert", db_dir, candles, bulk=True)
+
+    print(f"{'path':<12}{'phase':<8}{'rows/s':>12}{'seconds':>10}{'commits':>9}{'fsyncs':>8}")
+    for label, results in (("per-candle", before), ("bulk", after)):
+        for phase in ("insert", "update"):
+            r = results[phase]
+            print(
+                f"{label:<12}{phase:<8}{r['rows_per_sec']:>12,.0f}{r['seconds']:>10.3f}"
+                f"{r['commits']:>9}{r['fsyncs']:>8}"
+            )
+    print()
+    for phase in ("insert", "update"):
+        speedup = after[phase]["rows_per_sec"] / before[phase]["rows_per_sec"]
+        print(f"{phase}: {speedup:.1f}x throughput")
+    print(f"rows stored: per-candle={before['rows']} bulk={after['rows']}")
+
+
+if __name__ == "__main__":
+    main()
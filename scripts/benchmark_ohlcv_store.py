@@ -0,0 +1,94 @@
+"""
+OHLCV Read Benchmark
+Reads a one-year 1m-candle series (525,600 candles by default) through
+CacheQueries.get_cached_ohlc (ORM rows -> list of dicts) and through the
+columnar OHLCVStore (memory-mapped NumPy views), then computes RSI on the
+closes. Reports wall time and peak Python allocations (tracemalloc, measured
+on a second run).
+
+Usage:
+    python scripts/benchmark_ohlcv_store.py [--candles 525600]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from backend.services import indicator_engine
+from backend.services.ohlcv_store import OHLCVStore
+from database.cache_queries import CacheQueries
+from database.db_manager import DatabaseManager
+
+
+def measure(label, fn):
+    # Time an untraced run; tracemalloc slows allocation-heavy code down a lot
+    start = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28}{rows:>10,}{elapsed:>10.3f}s{peak / 1e6:>12.1f} MB")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OHLCV reads")
+    parser.add_argument("--candles", type=int, default=525_600, help="Number of 1m candles")
+    args = parser.parse_args()
+
+    n = args.candles
+    rng = np.random.default_rng(0)
+    closes = 30000 + np.cumsum(rng.normal(0, 5, n))
+    start = datetime(2024, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        db.init_database()
+        cache = CacheQueries(db)
+        store = OHLCVStore(os.path.join(tmp, "store"))
+
+        print(f"Loading {n:,} candles...")
+        candles = [
+            {
+                "symbol": "BTC", "interval": "1m", "timestamp": start + timedelta(minutes=i),
+                "open": c, "high": c + 3, "low": c - 3, "close": c, "volume": 1.0, "provider": "benchmark"
+            }
+            for i, c in enumerate(closes.tolist())
+        ]
+        for i in range(0, n, 50_000):
+            cache.save_ohlc_candles_bulk(candles[i:i + 50_000])
+        store.append_candles(candles)
+        del candles
+
+        print(f"\n{'path':<28}{'candles':>10}{'time':>11}{'peak alloc':>12}")
+
+        def sqlite_path():
+            rows = cache.get_cached_ohlc("BTC", "1m", limit=n)
+            indicator_engine.rsi([row["close"] for row in rows])
+            return len(rows)
+
+        def store_path():
+            view = store.read("BTC", "1m")
+            indicator_engine.rsi(view.close)
+            return len(view)
+
+        orm = measure("get_cached_ohlc + RSI", sqlite_path)
+        mmap = measure("OHLCVStore.read + RSI", store_path)
+        print(f"\nspeedup: {orm / mmap:.0f}x")
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
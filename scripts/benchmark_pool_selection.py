@@ -0,0 +1,123 @@
+"""
+Source Pool Selection Benchmark
+Times SourcePoolManager.get_next_provider against the previous
+implementation (pool + member queries, one Provider lookup per member for the
+rate-limit check, rotation record + commit on every call) on a temporary
+SQLite database, and counts SQL statements per selection.
+
+Usage:
+    python scripts/benchmark_pool_selection.py [--members 8] [--calls 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from database.db_manager import DatabaseManager
+from database.models import PoolMember, Provider, RotationHistory, RotationState, SourcePool
+from monitoring.rate_limiter import rate_limiter
+from monitoring.source_pool_manager import SourcePoolManager
+
+
+def legacy_get_next_provider(db, pool_id):
+    """Previous get_next_provider (round_robin path)"""
+    pool = db.query(SourcePool).filter_by(id=pool_id).first()
+    members = (
+        db.query(PoolMember)
+        .filter_by(pool_id=pool_id, enabled=True)
+        .join(Provider)
+        .filter(Provider.id == PoolMember.provider_id)
+        .all()
+    )
+    available = []
+    for member in members:
+        provider = db.get(Provider, member.provider_id)
+        if rate_limiter.can_make_request(provider.name)[0]:
+            available.append(member)
+    never_used = [m for m in available if m.last_used is None]
+    selected = never_used[0] if never_used else min(available, key=lambda m: m.last_used)
+
+    state = db.query(RotationState).filter_by(pool_id=pool_id).first()
+    if state.current_provider_id != selected.provider_id:
+        db.add(RotationHistory(
+            pool_id=pool_id, from_provider_id=state.current_provider_id,
+            to_provider_id=selected.provider_id, rotation_reason="rotation", success=True
+        ))
+        db.commit()
+    state.current_provider_id = selected.provider_id
+    state.last_rotation = datetime.utcnow()
+    state.rotation_count += 1
+    selected.last_used = datetime.utcnow()
+    selected.use_count += 1
+    db.commit()
+    return db.get(Provider, selected.provider_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark source pool selection")
+    parser.add_argument("--members", type=int, default=8, help="Providers in the pool")
+    parser.add_argument("--calls", type=int, default=2000, help="Selections per run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "pools.db"))
+        db.init_database()
+        session = db.SessionLocal()
+        providers = [
+            Provider(name=f"bench{i}", category="market_data", endpoint_url=f"https://bench{i}.example")
+            for i in range(args.members)
+        ]
+        session.add_all(providers)
+        session.commit()
+
+        manager = SourcePoolManager(session)
+        pools = []
+        for name in ("legacy", "cached"):
+            pool = manager.create_pool(f"{name} pool", "market_data", rotation_strategy="round_robin")
+            for provider in providers:
+                manager.add_to_pool(pool.id, provider.id)
+            pools.append(pool.id)
+
+        statements = {"n": 0}
+        event.listen(db.engine, "before_cursor_execute", lambda *a: statements.__setitem__("n", statements["n"] + 1))
+
+        def run(select, pool_id):
+            select(pool_id)  # warm-up / snapshot load
+            statements["n"] = 0
+            latencies = []
+            for _ in range(args.calls):
+                start = time.perf_counter()
+                select(pool_id)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            return {
+                "p50": latencies[len(latencies) // 2],
+                "mean": sum(latencies) / len(latencies),
+                "sql": statements["n"] / args.calls,
+            }
+
+        legacy = run(lambda pool_id: legacy_get_next_provider(session, pool_id), pools[0])
+        cached = run(manager.get_next_provider, pools[1])
+        manager.flush()
+
+        # The cached mean includes the batched flushes (amortized)
+        print(f"{args.members} members, {args.calls} selections\n")
+        print(f"{'path':<10}{'p50':>12}{'mean':>12}{'SQL/call':>10}")
+        for label, r in (("previous", legacy), ("cached", cached)):
+            print(f"{label:<10}{r['p50'] * 1e6:>10.1f}us{r['mean'] * 1e6:>10.1f}us{r['sql']:>10.2f}")
+        print(f"\nspeedup: {legacy['p50'] / cached['p50']:.0f}x (p50), {legacy['mean'] / cached['mean']:.0f}x (mean)")
+
+        session.close()
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Provider Stats Benchmark
+30-day provider stats and failure analysis as the raw log history grows:
+the previous per-request aggregation over the raw tables versus the
+minute/hour rollups plus the unrolled tail.
+
+Usage:
+    python scripts/benchmark_provider_stats.py [--days 30 90 180] [--rows-per-hour 60] [--providers 20]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import case, func
+
+from database.db_manager import DatabaseManager
+from database.models import ConnectionAttempt, DataCollection, FailureLog
+
+
+def raw_provider_stats(db: DatabaseManager, provider_id: int, cutoff: datetime):
+    """Previous implementation: aggregate the raw tables on every request"""
+    with db.get_read_session() as session:
+        session.query(
+            func.count(ConnectionAttempt.id),
+            func.sum(case((ConnectionAttempt.status == 'success', 1), else_=0)),
+            func.sum(case((ConnectionAttempt.status == 'failed', 1), else_=0)),
+            func.sum(case((ConnectionAttempt.status == 'timeout', 1), else_=0)),
+            func.sum(case((ConnectionAttempt.status == 'rate_limited', 1), else_=0)),
+            func.avg(ConnectionAttempt.response_time_ms)
+        ).filter(ConnectionAttempt.provider_id == provider_id, ConnectionAttempt.timestamp >= cutoff).first()
+        session.query(
+            func.count(DataCollection.id),
+            func.sum(DataCollection.record_count),
+            func.sum(DataCollection.payload_size_bytes),
+            func.avg(DataCollection.data_quality_score),
+            func.avg(DataCollection.staleness_minutes)
+        ).filter(DataCollection.provider_id == provider_id, DataCollection.actual_fetch_time >= cutoff).first()
+        session.query(func.count(FailureLog.id)).filter(
+            FailureLog.provider_id == provider_id, FailureLog.timestamp >= cutoff
+        ).scalar()
+
+
+def raw_failure_analysis(db: DatabaseManager, cutoff: datetime):
+    with db.get_read_session() as session:
+        session.query(FailureLog.error_type, func.count(FailureLog.id)).filter(
+            FailureLog.timestamp >= cutoff).group_by(FailureLog.error_type).all()
+        session.query(FailureLog.provider_id, func.count(FailureLog.id)).filter(
+            FailureLog.timestamp >= cutoff).group_by(FailureLog.provider_id).all()
+        session.query(
+            func.sum(case((FailureLog.retry_attempted == True, 1), else_=0)),  # noqa: E712
+            func.sum(case((FailureLog.retry_result == 'success', 1), else_=0))
+        ).filter(FailureLog.timestamp >= cutoff).first()
+
+
+def fill(db: DatabaseManager, provider_ids, start: datetime, hours: int, rows_per_hour: int):
+    rng = random.Random(hours)
+    engine = db.engine
+    for hour in range(hours):
+        base = start + timedelta(hours=hour)
+        stamps = [base + timedelta(seconds=rng.uniform(0, 3600)) for _ in range(rows_per_hour)]
+        attempts, collections, failures = [], [], []
+        for ts in stamps:
+            provider_id = rng.choice(provider_ids)
+            attempts.append({
+                "provider_id": provider_id, "timestamp": ts, "endpoint": "/x",
+                "status": rng.choice(["success", "success", "success", "failed", "timeout"]),
+                "response_time_ms": rng.randint(10, 900), "retry_count": 0
+            })
+            collections.append({
+                "provider_id": provider_id, "category": "market_data", "scheduled_time": ts,
+                "actual_fetch_time": ts, "record_count": rng.randint(0, 50),
+                "payload_size_bytes": rng.randint(100, 5000), "data_quality_score": rng.random(),
+                "on_schedule": True
+            })
+            if rng.random() < 0.2:
+                failures.append({
+                    "provider_id": provider_id, "timestamp": ts, "endpoint": "/x",
+                    "error_type": rng.choice(["timeout", "http_500", "rate_limit"]),
+                    "retry_attempted": rng.random() < 0.5, "retry_result": rng.choice(["success", "failed"])
+                })
+        with engine.begin() as conn:
+            conn.execute(ConnectionAttempt.__table__.insert(), attempts)
+            conn.execute(DataCollection.__table__.insert(), collections)
+            if failures:
+                conn.execute(FailureLog.__table__.insert(), failures)
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark provider stats rollups")
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 90, 180], help="Raw history kept")
+    parser.add_argument("--rows-per-hour", type=int, default=60)
+    parser.add_argument("--providers", type=int, default=20)
+    parser.add_argument("--window-hours", type=int, default=24 * 30)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"window: {args.window_hours}h, {args.rows_per_hour} attempts/hour, {args.providers} providers\n")
+    print(f"{'history':>8} {'raw rows':>10} {'compact s':>10} {'stats raw':>10} {'stats rollup':>13} "
+          f"{'failures raw':>13} {'failures rollup':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "stats.db"))
+        db.init_database()
+        provider_ids = [db.create_provider(f"p{i}", "market_data", "https://x").id for i in range(args.providers)]
+        now = datetime.utcnow()
+        filled_hours = 0
+        for days in sorted(args.days):
+            # Extend history backwards in time; the window always ends now
+            hours = days * 24
+            fill(db, provider_ids, now - timedelta(hours=hours), hours - filled_hours, args.rows_per_hour)
+            filled_hours = hours
+
+            start = time.perf_counter()
+            db.compact_stats()
+            compact_time = time.perf_counter() - start
+            # Unrolled tail: one compaction interval of new rows
+            fill(db, provider_ids, now - timedelta(minutes=1), 1, args.rows_per_hour // 60 or 1)
+
+            cutoff = now - timedelta(hours=args.window_hours)
+            pid = provider_ids[0]
+            stats_raw = timed(lambda: raw_provider_stats(db, pid, cutoff))
+            stats_rollup = timed(lambda: db.get_provider_stats(pid, hours=args.window_hours))
+            failures_raw = timed(lambda: raw_failure_analysis(db, cutoff))
+            failures_rollup = timed(lambda: db.get_failure_analysis(hours=args.window_hours))
+            print(f"{days:>7}d {hours * args.rows_per_hour:>10,} {compact_time:>10.2f} {stats_raw:>8.1f}ms "
+                  f"{stats_rollup:>11.1f}ms {failures_raw:>11.1f}ms {failures_rollup:>14.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
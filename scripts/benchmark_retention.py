@@ -0,0 +1,143 @@
+"""
+Retention Cleanup Benchmark
+Worst-case writer stall while cleanup_old_data runs: the previous single
+transaction deleting every expired row versus the batched deletes
+(RETENTION_BATCH_SIZE rows per transaction) plus incremental vacuum.
+
+A writer process inserts small batches of connection attempts (like the
+collectors) for the whole cleanup; its insert latency percentiles and the
+longest single insert are the stall the collectors see.
+
+Usage:
+    python scripts/benchmark_retention.py [--rows 200000] [--batch-size 500] [--pause 10] [--dir data]
+"""
+
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database.db_manager as db_manager
+from database.db_manager import DatabaseManager
+from database.models import ConnectionAttempt, DataCollection
+
+
+def legacy_cleanup(db: DatabaseManager, days: int) -> int:
+    """Previous implementation: one transaction for every expired row"""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    with db.get_session() as session:
+        deleted = session.query(ConnectionAttempt).filter(ConnectionAttempt.timestamp < cutoff).delete()
+        deleted += session.query(DataCollection).filter(DataCollection.actual_fetch_time < cutoff).delete()
+    return deleted
+
+
+def fill(db: DatabaseManager, provider_id: int, rows: int, chunk: int = 10_000):
+    old = datetime.utcnow() - timedelta(days=60)
+    for start in range(0, rows, chunk):
+        count = min(chunk, rows - start)
+        with db.engine.begin() as conn:
+            conn.execute(ConnectionAttempt.__table__.insert(), [
+                {"provider_id": provider_id, "timestamp": old, "endpoint": "/api/v3/ticker",
+                 "status": "success", "response_time_ms": 120.0, "retry_count": 0}
+                for _ in range(count)
+            ])
+            conn.execute(DataCollection.__table__.insert(), [
+                {"provider_id": provider_id, "category": "market_data", "scheduled_time": old,
+                 "actual_fetch_time": old, "record_count": 10, "payload_size_bytes": 2048, "on_schedule": True}
+                for _ in range(count)
+            ])
+
+
+def _writer(path: str, provider_id: int, interval: float, ready, stop, results):
+    """Insert a small batch every interval until stopped, timing each insert"""
+    logging.disable(logging.CRITICAL)
+    db = DatabaseManager(path)
+    latencies = []
+    ready.set()
+    while not stop.is_set():
+        start = time.perf_counter()
+        with db.get_session() as session:
+            session.add_all([
+                ConnectionAttempt(provider_id=provider_id, endpoint="/api/v3/ticker", status="success",
+                                  response_time_ms=100.0)
+                for _ in range(10)
+            ])
+        latencies.append(time.perf_counter() - start)
+        time.sleep(interval)
+    results.put(latencies)
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run(path: str, mode: str, rows: int, interval: float):
+    db = DatabaseManager(path)
+    db.init_database()
+    provider_id = db.create_provider("provider", "market_data", "https://example.com").id
+    fill(db, provider_id, rows)
+    db.compact_stats()  # Same rollup work for both modes, keep it out of the timing
+
+    ctx = mp.get_context("spawn")
+    ready, stop, results = ctx.Event(), ctx.Event(), ctx.Queue()
+    writer = ctx.Process(target=_writer, args=(path, provider_id, interval, ready, stop, results))
+    writer.start()
+    ready.wait()
+    time.sleep(0.5)  # Baseline latencies before the cleanup starts
+
+    start = time.perf_counter()
+    if mode == "legacy":
+        deleted = legacy_cleanup(db, days=30)
+    else:
+        counts = db.cleanup_old_data(days=30)
+        deleted = counts["connection_attempts"] + counts["data_collections"]
+    elapsed = time.perf_counter() - start
+
+    time.sleep(0.2)
+    stop.set()
+    latencies = results.get()
+    writer.join()
+    return deleted, elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark writer stalls during retention cleanup")
+    parser.add_argument("--rows", type=int, default=200_000, help="Expired rows per table")
+    parser.add_argument("--batch-size", type=int, default=db_manager.RETENTION_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=db_manager.RETENTION_PAUSE * 1000, help="Pause between batches (ms)")
+    parser.add_argument("--interval", type=float, default=20.0, help="Writer think time (ms)")
+    parser.add_argument("--dir", default=None, help="Directory for the test databases (default: temp dir)")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    db_manager.RETENTION_BATCH_SIZE = args.batch_size
+    db_manager.RETENTION_PAUSE = args.pause / 1000
+
+    print(f"{args.rows:,} expired rows x 2 tables, batches of {args.batch_size}, {args.pause:.0f} ms pause\n")
+    print(f"{'mode':>8} {'deleted':>9} {'cleanup s':>10} {'inserts':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>9} {'file MB':>8}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for mode in ("legacy", "batched"):
+            path = os.path.join(tmp, f"{mode}.db")
+            deleted, elapsed, latencies = run(path, mode, args.rows, args.interval / 1000)
+            db = DatabaseManager(path)
+            with db.engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"{mode:>8} {deleted:>9,} {elapsed:>10.2f} {len(latencies):>8} "
+                  f"{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f} "
+                  f"{max(latencies, default=0) * 1000:>9.1f} {size_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+SQLite Profile Benchmark
+Mixed read/write concurrency against DatabaseManager with the legacy
+settings ("off": rollback journal, one shared pool) and the tuned profiles.
+
+Writer processes insert batches of connection attempts (like the
+scheduler and the collector worker), reader processes run the API's
+provider / log queries, all against one database file. Lock wait per op is
+wall time minus the process's CPU time: time blocked on SQLite locks (busy
+handler sleeps) and disk syncs, plus CPU scheduling, which is the same for
+every profile - compare the columns between profiles. Failed ops are the
+ones that gave up with "database is locked".
+
+Usage:
+    python scripts/benchmark_sqlite_profile.py [--writers 2] [--readers 4] [--seconds 5] [--batch 50] [--pause 50] [--dir data]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import multiprocessing as mp
+import tempfile
+import time
+from typing import Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.models import ConnectionAttempt
+from database.sqlite_tuning import SQLITE_PROFILES
+
+
+def write_op(db: DatabaseManager, provider_ids: List[int], batch: int) -> bool:
+    try:
+        with db.get_session() as session:
+            session.add_all([
+                ConnectionAttempt(
+                    provider_id=random.choice(provider_ids),
+                    endpoint="/api/v3/ticker",
+                    status="success" if random.random() > 0.1 else "failed",
+                    response_time_ms=random.uniform(20, 400),
+                    http_status_code=200
+                )
+                for _ in range(batch)
+            ])
+        return True
+    except Exception:
+        return False
+
+
+def read_op(db: DatabaseManager, provider_ids: List[int], batch: int) -> bool:
+    # Manager getters log and swallow errors, returning empty results
+    if random.random() < 0.8:
+        return db.get_provider(provider_id=random.choice(provider_ids)) is not None
+    return bool(db.get_connection_attempts(provider_id=random.choice(provider_ids), hours=1, limit=20))
+
+
+def setup_db(path: str, profile: str, rows: int, batch: int) -> (DatabaseManager, List[int]):
+    db = DatabaseManager(path, profile=profile)
+    db.init_database()
+    provider_ids = []
+    for i in range(8):
+        provider = db.create_provider(f"provider_{i}", "market_data", f"https://example{i}.com")
+        provider_ids.append(provider.id)
+    for _ in range(rows // batch):
+        write_op(db, provider_ids, batch)
+    return db, provider_ids
+
+
+def _worker(role: str, path: str, profile: str, provider_ids: List[int], batch: int,
+            seconds: float, pause: float, barrier, results):
+    """One writer / reader process: run ops until the deadline"""
+    logging.disable(logging.CRITICAL)
+    db = DatabaseManager(path, profile=profile)
+    op = write_op if role == "write" else read_op
+    latencies, waits, errors = [], [], 0
+    barrier.wait()
+    stop_at = time.perf_counter() + seconds
+    while time.perf_counter() < stop_at:
+        start, cpu_start = time.perf_counter(), time.process_time()
+        ok = op(db, provider_ids, batch)
+        elapsed = time.perf_counter() - start
+        if not ok:
+            errors += 1
+            continue
+        latencies.append(elapsed)
+        waits.append(max(0.0, elapsed - (time.process_time() - cpu_start)))
+        time.sleep(random.uniform(0, 2 * pause))
+    results.put((role, latencies, waits, errors))
+
+
+def run_mixed(path: str, profile: str, provider_ids: List[int], writers: int, readers: int,
+              seconds: float, batch: int, pause: float) -> (Dict[str, List], Dict[str, List], Dict[str, int]):
+    """Run writer and reader processes concurrently against one database file"""
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(writers + readers)
+    results = ctx.Queue()
+    roles = ["write"] * writers + ["read"] * readers
+    procs = [
+        ctx.Process(target=_worker, args=(role, path, profile, provider_ids, batch, seconds, pause, barrier, results))
+        for role in roles
+    ]
+    for proc in procs:
+        proc.start()
+
+    latencies = {"write": [], "read": []}
+    waits = {"write": [], "read": []}
+    failures = {"write": 0, "read": 0}
+    for _ in procs:
+        role, role_latencies, role_waits, errors = results.get()
+        latencies[role].extend(role_latencies)
+        waits[role].extend(role_waits)
+        failures[role] += errors
+    for proc in procs:
+        proc.join()
+    return latencies, waits, failures
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite tuning profiles under mixed load")
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=50, help="Rows per write transaction")
+    parser.add_argument("--pause", type=float, default=50.0, help="Mean think time between ops per process (ms)")
+    parser.add_argument("--rows", type=int, default=5000, help="Connection attempts pre-loaded")
+    parser.add_argument("--profiles", nargs="+", default=["off", "performance", "durable"],
+                        choices=sorted(SQLITE_PROFILES))
+    parser.add_argument("--dir", default=None, help="Directory for the test databases (default: temp dir)")
+    args = parser.parse_args()
+
+    # Manager methods log every failure; keep the output to the table
+    logging.disable(logging.CRITICAL)
+
+    print(f"{args.writers} writers x {args.batch} rows, {args.readers} readers, "
+          f"{args.pause:.0f} ms think time, {args.seconds:.0f}s per profile\n")
+    print(f"{'profile':>12} {'op':>6} {'ops/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'failed':>7} {'lock wait s':>12} {'wait p99 ms':>12}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for profile in args.profiles:
+            path = os.path.join(tmp, f"{profile}.db")
+            db, provider_ids = setup_db(path, profile, args.rows, args.batch)
+            db.optimize()
+            latencies, waits, failures = run_mixed(
+                path, profile, provider_ids, args.writers, args.readers, args.seconds, args.batch, args.pause / 1000
+            )
+            for op in ("write", "read"):
+                values = latencies[op]
+                print(f"{profile:>12} {op:>6} {len(values) / args.seconds:>8.0f} "
+                      f"{percentile(values, 0.5) * 1000:>8.2f} {percentile(values, 0.99) * 1000:>8.2f} "
+                      f"{max(values, default=0) * 1000:>8.1f} {failures[op]:>7} "
+                      f"{sum(waits[op]):>12.2f} {percentile(waits[op], 0.99) * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
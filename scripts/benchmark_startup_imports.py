@@ -0,0 +1,89 @@
+"""
+Startup Import-Time Benchmark
+Imports the server module in a fresh interpreter under `python -X importtime`
+and reports the total import time and the heaviest top-level imports, with
+lazy routers (default) and, for comparison, with LAZY_ROUTERS=false.
+
+Exits with status 1 when the lazy import time exceeds the budget, so it can
+run as a CI / pre-deploy check.
+
+Usage:
+    python scripts/benchmark_startup_imports.py [--module hf_unified_server] [--budget-ms 2000] [--runs 3] [--no-eager]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module, lazy=True):
+    """
+    Import `module` once in a subprocess
+
+    Returns:
+        (total_us, [(cumulative_us, name), ...] for the module's direct imports)
+    """
+    env = dict(os.environ, LAZY_ROUTERS="true" if lazy else "false", PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    total = None
+    children = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if name == module and depth == 1:
+            total = cumulative
+        elif depth == 3:
+            children.append((cumulative, name))
+    if total is None:
+        raise RuntimeError(f"{module} not found in -X importtime output")
+    return total, sorted(children, reverse=True)
+
+
+def best_of(module, runs, lazy):
+    results = [measure(module, lazy) for _ in range(runs)]
+    return min(results, key=lambda result: result[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark server import time")
+    parser.add_argument("--module", default="hf_unified_server", help="Module to import")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000")),
+                        help="Fail when the lazy import time exceeds this")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per mode (best is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest direct imports to list")
+    parser.add_argument("--no-eager", action="store_true", help="Skip the LAZY_ROUTERS=false comparison")
+    args = parser.parse_args()
+
+    lazy_total, lazy_children = best_of(args.module, args.runs, lazy=True)
+    print(f"import {args.module} (lazy routers): {lazy_total / 1000:.0f} ms  (best of {args.runs})")
+    for cumulative, name in lazy_children[:args.top]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    if not args.no_eager:
+        eager_total, _ = best_of(args.module, args.runs, lazy=False)
+        print(f"\nimport {args.module} (LAZY_ROUTERS=false): {eager_total / 1000:.0f} ms")
+        print(f"lazy routers save {(eager_total - lazy_total) / 1000:.0f} ms ({eager_total / lazy_total:.1f}x)")
+
+    budget_us = args.budget_ms * 1000
+    if lazy_total > budget_us:
+        print(f"\nFAIL: {lazy_total / 1000:.0f} ms exceeds the {args.budget_ms:.0f} ms import budget")
+        sys.exit(1)
+    print(f"\nOK: within the {args.budget_ms:.0f} ms import budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+WebSocket Delta Encoding Benchmark
+Replays a synthetic market feed (N coins x prices/volumes/market_caps/
+price_changes) where each tick changes a fraction of the coins and some ticks
+change nothing, and compares for S subscribers:
+
+    full per client   the old broadcast: full state, send_json per subscriber
+    full once         full state encoded once per tick (ChannelHub)
+    delta             snapshot once, then changed fields only (DeltaStream)
+    delta msgpack     same, binary frames (if msgpack is installed)
+
+Reports egress bytes and serialization CPU (including the diff) per run.
+
+Usage:
+    python scripts/benchmark_ws_delta.py [--coins 100] [--ticks 120] [--subscribers 1000] [--change 0.05] [--idle 0.3]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.ws_delta import DeltaStream
+from backend.services.ws_hub import MSGPACK_AVAILABLE, encode_message
+
+
+def make_feed(coins: int, ticks: int, change: float, idle: float, seed: int = 7):
+    rng = random.Random(seed)
+    symbols = [f"C{i:03d}" for i in range(coins)]
+    prices = {s: rng.uniform(0.01, 60000) for s in symbols}
+    feed = []
+    for _ in range(ticks):
+        if rng.random() >= idle:
+            for symbol in rng.sample(symbols, max(1, int(coins * change))):
+                prices[symbol] = round(prices[symbol] * rng.uniform(0.995, 1.005), 6)
+        feed.append({
+            "prices": dict(prices),
+            "volumes": {s: round(p * 1000, 2) for s, p in prices.items()},
+            "market_caps": {s: round(p * 19_000_000, 0) for s, p in prices.items()},
+            "price_changes": {s: round((p % 7) - 3.5, 4) for s, p in prices.items()},
+        })
+    return feed
+
+
+def full_message(state):
+    return {
+        "type": "market_data",
+        "data": state,
+        "count": len(state["prices"]),
+        "timestamp": datetime.utcnow().isoformat(),
+        "source": "benchmark",
+    }
+
+
+def run_full(feed, subscribers, per_client):
+    egress = 0
+    start = time.perf_counter()
+    for state in feed:
+        message = full_message(state)
+        if per_client:
+            for _ in range(subscribers):
+                egress += len(json.dumps(message, separators=(",", ":"), ensure_ascii=False))
+        else:
+            egress += len(encode_message(message)) * subscribers
+    return egress, time.perf_counter() - start, len(feed)
+
+
+def run_delta(feed, subscribers, encoding):
+    stream = DeltaStream("market_data")
+    egress = 0
+    frames = 0
+    start = time.perf_counter()
+    for i, state in enumerate(feed):
+        delta = stream.update(state, source="benchmark")
+        if i == 0:
+            # Every subscriber starts from one snapshot
+            egress += len(encode_message(stream.snapshot(), encoding)) * subscribers
+            frames += 1
+        elif delta is not None:
+            egress += len(encode_message(delta, encoding)) * subscribers
+            frames += 1
+    return egress, time.perf_counter() - start, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark delta-encoded WebSocket market updates")
+    parser.add_argument("--coins", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=120)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--change", type=float, default=0.05, help="Fraction of coins changing per active tick")
+    parser.add_argument("--idle", type=float, default=0.3, help="Fraction of ticks with no change")
+    args = parser.parse_args()
+
+    feed = make_feed(args.coins, args.ticks, args.change, args.idle)
+    print(f"{args.coins} coins, {args.ticks} ticks, {args.subscribers} subscribers, "
+          f"{args.change:.0%} of coins change per tick, {args.idle:.0%} idle ticks\n")
+
+    runs = [
+        ("full per client", lambda: run_full(feed, args.subscribers, per_client=True)),
+        ("full once", lambda: run_full(feed, args.subscribers, per_client=False)),
+        ("delta json", lambda: run_delta(feed, args.subscribers, "json")),
+    ]
+    if MSGPACK_AVAILABLE:
+        runs.append(("delta msgpack", lambda: run_delta(feed, args.subscribers, "msgpack")))
+    else:
+        print("(msgpack not installed: skipping binary encoding)\n")
+
+    baseline = None
+    print(f"{'mode':<18} {'egress':>12} {'cpu':>10} {'frames':>7}")
+    for label, run in runs:
+        egress, cpu, frames = run()
+        if baseline is None:
+            baseline = (egress, cpu)
+        print(f"{label:<18} {egress / 1e6:>9.1f} MB {cpu * 1000:>7.0f} ms {frames:>7}   "
+              f"(egress /{baseline[0] / egress:.0f}, cpu /{baseline[1] / cpu:.0f})")
+
+
+if __name__ == "__main__":
+    main()
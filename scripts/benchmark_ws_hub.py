@@ -0,0 +1,163 @@
+"""
+WebSocket Fan-out Load Test
+Simulates N clients subscribed to one channel and delivers a number of ticks
+the old way (each client runs its own update loop: one upstream fetch and one
+send_json per client, sent one after another) and through ChannelHub (one
+fetch per channel, encoded once, concurrent per-client queues).
+
+Each simulated socket spends --send-ms per frame and a --slow fraction of them
+spend --slow-ms, to show that slow consumers no longer hold up everyone else.
+The upstream fetch costs --fetch-ms.
+
+Usage:
+    python scripts/benchmark_ws_hub.py [--clients 1000] [--ticks 5] [--send-ms 0.2] [--slow 0.01] [--slow-ms 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.ws_hub import ChannelHub
+
+CHANNEL = "market"
+
+
+def make_market(tick: int):
+    return {
+        "tickers": [
+            {"symbol": f"COIN{i}", "price": 100.0 + i + tick * 0.01, "volume_24h": 1e6 * (i + 1)}
+            for i in range(50)
+        ]
+    }
+
+
+class SimulatedSocket:
+    def __init__(self, send_delay: float):
+        self.send_delay = send_delay
+        self.frames = 0
+        self.bytes = 0
+
+    async def _deliver(self, text: str):
+        await asyncio.sleep(self.send_delay)
+        self.frames += 1
+        self.bytes += len(text)
+
+    async def send_json(self, message):
+        # What Starlette does: serialize per call
+        await self._deliver(json.dumps(message, separators=(",", ":"), ensure_ascii=False))
+
+    async def send_text(self, text: str):
+        await self._deliver(text)
+
+
+def make_sockets(args):
+    slow_every = int(1 / args.slow) if args.slow > 0 else 0
+    return [
+        SimulatedSocket((args.slow_ms if slow_every and i % slow_every == 0 else args.send_ms) / 1000)
+        for i in range(args.clients)
+    ]
+
+
+async def run_per_client(args):
+    """Previous behaviour: every client fetches and sends its own updates"""
+    sockets = make_sockets(args)
+    fetches = 0
+
+    async def fetch(tick):
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(args.fetch_ms / 1000)
+        return make_market(tick)
+
+    async def client_loop(socket):
+        for tick in range(args.ticks):
+            data = await fetch(tick)
+            await socket.send_json({"type": "update", "channel": CHANNEL, "data": data})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(s) for s in sockets))
+    return time.perf_counter() - start, fetches, sockets
+
+
+async def run_sequential_broadcast(args):
+    """Previous broadcast(): one fetch, but send_json to each client in turn"""
+    sockets = make_sockets(args)
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        await asyncio.sleep(args.fetch_ms / 1000)
+        message = {"type": "update", "channel": CHANNEL, "data": make_market(tick)}
+        for socket in sockets:
+            await socket.send_json(message)
+    return time.perf_counter() - start, args.ticks, sockets
+
+
+async def run_hub(args):
+    sockets = make_sockets(args)
+    fetches = 0
+    tick = 0
+
+    async def fetch(channel):
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(args.fetch_ms / 1000)
+        return {"type": "update", "channel": channel, "data": make_market(tick)}
+
+    hub = ChannelHub(fetch=fetch, interval=3600)
+    for i, socket in enumerate(sockets):
+        hub.register(f"client_{i}", socket.send_text)
+        hub.subscribe(f"client_{i}", CHANNEL)
+
+    fast = [s for s in sockets if s.send_delay * 1000 <= args.send_ms]
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        # Bypass the cache so each tick is a fresh shared fetch, like the producer
+        message = await hub._fetch_shared(CHANNEL)
+        hub.publish(CHANNEL, message)
+        target = tick + 1
+        while any(s.frames < target for s in fast):
+            await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    stats = hub.stats()
+    await hub.close()
+    return elapsed, fetches, sockets, stats
+
+
+def report(label, elapsed, fetches, sockets, args):
+    frames = sum(s.frames for s in sockets)
+    print(f"{label:<28} {elapsed:>8.2f} s  fetches={fetches:<6} frames={frames:<7} "
+          f"({args.clients * args.ticks / elapsed:,.0f} client-updates/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket fan-out load test")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--fetch-ms", type=float, default=20.0, help="Upstream fetch latency")
+    parser.add_argument("--send-ms", type=float, default=0.2, help="Per-frame send time of a normal client")
+    parser.add_argument("--slow", type=float, default=0.01, help="Fraction of slow clients")
+    parser.add_argument("--slow-ms", type=float, default=50.0, help="Per-frame send time of a slow client")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.ticks} ticks, fetch {args.fetch_ms} ms, "
+          f"send {args.send_ms} ms ({args.slow:.0%} slow at {args.slow_ms} ms)\n")
+
+    elapsed, fetches, sockets = asyncio.run(run_per_client(args))
+    report("per-client update loops", elapsed, fetches, sockets, args)
+
+    elapsed, fetches, sockets = asyncio.run(run_sequential_broadcast(args))
+    report("sequential broadcast", elapsed, fetches, sockets, args)
+
+    elapsed, fetches, sockets, stats = asyncio.run(run_hub(args))
+    report("channel hub", elapsed, fetches, sockets, args)
+    print(f"  hub: {stats['published']} encodes, {stats['coalesced']} coalesced, "
+          f"{stats['dropped']} dropped for slow clients (timed until fast clients had every tick)")
+
+
+if __name__ == "__main__":
+    main()
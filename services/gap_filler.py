@@ -12,6 +12,8 @@ from enum import Enum
 from datetime import datetime
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -153,30 +155,42 @@ class GapFillerService:
         timestamps: List[int], 
         context: Optional[Dict[str, Any]]
     ) -> List[int]:
-        """Detect missing timestamps in a time series"""
+        """
+        Detect missing timestamps in a time series
+        
+        The series is sorted into an array once; gaps are the diffs larger
+        than 1.5x the expected interval (the smallest step) and their missing
+        slots are generated with array arithmetic, so no Python loop runs
+        over the series. At most context["max_missing"] (default 100)
+        timestamps are returned, oldest first.
+        """
         if not timestamps or len(timestamps) < 2:
             return []
         
-        timestamps = sorted(timestamps)
-        missing = []
+        max_missing = int((context or {}).get("max_missing", 100))
+        ts = np.unique(np.asarray(timestamps))  # sorted, duplicates removed
+        if len(ts) < 2:
+            return []
         
         # Determine expected interval (e.g., 1 minute, 5 minutes, 1 hour)
-        intervals = [timestamps[i+1] - timestamps[i] for i in range(len(timestamps)-1)]
-        expected_interval = min(intervals) if intervals else 60
-        
-        # Find gaps
-        for i in range(len(timestamps) - 1):
-            current = timestamps[i]
-            next_ts = timestamps[i + 1]
-            diff = next_ts - current
-            
-            if diff > expected_interval * 1.5:  # Allow 50% tolerance
-                # Generate missing timestamps
-                num_missing = int(diff / expected_interval) - 1
-                for j in range(1, num_missing + 1):
-                    missing.append(current + j * expected_interval)
+        diffs = np.diff(ts)
+        expected_interval = diffs.min()
+        
+        # Find gaps (allow 50% tolerance)
+        gap_idx = np.flatnonzero(diffs > expected_interval * 1.5)
+        if not len(gap_idx):
+            return []
+        counts = (diffs[gap_idx] // expected_interval).astype(np.int64) - 1
         
-        return missing[:100]  # Limit to 100 missing points
+        # Only materialize the gaps needed to reach max_missing
+        used = int(np.searchsorted(np.cumsum(counts), max_missing)) + 1
+        gap_idx, counts = gap_idx[:used], counts[:used]
+        
+        starts = np.repeat(ts[gap_idx], counts)
+        # 1..count within each gap
+        steps = np.arange(1, counts.sum() + 1) - np.repeat(np.cumsum(counts) - counts, counts)
+        missing = starts + steps * expected_interval
+        return missing[:max_missing].tolist()
     
     def _detect_price_gaps(self, prices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect gaps in price data (e.g., missing OHLC fields)"""
@@ -306,8 +320,8 @@ class GapFillerService:
                     text = data["text"]
                 
                 if text:
-                    from ai_models import ensemble_crypto_sentiment
-                    sentiment = ensemble_crypto_sentiment(text)
+                    from ai_models import ensemble_crypto_sentiment_async
+                    sentiment = await ensemble_crypto_sentiment_async(text)
                     
                     return {
                         "success": True,
@@ -353,6 +367,11 @@ class GapFillerService:
             existing_data = data.get("prices", [])
             missing_timestamps = gap.get("missing_timestamps", [])
             
+            if not existing_data and context and context.get("interval"):
+                # Neighbouring candles straight from the columnar store (zero-copy view)
+                from backend.services.ohlcv_store import get_ohlcv_store
+                existing_data = get_ohlcv_store().read(symbol, context["interval"])
+            
             if not existing_data or not missing_timestamps:
                 return {"success": False, "error": "Insufficient data for interpolation"}
             
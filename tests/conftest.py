@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Routers open their database at import time (unified_service_api defaults to
+# ./unified_service.db); keep it out of the working tree
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="tests-"), "unified_service.db")
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from backend.services.backtest_engine import (
+    BUY, HOLD, SELL, STRATEGIES, OHLCVArrays, Strategy, get_strategy, run_backtest, simulate, stream_signals
+)
+
+
+def _candles(n=3000, seed=3):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return [{"timestamp": i, "open": c, "high": c, "low": c, "close": c, "volume": 1.0}
+            for i, c in enumerate(closes.tolist())]
+
+
+def _sequential_fills(closes, signals, capital):
+    """Reference: the original one-bar-at-a-time fill loop"""
+    position, entry, trades, equity = 0.0, 0.0, 0, [capital]
+    for close, signal in zip(closes, signals):
+        if signal == BUY and position == 0:
+            position, entry, capital = capital / close, close, 0
+        elif signal == SELL and position > 0:
+            capital, position, trades = position * close, 0, trades + 1
+        equity.append(capital + position * close)
+    if position > 0:
+        capital, trades = position * closes[-1], trades + 1
+    return capital, trades, equity
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_vectorised_matches_streaming_and_sequential(name):
+    candles = _candles()
+    data = OHLCVArrays.from_candles(candles)
+    strategy = get_strategy(name)
+
+    vectorised = run_backtest(data, strategy, 1000.0)
+    streamed = run_backtest(data, strategy, 1000.0, stream=True)
+    assert vectorised["total_trades"] == streamed["total_trades"] > 0
+    assert [t["timestamp"] for t in vectorised["trades"]] == [t["timestamp"] for t in streamed["trades"]]
+
+    signals = strategy.signals(data, strategy.indicators(data))
+    capital, trades, equity = _sequential_fills(data.close.tolist(), signals.tolist(), 1000.0)
+    assert vectorised["total_trades"] == trades
+    assert vectorised["total_return"] == pytest.approx((capital - 1000.0) / 10.0, rel=1e-9)
+    np.testing.assert_allclose(vectorised["equity_curve"], equity, rtol=1e-9)
+    peak = np.maximum.accumulate(equity)
+    assert vectorised["max_drawdown"] == pytest.approx(((peak - equity) / peak).max() * 100, rel=1e-9)
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_streaming_matches_vectorised_on_flat_runs(name):
+    # Exact SMA ties on a flat run after a long random walk
+    rng = np.random.default_rng(0)
+    closes = 30000 * np.exp(np.cumsum(rng.normal(0, 0.01, 5000)))
+    closes = np.concatenate([closes, np.full(200, round(closes[-1], 2))])
+    data = OHLCVArrays.from_candles([{"timestamp": i, "close": c} for i, c in enumerate(closes.tolist())])
+    strategy = get_strategy(name)
+    indicators = strategy.indicators(data)
+
+    np.testing.assert_array_equal(stream_signals(strategy, data, indicators), strategy.signals(data, indicators))
+
+
+def test_streaming_strategy_sees_bounded_state():
+    seen_windows = []
+
+    class Breakout(Strategy):
+        lookback = 3
+
+        def indicators(self, data):
+            return {"close_x2": data.close * 2}
+
+        def on_bar(self, state):
+            seen_windows.append(len(state.window))
+            assert state.indicator("close_x2") == state.close * 2
+            if not state.in_position and state.close > max(list(state.window)[:-1], default=state.close):
+                return "BUY"
+            if state.in_position and state.close < state.window[0]:
+                return "SELL"
+            return "HOLD"
+
+    closes = [10, 11, 12, 11, 9, 8, 10, 12]
+    data = OHLCVArrays.from_candles([{"timestamp": i, "close": c} for i, c in enumerate(closes)])
+    result = run_backtest(data, Breakout(), 100.0)
+
+    assert max(seen_windows) == 3
+    assert [(t["entry_price"], t["exit_price"]) for t in result["trades"]] == [(11, 9), (10, 12)]
+    assert result["total_return"] == pytest.approx((100 / 11 * 9 / 10 * 12 - 100))
+
+
+def test_simulate_handles_no_trades():
+    result = simulate(np.array([1.0, 2.0, 3.0]), np.array([HOLD, SELL, HOLD], dtype=np.int8), 50.0)
+    assert result["total_trades"] == 0 and result["total_return"] == 0
+    assert result["max_drawdown"] == 0 and result["equity_curve"].tolist() == [50.0] * 4
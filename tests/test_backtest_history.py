@@ -0,0 +1,114 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+import backend.services.trading_backtesting_service as service_module
+from backend.services.ohlcv_store import OHLCVStore
+from backend.services.trading_backtesting_service import BacktestingService
+
+HOUR_MS = 3_600_000
+
+
+class _Exchange:
+    """Hourly candles for any range (except the `closed` range), recording the requested ranges"""
+
+    def __init__(self, closed=None):
+        self.calls = []
+        self.closed = closed
+
+    async def get_trading_ohlcv(self, symbol, timeframe, limit, exchange, start_time, end_time):
+        self.calls.append((start_time, end_time))
+        first = -(-start_time // HOUR_MS) * HOUR_MS
+        candles = [
+            {"timestamp": ts, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 1.0}
+            for ts in range(first, end_time + 1, HOUR_MS)
+            if not (self.closed and self.closed[0] <= ts <= self.closed[1])
+        ]
+        return {"candles": candles[:limit]}
+
+
+def _hours_ago(hours):
+    now = int(time.time() * 1000)
+    return now // HOUR_MS * HOUR_MS - hours * HOUR_MS
+
+
+def _stored(start_hours_ago, end_hours_ago):
+    return [
+        {"timestamp": _hours_ago(h), "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.0, "volume": 1.0}
+        for h in range(start_hours_ago, end_hours_ago - 1, -1)
+    ]
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    store = OHLCVStore(str(tmp_path))
+    monkeypatch.setattr(service_module, "get_ohlcv_store", lambda: store)
+
+    async def no_sleep(_):
+        pass
+
+    monkeypatch.setattr(service_module.asyncio, "sleep", no_sleep)
+    backtesting = BacktestingService(_Exchange())
+    return backtesting, store
+
+
+def test_stale_tail_is_fetched(service):
+    backtesting, store = service
+    store.append("BTCUSDT", "1h", _stored(48, 10), exchange="binance")  # head covered, last 10 hours missing
+
+    df = asyncio.run(backtesting.fetch_historical_data("BTCUSDT", "1h", days=1))
+
+    calls = backtesting.trading_service.calls
+    assert calls[0][0] == _hours_ago(10)  # from the last stored candle
+    assert df.index[-1] == datetime.utcfromtimestamp(_hours_ago(0) / 1000)
+    assert len(df) == 24  # window starts mid-hour
+
+
+def test_missing_head_is_backfilled_into_the_store(service):
+    backtesting, store = service
+    store.append("BTCUSDT", "1h", _stored(24, 0), exchange="binance")
+
+    df = asyncio.run(backtesting.fetch_historical_data("BTCUSDT", "1h", days=3))
+
+    assert len(df) == 72
+    assert len(store.read("BTCUSDT", "1h", exchange="binance")) == 72
+    # Covered now: served from the store without fetching
+    backtesting.trading_service.calls.clear()
+    asyncio.run(backtesting.fetch_historical_data("BTCUSDT", "1h", days=3))
+    assert backtesting.trading_service.calls == []
+
+
+def test_hole_between_stored_windows_is_filled(service):
+    backtesting, store = service
+    store.append("BTCUSDT", "1h", _stored(48, 30), exchange="binance")
+    store.append("BTCUSDT", "1h", _stored(10, 0), exchange="binance")  # 19-hour hole
+
+    result = asyncio.run(backtesting.run_backtest("BTCUSDT", "sma_crossover", days=2))
+
+    assert result["success"]
+    assert (_hours_ago(29), _hours_ago(10) - 1) in backtesting.trading_service.calls
+    view = store.read("BTCUSDT", "1h", exchange="binance")
+    assert len(view) == 49
+    assert (view.timestamp[1:] - view.timestamp[:-1] == HOUR_MS).all()
+    # Other exchanges keep their own series
+    assert store.read("BTCUSDT", "1h", exchange="kucoin") is None
+
+
+def test_exchange_gaps_are_fetched_once(service):
+    backtesting, store = service
+    # Exchange maintenance: no candles 29..20 hours ago
+    backtesting.trading_service.closed = (_hours_ago(29), _hours_ago(20))
+    store.append("BTCUSDT", "1h", _stored(48, 30), exchange="binance")
+    store.append("BTCUSDT", "1h", _stored(10, 0), exchange="binance")
+
+    asyncio.run(backtesting.fetch_historical_data("BTCUSDT", "1h", days=2))
+    assert (_hours_ago(29), _hours_ago(10) - 1) in backtesting.trading_service.calls
+    assert store.empty_ranges("BTCUSDT", "1h", exchange="binance") == [(_hours_ago(29), _hours_ago(19) - 1)]
+
+    # Known gap, covered head and fresh tail: nothing to fetch
+    backtesting.trading_service.calls.clear()
+    df = asyncio.run(backtesting.fetch_historical_data("BTCUSDT", "1h", days=2))
+    assert backtesting.trading_service.calls == []
+    assert len(df) == 38  # 47..30 and 19..0 hours ago
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers import unified_service_api as service
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = {"batch": [], "single": [], "excluded": set()}
+
+    async def hf(pairs):
+        calls["batch"].append(("hf", list(pairs)))
+        return {}
+
+    async def coingecko(pairs):
+        calls["batch"].append(("coingecko", list(pairs)))
+        return {p: service._rate_data(p, 100.0) for p in pairs if p.startswith(("BTC", "ETH"))}
+
+    async def binance(pairs):
+        calls["batch"].append(("binance", list(pairs)))
+        raise RuntimeError("binance down")
+
+    async def coincap(pairs):
+        calls["batch"].append(("coincap", list(pairs)))
+        return {p: service._rate_data(p, 5.0, "USD") for p in pairs if p.startswith("SOL")}
+
+    async def fallback(endpoint, params, exclude=()):
+        pair = params["pair"]
+        calls["single"].append(pair)
+        calls["excluded"].add(tuple(exclude))
+        await asyncio.sleep(0.05)
+        if pair.startswith("NOPE"):
+            return {"attempted": ["coinpaprika"], "error": "All fallback providers failed"}
+        return {"data": service._rate_data(pair, 1.0), "source": "coinpaprika", "attempted": ["coinpaprika"]}
+
+    monkeypatch.setattr(service, "BATCH_RATE_PROVIDERS", [
+        ("hf", hf), ("coingecko", coingecko), ("binance", binance), ("coincap", coincap)
+    ])
+    monkeypatch.setattr(service, "try_fallback_providers", fallback)
+    monkeypatch.setattr(service, "SessionLocal", None)
+
+    app = FastAPI()
+    app.include_router(service.router)
+    return TestClient(app), calls
+
+
+def test_batch_groups_pairs_by_provider(client):
+    http, calls = client
+    pairs = "BTC/USDT,ETH/USDT,SOL/USDT,ADA/USDT,DOT/USDT,NOPE/USDT,BTC/USDT"
+
+    body = http.get("/api/service/rate/batch", params={"pairs": pairs}).json()
+
+    # Input order, duplicates collapsed, unresolved pairs dropped
+    assert [d["pair"] for d in body["data"]] == ["BTC/USDT", "ETH/USDT", "SOL/USDT", "ADA/USDT", "DOT/USDT"]
+    assert [name for name, _ in calls["batch"]] == ["hf", "coingecko", "binance", "coincap"]
+    assert calls["batch"][3][1] == ["SOL/USDT", "ADA/USDT", "DOT/USDT", "NOPE/USDT"]
+    assert sorted(calls["single"]) == ["ADA/USDT", "DOT/USDT", "NOPE/USDT"]
+    assert calls["excluded"] == {("hf", "coingecko", "binance", "coincap")}
+    assert body["meta"]["attempted"] == ["hf", "coingecko", "binance", "coincap", "coinpaprika"]
+
+
+def test_batch_streams_ndjson(client):
+    http, _ = client
+
+    with http.stream("GET", "/api/service/rate/batch", params={"pairs": "BTC/USDT,ADA/USDT,NOPE/USDT", "stream": "true"}) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert lines[0] == {"pair": "BTC/USDT", "data": lines[0]["data"], "source": "coingecko"}
+    assert {line["pair"]: line["source"] for line in lines[1:-1]} == {"ADA/USDT": "coinpaprika", "NOPE/USDT": "none"}
+    assert lines[-1]["meta"]["resolved"] == 2
+    assert lines[-1]["meta"]["requested"] == 3
+
+
+def test_fallback_chain_skips_providers_tried_in_the_batch(monkeypatch):
+    tried = []
+
+    def provider(name):
+        async def fetch(params):
+            tried.append(name)
+            return {"error": "down"}
+        return fetch
+
+    for name in ("coingecko", "binance", "coinmarketcap", "coinpaprika", "coincap"):
+        monkeypatch.setattr(service, f"_fetch_{name}_rate", provider(name))
+
+    result = asyncio.run(service.try_fallback_providers(
+        "rate", {"pair": "ADA/USDT"}, exclude=("coingecko", "binance", "coinmarketcap", "coincap")
+    ))
+    assert tried == ["coinpaprika"]
+    assert result["attempted"] == ["coinpaprika"]
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, text
+
+from database.cache_queries import CacheQueries
+from database.db_manager import DatabaseManager
+from database.models import CachedOHLC
+
+
+def _candles(n, close_offset=0.0):
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "symbol": "BTCUSDT", "interval": "1h", "timestamp": start + timedelta(hours=i),
+            "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5 + close_offset, "volume": 10.0,
+            "provider": "test"
+        }
+        for i in range(n)
+    ]
+
+
+def _db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "cache.db"))
+    db.init_database()
+    return db
+
+
+def test_ohlc_bulk_upsert_updates_existing_candles(tmp_path):
+    db = _db(tmp_path)
+    cache = CacheQueries(db)
+
+    assert cache.save_ohlc_candles_bulk(_candles(50)) == 50
+    assert cache.save_ohlc_candles_bulk(_candles(60, close_offset=1.0)) == 60
+    assert cache.save_ohlc_candle("BTCUSDT", "1h", datetime(2024, 1, 1), 1, 2, 0.5, 9.0, 10)
+
+    rows = cache.get_cached_ohlc("BTCUSDT", "1h", limit=1000)
+    assert len(rows) == 60
+    assert rows[0]["close"] == 9.0
+    assert all(row["close"] == 2.5 for row in rows[1:])
+
+
+def test_unique_index_is_added_to_existing_tables_with_duplicates(tmp_path):
+    db = _db(tmp_path)
+    with db.get_session() as session:
+        session.execute(text("DROP INDEX ux_cached_ohlc_symbol_interval_timestamp"))
+        for close in (1.0, 2.0):
+            session.add(CachedOHLC(
+                symbol="ETHUSDT", interval="4h", timestamp=datetime(2024, 1, 1),
+                open=1, high=2, low=0.5, close=close, volume=1, provider="old"
+            ))
+
+    cache = CacheQueries(db)
+    assert cache.save_ohlc_candles_bulk(_candles(3)) == 3
+
+    rows = cache.get_cached_ohlc("ETHUSDT", "4h")
+    assert [row["close"] for row in rows] == [2.0]
+
+
+def test_market_and_whale_bulk_writes(tmp_path):
+    db = _db(tmp_path)
+    cache = CacheQueries(db)
+
+    records = [{"symbol": s, "price": p, "provider": "test"} for s, p in (("BTC", 1.0), ("ETH", 2.0))]
+    assert cache.save_market_data_bulk(records) == 2
+    assert {row["symbol"] for row in cache.get_cached_market_data()} == {"BTC", "ETH"}
+
+    txs = [
+        {
+            "blockchain": "ethereum", "transaction_hash": f"0x{i}", "from_address": "a",
+            "to_address": "b", "amount": 1.0, "amount_usd": 1e6, "source": "test"
+        }
+        for i in range(5)
+    ]
+    assert db.save_whale_transactions_bulk(txs[:3]) == 3
+    assert db.save_whale_transactions_bulk(txs) == 2
+    assert len(db.get_whale_transactions(limit=10)) == 5
+
+    # A record missing a field does not lose the rest of the batch
+    broken = {key: value for key, value in txs[0].items() if key != "to_address"}
+    more = [{**txs[0], "transaction_hash": "0x5"}, {**broken, "transaction_hash": "0x6"}, "not a dict"]
+    assert db.save_whale_transactions_bulk(more) == 1
+    assert len(db.get_whale_transactions(limit=10)) == 6
+
+
+def test_malformed_records_are_skipped(tmp_path):
+    cache = CacheQueries(_db(tmp_path))
+
+    candles = _candles(3)
+    del candles[1]["close"]
+    candles.append({**_candles(1)[0], "timestamp": None})
+    assert cache.save_ohlc_candles_bulk(candles) == 2
+    assert cache.save_ohlc_candles_bulk([{"symbol": "BTCUSDT"}]) == 0
+
+    records = [{"symbol": "BTC", "price": 1.0}, {"price": 2.0}, {"symbol": "ETH", "price": "n/a"}]
+    assert cache.save_market_data_bulk(records) == 1
+    assert [row["symbol"] for row in cache.get_cached_market_data()] == ["BTC"]
+
+
+def test_existing_unique_index_skips_the_dedup_scan(tmp_path):
+    db = _db(tmp_path)
+    statements = []
+
+    @event.listens_for(db.engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    # A new process: fresh CacheQueries on a database that has the index
+    assert CacheQueries(db).save_ohlc_candles_bulk(_candles(3)) == 3
+    assert not any(statement.startswith("DELETE") for statement in statements)
+    assert not any("CREATE UNIQUE INDEX" in statement for statement in statements)
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from ai_models import GapFillingService
+from services.gap_filler import GapFillerService
+
+
+def test_detect_missing_timestamps_vectorized():
+    service = GapFillerService()
+    # Unsorted, with a duplicate, gaps of 1 and 3 slots
+    timestamps = [0, 60, 60, 240, 120, 480, 420]
+
+    assert service._detect_missing_timestamps(timestamps, None) == [180, 300, 360]
+    assert service._detect_missing_timestamps(timestamps, {"max_missing": 2}) == [180, 300]
+    assert service._detect_missing_timestamps([0, 60, 120], None) == []
+
+
+def test_fill_missing_ohlc_matches_per_point_rules():
+    candles = [
+        {"timestamp": 300, "open": 13, "high": 16, "low": 12, "close": 15, "volume": 4},
+        {"timestamp": 100, "open": 9, "high": 11, "low": 8, "close": 10, "volume": 2},
+        {"timestamp": 400, "price": 20},
+    ]
+
+    result = asyncio.run(GapFillingService().fill_missing_ohlc("BTC", candles, [50, 200, 350, 500]))
+    points = {p["timestamp"]: p for p in result["filled_data"]}
+
+    # Before the series: first known value
+    assert points[50]["method"] == "first_known_value"
+    assert points[50]["close"] == 9
+    # Between two complete candles: linear interpolation at position 0.5
+    assert points[200]["method"] == "linear_interpolation"
+    assert points[200]["open"] == pytest.approx(10 * 0.5 + 13 * 0.5)
+    assert points[200]["close"] == pytest.approx(12.5)
+    assert points[200]["high"] == pytest.approx(16 * 1.0)
+    # Next candle has no open/close: skipped like before
+    assert 350 not in points
+    # After the series: last known value from 'price'
+    assert points[500]["method"] == "last_known_value"
+    assert points[500]["close"] == 20
+    assert result["filled_count"] == 3
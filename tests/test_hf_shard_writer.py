@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from hf_shard_writer import LocalDirectoryHub, ShardedAppendWriter, drop_revisions
+
+OHLC_KEYS = ["symbol", "interval", "timestamp"]
+
+
+def _candles(start_hour, count, close=1.0):
+    start = datetime(2024, 3, 1, 20)
+    return [
+        {
+            "symbol": "BTCUSDT", "interval": "1h",
+            "timestamp": (start + timedelta(hours=start_hour + i)).isoformat() + "Z",
+            "open": 1.0, "high": 2.0, "low": 0.5, "close": close, "volume": 3.0
+        }
+        for i in range(count)
+    ]
+
+
+def _hub_files(root):
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*.parquet"))
+
+
+def test_append_uploads_only_new_rows_partitioned_by_date(tmp_path):
+    hub = tmp_path / "hub"
+    writer = ShardedAppendWriter(LocalDirectoryHub(str(hub)), state_dir=str(tmp_path / "state"))
+
+    # 20:00 .. 03:00 spans two dates
+    assert writer.append("ns/ohlc", _candles(0, 8), key_columns=OHLC_KEYS) == 8
+    files = _hub_files(hub)
+    assert len(files) == 2
+    assert files[0].startswith("ns/ohlc/data/date=2024-03-01/part-")
+    assert files[1].startswith("ns/ohlc/data/date=2024-03-02/part-")
+
+    # Manifest survives a restart: overlapping rows are skipped
+    restarted = ShardedAppendWriter(LocalDirectoryHub(str(hub)), state_dir=str(tmp_path / "state"))
+    assert restarted.append("ns/ohlc", _candles(4, 8), key_columns=OHLC_KEYS) == 4
+    assert restarted.append("ns/ohlc", _candles(0, 12), key_columns=OHLC_KEYS) == 0
+    assert len(restarted.read("ns/ohlc")) == 12
+    assert restarted.manifest("ns/ohlc")["watermark"] == "2024-03-02"
+
+
+def test_partitions_are_compacted_at_threshold(tmp_path):
+    hub = tmp_path / "hub"
+    writer = ShardedAppendWriter(LocalDirectoryHub(str(hub)), state_dir=str(tmp_path / "state"), compact_threshold=3)
+
+    for batch in range(3):
+        writer.append("ns/ohlc", _candles(4 + batch, 1), key_columns=OHLC_KEYS)
+
+    files = _hub_files(hub)
+    assert len(files) == 1 and "/compact-" in files[0]
+    assert writer.read("ns/ohlc")["timestamp"].tolist() == [c["timestamp"] for c in _candles(4, 3)]
+
+
+def test_uploader_appends_to_local_hub_without_token(tmp_path, monkeypatch):
+    monkeypatch.setenv("HF_SHARD_STATE_DIR", str(tmp_path / "state"))
+    from hf_dataset_uploader import HuggingFaceDatasetUploader
+
+    uploader = HuggingFaceDatasetUploader(dataset_namespace="test", local_hub_dir=str(tmp_path / "hub"))
+    assert asyncio.run(uploader.upload_ohlc_data(_candles(0, 3)))
+    assert asyncio.run(uploader.upload_ohlc_data(_candles(0, 3)))
+
+    assert len(uploader.shard_writer.read(uploader.ohlc_dataset)) == 3
+    assert _hub_files(tmp_path / "hub")[0].startswith("test/crypto-ohlc-data/data/date=2024-03-01/")
+
+
+def test_revised_rows_are_appended_and_last_version_wins(tmp_path):
+    hub = tmp_path / "hub"
+    writer = ShardedAppendWriter(LocalDirectoryHub(str(hub)), state_dir=str(tmp_path / "state"), compact_threshold=3)
+
+    assert writer.append("ns/ohlc", _candles(0, 3, close=1.0), key_columns=OHLC_KEYS) == 3
+    # Same candles fetched again: only fetched_at differs, nothing to upload
+    refetched = [{**row, "fetched_at": "2024-03-01T23:59:00Z"} for row in _candles(0, 3, close=1.0)]
+    assert writer.append("ns/ohlc", refetched, key_columns=OHLC_KEYS) == 0
+    # The still-open last candle changed
+    assert writer.append("ns/ohlc", _candles(2, 1, close=5.0), key_columns=OHLC_KEYS) == 1
+
+    assert writer.read("ns/ohlc")["close"].tolist() == [1.0, 1.0, 5.0]
+    assert len(_hub_files(hub)) == 2
+
+    # Compaction also keeps the last version
+    assert writer.append("ns/ohlc", _candles(2, 1, close=6.0), key_columns=OHLC_KEYS) == 1
+    files = _hub_files(hub)
+    assert len(files) == 1 and "/compact-" in files[0]
+    assert writer.read("ns/ohlc")["close"].tolist() == [1.0, 1.0, 6.0]
+
+    # Rows older than the dedup window are checked against the partition's shards
+    writer.key_retention_days = 0
+    writer.append("ns/ohlc", _candles(48, 1), key_columns=OHLC_KEYS)
+    assert writer.manifest("ns/ohlc")["partitions"]["2024-03-01"]["keys"] == {}
+    assert writer.append("ns/ohlc", _candles(0, 3, close=1.0)[:2], key_columns=OHLC_KEYS) == 0
+    assert writer.append("ns/ohlc", _candles(0, 4, close=7.0), key_columns=OHLC_KEYS) == 4
+    assert writer.read("ns/ohlc")["close"].tolist() == [7.0, 7.0, 7.0, 7.0, 1.0]
+
+
+def test_load_dataset_sees_shards_next_to_push_to_hub_files(tmp_path, monkeypatch):
+    datasets = pytest.importorskip("datasets")
+    monkeypatch.setenv("HF_SHARD_STATE_DIR", str(tmp_path / "state"))
+    from hf_dataset_uploader import HuggingFaceDatasetUploader
+
+    # A repo created by push_to_hub: train split mapped to data/train-*
+    repo = tmp_path / "hub" / "test" / "crypto-ohlc-data"
+    (repo / "data").mkdir(parents=True)
+    legacy = [{**row, "fetched_at": "2024-03-01T00:00:00Z"} for row in _candles(-3, 3)]
+    pd.DataFrame(legacy).to_parquet(repo / "data" / "train-00000-of-00001.parquet", index=False)
+    (repo / "README.md").write_text(
+        "---\nlicense: mit\nconfigs:\n- config_name: default\n  data_files:\n"
+        "  - split: train\n    path: data/train-*\n---\n\n# crypto-ohlc-data\n"
+    )
+
+    uploader = HuggingFaceDatasetUploader(dataset_namespace="test", local_hub_dir=str(tmp_path / "hub"))
+    first = [{**row, "fetched_at": "2024-03-02T00:00:00Z"} for row in _candles(0, 3)]
+    revised = [{**row, "fetched_at": "2024-03-02T01:00:00Z"} for row in _candles(2, 1, close=9.0)]
+    assert asyncio.run(uploader.upload_ohlc_data(first))
+    assert asyncio.run(uploader.upload_ohlc_data(revised))
+
+    card = (repo / "README.md").read_text()
+    assert card.startswith("---\nlicense: mit\n") and "data/date=*/*.parquet" in card
+    assert card.endswith("# crypto-ohlc-data\n")
+
+    loaded = datasets.load_dataset(str(repo), split="train").to_pandas()
+    assert len(loaded) == 7
+    latest = drop_revisions(loaded, OHLC_KEYS)
+    assert len(latest) == 6
+    assert latest.sort_values("timestamp")["close"].tolist() == [1.0] * 5 + [9.0]
+
+    # The hub API deduplicates once per dataset fingerprint
+    from api.hf_data_hub_endpoints import _latest_rows
+
+    served = _latest_rows(datasets.load_dataset(str(repo), split="train"), "ohlc")
+    assert sorted(zip(served["timestamp"], served["close"]))[-1][1] == 9.0 and len(served) == 6
+    assert _latest_rows(datasets.load_dataset(str(repo), split="train"), "ohlc") is served
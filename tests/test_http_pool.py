@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.http_pool import HTTPClientPool, provider_key
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_provider_key_uses_hostname():
+    assert provider_key("https://API.Binance.com/api/v3/ticker") == "api.binance.com"
+    assert provider_key("CoinGecko") == "coingecko"
+
+
+def test_httpx_and_aiohttp_clients_are_shared_and_reuse_connections(server_url):
+    pool = HTTPClientPool()
+
+    async def run():
+        client = pool.get_httpx_client(server_url)
+        assert pool.get_httpx_client(server_url) is client
+        for _ in range(10):
+            assert (await client.get(f"{server_url}/ping")).status_code == 200
+
+        session = pool.get_aiohttp_session(server_url)
+        assert pool.get_aiohttp_session(server_url) is session
+        for _ in range(10):
+            async with session.get(f"{server_url}/ping") as response:
+                assert await response.json() == {"ok": True}
+
+        await pool.close_all()
+        assert client.is_closed and session.closed
+
+    asyncio.run(run())
+
+    stats = pool.get_stats()
+    assert stats["requests"] == 20
+    assert stats["new_connections"] == 2
+    assert stats["open_clients"] == 0
+    assert stats["providers"]["127.0.0.1"]["reuse_ratio"] == 0.9
+
+
+def test_api_client_close_keeps_shared_sessions_open(server_url):
+    from utils.api_client import APIClient
+    from utils.http_pool import close_http_pools, get_aiohttp_session
+
+    async def run():
+        client = APIClient(retry_attempts=1)
+        assert (await client.get(f"{server_url}/ping"))["success"]
+        session = get_aiohttp_session(server_url)
+
+        # e.g. HealthChecker.close() after a manual health check request
+        await client.close()
+        assert not session.closed
+        assert (await APIClient(retry_attempts=1).get(f"{server_url}/ping"))["success"]
+
+        await close_http_pools()
+        assert session.closed
+
+    asyncio.run(run())
@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import pytest
+
+from backend.services import indicator_engine
+
+
+def _prices(n=600, seed=7):
+    rng = np.random.default_rng(seed)
+    return 30000 + np.cumsum(rng.normal(0, 40, n))
+
+
+def _ema_reference(prices, period):
+    alpha = 2 / (period + 1)
+    value = sum(prices[:period]) / period
+    out = [math.nan] * (period - 1) + [value]
+    for price in prices[period:]:
+        value = alpha * price + (1 - alpha) * value
+        out.append(value)
+    return np.array(out)
+
+
+def _wilder_rsi_reference(prices, period):
+    deltas = np.diff(prices)
+    avg_gain = np.clip(deltas[:period], 0, None).mean()
+    avg_loss = np.clip(-deltas[:period], 0, None).mean()
+    for delta in deltas[period:]:
+        avg_gain = (avg_gain * (period - 1) + max(delta, 0)) / period
+        avg_loss = (avg_loss * (period - 1) + max(-delta, 0)) / period
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+@pytest.mark.parametrize("period", [2, 12, 26, 200])
+def test_ema_matches_recursive_reference(period):
+    prices = _prices()
+    np.testing.assert_allclose(
+        indicator_engine.ema(prices, period), _ema_reference(prices, period), rtol=1e-12
+    )
+
+
+def test_sma_and_bollinger():
+    prices = _prices()
+    upper, middle, lower = indicator_engine.bollinger_bands(prices, 20, 2)
+    window = prices[-20:]
+    assert middle[-1] == pytest.approx(window.mean())
+    assert upper[-1] == pytest.approx(window.mean() + 2 * window.std())
+    assert lower[-1] == pytest.approx(window.mean() - 2 * window.std())
+    assert np.isnan(indicator_engine.sma(prices, 20)[18])
+
+
+def test_rsi_uses_wilder_smoothing():
+    prices = _prices()
+    assert indicator_engine.rsi(prices, 14)[-1] == pytest.approx(_wilder_rsi_reference(prices, 14))
+    assert indicator_engine.rsi([1, 1, 1, 1], 2)[-1] == 50.0
+
+
+def test_macd_signal_is_ema_of_macd_line():
+    prices = _prices()
+    line, signal, hist = indicator_engine.macd(prices, 12, 26, 9)
+    expected_line = _ema_reference(prices, 12) - _ema_reference(prices, 26)
+    np.testing.assert_allclose(line[25:], expected_line[25:], rtol=1e-9)
+    assert signal[-1] == pytest.approx(_ema_reference(expected_line[25:], 9)[-1])
+    assert hist[-1] == pytest.approx(line[-1] - signal[-1])
+
+
+def test_stoch_rsi_and_atr_are_bounded():
+    prices = _prices()
+    k_line, d_line = indicator_engine.stoch_rsi(prices, 14, 14)
+    valid = k_line[~np.isnan(k_line)]
+    assert valid.size == len(prices) - 27
+    assert ((valid >= 0) & (valid <= 100)).all()
+    assert d_line[-1] == pytest.approx(k_line[-3:].mean())
+
+    atr = indicator_engine.atr(prices * 1.005, prices * 0.995, prices, 14)
+    assert atr[-1] > 0
+    assert np.isnan(atr[13]) and not np.isnan(atr[14])
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from backend.services import indicator_engine
+from backend.services.indicator_state import IndicatorState, IndicatorStateRegistry
+
+
+def _candles(n=300, seed=3):
+    rng = np.random.default_rng(seed)
+    closes = 30000 + np.cumsum(rng.normal(0, 40, n))
+    highs = closes + rng.random(n) * 50
+    lows = closes - rng.random(n) * 50
+    return highs, lows, closes
+
+
+def test_streaming_state_matches_batch_engine():
+    highs, lows, closes = _candles()
+    state = IndicatorState("BTC", "1h")
+    for i in range(len(closes)):
+        state.update(i * 3600, highs[i], lows[i], closes[i])
+
+    snap = state.snapshot()
+    k_line, d_line = indicator_engine.stoch_rsi(closes)
+    macd_line, signal_line, _ = indicator_engine.macd(closes)
+    upper, _, _ = indicator_engine.bollinger_bands(closes)
+
+    assert snap["rsi"] == pytest.approx(indicator_engine.rsi(closes)[-1])
+    assert snap["atr"] == pytest.approx(indicator_engine.atr(highs, lows, closes)[-1])
+    assert snap["stoch_rsi"]["k_line"] == pytest.approx(k_line[-1], abs=1e-6)
+    assert snap["stoch_rsi"]["d_line"] == pytest.approx(d_line[-1], abs=1e-6)
+    assert snap["macd"]["macd_line"] == pytest.approx(macd_line[-1], rel=1e-6)
+    assert snap["macd"]["signal_line"] == pytest.approx(signal_line[-1], rel=1e-6)
+    assert snap["bollinger_bands"]["upper"] == pytest.approx(upper[-1])
+    assert snap["sma"]["sma200"] == pytest.approx(closes[-200:].mean())
+
+
+def test_revised_last_candle_replaces_previous_values():
+    highs, lows, closes = _candles(120)
+    revised = IndicatorState("ETH", "4h")
+    clean = IndicatorState("ETH", "4h")
+    for i in range(len(closes)):
+        revised.update(i, highs[i], lows[i], closes[i])
+        clean.update(i, highs[i], lows[i], closes[i])
+
+    # Same timestamp sent twice with a different close, then the final value
+    revised.update(len(closes) - 1, highs[-1], lows[-1], closes[-1] + 900)
+    revised.update(len(closes) - 1, highs[-1], lows[-1], closes[-1])
+    # Older candles are ignored
+    assert revised.update(5, highs[5], lows[5], closes[5]) is False
+
+    assert revised.candles == clean.candles
+    assert revised.snapshot() == clean.snapshot()
+
+
+def test_every_head_revision_is_undone_exactly():
+    # Long enough for every window to evict values and resync its running sum
+    highs, lows, closes = _candles(450)
+    revised = IndicatorState("SOL", "1h")
+    clean = IndicatorState("SOL", "1h")
+    for i in range(len(closes)):
+        revised.update(i, highs[i] + 70, lows[i] - 70, closes[i] * 1.5)
+        revised.update(i, highs[i], lows[i], closes[i])
+        clean.update(i, highs[i], lows[i], closes[i])
+
+    assert revised.snapshot() == clean.snapshot()
+    assert list(revised.sma[200].values) == list(clean.sma[200].values)
+
+
+def test_registry_groups_and_orders_candles():
+    highs, lows, closes = _candles(80)
+    candles = [
+        {"symbol": "btc", "interval": "1h", "timestamp": i * 3600, "high": highs[i], "low": lows[i], "close": closes[i]}
+        for i in reversed(range(len(closes)))
+    ]
+    registry = IndicatorStateRegistry()
+    assert registry.update_from_candles(candles) == 80
+    assert registry.update_from_candles(candles[:10]) == 1  # only the head is re-applied
+
+    live = registry.latest("BTC", "1h")
+    assert live is not None
+    assert live["current_price"] == pytest.approx(closes[-1])
+    assert registry.latest("BTC", "4h") is None
+
+
+def test_naive_datetimes_are_utc(monkeypatch):
+    import time
+    from datetime import datetime, timezone
+
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        state = IndicatorState("BTC", "1h")
+        state.update(datetime(2024, 3, 1, 12), 2.0, 1.0, 1.5)
+        # The same candle from a UTC-aware source is a revision, not a new candle
+        state.update(datetime(2024, 3, 1, 12, tzinfo=timezone.utc), 2.0, 1.0, 1.7)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert state.candles == 1
+    assert state.last_timestamp == datetime(2024, 3, 1, 12, tzinfo=timezone.utc).timestamp()
+    assert state.last_close == 1.7
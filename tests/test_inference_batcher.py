@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from backend.services.inference_batcher import MicroBatcher
+
+
+def _recording_model():
+    batches = []
+
+    def infer(texts):
+        batches.append(list(texts))
+        return [{"label": "POSITIVE" if "up" in text else "NEGATIVE", "text": text} for text in texts]
+
+    return infer, batches
+
+
+def test_concurrent_submits_share_batches():
+    infer, batches = _recording_model()
+    batcher = MicroBatcher(infer, max_batch_size=8, max_wait_ms=20)
+    texts = [f"btc up {i}" for i in range(20)]
+
+    async def run():
+        return await asyncio.gather(*[batcher.submit(text) for text in texts])
+
+    results = asyncio.run(run())
+
+    assert [r["text"] for r in results] == texts
+    assert [len(b) for b in batches] == [8, 8, 4]
+    assert batcher.get_stats()["p99_latency_ms"] is not None
+
+
+def test_normalized_texts_are_cached_and_deduplicated():
+    infer, batches = _recording_model()
+    batcher = MicroBatcher(infer, max_batch_size=4, cache_size=2)
+
+    first = batcher.infer(["ETH  up", "ETH up", "sol down"])
+    assert batches == [["ETH up", "sol down"]]
+    assert first[0] is first[1]
+
+    batcher.infer(["ETH up\n"])
+    assert len(batches) == 1
+
+    # LRU: "ETH up" was used last, so adding a third text evicts "sol down"
+    batcher.infer(["ada up"])
+    batcher.infer(["sol down"])
+    assert batches[-1] == ["sol down"]
+    assert batcher.get_stats()["cache_hits"] == 1
+
+
+def test_batch_failure_reaches_every_caller():
+    def infer(texts):
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher(infer, max_batch_size=4, max_wait_ms=5)
+
+    async def run():
+        return await asyncio.gather(*[batcher.submit(f"t{i}") for i in range(3)], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    with pytest.raises(RuntimeError):
+        batcher.infer(["t0"])
@@ -0,0 +1,89 @@
+import asyncio
+import sys
+import textwrap
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routers.lazy_registry import LazyRouterRegistry
+
+
+@pytest.fixture
+def router_modules(tmp_path, monkeypatch):
+    package = tmp_path / "lazy_test_routers"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "first.py").write_text(textwrap.dedent("""
+        from fastapi import APIRouter
+        router = APIRouter()
+
+        @router.get("/api/alpha/ping")
+        async def ping():
+            return {"from": "first"}
+
+        @router.get("/api/shared")
+        async def shared():
+            return {"from": "first"}
+    """))
+    (package / "second.py").write_text(textwrap.dedent("""
+        from fastapi import APIRouter
+        router = APIRouter()
+
+        @router.get("/api/shared")
+        async def shared():
+            return {"from": "second"}
+    """))
+    (package / "broken.py").write_text("raise ImportError('missing optional dependency')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    for name in [m for m in sys.modules if m.startswith("lazy_test_routers")]:
+        del sys.modules[name]
+
+
+def _app():
+    app = FastAPI()
+    registry = LazyRouterRegistry(app)
+    registry.declare("second", "lazy_test_routers.second", ["/api/shared"])
+    registry.declare("first", "lazy_test_routers.first", ["/api/alpha", "/api/shared"])
+    registry.declare("broken", "lazy_test_routers.broken", ["/api/broken"])
+    registry.install()
+
+    @app.get("/api/shared")
+    async def app_level():
+        return {"from": "app"}
+
+    return app, registry
+
+
+def test_routers_load_on_first_matching_request(router_modules):
+    app, registry = _app()
+    client = TestClient(app)
+
+    assert "lazy_test_routers.first" not in sys.modules
+    assert client.get("/api/alpha/ping").json() == {"from": "first"}
+    status = registry.status()
+    assert status["first"]["status"] == "loaded"
+    assert status["second"]["status"] == "pending"
+    assert "lazy_test_routers.second" not in sys.modules
+
+    # Declaration order wins over later app routes, as with eager include_router
+    assert client.get("/api/shared").json() == {"from": "second"}
+
+    # A failed import is reported once and the path falls through to a 404
+    assert client.get("/api/broken/x").status_code == 404
+    assert registry.status()["broken"]["status"] == "failed"
+    assert "missing optional dependency" in registry.status()["broken"]["error"]
+
+
+def test_openapi_and_warmup_load_everything(router_modules):
+    app, registry = _app()
+    client = TestClient(app)
+
+    paths = client.get("/openapi.json").json()["paths"]
+    assert "/api/alpha/ping" in paths
+    assert not registry.pending
+
+    app, registry = _app()
+    asyncio.run(registry.warmup(delay=0))
+    assert [spec.name for spec in registry.specs if spec.loaded] == ["second", "first"]
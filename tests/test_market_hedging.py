@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.services.market_data_aggregator import MarketDataAggregator
+from utils.latency_histogram import LatencyHistogram
+
+PROVIDERS = ("coingecko", "coinpaprika", "coincap", "binance", "coinlore", "messari", "coinstats")
+
+
+def _aggregator(behaviour):
+    """Aggregator whose providers sleep `delay` then return a price or raise"""
+    aggregator = MarketDataAggregator()
+    aggregator.hedge_default_delay = 0.05
+    calls, cancelled = [], []
+
+    for name in PROVIDERS:
+        delay, price = behaviour.get(name, (None, None))
+
+        async def fetch(symbol, name=name, delay=delay, price=price):
+            calls.append(name)
+            if delay is None:
+                raise RuntimeError("down")
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+            return {"symbol": symbol, "price": price, "source": name}
+
+        setattr(aggregator, f"_get_price_{name}", fetch)
+    return aggregator, calls, cancelled
+
+
+def test_latency_histogram_quantiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+
+    assert histogram.quantile(0.5) == pytest.approx(0.050, rel=0.03)
+    assert histogram.quantile(0.99) == pytest.approx(0.099, rel=0.03)
+    assert histogram.snapshot()["count"] == 100
+    assert LatencyHistogram().quantile(0.5) is None
+
+
+def test_hedged_get_price_takes_first_valid_answer():
+    # coingecko is slow, coinpaprika fails fast, coincap answers quickly
+    aggregator, calls, cancelled = _aggregator({
+        "coingecko": (1.0, 100.0),
+        "coincap": (0.01, 101.0),
+        "binance": (1.0, 102.0),
+    })
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await aggregator.get_price("BTCUSDT")
+        return result, loop.time() - start
+
+    result, elapsed = asyncio.run(run())
+
+    assert result["source"] == "coincap"
+    assert elapsed < 0.5
+    assert calls == ["coingecko", "coinpaprika", "coincap"]
+    assert cancelled == ["coingecko"]
+    stats = aggregator.get_latency_stats()
+    assert stats["providers"]["coincap"]["wins"] == 1
+    assert stats["providers"]["coinpaprika"]["errors"] == 1
+    assert stats["hedging"]["hedged"] == 1
+
+
+def test_hedge_delay_follows_observed_p50():
+    aggregator, _, _ = _aggregator({})
+    for _ in range(10):
+        aggregator.latency["binance"].observe(0.2)
+
+    assert aggregator.hedge_delay("binance") == pytest.approx(0.3, rel=0.03)
+    assert aggregator.hedge_delay("coingecko") == aggregator.hedge_default_delay
+
+
+def test_all_providers_failing_and_concurrent_fallback():
+    aggregator, _, _ = _aggregator({})
+    with pytest.raises(HTTPException):
+        asyncio.run(aggregator.get_price("BTC"))
+
+    aggregator, calls, _ = _aggregator({"binance": (0.05, 1.0)})
+
+    async def batch_fails(*args):
+        raise RuntimeError("batch down")
+
+    aggregator._get_batch_coingecko = aggregator._get_batch_coincap = aggregator._get_batch_coinpaprika = batch_fails
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        prices = await aggregator.get_multiple_prices(["BTC", "ETH", "SOL", "ADA"])
+        return prices, loop.time() - start
+
+    prices, elapsed = asyncio.run(run())
+
+    assert [p["symbol"] for p in prices] == ["BTC", "ETH", "SOL", "ADA"]
+    # Four symbols in parallel, not one after another
+    assert elapsed < 0.15
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.middleware import MetricsMiddleware
+from backend.routers import system_metrics_api
+from backend.routers.system_metrics_api import MetricsTracker
+from utils.server_timing import record_phase, timed_phase
+
+
+@pytest.fixture
+def app_and_tracker(monkeypatch):
+    tracker = MetricsTracker()
+    monkeypatch.setattr(system_metrics_api, "_metrics_tracker", tracker)
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    seen_during_stream = []
+
+    @app.get("/phases")
+    async def phases():
+        record_phase("upstream", 0.020)
+        record_phase("upstream", 0.005)
+        with timed_phase("compute"):
+            await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    @app.get("/sync")
+    def sync_handler():
+        with timed_phase("cache"):
+            pass
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            yield b"first\n"
+            # Headers (and metrics) went out before the body finished
+            seen_during_stream.append(tracker.routes["GET /stream"].requests)
+            yield b"second\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app, tracker, seen_during_stream
+
+
+def test_server_timing_header_reports_phases(app_and_tracker):
+    app, tracker, _ = app_and_tracker
+    client = TestClient(app)
+
+    header = client.get("/phases").headers["server-timing"]
+    entries = dict(entry.split(";dur=") for entry in header.split(", "))
+    assert float(entries["upstream"]) == pytest.approx(25.0)
+    assert float(entries["compute"]) >= 10.0
+    assert float(entries["app"]) >= float(entries["compute"])
+
+    assert "cache;dur=" in client.get("/sync").headers["server-timing"]
+    assert tracker.routes["GET /phases"].requests == 1
+
+
+def test_streaming_and_errors(app_and_tracker):
+    app, tracker, seen_during_stream = app_and_tracker
+    client = TestClient(app, raise_server_exceptions=False)
+
+    response = client.get("/stream")
+    assert response.text == "first\nsecond\n"
+    assert seen_during_stream == [1]
+
+    assert client.get("/boom").status_code == 500
+    assert tracker.routes["GET /boom"].status[4] == 1
+    assert tracker.error_count == 1
+
+    client.get("/api/system/metrics")
+    assert tracker.request_count == 2
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from backend.services import model_backends
+
+
+def test_resolve_backend(monkeypatch):
+    monkeypatch.setattr(model_backends, "ONNX_AVAILABLE", False)
+    monkeypatch.setattr(model_backends, "TORCH_AVAILABLE", True)
+
+    assert model_backends.resolve_backend("auto", "text-classification") == "int8"
+    assert model_backends.resolve_backend("onnx", "text-classification") == "torch"
+    # Generation models and GPU loads keep the plain pipeline
+    assert model_backends.resolve_backend("auto", "text-generation") == "torch"
+    assert model_backends.resolve_backend("int8", "sentiment-analysis", device=0) == "torch"
+
+    monkeypatch.setattr(model_backends, "ONNX_AVAILABLE", True)
+    assert model_backends.resolve_backend("auto", "sentiment-analysis") == "onnx-int8"
+
+
+def test_parity_check_reports_label_mismatches():
+    def reference(texts):
+        return [{"label": "POSITIVE", "score": 0.9} for _ in texts]
+
+    def candidate(texts):
+        return [[{"label": "NEGATIVE" if i == 0 else "POSITIVE", "score": 0.85}] for i, _ in enumerate(texts)]
+
+    parity = model_backends.parity_check(reference, candidate, ["a", "b", "c", "d"])
+
+    assert parity["label_agreement"] == 0.75
+    assert parity["max_score_diff"] == 0.05
+    assert parity["mismatches"] == [{"text": "a", "expected": "POSITIVE", "actual": "NEGATIVE"}]
+
+
+def test_rejected_conversion_is_not_retried(tmp_path):
+    target = model_backends.artifact_dir("org/model", "int8", str(tmp_path))
+    target.mkdir(parents=True)
+    (target / "parity.json").write_text(json.dumps({"accepted": False, "label_agreement": 0.5}))
+
+    def reference_factory():
+        raise AssertionError("fp32 model must not be loaded")
+
+    with pytest.raises(model_backends.FastBackendRejected):
+        model_backends.load_fast_pipeline(
+            "org/model", "text-classification", "int8", reference_factory, cache_dir=str(tmp_path)
+        )
@@ -0,0 +1,117 @@
+import asyncio
+from datetime import datetime, timezone
+
+import numpy as np
+
+from backend.services.ohlcv_store import OHLCVStore, to_epoch_ms
+
+HOUR_MS = 3_600_000
+START = 1_700_000_000_000
+
+
+def _candles(start, count, close=100.0):
+    return [
+        {
+            "timestamp": START + (start + i) * HOUR_MS,
+            "open": close, "high": close + 1, "low": close - 1, "close": close + i, "volume": 5.0
+        }
+        for i in range(count)
+    ]
+
+
+def test_append_is_ordered_and_revises_head(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    assert store.append("btc", "1h", list(reversed(_candles(0, 10)))) == 10
+
+    # Head revision + new candles; older candles are ignored
+    batch = _candles(9, 3, close=200.0) + _candles(2, 2)
+    assert store.append("BTC", "1h", batch) == 3
+
+    view = store.read("BTC", "1h")
+    assert len(view) == 12
+    assert np.all(np.diff(view.timestamp) == HOUR_MS)
+    assert view.close[9] == 200.0 and view.close[11] == 202.0
+    assert view.close[:9].tolist() == [100.0 + i for i in range(9)]
+
+
+def test_range_reads_are_memory_mapped_views(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    store.append("ETH", "1h", _candles(0, 100))
+
+    view = store.read("ETH", "1h", start=START + 10 * HOUR_MS, end=(START + 19 * HOUR_MS) / 1000)
+    assert len(view) == 10
+    assert view.first_timestamp == START + 10 * HOUR_MS
+    assert isinstance(view.close, np.memmap)
+    assert len(store.read("ETH", "1h", limit=5)) == 5
+    assert store.read("ETH", "4h") is None
+
+    df = view.to_dataframe()
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+    assert df["close"].iloc[0] == 110.0
+
+
+def test_interrupted_append_is_truncated(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    store.append("SOL", "1h", _candles(0, 5))
+    # Simulate a crash after the value columns were written
+    with open(tmp_path / "aggregate" / "SOL" / "1h" / "close.f8", "ab") as f:
+        f.write(np.float64(999).tobytes())
+
+    store.append("SOL", "1h", _candles(5, 1))
+    view = store.read("SOL", "1h")
+    assert len(view) == 6 and view.close[-1] == 100.0
+
+
+def test_gap_filler_reads_neighbours_from_view(tmp_path):
+    from ai_models import GapFillingService
+
+    store = OHLCVStore(str(tmp_path))
+    candles = _candles(0, 10)
+    del candles[4:6]
+    store.append("BTC", "1h", candles)
+
+    missing = [START + 4 * HOUR_MS, START + 5 * HOUR_MS]
+    result = asyncio.run(GapFillingService().fill_missing_ohlc("BTC", store.read("BTC", "1h"), missing))
+
+    assert result["status"] == "success" and result["filled_count"] == 2
+    first = result["filled_data"][0]
+    assert first["method"] == "linear_interpolation"
+    assert first["close"] == 103.0 + (106.0 - 103.0) / 3
+
+
+def test_merge_backfills_and_revises_inside_the_series(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    store.append("BTC", "1h", _candles(10, 5))
+    store.mark_empty("BTC", "1h", START - HOUR_MS, START - 1)
+
+    # Older candles are ignored by append but merged by merge()
+    assert store.append("BTC", "1h", _candles(0, 10)) == 0
+    assert store.merge("BTC", "1h", _candles(0, 10) + _candles(12, 1, close=500.0)) == 11
+
+    view = store.read("BTC", "1h")
+    assert len(view) == 15
+    assert np.all(np.diff(view.timestamp) == HOUR_MS)
+    assert view.close[12] == 500.0 and view.close[11] == 101.0
+    assert store.series() == [("aggregate", "BTC", "1h")]
+    assert store.empty_ranges("BTC", "1h") == [(START - HOUR_MS, START - 1)]  # kept by the rewrite
+
+    # Appends continue after a merge
+    assert store.append("BTC", "1h", _candles(15, 1)) == 1
+    assert len(store.read("BTC", "1h")) == 16
+
+
+def test_series_are_keyed_by_exchange(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    store.append("BTC", "1h", _candles(0, 3), exchange="binance")
+    store.append("BTC", "1h", _candles(0, 2, close=300.0), exchange="KuCoin")
+
+    assert len(store.read("BTC", "1h", exchange="binance")) == 3
+    assert store.read("BTC", "1h", exchange="kucoin").close[0] == 300.0
+    assert store.read("BTC", "1h") is None
+    assert store.series() == [("binance", "BTC", "1h"), ("kucoin", "BTC", "1h")]
+
+
+def test_naive_datetimes_are_utc():
+    aware = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    assert to_epoch_ms(datetime(2024, 1, 1, 12)) == to_epoch_ms(aware) == 1_704_110_400_000
+    assert to_epoch_ms("2024-01-01T12:00:00") == to_epoch_ms("2024-01-01T12:00:00Z")
@@ -0,0 +1,118 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services import parameter_sweep
+from backend.services.parameter_sweep import SweepJob, SweepManager, build_grid, evaluate_combinations
+from backend.services.trading_backtesting_service import BacktestingService
+
+
+def _close(n=4000, seed=5):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+@pytest.mark.parametrize("strategy,method", [
+    ("sma_crossover", "_backtest_sma_crossover"),
+    ("rsi", "_backtest_rsi"),
+    ("macd", "_backtest_macd"),
+])
+def test_default_combination_matches_single_backtest(strategy, method):
+    close = _close()
+    single = getattr(BacktestingService, method)(None, pd.DataFrame({"close": close}), 10000.0)
+
+    defaults = parameter_sweep.SWEEP_STRATEGIES[strategy]
+    fixed = {key: defaults[key] for key in parameter_sweep._TASK_KEYS[strategy]}
+    row = evaluate_combinations(strategy, close, fixed, [defaults], 10000.0, 8760)[0]
+
+    assert row["total_return"] == pytest.approx(single["total_return"], abs=1e-5)
+    assert row["trades"] == single["trades"]
+
+
+def test_grid_expansion_and_validation():
+    grid = build_grid("sma_crossover", {"fast": {"start": 5, "stop": 20, "step": 5}, "slow": [10, 30]})
+    assert [(c["fast"], c["slow"]) for c in grid] == [(5, 10), (5, 30), (10, 30), (15, 30), (20, 30)]
+    with pytest.raises(ValueError):
+        build_grid("rsi", {"window": [1, 2]})
+    with pytest.raises(ValueError):
+        build_grid("sma_crossover", {"fast": {"start": 1, "stop": 1000}, "slow": {"start": 2, "stop": 1000}})
+
+
+def test_sweep_on_process_pool_with_progress_and_cancel(monkeypatch):
+    close = _close(2000)
+    manager = SweepManager(workers=2)
+    # Many small tasks so progress is observable
+    monkeypatch.setattr(parameter_sweep, "TASK_ELEMENTS", 2000 * 4)
+
+    async def run():
+        job = manager.start("sma_crossover", {"fast": [5, 10, 15], "slow": {"start": 20, "stop": 60, "step": 5}}, close)
+        updates = 0
+        while not job.done:
+            await job.wait_for_update(timeout=30)
+            updates += 1
+        ranked = job.ranked("total_return")
+
+        cancelled = manager.start("rsi", {"period": {"start": 5, "stop": 40}, "oversold": [20, 25, 30]}, close)
+        await asyncio.sleep(0)
+        assert manager.cancel(cancelled.job_id)
+        await asyncio.gather(cancelled.task, return_exceptions=True)
+        return job, updates, ranked, cancelled
+
+    try:
+        job, updates, ranked, cancelled = asyncio.run(run())
+    finally:
+        manager.shutdown()
+
+    assert job.status == "completed" and job.completed == job.total == 27 and updates >= 2
+    returns = [row["total_return"] for row in ranked]
+    assert returns == sorted(returns, reverse=True) and ranked[0]["rank"] == 1
+
+    # Same numbers as evaluating in-process
+    best = ranked[0]["params"]
+    direct = evaluate_combinations("sma_crossover", close, {"fast": best["fast"]}, [best], 10000.0, 8760)[0]
+    assert direct["total_return"] == ranked[0]["total_return"]
+
+    assert cancelled.status == "cancelled" and cancelled.completed < cancelled.total
+
+
+def test_eviction_skips_running_jobs(monkeypatch):
+    monkeypatch.setattr(parameter_sweep, "MAX_SWEEP_JOBS", 2)
+    manager = SweepManager(workers=0)
+    close = _close(300)
+
+    async def run():
+        running = SweepJob("sma_crossover", [], {})  # a long sweep, oldest entry
+        running.status = "running"
+        manager.jobs[running.job_id] = running
+        for _ in range(4):
+            job = manager.start("sma_crossover", {"fast": [5], "slow": [20]}, close)
+            await job.task
+        return running, job
+
+    running, last = asyncio.run(run())
+    assert list(manager.jobs) == [running.job_id, last.job_id]
+
+
+def test_shared_block_is_unlinked_after_queued_tasks_finish():
+    from concurrent.futures import Future
+
+    class Block:
+        unlinked = 0
+
+        def unlink(self):
+            self.unlinked += 1
+
+    queued, cancelled = Future(), Future()
+    assert queued.set_running_or_notify_cancel()  # in the call queue: cannot be cancelled
+    assert cancelled.cancel()
+
+    block = Block()
+    SweepManager._unlink_when_done(block, [queued, cancelled])
+    assert block.unlinked == 0
+    queued.set_result([])
+    assert block.unlinked == 1
+
+    SweepManager._unlink_when_done(block, [cancelled])
+    assert block.unlinked == 2
@@ -0,0 +1,69 @@
+import asyncio
+import importlib
+
+import pytest
+
+
+@pytest.fixture
+def orchestration(tmp_path, monkeypatch):
+    # provider_manager opens its log files under ./logs at import time
+    (tmp_path / "logs").mkdir()
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module("backend.orchestration.provider_manager")
+    cache = importlib.import_module("backend.cache.ttl_cache").ttl_cache
+    asyncio.run(cache.clear())
+    return module
+
+
+def _manager_with_counter(module, delay=0.05):
+    calls = {"count": 0}
+
+    async def fetch(config, **params):
+        calls["count"] += 1
+        await asyncio.sleep(delay)
+        return {"value": calls["count"]}
+
+    manager = module.ProviderManager()
+    manager.register_provider(
+        "market", module.ProviderConfig(name="Test", category="market", base_url="http://test"), fetch
+    )
+    return manager, calls
+
+
+def test_concurrent_misses_share_one_upstream_call(orchestration):
+    manager, calls = _manager_with_counter(orchestration)
+
+    async def run():
+        return await asyncio.gather(*[
+            manager.fetch_data("market", params={"ids": "bitcoin"}) for _ in range(25)
+        ])
+
+    responses = asyncio.run(run())
+
+    assert calls["count"] == 1
+    assert all(r["success"] and r["data"] == {"value": 1} for r in responses)
+    stats = manager.get_coalescing_stats()
+    assert stats["upstream_calls"] == 1
+    assert stats["coalesced_waiters"] == 24
+    assert stats["inflight"] == 0
+
+
+def test_stale_while_revalidate_serves_expired_value_and_refreshes_once(orchestration):
+    manager, calls = _manager_with_counter(orchestration, delay=0.01)
+
+    async def run():
+        first = await manager.fetch_data("market", params={"ids": "eth"}, ttl=0, stale_while_revalidate=True)
+        stale = await asyncio.gather(*[
+            manager.fetch_data("market", params={"ids": "eth"}, ttl=0, stale_while_revalidate=True)
+            for _ in range(10)
+        ])
+        await asyncio.sleep(0.05)
+        return first, stale
+
+    first, stale = asyncio.run(run())
+
+    assert all(r["data"] == first["data"] for r in stale)
+    assert calls["count"] == 2  # initial fetch + a single background refresh
+    stats = manager.get_coalescing_stats()
+    assert stats["stale_served"] == 10
+    assert stats["background_refreshes"] == 1
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from monitoring import rate_limiter as rate_limiter_module
+from monitoring.rate_limiter import RateLimiter, RateLimitExceeded
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", fake)
+    return fake
+
+
+def test_burst_then_sustained_rate(clock):
+    limiter = RateLimiter()
+    limiter.configure_limit("Prov", "per_second", 10, burst=3)
+
+    assert [limiter.try_acquire("prov") for _ in range(4)] == [True, True, True, False]
+    assert limiter.time_until_available("PROV") == pytest.approx(0.1)
+    assert limiter.can_make_request("Prov")[0] is False
+
+    clock.now += 0.1
+    assert limiter.try_acquire("Prov")
+    assert not limiter.try_acquire("Prov")
+
+    status = limiter.get_status("Prov")
+    assert status["current_usage"] == 4
+    assert status["status"] == "blocked"
+    assert list(limiter.get_all_statuses()) == ["Prov"]
+
+    # Reconfiguring keeps the accounting
+    limiter.configure_limit("Prov", "per_second", 10, burst=3)
+    assert not limiter.try_acquire("Prov")
+
+
+def test_reserve_queues_callers_and_penalize(clock):
+    limiter = RateLimiter()
+    limiter.configure_rate("api", calls=2, period=1, burst=1)
+
+    assert [limiter.reserve("api") for _ in range(3)] == pytest.approx([0.0, 0.5, 1.0])
+    with pytest.raises(RateLimitExceeded):
+        limiter.reserve("api", timeout=1.0)
+
+    clock.now += 10
+    limiter.penalize("api", 30)
+    assert limiter.time_until_available("api") == pytest.approx(30)
+    # Unconfigured providers are never limited
+    assert limiter.reserve("other") == 0.0
+
+
+def test_acquire_sleeps_until_slot():
+    limiter = RateLimiter()
+    limiter.configure_rate("api", calls=20, period=1, burst=1)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        waits = await asyncio.gather(*(limiter.acquire("api") for _ in range(3)))
+        return waits, loop.time() - start
+
+    waits, elapsed = asyncio.run(run())
+
+    assert waits == pytest.approx([0.0, 0.05, 0.1], abs=0.01)
+    assert 0.09 <= elapsed < 0.5
+
+
+def test_provider_quotas_apply_on_first_use(clock):
+    limiter = RateLimiter()
+    quota = rate_limiter_module.PROVIDER_QUOTAS["coingecko"]
+
+    granted = sum(limiter.try_acquire("CoinGecko") for _ in range(quota["burst"] + 1))
+
+    assert granted == quota["burst"]
+    assert limiter.get_status("coingecko")["limit_type"] == "per_minute"
@@ -0,0 +1,74 @@
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from database.cache_queries import CacheQueries
+from database.db_manager import DatabaseManager
+from database.models import Alert, CachedMarketData, ConnectionAttempt
+
+
+def _db(tmp_path, **kwargs):
+    db = DatabaseManager(str(tmp_path / "retention.db"), **kwargs)
+    db.init_database()
+    return db
+
+
+def _fill_attempts(db, provider_id, old, new):
+    old_ts, new_ts = datetime.utcnow() - timedelta(days=60), datetime.utcnow()
+    with db.engine.begin() as conn:
+        conn.execute(ConnectionAttempt.__table__.insert(), [
+            {"provider_id": provider_id, "timestamp": old_ts if i < old else new_ts,
+             "endpoint": "/x" * 200, "status": "success", "retry_count": 0}
+            for i in range(old + new)
+        ])
+
+
+def test_cleanup_deletes_in_batches_and_releases_pages(tmp_path, monkeypatch):
+    db = _db(tmp_path)
+    provider_id = db.create_provider("p", "market_data", "https://x").id
+    _fill_attempts(db, provider_id, old=2300, new=100)
+    with db.get_session() as session:
+        session.add(Alert(provider_id=provider_id, alert_type="t", message="m", acknowledged=True,
+                          timestamp=datetime.utcnow() - timedelta(days=60)))
+        session.add(Alert(provider_id=provider_id, alert_type="t", message="m", acknowledged=False,
+                          timestamp=datetime.utcnow() - timedelta(days=60)))
+
+    deletes = []
+
+    @event.listens_for(db.engine, "before_cursor_execute")
+    def count_deletes(conn, cursor, statement, *args):
+        if statement.startswith("DELETE FROM connection_attempts"):
+            deletes.append(statement)
+
+    monkeypatch.setattr("database.db_manager.RETENTION_BATCH_SIZE", 500)
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    size_before = os.path.getsize(db.db_path)
+    counts = db.cleanup_old_data(days=30)
+
+    assert counts["connection_attempts"] == 2300 and counts["alerts"] == 1
+    assert len(deletes) == 5  # 4 full batches + remainder
+    with db.get_read_session() as session:
+        assert session.query(ConnectionAttempt).count() == 100
+        assert session.query(Alert).count() == 1
+
+    # New files use auto_vacuum=INCREMENTAL, so the freed pages are returned
+    with db.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
+        assert conn.exec_driver_sql("PRAGMA freelist_count").scalar() == 0
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    assert os.path.getsize(db.db_path) < size_before
+
+
+def test_cache_cleanup_without_incremental_vacuum(tmp_path):
+    db = _db(tmp_path, profile="off")
+    old = datetime.utcnow() - timedelta(days=10)
+    with db.get_session() as session:
+        session.add_all([
+            CachedMarketData(symbol=f"S{i}", price=1.0, provider="test", fetched_at=old if i % 2 else datetime.utcnow())
+            for i in range(40)
+        ])
+
+    assert CacheQueries(db).cleanup_old_data(days=7) == {"market_data": 20, "ohlc": 0}
+    assert db.reclaim_space() == 0  # auto_vacuum=NONE: nothing to release incrementally
@@ -0,0 +1,137 @@
+import time
+
+import pytest
+from sqlalchemy import event
+
+from database.db_manager import DatabaseManager
+from database.models import PoolMember, Provider, RotationHistory, RotationState
+from monitoring import source_pool_manager
+from monitoring.source_pool_manager import SourcePoolManager
+
+
+@pytest.fixture
+def pool_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(source_pool_manager, "_pool_selector", None)
+    db = DatabaseManager(str(tmp_path / "pools.db"))
+    db.init_database()
+    monkeypatch.setattr(source_pool_manager, "db_manager", db)  # flushes write through get_session()
+    session = db.SessionLocal()
+    providers = [
+        Provider(name=f"prov{i}", category="market_data", endpoint_url=f"https://p{i}.example")
+        for i in range(3)
+    ]
+    session.add_all(providers)
+    session.commit()
+    yield db, session, [p.id for p in providers]
+    if source_pool_manager._pool_selector is not None:
+        source_pool_manager._pool_selector.shutdown()
+    session.close()
+    db.engine.dispose()
+
+
+def _count_statements(engine):
+    counter = {"n": 0}
+    event.listen(engine, "before_cursor_execute", lambda *args: counter.__setitem__("n", counter["n"] + 1))
+    return counter
+
+
+def test_round_robin_selection_runs_in_memory(pool_db):
+    db, session, provider_ids = pool_db
+    manager = SourcePoolManager(session)
+    pool = manager.create_pool("Market", "market_data", rotation_strategy="round_robin")
+    for provider_id in provider_ids:
+        manager.add_to_pool(pool.id, provider_id)
+
+    manager.get_next_provider(pool.id)  # loads the snapshot
+    statements = _count_statements(db.engine)
+    picks = [manager.get_next_provider(pool.id).id for _ in range(5)]
+
+    assert picks == [provider_ids[i % 3] for i in range(1, 6)]
+    assert statements["n"] == 0
+
+    assert manager.flush() == 6
+    session.expire_all()
+    counts = {m.provider_id: m.use_count for m in session.query(PoolMember).all()}
+    assert counts == {provider_ids[0]: 2, provider_ids[1]: 2, provider_ids[2]: 2}
+    assert session.query(RotationState).filter_by(pool_id=pool.id).one().rotation_count == 6
+    assert session.query(RotationHistory).count() == 6
+
+
+def test_weighted_and_failover(pool_db):
+    db, session, provider_ids = pool_db
+    manager = SourcePoolManager(session)
+    pool = manager.create_pool("Weighted", "market_data", rotation_strategy="weighted")
+    manager.add_to_pool(pool.id, provider_ids[0], weight=3)
+    manager.add_to_pool(pool.id, provider_ids[1], weight=1)
+
+    picks = [manager.get_next_provider(pool.id).id for _ in range(8)]
+    assert picks.count(provider_ids[0]) == 6
+
+    replacement = manager.failover(pool.id, provider_ids[0], reason="timeout")
+    assert replacement.id == provider_ids[1]
+    failed = session.query(PoolMember).filter_by(pool_id=pool.id, provider_id=provider_ids[0]).one()
+    assert failed.failure_count == 1
+    assert session.query(RotationHistory).filter_by(rotation_reason="timeout").count() == 1
+
+
+def test_buffered_updates_are_flushed_on_a_timer_outside_the_lock(pool_db, monkeypatch):
+    db, session, provider_ids = pool_db
+    monkeypatch.setattr(source_pool_manager, "_pool_selector", source_pool_manager.PoolSelector(flush_interval=0.05))
+    manager = SourcePoolManager(session)
+    pool = manager.create_pool("Timed", "market_data", rotation_strategy="round_robin")
+    manager.add_to_pool(pool.id, provider_ids[0])
+    manager.get_next_provider(pool.id)
+
+    lock_free_during_writes = []
+
+    def check_lock(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith(("UPDATE", "INSERT")):
+            acquired = manager.selector.lock.acquire(blocking=False)
+            lock_free_during_writes.append(acquired)
+            if acquired:
+                manager.selector.lock.release()
+
+    event.listen(db.engine, "before_cursor_execute", check_lock)
+    manager.record_success(pool.id, provider_ids[0])
+
+    # No further selection: the flusher thread writes the counters on its own
+    deadline = time.monotonic() + 5
+    while True:
+        session.rollback()
+        member = session.query(PoolMember).filter_by(pool_id=pool.id).one()
+        if member.success_count or time.monotonic() > deadline:
+            break
+        time.sleep(0.02)
+    assert (member.use_count, member.success_count) == (1, 1)
+    assert lock_free_during_writes and all(lock_free_during_writes)
+
+    # Shutdown stops the timer and writes what is left
+    manager.record_failure(pool.id, provider_ids[0])
+    assert manager.selector.shutdown() == 1
+    assert not manager.selector.get_stats()["flusher_running"]
+    session.expire_all()
+    assert session.query(PoolMember).filter_by(pool_id=pool.id).one().failure_count == 1
+
+
+def test_failed_flush_is_kept_for_the_next_one(pool_db, monkeypatch):
+    db, session, provider_ids = pool_db
+    manager = SourcePoolManager(session)
+    pool = manager.create_pool("Retry", "market_data", rotation_strategy="round_robin")
+    manager.add_to_pool(pool.id, provider_ids[0])
+    manager.get_next_provider(pool.id)
+
+    get_session = db.get_session
+
+    def locked():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(db, "get_session", locked)
+    manager.record_success(pool.id, provider_ids[0])
+    assert manager.flush() == 0
+    assert manager.selector.get_stats()["pending_updates"] == 2
+
+    monkeypatch.setattr(db, "get_session", get_session)
+    assert manager.flush() == 2
+    session.expire_all()
+    member = session.query(PoolMember).filter_by(pool_id=pool.id).one()
+    assert (member.use_count, member.success_count) == (1, 1)
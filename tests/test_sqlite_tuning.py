@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from database.db_manager import DatabaseManager
+from database.models import Provider
+from database.sqlite_tuning import get_sqlite_profile, sqlite_settings
+
+
+def test_performance_profile_pragmas_and_read_pool(tmp_path):
+    db = DatabaseManager(str(tmp_path / "tuned.db"), profile="performance")
+    db.init_database()
+
+    writer = sqlite_settings(db.engine)
+    assert writer["journal_mode"] == "wal"
+    assert writer["synchronous"] == 1  # NORMAL
+    assert writer["busy_timeout"] == 5000
+    assert writer["cache_size"] == -64 * 1024
+    assert writer["query_only"] == 0
+    assert sqlite_settings(db.read_engine)["query_only"] == 1
+
+    assert db.create_provider("binance", "market_data", "https://api.binance.com")
+    assert db.get_provider(name="binance").name == "binance"
+
+    # Read sessions cannot write
+    with pytest.raises(OperationalError):
+        with db.get_read_session() as session:
+            session.add(Provider(name="x", category="c", endpoint_url="u"))
+            session.flush()
+
+    # Nested write sessions on the same thread don't deadlock
+    with db.get_session() as outer:
+        outer.execute(text("SELECT 1"))
+        assert db.get_all_providers()
+        assert db.update_provider(db.get_provider(name="binance").id, priority_tier=1)
+
+    assert db.optimize()
+
+
+def test_open_write_session_does_not_block_other_writers(tmp_path):
+    db = DatabaseManager(str(tmp_path / "tuned.db"), profile="performance")
+    db.init_database()
+    with db.engine.connect() as conn:
+        assert conn.connection.dbapi_connection.isolation_level == "IMMEDIATE"
+
+    opened, release = threading.Event(), threading.Event()
+
+    def slow_session():
+        with db.get_session() as session:
+            session.execute(text("SELECT 1"))
+            opened.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=slow_session)
+    thread.start()
+    assert opened.wait(10)
+    try:
+        started = time.monotonic()
+        assert db.create_provider("binance", "market_data", "https://api.binance.com")
+        assert time.monotonic() - started < 2
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_off_profile_keeps_single_engine(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "250")
+    profile = get_sqlite_profile("off")
+    assert profile.busy_timeout_ms == 250 and profile.journal_mode is None
+
+    db = DatabaseManager(str(tmp_path / "plain.db"), profile="off")
+    assert db.read_engine is db.engine
+    assert sqlite_settings(db.engine)["journal_mode"] == "delete"
@@ -0,0 +1,194 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from database.models import ConnectionAttempt, DataCollection, FailureLog, ProviderStatsHour
+from database.stats_rollup import MINUTE_RETENTION
+
+
+def _db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "stats.db"))
+    db.init_database()
+    return db
+
+
+def _add_logs(db, provider_ids, now, count, max_age):
+    rng = random.Random(count)
+    rows = []
+    for _ in range(count):
+        provider_id = rng.choice(provider_ids)
+        ts = now - timedelta(seconds=rng.uniform(0, max_age.total_seconds()))
+        rows.append(ConnectionAttempt(
+            provider_id=provider_id, timestamp=ts, endpoint="/x",
+            status=rng.choice(["success", "success", "failed", "timeout", "rate_limited"]),
+            response_time_ms=rng.choice([None, rng.randint(10, 900)])
+        ))
+        rows.append(DataCollection(
+            provider_id=provider_id, category="market_data", scheduled_time=ts, actual_fetch_time=ts,
+            record_count=rng.randint(0, 50), payload_size_bytes=rng.randint(100, 5000),
+            data_quality_score=rng.random(), staleness_minutes=rng.choice([None, rng.random() * 10])
+        ))
+        rows.append(FailureLog(
+            provider_id=provider_id, timestamp=ts, endpoint="/x",
+            error_type=rng.choice(["timeout", "http_500", "rate_limit"]),
+            retry_attempted=rng.random() < 0.5, retry_result=rng.choice([None, "success", "failed"])
+        ))
+    with db.get_session() as session:
+        session.add_all(rows)
+
+
+def _raw_provider_stats(db, provider_id, cutoff):
+    """Reference: aggregate the raw rows directly"""
+    with db.get_read_session() as session:
+        attempts = session.query(ConnectionAttempt).filter(
+            ConnectionAttempt.provider_id == provider_id, ConnectionAttempt.timestamp >= cutoff).all()
+        collections = session.query(DataCollection).filter(
+            DataCollection.provider_id == provider_id, DataCollection.actual_fetch_time >= cutoff).all()
+        failures = session.query(FailureLog).filter(
+            FailureLog.provider_id == provider_id, FailureLog.timestamp >= cutoff).count()
+    times = [a.response_time_ms for a in attempts if a.response_time_ms is not None]
+    return {
+        "total_attempts": len(attempts),
+        "successful": sum(a.status == "success" for a in attempts),
+        "timeout": sum(a.status == "timeout" for a in attempts),
+        "avg_response_time_ms": round(sum(times) / len(times), 2) if times else 0,
+        "total_records": sum(c.record_count for c in collections),
+        "total_collections": len(collections),
+        "failure_count": failures,
+    }
+
+
+@pytest.mark.parametrize("hours", [1, 24, 24 * 30])
+def test_rollups_plus_tail_match_raw_aggregates(tmp_path, hours):
+    db = _db(tmp_path)
+    provider_ids = [db.create_provider(f"p{i}", "market_data", "https://x").id for i in range(3)]
+    # Whole-minute "now" so the window edge falls on a minute bucket boundary
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+
+    _add_logs(db, provider_ids, now, 2500, timedelta(days=40))
+    compacted = db.compact_stats()
+    assert compacted["connection_attempts"] == 2500
+    _add_logs(db, provider_ids, now, 200, timedelta(hours=2))  # unrolled tail
+
+    cutoff = (datetime.utcnow() - timedelta(hours=hours)).replace(second=0, microsecond=0)
+    if timedelta(hours=hours) > MINUTE_RETENTION:
+        # Past the minute retention the window starts on the next whole hour
+        cutoff = cutoff.replace(minute=0) + timedelta(hours=1)
+    stats = db.get_provider_stats(provider_ids[0], hours=hours)
+    expected = _raw_provider_stats(db, provider_ids[0], cutoff)
+
+    assert stats["connection_stats"]["total_attempts"] == expected["total_attempts"]
+    assert stats["connection_stats"]["successful"] == expected["successful"]
+    assert stats["connection_stats"]["timeout"] == expected["timeout"]
+    assert stats["connection_stats"]["avg_response_time_ms"] == pytest.approx(expected["avg_response_time_ms"], abs=0.01)
+    assert stats["data_collection_stats"]["total_records"] == expected["total_records"]
+    assert stats["data_collection_stats"]["total_collections"] == expected["total_collections"]
+    assert stats["failure_count"] == expected["failure_count"]
+
+
+def test_failure_analysis_and_incremental_compaction(tmp_path):
+    db = _db(tmp_path)
+    provider_ids = [db.create_provider(f"p{i}", "market_data", "https://x").id for i in range(2)]
+    now = datetime.utcnow()
+    _add_logs(db, provider_ids, now, 300, timedelta(hours=20))
+
+    before = db.get_failure_analysis(hours=24)  # served from the raw tail
+    db.compact_stats()
+    _add_logs(db, provider_ids, now, 50, timedelta(minutes=30))
+    assert db.compact_stats() == {"connection_attempts": 50, "data_collections": 50, "failure_logs": 50}
+    after = db.get_failure_analysis(hours=24)
+
+    assert sum(row["count"] for row in before["failures_by_error_type"]) == 300
+    assert sum(row["count"] for row in after["failures_by_error_type"]) == 350
+    assert sum(row["failure_count"] for row in after["top_failing_providers"]) == 350
+    with db.get_read_session() as session:
+        assert sum(row.attempts for row in session.query(ProviderStatsHour).all()) == 350
+
+    # Retention keeps the rolled-up history
+    db.cleanup_old_data(days=0)
+    assert sum(row["count"] for row in db.get_failure_analysis(hours=24)["failures_by_error_type"]) == 350
+
+
+@pytest.mark.parametrize("profile,managers", [("off", 1), ("performance", 2)])
+def test_concurrent_compactors_roll_up_each_row_once(tmp_path, monkeypatch, profile, managers):
+    import threading
+
+    import database.stats_rollup as stats_rollup
+
+    dbs = [DatabaseManager(str(tmp_path / "stats.db"), profile=profile) for _ in range(managers)]
+    dbs[0].init_database()
+    provider_id = dbs[0].create_provider("p", "market_data", "https://x").id
+    dbs[0].compact_stats()  # Watermark rows exist (first pass is serialized on their insert)
+    _add_logs(dbs[0], [provider_id], datetime.utcnow(), 200, timedelta(hours=2))
+
+    # Both compactors have read the same watermark and aggregated the same
+    # id range before either of them writes
+    barrier = threading.Barrier(2)
+    claim_range = stats_rollup._claim_range
+    waited = threading.local()
+
+    def claim_after_barrier(session, name, last_id, upper):
+        if name == "connection_attempts" and not getattr(waited, "done", False):
+            waited.done = True
+            barrier.wait(timeout=10)
+        return claim_range(session, name, last_id, upper)
+
+    monkeypatch.setattr(stats_rollup, "_claim_range", claim_after_barrier)
+    threads = [threading.Thread(target=dbs[i % managers].compact_stats) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with dbs[0].get_read_session() as session:
+        assert sum(row.attempts for row in session.query(ProviderStatsHour).all()) == 200
+    assert dbs[0].get_provider_stats(provider_id, hours=24)["connection_stats"]["total_attempts"] == 200
+
+
+def test_reused_ids_after_retention_empties_a_table(tmp_path):
+    db = _db(tmp_path)
+    provider_id = db.create_provider("p", "market_data", "https://x").id
+    _add_logs(db, [provider_id], datetime.utcnow() - timedelta(days=5), 100, timedelta(hours=1))
+    db.compact_stats()
+
+    # Retention empties the log tables; new rows reuse ids from 1
+    db.cleanup_old_data(days=1)
+    _add_logs(db, [provider_id], datetime.utcnow(), 150, timedelta(hours=1))
+    assert db.get_provider_stats(provider_id, hours=2)["connection_stats"]["total_attempts"] == 150
+    db.compact_stats()
+    assert db.get_provider_stats(provider_id, hours=2)["connection_stats"]["total_attempts"] == 150
+
+
+def test_emptied_table_below_the_watermark_is_recompacted(tmp_path):
+    db = _db(tmp_path)
+    provider_id = db.create_provider("p", "market_data", "https://x").id
+    _add_logs(db, [provider_id], datetime.utcnow(), 100, timedelta(hours=1))
+    db.compact_stats()
+
+    # Emptied outside cleanup_old_data: the watermark (100) is above the reused ids
+    with db.get_session() as session:
+        session.query(ConnectionAttempt).delete()
+    _add_logs(db, [provider_id], datetime.utcnow(), 30, timedelta(hours=1))
+    assert db.get_provider_stats(provider_id, hours=2)["connection_stats"]["total_attempts"] == 130
+    assert db.compact_stats()["connection_attempts"] == 30
+    assert db.get_provider_stats(provider_id, hours=2)["connection_stats"]["total_attempts"] == 130
+
+
+def test_stats_reads_never_compact_and_filter_the_raw_tail(tmp_path):
+    db = _db(tmp_path)
+    provider_ids = [db.create_provider(f"p{i}", "market_data", "https://x").id for i in range(2)]
+    now = datetime.utcnow()
+    _add_logs(db, provider_ids, now - timedelta(hours=10), 120, timedelta(hours=1))  # outside the window
+    _add_logs(db, provider_ids, now, 80, timedelta(minutes=30))
+
+    # Served from the raw tail without writing inside the request
+    stats = db.get_provider_stats(provider_ids[0], hours=2)
+    assert db.get_failure_analysis(hours=2)["failures_by_error_type"]
+    with db.get_read_session() as session:
+        assert session.query(ProviderStatsHour).count() == 0
+    expected = _raw_provider_stats(db, provider_ids[0], now - timedelta(hours=2))
+    assert stats["connection_stats"]["total_attempts"] == expected["total_attempts"]
+    assert stats["failure_count"] == expected["failure_count"]
+    assert db.compact_stats()["connection_attempts"] == 200
@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from backend.middleware import MetricsMiddleware
+from backend.routers import system_metrics_api
+from backend.routers.system_metrics_api import MAX_TRACKED_ROUTES, MetricsTracker
+
+
+def test_window_percentiles_and_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    tracker = MetricsTracker()
+
+    for ms in range(1, 1001):
+        status = 500 if ms % 100 == 0 else 200
+        tracker.record_request(ms, is_error=status >= 400, route="GET /api/x", status_code=status)
+        now[0] += 0.01
+
+    window = tracker.get_window()
+    assert window["requests"] == 1000 and window["errors"] == 10
+    assert window["status"]["2xx"] == 990 and window["status"]["5xx"] == 10
+    percentiles = tracker.get_percentiles()
+    assert percentiles["p50_ms"] == pytest.approx(500, rel=0.03)
+    assert percentiles["p99_ms"] == pytest.approx(990, rel=0.03)
+    assert tracker.get_average_response_time() == pytest.approx(500.5, rel=1e-6)
+
+    # A minute later the window is empty but lifetime stats remain
+    now[0] += 61
+    assert tracker.get_requests_per_minute() == 0
+    assert tracker.get_percentiles()["p50_ms"] is None
+    assert tracker.get_percentiles(window=False)["p50_ms"] == pytest.approx(500, rel=0.03)
+    assert tracker.get_route_stats()["GET /api/x"]["requests"] == 1000
+
+    for i in range(MAX_TRACKED_ROUTES + 10):
+        tracker.record_request(1.0, route=f"GET /r{i}", status_code=404, is_error=True)
+    assert len(tracker.routes) == MAX_TRACKED_ROUTES + 1
+    assert tracker.routes["other"].requests == 11
+
+
+def test_middleware_records_route_templates(monkeypatch):
+    tracker = MetricsTracker()
+    monkeypatch.setattr(system_metrics_api, "_metrics_tracker", tracker)
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(system_metrics_api.router)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    client = TestClient(app)
+    for item_id in (1, 2, 3, 0):
+        client.get(f"/items/{item_id}")
+    client.get("/nowhere")
+
+    assert tracker.routes["GET /items/{item_id}"].requests == 4
+    assert tracker.routes["GET /items/{item_id}"].errors == 1
+    assert tracker.routes["GET unmatched"].status[3] == 1
+
+    metrics = client.get("/api/system/metrics").json()
+    assert metrics["requests_per_min"] == 5
+    assert metrics["p50_ms"] is not None and metrics["p99_ms"] >= metrics["p50_ms"]
+    assert metrics["status_classes"]["4xx"] == 2
+
+    routes = client.get("/api/system/metrics/routes").json()["routes"]
+    assert list(routes)[0] == "GET /items/{item_id}"
@@ -0,0 +1,176 @@
+import asyncio
+import time
+
+import pandas as pd
+
+from backend.cache.tiered_cache import NamespaceConfig, TieredCache
+from backend.cache.ttl_cache import TTLCache
+
+
+def _eventually(check, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = check()
+        if result:
+            return result
+        time.sleep(0.01)
+    return check()
+
+
+def _namespaces():
+    return {
+        "small": NamespaceConfig(ttl=60, max_entries=3, max_bytes=1000),
+        "persisted": NamespaceConfig(ttl=60, stale_ttl=60, persistent=True),
+    }
+
+
+def test_lru_bounds_ttl_and_stale_window(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = TieredCache(_namespaces(), l2_path=None)
+
+    for key in "abc":
+        cache.set("small", key, key * 10)
+    assert cache.get("small", "a") == "a" * 10  # a becomes most recently used
+    cache.set("small", "d", "d" * 10)
+    assert cache.get("small", "b") is None
+    assert cache.get("small", "a") is not None
+
+    cache.set("small", "big", "x" * 995)  # over max_bytes: evicts everything older
+    stats = cache.stats()["namespaces"]["small"]
+    assert stats["entries"] == 1 and stats["bytes"] == 995
+    assert stats["evictions"] == 4
+
+    # Non-JSON values are fine in memory-only namespaces
+    frame = pd.DataFrame({"close": [1.0, 2.0]})
+    cache.set("frames", "df", frame)
+    assert cache.get("frames", "df") is frame
+
+    cache.set("persisted", "k", {"v": 1}, ttl=10, stale_ttl=20)
+    now[0] += 15
+    assert cache.get("persisted", "k") is None
+    assert cache.get_entry("persisted", "k") == ({"v": 1}, False)
+    assert cache.get_stale("persisted", "k", max_age=10) is None
+    assert cache.get_stale("persisted", "k", max_age=60) == {"v": 1}
+    now[0] += 20
+    assert cache.get_entry("persisted", "k") is None
+
+
+def test_l2_write_behind_and_warm_start(tmp_path):
+    path = str(tmp_path / "cache_l2.db")
+    cache = TieredCache(_namespaces(), l2_path=path)
+    cache.set("persisted", "prices", {"BTC": 65000.5})
+    cache.set("persisted", "gone", [1, 2])
+    cache.set("persisted", "frame", pd.DataFrame({"a": [1]}))  # not JSON: L1 only
+    cache.delete("persisted", "gone")
+    cache.set("small", "not-persisted", "x")
+    cache.close()
+
+    restarted = TieredCache(_namespaces(), l2_path=path)
+    assert restarted.warm() == 1
+    assert restarted.get("persisted", "prices") == {"BTC": 65000.5}
+    assert restarted.get("persisted", "gone") is None
+    assert restarted.get("persisted", "frame") is None
+    assert restarted.get("small", "not-persisted") is None
+
+    # Without warm-up an L1 miss is read back from L2 in the background
+    cold = TieredCache(_namespaces(), l2_path=path)
+    assert cold.get("persisted", "prices") is None
+    assert _eventually(lambda: cold.get("persisted", "prices")) == {"BTC": 65000.5}
+    assert cold.stats()["namespaces"]["persisted"]["l2_hits"] == 1
+
+    # The async TTLCache adapter keeps its interface
+    ttl_cache = TTLCache(default_ttl=60, namespace="persisted", cache=cold)
+
+    async def run():
+        await ttl_cache.set("key", {"ok": True}, stale_ttl=30)
+        assert await ttl_cache.get_entry("key") == ({"ok": True}, True)
+        await ttl_cache.clear()
+        return await ttl_cache.get("prices")
+
+    assert asyncio.run(run()) is None
+    cold.close()
+    assert TieredCache(_namespaces(), l2_path=path).warm() == 0
+
+
+def test_l2_io_runs_on_the_flusher_and_misses_skip_sqlite(tmp_path, monkeypatch):
+    import threading
+
+    from backend.cache import tiered_cache
+
+    path = str(tmp_path / "cache_l2.db")
+    seeded = TieredCache(_namespaces(), l2_path=path)
+    seeded.set("persisted", "evicted", {"v": 1})
+    seeded.set("persisted", "indexed", {"v": 0})
+    seeded.close()
+
+    monkeypatch.setattr(tiered_cache, "L2_FLUSH_INTERVAL", 0.05)
+    cache = TieredCache(_namespaces(), l2_path=path)
+    assert cache.warm() == 2
+    cache._ns("persisted").entries.clear()  # as if evicted from L1
+
+    reads, writers = [], []
+    get, write, keys = cache.l2.get, cache.l2.write, cache.l2.keys
+    monkeypatch.setattr(cache.l2, "get", lambda *args: reads.append((threading.current_thread(), args)) or get(*args))
+    monkeypatch.setattr(cache.l2, "keys", lambda *args: reads.append((threading.current_thread(), args)) or keys(*args))
+    monkeypatch.setattr(cache.l2, "write", lambda *args: writers.append(threading.current_thread()) or write(*args))
+
+    # Misses are answered by the key index; a key held in L2 is read back by the flusher
+    assert cache.get("persisted", "missing") is None
+    assert cache.get("persisted", "evicted") is None
+    assert _eventually(lambda: cache.get("persisted", "evicted")) == {"v": 1}
+    assert [args for _, args in reads] == [("persisted", "evicted")]
+    assert reads[0][0] is not threading.current_thread()
+
+    # A cold key index is loaded in the background too
+    cold = TieredCache(_namespaces(), l2_path=path)
+    monkeypatch.setattr(cold.l2, "keys", lambda *args: reads.append((threading.current_thread(), args)) or keys(*args))
+    assert cold.get("persisted", "indexed") is None
+    assert _eventually(lambda: cold.get("persisted", "indexed")) == {"v": 0}
+    assert reads[-1][0] is not threading.current_thread() and reads[-1][1][0] == "persisted"
+    assert _eventually(lambda: cold.stats()["l2"]["indexed_keys"] == 2)
+    cold.close()
+
+    # set() only queues; the flusher thread writes
+    cache.set("persisted", "new", {"v": 2})
+    deadline = time.monotonic() + 5
+    while not writers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writers and writers[0] is not threading.current_thread()
+    cache.close()
+
+    restarted = TieredCache(_namespaces(), l2_path=path)
+    assert restarted.warm() == 3
+    assert restarted.get("persisted", "new") == {"v": 2}
+    restarted.close()
+
+
+def test_failed_l2_write_is_retried_on_the_next_flush(tmp_path, monkeypatch):
+    import sqlite3
+
+    from backend.cache import tiered_cache
+
+    monkeypatch.setattr(tiered_cache, "L2_FLUSH_INTERVAL", 60)  # flush() only when called here
+    path = str(tmp_path / "cache_l2.db")
+    cache = TieredCache(_namespaces(), l2_path=path)
+    cache.set("persisted", "a", {"v": 1})
+    cache.set("persisted", "b", {"v": 1})
+
+    write = cache.l2.write
+
+    def locked(*args):
+        cache.set("persisted", "a", {"v": 2})  # queued while the batch is in flight
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache.l2, "write", locked)
+    assert cache.flush() == 0
+    assert cache.stats()["l2"]["pending_writes"] == 2
+
+    monkeypatch.setattr(cache.l2, "write", write)
+    assert cache.flush() == 2
+    cache.close()
+
+    restarted = TieredCache(_namespaces(), l2_path=path)
+    assert restarted.warm() == 2
+    assert restarted.get("persisted", "a") == {"v": 2}
+    assert restarted.get("persisted", "b") == {"v": 1}
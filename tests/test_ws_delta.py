@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+from backend.services.ws_delta import DeltaStream, apply_delta
+from backend.services.ws_hub import MSGPACK_AVAILABLE
+from backend.services.ws_service_manager import ServiceType, WebSocketServiceManager
+
+
+class FakeSocket:
+    def __init__(self):
+        self.frames = []
+        self.query_params = {}
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+    async def send_bytes(self, data):
+        import msgpack
+        self.frames.append(msgpack.unpackb(data))
+
+    async def close(self):
+        pass
+
+
+def test_delta_stream_sends_only_changes():
+    stream = DeltaStream("market_data")
+    assert stream.snapshot() is None
+
+    first = stream.update({"prices": {"BTC": 100, "ETH": 10, "XRP": 1}, "volumes": {"BTC": 5}}, source="a")
+    assert first["seq"] == 1 and first["base_seq"] == 0
+    client = apply_delta({}, first)
+
+    assert stream.update({"prices": {"BTC": 100, "ETH": 10, "XRP": 1}, "volumes": {"BTC": 5}}, source="b") is None
+    assert stream.seq == 1 and stream.unchanged_ticks == 1
+
+    new_state = {"prices": {"BTC": 101, "ETH": 10}, "volumes": {"BTC": 5}}
+    delta = stream.update(new_state, source="b")
+    assert delta["type"] == "market_data_delta"
+    assert (delta["seq"], delta["base_seq"]) == (2, 1)
+    assert delta["data"] == {"prices": {"BTC": 101}}
+    assert delta["removed"] == {"prices": ["XRP"]}
+
+    assert apply_delta(client, delta) == new_state
+    snapshot = stream.snapshot()
+    assert snapshot["snapshot"] is True and snapshot["seq"] == 2
+    assert snapshot["data"] == new_state and snapshot["source"] == "b"
+
+
+def test_subscriber_gets_snapshot_then_deltas():
+    async def run():
+        manager = WebSocketServiceManager()
+        stream = DeltaStream("market_data")
+        manager.register_snapshot_provider(ServiceType.MARKET_DATA, stream.snapshot)
+        stream.update({"prices": {"BTC": 100, "ETH": 10}})
+
+        socket = FakeSocket()
+        connection = await manager.connect(socket)
+        await manager.handle_client_message(connection, {"action": "subscribe", "service": "market_data"})
+
+        delta = stream.update({"prices": {"BTC": 101, "ETH": 10}})
+        await manager.broadcast_to_service(ServiceType.MARKET_DATA, delta, coalesce=False)
+        await manager.handle_client_message(connection, {"action": "get_snapshot", "service": "market_data"})
+        await manager.handle_client_message(connection, {"action": "set_encoding", "encoding": "msgpack"})
+        await manager.broadcast_to_service(ServiceType.MARKET_DATA, stream.update({"prices": {"BTC": 102}}))
+        await asyncio.sleep(0.01)
+        await manager.hub.close()
+        return socket.frames
+
+    frames = asyncio.run(run())
+    types = [f["type"] for f in frames]
+
+    assert types[:5] == [
+        "connection_established", "subscription_confirmed", "market_data", "market_data_delta", "market_data"
+    ]
+    snapshot, delta = frames[2], frames[3]
+    assert snapshot["service"] == "market_data" and snapshot["seq"] == 1
+    assert snapshot["data"] == {"prices": {"BTC": 100, "ETH": 10}}
+    assert delta["base_seq"] == snapshot["seq"] and delta["data"] == {"prices": {"BTC": 101}}
+    assert frames[4]["seq"] == 2
+
+    if MSGPACK_AVAILABLE:
+        assert types[5:] == ["encoding_changed", "market_data_delta"]
+        assert frames[6]["removed"] == {"prices": ["ETH"]}
+    else:
+        assert types[5:] == ["error", "market_data_delta"]
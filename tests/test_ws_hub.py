@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+from backend.services.real_websocket import RealWebSocketManager
+from backend.services.ws_hub import ChannelHub
+
+
+class FakeSocket:
+    def __init__(self, delay=0.0, fail=False):
+        self.frames = []
+        self.delay = delay
+        self.fail = fail
+        self.gate = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            raise ConnectionError("socket closed")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(json.loads(text))
+
+
+def test_thousand_clients_share_one_fetch_per_channel():
+    fetches = []
+
+    async def fetch(channel):
+        fetches.append(channel)
+        await asyncio.sleep(0.01)
+        return {"type": "update", "channel": channel, "n": len(fetches)}
+
+    async def run():
+        hub = ChannelHub(fetch=fetch, interval=0.05)
+        sockets = [FakeSocket() for _ in range(1000)]
+        for i, socket in enumerate(sockets):
+            hub.register(f"c{i}", socket.send_text)
+            hub.subscribe(f"c{i}", "market" if i % 2 else "news")
+        initial = await asyncio.gather(*(hub.current("market") for _ in range(500)))
+        await asyncio.sleep(0.13)
+        stats = hub.stats()
+        await hub.close()
+        return sockets, initial, stats
+
+    sockets, initial, stats = asyncio.run(run())
+
+    # One initial fetch for 500 callers, then one fetch per channel per tick
+    assert 2 <= fetches.count("market") <= 4
+    assert all(message == initial[0] for message in initial)
+    assert stats["producers"] == ["market", "news"]
+    assert all(len(s.frames) >= 1 for s in sockets)
+    assert {f["channel"] for f in sockets[1].frames} == {"market"}
+
+
+def test_slow_client_is_coalesced_and_failed_client_removed():
+    closed = []
+
+    async def run():
+        hub = ChannelHub(queue_size=4)
+        slow, fast, broken = FakeSocket(), FakeSocket(), FakeSocket(fail=True)
+        slow.gate = asyncio.Event()
+        hub.register("slow", slow.send_text)
+        hub.register("fast", fast.send_text)
+        hub.register("broken", broken.send_text, on_close=closed.append)
+        for client_id in ("slow", "fast", "broken"):
+            hub.subscribe(client_id, "prices")
+
+        for n in range(10):
+            hub.publish("prices", {"n": n})
+            await asyncio.sleep(0.001)
+        for n in range(10):
+            hub.send("slow", {"direct": n})
+        slow_stats = hub.clients["slow"].stats()
+
+        slow.gate.set()
+        await asyncio.sleep(0.01)
+        await hub.close()
+        return slow, fast, slow_stats
+
+    slow, fast, slow_stats = asyncio.run(run())
+
+    assert [f["n"] for f in fast.frames] == list(range(10))
+    # Stuck on the first frame: later updates collapse into one pending entry,
+    # then direct messages overflow the 4-slot queue and push out the oldest
+    assert slow_stats["coalesced"] == 8
+    assert slow_stats["dropped"] == 7
+    assert slow.frames[0] == {"n": 0}
+    assert [f.get("direct") for f in slow.frames[1:]] == [6, 7, 8, 9]
+    assert closed == ["broken"]
+
+
+def test_real_websocket_manager_fetches_once_for_all_subscribers(monkeypatch):
+    manager = RealWebSocketManager()
+    calls = []
+
+    async def fetch(channel):
+        calls.append(channel)
+        return {"price": 100.0}
+
+    monkeypatch.setattr(manager, "fetch_real_data_for_channel", fetch)
+
+    async def run():
+        sockets = [FakeSocket() for _ in range(5)]
+        for i, socket in enumerate(sockets):
+            await manager.connect(socket, f"client-{i}")
+        await asyncio.gather(*(manager.subscribe(f"client-{i}", ["market.BTC"]) for i in range(5)))
+        await asyncio.sleep(0.01)
+        producers = manager.hub.stats()["producers"]
+        for i in range(5):
+            await manager.disconnect(f"client-{i}")
+        remaining = manager.hub.stats()["producers"]
+        await manager.hub.close()
+        return sockets, producers, remaining
+
+    sockets, producers, remaining = asyncio.run(run())
+
+    assert calls == ["market.BTC"]
+    assert producers == ["market.BTC"] and remaining == []
+    for socket in sockets:
+        assert [f["type"] for f in socket.frames] == ["connected", "initial_data"]
+        assert socket.frames[1]["data"] == {"price": 100.0}
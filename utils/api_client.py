@@ -8,6 +8,7 @@ import asyncio
 from typing import Dict, Optional, Tuple, Any
 from datetime import datetime
 import time
+from utils.http_pool import get_aiohttp_session
 from utils.logger import setup_logger
 
 logger = setup_logger("api_client")
@@ -57,7 +58,7 @@ class APIClient:
 
         Args:
             default_timeout: Default timeout in seconds
-            max_connections: Maximum concurrent connections
+            max_connections: Kept for compatibility; per-host limits come from utils.http_pool
             retry_attempts: Maximum number of retry attempts
             retry_delay: Initial retry delay in seconds (exponential backoff)
         """
@@ -66,27 +67,12 @@ class APIClient:
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
 
-        # Connection pool configuration (lazy initialization)
-        self._connector = None
-
         # Default headers
         self.default_headers = {
             "User-Agent": "CryptoAPIMonitor/1.0",
             "Accept": "application/json"
         }
 
-    @property
-    def connector(self):
-        """Lazy initialize connector when first accessed"""
-        if self._connector is None:
-            self._connector = aiohttp.TCPConnector(
-                limit=self.max_connections,
-                limit_per_host=10,
-                ttl_dns_cache=300,
-                enable_cleanup_closed=True
-            )
-        return self._connector
-
     async def _make_request(
         self,
         method: str,
@@ -113,29 +99,28 @@ class APIClient:
         error_message = None
 
         try:
-            async with aiohttp.ClientSession(
-                connector=self.connector,
-                timeout=timeout_config
-            ) as session:
-                async with session.request(
-                    method,
-                    url,
-                    headers=merged_headers,
-                    params=params,
-                    ssl=True,  # Enable SSL verification
-                    **kwargs
-                ) as response:
-                    response_time_ms = (time.time() - start_time) * 1000
-                    status_code = response.status
-
-                    # Try to parse JSON response
-                    try:
-                        data = await response.json()
-                    except:
-                        # If not JSON, get text
-                        data = await response.text()
-
-                    return status_code, data, response_time_ms, error_message
+            # Shared keep-alive session per host (not closed after the request)
+            session = get_aiohttp_session(url)
+            async with session.request(
+                method,
+                url,
+                headers=merged_headers,
+                params=params,
+                timeout=timeout_config,
+                ssl=True,  # Enable SSL verification
+                **kwargs
+            ) as response:
+                response_time_ms = (time.time() - start_time) * 1000
+                status_code = response.status
+
+                # Try to parse JSON response
+                try:
+                    data = await response.json()
+                except:
+                    # If not JSON, get text
+                    data = await response.text()
+
+                return status_code, data, response_time_ms, error_message
 
         except asyncio.TimeoutError:
             response_time_ms = (time.time() - start_time) * 1000
@@ -305,9 +290,13 @@ class APIClient:
         return await self.request("POST", url, **kwargs)
 
     async def close(self):
-        """Close connector"""
-        if self.connector:
-            await self.connector.close()
+        """
+        Release resources owned by this client
+
+        Requests go through the process-wide sessions in utils.http_pool,
+        which other clients are still using; those are closed only by the
+        application shutdown (close_http_pools). Nothing to release here.
+        """
 
 
 # Global client instance
@@ -0,0 +1,297 @@
+"""
+Shared HTTP Client Pool
+Process-wide registry of keep-alive HTTP clients keyed by provider/host
+
+Creating an httpx.AsyncClient or aiohttp.ClientSession per request pays for
+DNS, TCP and TLS on every call. Clients obtained here are created once per
+provider (and event loop), keep connections alive, use HTTP/2 when the `h2`
+package is installed, and apply per-provider timeouts and connection limits.
+
+Usage:
+    async with pooled_client("coingecko") as client:
+        response = await client.get(url, params=params)
+
+Pool reuse ratio and handshake (connect + TLS) time are tracked per provider
+and exposed through get_pool_stats().
+"""
+
+import asyncio
+import importlib.util
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+import httpx
+
+from utils.logger import setup_logger
+from utils.server_timing import record_phase
+
+logger = setup_logger("http_pool")
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Per-provider pool settings. Keys are matched exactly, then as a substring of
+# the requested provider/host (so "api1.binance.com" uses "binance").
+PROVIDER_POOL_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "default": {"timeout": 10.0, "max_connections": 20, "max_keepalive": 10, "keepalive_expiry": 30.0, "http2": True},
+    "coingecko": {"timeout": 15.0, "max_connections": 10},
+    "binance": {"timeout": 10.0, "max_connections": 20},
+    "kraken": {"timeout": 15.0, "max_connections": 10},
+    "coinbase": {"timeout": 15.0, "max_connections": 10},
+    "coinpaprika": {"timeout": 10.0, "max_connections": 10},
+    "coincap": {"timeout": 10.0, "max_connections": 10},
+    "cryptocompare": {"timeout": 10.0, "max_connections": 10},
+    "huggingface": {"timeout": 30.0, "max_connections": 10},
+}
+
+
+def _settings_for(provider: str) -> Dict[str, Any]:
+    settings = dict(PROVIDER_POOL_SETTINGS["default"])
+    if provider in PROVIDER_POOL_SETTINGS:
+        settings.update(PROVIDER_POOL_SETTINGS[provider])
+        return settings
+    for name, overrides in PROVIDER_POOL_SETTINGS.items():
+        if name != "default" and name in provider:
+            settings.update(overrides)
+            break
+    return settings
+
+
+def provider_key(url_or_provider: str) -> str:
+    """Normalize a provider name or URL to a registry key (the hostname for URLs)"""
+    if "://" in url_or_provider:
+        return (urlparse(url_or_provider).hostname or url_or_provider).lower()
+    return url_or_provider.lower()
+
+
+class PoolStats:
+    """Connection reuse and handshake timing for one provider pool"""
+
+    __slots__ = ("requests", "new_connections", "handshake_total", "handshake_max")
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.handshake_total = 0.0
+        self.handshake_max = 0.0
+
+    def record_handshake(self, seconds: float):
+        self.new_connections += 1
+        self.handshake_total += seconds
+        self.handshake_max = max(self.handshake_max, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        reused = max(0, self.requests - self.new_connections)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / self.requests, 4) if self.requests else None,
+            "avg_handshake_ms": (
+                round(self.handshake_total / self.new_connections * 1000, 2) if self.new_connections else None
+            ),
+            "max_handshake_ms": round(self.handshake_max * 1000, 2),
+        }
+
+
+class HTTPClientPool:
+    """Registry of shared httpx clients and aiohttp sessions"""
+
+    def __init__(self):
+        self._httpx: Dict[Tuple[str, int], Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._aiohttp: Dict[Tuple[str, int], Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+        self.stats: Dict[str, PoolStats] = {}
+
+    def _stats(self, key: str) -> PoolStats:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = PoolStats()
+        return stats
+
+    def _purge_closed_loops(self):
+        """Drop clients bound to event loops that no longer run (e.g. after asyncio.run)"""
+        for registry in (self._httpx, self._aiohttp):
+            for key in [k for k, (loop, _) in registry.items() if loop.is_closed()]:
+                registry.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # httpx
+    # ------------------------------------------------------------------
+
+    def _httpx_tracer(self, stats: PoolStats):
+        """Build an httpcore trace callback recording connect + TLS time"""
+        started: Dict[str, float] = {}
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            if event_name == "connection.connect_tcp.started":
+                started["connect"] = time.perf_counter()
+            elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                started["done"] = time.perf_counter()
+            elif event_name.endswith("send_request_headers.started") and "connect" in started:
+                stats.record_handshake(started.get("done", time.perf_counter()) - started.pop("connect"))
+
+        return trace
+
+    def get_httpx_client(self, provider: str) -> httpx.AsyncClient:
+        """Shared httpx.AsyncClient for a provider name or URL (bound to the running loop)"""
+        key = provider_key(provider)
+        loop = asyncio.get_running_loop()
+        entry = self._httpx.get((key, id(loop)))
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+
+        self._purge_closed_loops()
+        settings = _settings_for(key)
+        stats = self._stats(key)
+
+        async def on_request(request: httpx.Request):
+            stats.requests += 1
+            request.extensions["trace"] = self._httpx_tracer(stats)
+            request.extensions["upstream_started"] = time.perf_counter()
+
+        async def on_response(response: httpx.Response):
+            # Time to response headers, reported in the Server-Timing "upstream" phase
+            started = response.request.extensions.get("upstream_started")
+            if started is not None:
+                record_phase("upstream", time.perf_counter() - started)
+
+        client = httpx.AsyncClient(
+            timeout=settings["timeout"],
+            limits=httpx.Limits(
+                max_connections=settings["max_connections"],
+                max_keepalive_connections=settings["max_keepalive"],
+                keepalive_expiry=settings["keepalive_expiry"],
+            ),
+            http2=settings["http2"] and HTTP2_AVAILABLE,
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+        self._httpx[(key, id(loop))] = (loop, client)
+        logger.debug(f"Created pooled httpx client for {key} (http2={settings['http2'] and HTTP2_AVAILABLE})")
+        return client
+
+    # ------------------------------------------------------------------
+    # aiohttp
+    # ------------------------------------------------------------------
+
+    def _aiohttp_trace_config(self, stats: PoolStats) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            stats.requests += 1
+            ctx.upstream_started = time.perf_counter()
+
+        async def on_request_end(session, ctx, params):
+            record_phase("upstream", time.perf_counter() - getattr(ctx, "upstream_started", time.perf_counter()))
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_started = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            stats.record_handshake(time.perf_counter() - getattr(ctx, "connect_started", time.perf_counter()))
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        return trace_config
+
+    def get_aiohttp_session(self, provider: str) -> aiohttp.ClientSession:
+        """Shared aiohttp.ClientSession for a provider name or URL (bound to the running loop)"""
+        key = provider_key(provider)
+        loop = asyncio.get_running_loop()
+        entry = self._aiohttp.get((key, id(loop)))
+        if entry is not None and entry[0] is loop and not entry[1].closed:
+            return entry[1]
+
+        self._purge_closed_loops()
+        settings = _settings_for(key)
+        connector = aiohttp.TCPConnector(
+            limit=settings["max_connections"],
+            limit_per_host=settings["max_connections"],
+            ttl_dns_cache=300,
+            keepalive_timeout=settings["keepalive_expiry"],
+            enable_cleanup_closed=True,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=settings["timeout"]),
+            trace_configs=[self._aiohttp_trace_config(self._stats(key))],
+        )
+        self._aiohttp[(key, id(loop))] = (loop, session)
+        logger.debug(f"Created pooled aiohttp session for {key}")
+        return session
+
+    # ------------------------------------------------------------------
+    # Lifecycle & stats
+    # ------------------------------------------------------------------
+
+    async def close_all(self):
+        """Close every client owned by the current event loop"""
+        loop = asyncio.get_running_loop()
+        for registry in (self._httpx, self._aiohttp):
+            for key, (owner, client) in list(registry.items()):
+                if owner is not loop:
+                    continue
+                try:
+                    if isinstance(client, httpx.AsyncClient):
+                        await client.aclose()
+                    else:
+                        await client.close()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled client {key[0]}: {e}")
+                registry.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        providers = {key: stats.to_dict() for key, stats in sorted(self.stats.items())}
+        requests = sum(s.requests for s in self.stats.values())
+        new_connections = sum(s.new_connections for s in self.stats.values())
+        return {
+            "http2_available": HTTP2_AVAILABLE,
+            "open_clients": len(self._httpx) + len(self._aiohttp),
+            "requests": requests,
+            "new_connections": new_connections,
+            "reuse_ratio": round(1 - new_connections / requests, 4) if requests else None,
+            "providers": providers,
+        }
+
+
+_pool: Optional[HTTPClientPool] = None
+
+
+def get_http_pool() -> HTTPClientPool:
+    """Get global HTTPClientPool instance"""
+    global _pool
+    if _pool is None:
+        _pool = HTTPClientPool()
+    return _pool
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """Shared keep-alive httpx client for a provider name or URL"""
+    return get_http_pool().get_httpx_client(provider)
+
+
+def get_aiohttp_session(provider: str) -> aiohttp.ClientSession:
+    """Shared keep-alive aiohttp session for a provider name or URL"""
+    return get_http_pool().get_aiohttp_session(provider)
+
+
+@asynccontextmanager
+async def pooled_client(provider: str) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Drop-in replacement for `async with httpx.AsyncClient(...) as client`.
+    The shared client is not closed on exit.
+    """
+    yield get_http_client(provider)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Pool reuse ratio and handshake timing per provider"""
+    return get_http_pool().get_stats()
+
+
+async def close_http_pools():
+    """Close all pooled clients (call on application shutdown)"""
+    await get_http_pool().close_all()
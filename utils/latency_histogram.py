@@ -0,0 +1,126 @@
+"""
+Latency Histogram
+Constant-memory latency distribution with log-spaced buckets (HDR style)
+
+Values are counted in buckets whose width grows geometrically, so every
+quantile is reported with a bounded relative error (~3% with the default 40
+buckets per decade) no matter how many samples were observed. Recording is
+a single integer increment; no samples are stored.
+
+Usage:
+    histogram = LatencyHistogram()
+    histogram.observe(0.120)          # seconds
+    histogram.quantile(0.5)           # -> ~0.120
+    histogram.snapshot()              # counts and p50/p90/p99 in ms
+"""
+
+import math
+from typing import Dict, Optional
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram
+
+    Args:
+        min_value: Smallest distinguishable value in seconds (smaller values
+            land in the first bucket)
+        max_value: Largest tracked value in seconds (larger values land in
+            the last bucket; the exact maximum is kept separately)
+        buckets_per_decade: Resolution; relative error is about
+            10 ** (1 / buckets_per_decade / 2) - 1
+    """
+
+    __slots__ = ("min_value", "max_value", "_scale", "_counts", "count", "total", "min", "max")
+
+    def __init__(self, min_value: float = 1e-4, max_value: float = 600.0, buckets_per_decade: int = 40):
+        self.min_value = min_value
+        self.max_value = max_value
+        self._scale = buckets_per_decade
+        size = int(math.ceil(math.log10(max_value / min_value) * buckets_per_decade)) + 1
+        self._counts = [0] * size
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = int(math.log10(value / self.min_value) * self._scale)
+        return min(index, len(self._counts) - 1)
+
+    def _bucket_value(self, index: int) -> float:
+        """Geometric midpoint of a bucket"""
+        return self.min_value * 10 ** ((index + 0.5) / self._scale)
+
+    def observe(self, value: float):
+        """Record one latency in seconds"""
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate quantile in seconds
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Latency in seconds, or None without observations
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(q * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank:
+                # Clamp to the observed range (exact for single-bucket data)
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram with the same bucket layout"""
+        if len(other._counts) != len(self._counts) or other.min_value != self.min_value:
+            raise ValueError("Histogram bucket layouts differ")
+        for index, bucket_count in enumerate(other._counts):
+            self._counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def reset(self):
+        """Drop all observations"""
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Summary in milliseconds"""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.mean),
+            "p50_ms": ms(self.quantile(0.5)),
+            "p90_ms": ms(self.quantile(0.9)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "min_ms": ms(self.min),
+            "max_ms": ms(self.max),
+        }
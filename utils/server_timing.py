@@ -0,0 +1,59 @@
+"""
+Server-Timing Phases
+Lets handlers and services record how long parts of a request took
+(upstream fetch, cache lookup, compute); MetricsMiddleware reports them in
+the response's Server-Timing header.
+
+Usage:
+    with timed_phase("compute"):
+        result = expensive()
+
+    record_phase("upstream", elapsed_seconds)
+
+Outside a request (background workers, scripts) both are no-ops.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, Optional
+
+_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("server_timing_phases", default=None)
+
+
+def begin_request() -> Token:
+    """Start collecting phases for the current request (called by the middleware)"""
+    return _phases.set({})
+
+
+def end_request(token: Token):
+    _phases.reset(token)
+
+
+def current_phases() -> Optional[Dict[str, float]]:
+    """Phase durations in seconds recorded so far in this request"""
+    return _phases.get()
+
+
+def record_phase(name: str, seconds: float):
+    """Add time to a phase of the current request (repeated phases are summed)"""
+    phases = _phases.get()
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed_phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as a phase of the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+def format_server_timing(phases: Dict[str, float], total: float) -> bytes:
+    """Server-Timing header value: recorded phases plus total app time, in ms"""
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.items()]
+    entries.append(f"app;dur={total * 1000:.1f}")
+    return ", ".join(entries).encode("latin-1")
@@ -27,6 +27,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import httpx
 
+from backend.cache.tiered_cache import get_tiered_cache
 from utils.logger import setup_logger
 
 logger = setup_logger("data_collection_worker")
@@ -376,7 +377,8 @@ class RealTimeDataFetcher:
     """
     
     def __init__(self):
-        self.cache = {}  # Simple in-memory cache
+        self.cache = get_tiered_cache()
+        self.cache_namespace = "realtime"
         self.timeout = httpx.Timeout(10.0)
     
     def _get_cache_key(self, source: str, data_type: str, params: Dict) -> str:
@@ -384,22 +386,22 @@ class RealTimeDataFetcher:
         params_str = "_".join(f"{k}={v}" for k, v in sorted(params.items()))
         return f"{source}_{data_type}_{params_str}"
     
-    def _is_cache_valid(self, cache_key: str, ttl_seconds: int) -> bool:
-        """Check if cached data is still valid"""
-        if cache_key not in self.cache:
-            return False
-        cached_at = self.cache[cache_key].get("cached_at")
-        if not cached_at:
-            return False
-        return (datetime.utcnow() - cached_at).total_seconds() < ttl_seconds
+    def _get_cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get cached data if still valid"""
+        return self.cache.get(self.cache_namespace, cache_key)
+    
+    def _set_cache(self, cache_key: str, data: Dict[str, Any], ttl_seconds: int):
+        """Store data in cache for `ttl_seconds`"""
+        self.cache.set(self.cache_namespace, cache_key, data, ttl=ttl_seconds)
     
     async def fetch_price(self, symbol: str, source: str = "binance") -> Dict[str, Any]:
         """Fetch real-time price"""
         cache_key = self._get_cache_key(source, "price", {"symbol": symbol})
         ttl = CACHE_TTL.get("market", 60)
         
-        if self._is_cache_valid(cache_key, ttl):
-            return self.cache[cache_key]["data"]
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
@@ -415,7 +417,7 @@ class RealTimeDataFetcher:
                             "source": "binance",
                             "timestamp": datetime.utcnow().isoformat()
                         }
-                        self.cache[cache_key] = {"data": result, "cached_at": datetime.utcnow()}
+                        self._set_cache(cache_key, result, ttl)
                         return result
                 
                 elif source == "coingecko":
@@ -431,7 +433,7 @@ class RealTimeDataFetcher:
                             "source": "coingecko",
                             "timestamp": datetime.utcnow().isoformat()
                         }
-                        self.cache[cache_key] = {"data": result, "cached_at": datetime.utcnow()}
+                        self._set_cache(cache_key, result, ttl)
                         return result
         except Exception as e:
             logger.error(f"Real-time price fetch error: {e}")
@@ -443,8 +445,9 @@ class RealTimeDataFetcher:
         cache_key = self._get_cache_key("binance", "ohlcv", {"symbol": symbol, "interval": interval})
         ttl = CACHE_TTL.get("ohlcv", 60)
         
-        if self._is_cache_valid(cache_key, ttl):
-            return self.cache[cache_key]["data"]
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
@@ -477,7 +480,7 @@ class RealTimeDataFetcher:
                         "source": "binance",
                         "timestamp": datetime.utcnow().isoformat()
                     }
-                    self.cache[cache_key] = {"data": result, "cached_at": datetime.utcnow()}
+                    self._set_cache(cache_key, result, ttl)
                     return result
         except Exception as e:
             logger.error(f"OHLCV fetch error: {e}")
@@ -170,29 +170,8 @@ async def save_market_data_to_cache(market_data: List[Dict[str, Any]]) -> int:
     Returns:
         int: Number of records saved
     """
-    saved_count = 0
-
-    # Step 1: Save to local SQLite cache
-    for data in market_data:
-        try:
-            success = cache.save_market_data(
-                symbol=data["symbol"],
-                price=data["price"],
-                market_cap=data.get("market_cap"),
-                volume_24h=data.get("volume_24h"),
-                change_24h=data.get("change_24h"),
-                high_24h=data.get("high_24h"),
-                low_24h=data.get("low_24h"),
-                provider=data["provider"]
-            )
-
-            if success:
-                saved_count += 1
-                logger.debug(f"Saved market data for {data['symbol']}: ${data['price']:.2f}")
-
-        except Exception as e:
-            logger.error(f"Error saving market data for {data.get('symbol')}: {e}")
-            continue
+    # Step 1: Save to local SQLite cache (single transaction)
+    saved_count = cache.save_market_data_bulk(market_data)
 
     # Step 2: Upload to HuggingFace Datasets (if enabled)
     if HF_UPLOAD_ENABLED and hf_uploader and market_data:
@@ -24,8 +24,11 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 import httpx
 
+from backend.services.indicator_state import get_indicator_registry
+from backend.services.ohlcv_store import get_ohlcv_store
 from database.cache_queries import get_cache_queries
 from database.db_manager import db_manager
+from utils.http_pool import pooled_client
 from utils.logger import setup_logger
 
 logger = setup_logger("ohlc_worker")
@@ -33,6 +36,10 @@ logger = setup_logger("ohlc_worker")
 # Get cache queries instance
 cache = get_cache_queries(db_manager)
 
+# Streaming indicator state, advanced as candles are saved
+indicator_registry = get_indicator_registry()
+ohlcv_store = get_ohlcv_store()
+
 # HuggingFace Dataset Uploader (optional - only if HF_TOKEN is set)
 HF_UPLOAD_ENABLED = bool(os.getenv("HF_TOKEN") or os.getenv("HF_API_TOKEN"))
 if HF_UPLOAD_ENABLED:
@@ -117,7 +124,7 @@ async def fetch_from_coingecko(symbol: str, interval: str, limit: int) -> List[D
         
         logger.debug(f"Fetching from CoinGecko: {coin_id} ({symbol})")
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with pooled_client("coingecko") as client:
             response = await client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
@@ -184,7 +191,7 @@ async def fetch_from_kraken(symbol: str, interval: str, limit: int) -> List[Dict
         
         logger.debug(f"Fetching from Kraken: {pair} ({symbol})")
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with pooled_client("kraken") as client:
             response = await client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
@@ -255,7 +262,7 @@ async def fetch_from_coinbase(symbol: str, interval: str, limit: int) -> List[Di
         
         logger.debug(f"Fetching from Coinbase: {pair} ({symbol})")
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with pooled_client("coinbase") as client:
             response = await client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
@@ -313,7 +320,7 @@ async def fetch_from_binance(symbol: str, interval: str, limit: int) -> List[Dic
         
         logger.debug(f"Fetching from Binance: {pair} ({symbol})")
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with pooled_client("binance") as client:
             response = await client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
@@ -399,8 +406,10 @@ async def save_ohlc_data_to_cache(ohlc_data: List[Dict[str, Any]]) -> int:
 
     Data Flow:
         1. Save to SQLite cache (local persistence)
-        2. Upload to HuggingFace Datasets (cloud storage & hub)
-        3. Clients can fetch from HuggingFace Datasets
+        2. Append to the columnar OHLCV store (memory-mapped reads)
+        3. Advance the streaming indicator state for each symbol/interval
+        4. Upload to HuggingFace Datasets (cloud storage & hub)
+        5. Clients can fetch from HuggingFace Datasets
 
     Args:
         ohlc_data: List of REAL OHLC data dictionaries
@@ -408,31 +417,24 @@ async def save_ohlc_data_to_cache(ohlc_data: List[Dict[str, Any]]) -> int:
     Returns:
         int: Number of candles saved
     """
-    saved_count = 0
+    # Step 1: Upsert into local SQLite cache (single transaction)
+    saved_count = cache.save_ohlc_candles_bulk(ohlc_data)
 
-    # Step 1: Save to local SQLite cache
-    for data in ohlc_data:
+    # Step 2: Append to the columnar store used for backtests and indicators
+    if saved_count > 0:
         try:
-            success = cache.save_ohlc_candle(
-                symbol=data["symbol"],
-                interval=data["interval"],
-                timestamp=data["timestamp"],
-                open_price=data["open"],
-                high=data["high"],
-                low=data["low"],
-                close=data["close"],
-                volume=data["volume"],
-                provider=data["provider"]
-            )
-
-            if success:
-                saved_count += 1
+            ohlcv_store.append_candles(ohlc_data)
+        except Exception as e:
+            logger.error(f"Error appending to OHLCV store: {e}")
 
+    # Step 3: Advance streaming indicators (only candles newer than the head are applied)
+    if saved_count > 0:
+        try:
+            indicator_registry.update_from_candles(ohlc_data)
         except Exception as e:
-            logger.error(f"Error saving OHLC data for {data.get('symbol')}: {e}")
-            continue
+            logger.error(f"Error updating indicator state: {e}")
 
-    # Step 2: Upload to HuggingFace Datasets (if enabled)
+    # Step 4: Upload to HuggingFace Datasets (if enabled)
     if HF_UPLOAD_ENABLED and hf_uploader and ohlc_data:
         try:
             # Prepare data for upload (convert datetime to ISO string)